@@ -0,0 +1,133 @@
+"""
+Measure request latency with many concurrent asyncio clients while catalog scans run.
+
+Compares calling a Library directly from coroutines (scans block the event loop)
+with going through AsyncLibrary (scans run on the thread pool). With --storage
+the library logs to a FileStorage, whose disk syncs then also stall the loop of
+the direct calls, while AsyncLibrary runs the point operations on the pool.
+
+Each client sends a request at a random moment of every --window seconds, so
+the offered load is clients / window requests per second; keep it below what
+one event loop can serve or queueing, not blocking, dominates the latencies.
+
+Run from the project root:
+
+    python -m benchmarks.bench_async --clients 10000
+    python -m benchmarks.bench_async --clients 10000 --storage
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from library_management.async_library import AsyncLibrary
+from library_management.library import Library
+from library_management.storage import FileStorage
+
+from .common import make_items, percentile
+
+
+class BlockingFacade:
+    """Awaitable wrapper that calls the library directly on the event loop."""
+
+    def __init__(self, library:Library):
+        self.library = library
+
+    async def search_item(self, keyword:str) -> list:
+        return self.library.search_item(keyword)
+
+    async def lend_item(self, member_id:str, item) -> None:
+        self.library.lend_item(member_id, item)
+
+    async def return_item(self, member_id:str, item) -> None:
+        self.library.return_item(member_id, item)
+
+    async def get_items(self) -> list:
+        return self.library.get_items()
+
+
+async def run(
+        facade,
+        items:list,
+        member_ids:list,
+        clients:int,
+        rounds:int,
+        window:float,
+        interval:float
+) -> list:
+    """Run the simulated clients and a scanning dashboard, returning request latencies."""
+    latencies = []
+    done = asyncio.Event()
+
+    async def client(number:int) -> None:
+        loop = asyncio.get_running_loop()
+        rng = random.Random(number)
+        member_id = member_ids[number % len(member_ids)]
+        for _ in range(rounds):
+            # Latency is measured from when the request was due to be sent, so
+            # time spent waiting for a blocked event loop counts against it.
+            due = loop.time() + rng.random() * window
+            await asyncio.sleep(due - loop.time())
+            item = items[rng.randrange(len(items))]
+            await facade.search_item(item.get_title())
+            try:
+                await facade.lend_item(member_id, item)
+                await facade.return_item(member_id, item)
+            except Exception:
+                pass
+            latencies.append(loop.time() - due)
+
+    async def dashboard() -> None:
+        while not done.is_set():
+            await facade.get_items()
+            try:
+                await asyncio.wait_for(done.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    scanner = asyncio.ensure_future(dashboard())
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    done.set()
+    await scanner
+
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--window", type=float, default=4.0, help="seconds over which each round is spread")
+    parser.add_argument("--interval", type=float, default=0.25, help="seconds between dashboard scans")
+    parser.add_argument("--storage", action="store_true", help="log every mutation to a FileStorage")
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+
+    for name in ("blocking", "async"):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = FileStorage(directory) if args.storage else None
+            library = Library(storage=storage, thread_safe=True)
+            library.add_items(items)
+            member_ids = library.create_members(f"Member {number}" for number in range(1_000))
+            facade = BlockingFacade(library) if name == "blocking" else AsyncLibrary(library)
+
+            start = time.perf_counter()
+            latencies = asyncio.run(
+                run(facade, items, member_ids, args.clients, args.rounds, args.window, args.interval)
+            )
+            elapsed = time.perf_counter() - start
+            library.close()
+
+        print(
+            f"{name:>9}: {len(latencies) / elapsed:>8,.0f} req/s  "
+            f"p50 {percentile(latencies, 0.50) * 1e3:>8.1f} ms  "
+            f"p99 {percentile(latencies, 0.99) * 1e3:>8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
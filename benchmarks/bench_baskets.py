@@ -0,0 +1,66 @@
+"""
+Compare checking out and returning baskets item by item against lend_items/return_items.
+
+Run from the project root:
+
+    python -m benchmarks.bench_baskets --baskets 2000 --basket-size 20
+"""
+
+import argparse
+import tempfile
+import time
+
+from library_management.library import Library
+from library_management.storage import FileStorage
+
+from .common import make_items
+
+
+def run(library:Library, items:list, basket_size:int, batched:bool) -> float:
+    """Lend and return every item in baskets of IDs, as kiosks send them, and return the elapsed seconds."""
+    member_id = library.create_member("Kiosk")
+    item_ids = [item.get_id() for item in items]
+    id_baskets = [item_ids[start:start + basket_size] for start in range(0, len(item_ids), basket_size)]
+
+    start = time.perf_counter()
+    if batched:
+        for item_ids in id_baskets:
+            library.lend_items(member_id, item_ids)
+        for item_ids in id_baskets:
+            library.return_items(member_id, item_ids)
+    else:
+        for item_ids in id_baskets:
+            for item_id in item_ids:
+                library.lend_item(member_id, library.get_item(item_id))
+        for item_ids in id_baskets:
+            for item_id in item_ids:
+                library.return_item(member_id, library.get_item(item_id))
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baskets", type=int, default=2_000)
+    parser.add_argument("--basket-size", type=int, default=20)
+    args = parser.parse_args()
+
+    items = make_items(args.baskets * args.basket_size)
+    print(f"{'library':>12} {'per item s':>11} {'baskets s':>10} {'speedup':>8}")
+    for name in ("plain", "thread-safe", "wal"):
+        timings = []
+        for batched in (False, True):
+            with tempfile.TemporaryDirectory() as directory:
+                if name == "wal":
+                    library = Library(storage=FileStorage(directory))
+                else:
+                    library = Library(thread_safe=name == "thread-safe")
+                library.add_items(items)
+                timings.append(run(library, items, args.basket_size, batched))
+                library.close()
+
+        print(f"{name:>12} {timings[0]:>11.3f} {timings[1]:>10.3f} {timings[0] / timings[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
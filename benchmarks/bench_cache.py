@@ -0,0 +1,91 @@
+"""
+Measure the result cache on a skewed query mix interleaved with lends and returns.
+
+Prefix, substring and ranked searches pick titles with a Zipf-like skew, so a
+few popular queries repeat often, and a dashboard poll of get_items runs every --poll-every operations.
+Every --mutate-every operations an item is lent or returned, which
+invalidates the cache. Run from the project root:
+
+    python -m benchmarks.bench_cache --items 50000 --operations 5000 --mutate-every 1000
+"""
+
+import argparse
+import random
+import time
+
+from library_management.library import Library
+from library_management.result_cache import ResultCache
+
+from .common import make_items
+
+
+SEARCH_MODES = ("prefix", "substring", "ranked")
+
+
+def workload(items:list, operations:int, poll_every:int, mutate_every:int, seed:int) -> list:
+    """Build the (kind, argument) operations of the benchmark."""
+    rng = random.Random(seed)
+    titles = list(dict.fromkeys(item.get_title() for item in items))
+    weights = [1 / rank for rank in range(1, len(titles) + 1)]
+    keywords = rng.choices(titles, weights, k=operations)
+
+    plan = []
+    for number, keyword in enumerate(keywords, 1):
+        if number % mutate_every == 0:
+            plan.append(("mutate", rng.choice(items)))
+        elif number % poll_every == 0:
+            plan.append(("poll", None))
+        else:
+            mode = SEARCH_MODES[number % len(SEARCH_MODES)]
+            plan.append(("search", (keyword, mode, 10)))
+
+    return plan
+
+
+def run(items:list, plan:list, cache:ResultCache) -> float:
+    """Replay a plan against a fresh library and return the elapsed seconds."""
+    library = Library(cache=cache)
+    library.add_items(items)
+    member_id = library.create_member("Benchmark")
+
+    start = time.perf_counter()
+    for kind, argument in plan:
+        if kind == "search":
+            library.search_item(*argument)
+        elif kind == "poll":
+            library.get_items(fields=("id", "title", "borrower_id"))
+        elif argument.get_is_borrowed():
+            library.return_item(argument.get_borrowed_by().get_id(), argument)
+        else:
+            library.lend_item(member_id, argument)
+    elapsed = time.perf_counter() - start
+
+    for item in items:
+        if item.get_is_borrowed():
+            library.return_item(member_id, item)
+
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--operations", type=int, default=5_000)
+    parser.add_argument("--poll-every", type=int, default=100)
+    parser.add_argument("--mutate-every", type=int, nargs="+", default=[10_000, 1_000, 250])
+    parser.add_argument("--max-entries", type=int, default=1_024)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    print(f"{'mutate every':>12} {'uncached s':>11} {'cached s':>9} {'speedup':>8} {'hit rate':>9}")
+    for mutate_every in args.mutate_every:
+        plan = workload(items, args.operations, args.poll_every, mutate_every, seed=mutate_every)
+        uncached = run(items, plan, None)
+        cache = ResultCache(max_entries=args.max_entries)
+        cached = run(items, plan, cache)
+        print(f"{mutate_every:>12} {uncached:>11.2f} {cached:>9.2f} {uncached / cached:>7.1f}x "
+              f"{cache.get_stats()['hit_rate']:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare the loan event feed against polling the overdue list and diffing it.
+
+A notification service checks for newly overdue loans every --interval
+minutes over --hours of simulated time. The polling baseline rebuilds the
+set of overdue loans from the due date index and diffs it with the previous
+poll; the feed only touches the loans that crossed a milestone. Run from the
+project root:
+
+    python -m benchmarks.bench_change_feed --items 1000000 --loan-ratio 0.3
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from library_management.library import Library
+
+from .common import make_items, mark_borrowed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--loan-ratio", type=float, default=0.3)
+    parser.add_argument("--interval", type=float, default=5)
+    parser.add_argument("--hours", type=float, default=24)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    borrowed = mark_borrowed(items, args.loan_ratio)
+    library = Library()
+    library.add_items(items)
+
+    start = time.perf_counter()
+    subscription_id = library.subscribe()
+    subscribe_seconds = time.perf_counter() - start
+
+    now = datetime.now()
+    moments = [
+        now + timedelta(minutes=args.interval * number)
+        for number in range(1, int(args.hours * 60 / args.interval) + 1)
+    ]
+    loans = [(item.get_due_date(), item.get_id()) for item in borrowed]
+
+    start = time.perf_counter()
+    previous = {item_id for due_date, item_id in loans if due_date < now}
+    diffed = 0
+    for moment in moments:
+        overdue = {item_id for due_date, item_id in loans if due_date < moment}
+        diffed += len(overdue - previous)
+        previous = overdue
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    events = 0
+    for moment in moments:
+        events += sum(
+            event.get_kind() == "overdue" for event in library.poll_events(subscription_id, moment)
+        )
+    feed_seconds = time.perf_counter() - start
+
+    print(f"{len(borrowed)} loans, {len(moments)} polls, subscribe {subscribe_seconds * 1e3:.1f} ms")
+    print(f"{'scan + diff':>12} {scan_seconds / len(moments) * 1e3:9.3f} ms/poll  {diffed} newly overdue")
+    print(f"{'change feed':>12} {feed_seconds / len(moments) * 1e3:9.3f} ms/poll  {events} overdue events")
+
+
+if __name__ == "__main__":
+    main()
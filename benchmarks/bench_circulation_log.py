@@ -0,0 +1,76 @@
+"""
+Measure loan history queries on the segmented circulation log against scanning a flat event list.
+
+A year of --events lends and returns over --items items is logged, then
+"all events of one item in one month" queries are timed on the segmented
+CirculationLog and by filtering a plain list of the same events, as
+rebuilding history from periodic catalog snapshots amounts to. Also
+times compacting away the first half of the year. Run from the project root:
+
+    python -m benchmarks.bench_circulation_log --events 1000000
+"""
+
+import argparse
+import random
+import time
+
+from library_management.circulation_log import CirculationLog
+from library_management.fines import DAY_MICROS
+from library_management.storage import LEND_ITEM, RETURN_ITEM
+
+
+def make_events(count:int, items:int, members:int, seed:int = 0) -> list[tuple]:
+    """Draw (kind, item_id, member_id, moment) events spread evenly over a year, in time order."""
+    rng = random.Random(seed)
+    step = 365 * DAY_MICROS // count
+    return [
+        (LEND_ITEM if number % 2 == 0 else RETURN_ITEM, f"i-{rng.randrange(items)}",
+         f"m-{rng.randrange(members)}", number * step)
+        for number in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    events = make_events(args.events, args.items, args.members)
+    log = CirculationLog()
+    start = time.perf_counter()
+    for kind, item_id, member_id, moment in events:
+        log.append(kind, item_id, member_id, moment)
+    append = (time.perf_counter() - start) / len(events)
+    print(f"append:                {append * 1e6:10.2f} us/event ({log.get_segment_count()} segments)")
+
+    rng = random.Random(1)
+    queries = [
+        (f"i-{rng.randrange(args.items)}", month * 30 * DAY_MICROS, (month + 1) * 30 * DAY_MICROS)
+        for month in (rng.randrange(12) for _ in range(args.queries))
+    ]
+
+    start = time.perf_counter()
+    for item_id, low, high in queries:
+        [event for event in events if event[1] == item_id and low <= event[3] < high]
+    scan = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    for item_id, low, high in queries:
+        log.query(item_id=item_id, start=low, end=high)
+    segmented = (time.perf_counter() - start) / len(queries)
+
+    print(f"item + month, scan:    {scan * 1e3:10.3f} ms/query")
+    print(f"item + month, log:     {segmented * 1e3:10.3f} ms/query ({scan / segmented:.0f}x)")
+
+    start = time.perf_counter()
+    dropped = log.compact(before=182 * DAY_MICROS)
+    compact = time.perf_counter() - start
+    print(f"compact half the year: {compact * 1e3:10.1f} ms ({dropped} events dropped, "
+          f"{log.get_segment_count()} segments left)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Measure dashboard aggregates kept by CirculationStats against counting over get_items().
+
+A library of --items items serves --lends random lends and returns; then
+the active loans per kind, the top authors and the loans per title are
+queried from the incremental counters and computed by scanning the
+catalog. Also reports the lend overhead of keeping the counters, and the
+memory of the exact and approximate modes counting a skewed stream of
+lends over --distinct titles. Run from the project root:
+
+    python -m benchmarks.bench_circulation_stats --items 100000 --lends 100000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from library_management.circulation_stats import CirculationStats, title_key
+from library_management.library import Library
+
+from .bench_memory import measure
+from .common import make_items, best_of
+
+
+def circulate(library:Library, items:list, lends:int, seed:int = 0) -> float:
+    """Lend random items and return every other one, returning the time per lend in seconds."""
+    rng = random.Random(seed)
+    member_id = library.create_member("Benchmark")
+    sample = rng.sample(items, lends)
+
+    start = time.perf_counter()
+    for number, item in enumerate(sample):
+        library.lend_item(member_id, item)
+        if number % 2:
+            library.return_item(member_id, item)
+
+    return (time.perf_counter() - start) / lends
+
+
+def scan_summary(library:Library) -> dict:
+    """Compute the active loans per kind from a full listing, as dashboards had to."""
+    active = Counter()
+    for item in library.get_items(("id", "is_borrowed")):
+        if item["is_borrowed"]:
+            active[type(library.get_item(item["id"])).__name__] += 1
+
+    return dict(active)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--lends", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=100_000)
+    args = parser.parse_args()
+
+    plain = Library()
+    plain_items = make_items(args.items)
+    plain.add_items(plain_items)
+    plain_lend = circulate(plain, plain_items, args.lends)
+
+    items = make_items(args.items)
+    stats = CirculationStats()
+    library = Library(circulation_stats=stats)
+    library.add_items(items)
+    stats_lend = circulate(library, items, args.lends)
+
+    print(f"lend + return, no stats: {plain_lend * 1e6:10.2f} us")
+    print(f"lend + return, stats:    {stats_lend * 1e6:10.2f} us")
+
+    scan = best_of(lambda: scan_summary(library), repeat=3)
+    counters = best_of(lambda: library.get_circulation_summary(10), repeat=3)
+    assert scan_summary(library) == library.get_circulation_summary()["active_loans"]
+    print(f"active loans by scan:    {scan * 1e3:10.3f} ms")
+    print(f"summary by counters:     {counters * 1e3:10.3f} ms")
+
+    rng = random.Random(1)
+    catalog = make_items(args.distinct, seed=1)
+    # Half the lends go to a few popular titles, the rest anywhere in the catalog.
+    stream = [
+        catalog[min(int(rng.paretovariate(1.0)), args.distinct) - 1] if number % 2 else rng.choice(catalog)
+        for number in range(args.distinct * 2)
+    ]
+    for approximate in (False, True):
+        def build():
+            filled = CirculationStats(approximate=approximate)
+            for item in stream:
+                filled.record_lend(item)
+            return filled
+
+        _, size = measure(build)
+        mode = "approximate" if approximate else "exact"
+        print(f"{mode:>11} mode, {len(set(map(title_key, stream)))} titles: {size / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
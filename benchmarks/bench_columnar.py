@@ -0,0 +1,82 @@
+"""
+Compare columnar snapshots with the storage snapshot on export, import, open and lookup time.
+
+The storage snapshot is FileStorage.write_snapshot, restored by reopening the
+library; the columnar snapshot is Library.export_columnar, loaded back with
+import_columnar or opened read-only as a SnapshotLibrary. Run from the project root:
+
+    python -m benchmarks.bench_columnar --items 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from library_management.library import Library
+from library_management.snapshot_library import SnapshotLibrary
+from library_management.storage import FileStorage
+
+from .common import make_items, mark_borrowed, percentile
+
+
+def timed(func) -> tuple:
+    """Run a callable and return its result and the seconds it took."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def directory_size(path:str) -> int:
+    """Return the total size of the files in a directory."""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    mark_borrowed(items, ratio=0.3)
+    library = Library()
+    library.add_items(items)
+    item_ids = random.Random(0).choices([item.get_id() for item in items], k=args.lookups)
+
+    with tempfile.TemporaryDirectory() as directory:
+        wal = os.path.join(directory, "wal")
+        os.mkdir(wal)
+        storage = FileStorage(wal)
+        _, export_seconds = timed(lambda: storage.write_snapshot([], items))
+        storage.close()
+        _, import_seconds = timed(lambda: Library(storage=FileStorage(wal)).close())
+        print(
+            f"{'storage':>9}  export {export_seconds:6.2f} s  import {import_seconds:6.2f} s"
+            f"  size {directory_size(wal) / 2**20:8.1f} MiB"
+        )
+
+        path = os.path.join(directory, "catalog.col")
+        _, export_seconds = timed(lambda: library.export_columnar(path))
+        _, import_seconds = timed(lambda: Library().import_columnar(path))
+        print(
+            f"{'columnar':>9}  export {export_seconds:6.2f} s  import {import_seconds:6.2f} s"
+            f"  size {os.path.getsize(path) / 2**20:8.1f} MiB"
+        )
+
+        snapshot, open_seconds = timed(lambda: SnapshotLibrary(path))
+        samples = []
+        for item_id in item_ids:
+            start = time.perf_counter()
+            snapshot.get_item(item_id)
+            samples.append(time.perf_counter() - start)
+        snapshot.close()
+        print(
+            f"{'snapshot':>9}  open {open_seconds * 1e3:6.2f} ms  get_item"
+            f" p50 {percentile(samples, 0.5) * 1e6:6.1f} us  p99 {percentile(samples, 0.99) * 1e6:6.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
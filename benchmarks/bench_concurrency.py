@@ -0,0 +1,110 @@
+"""
+Stress a thread-safe Library with concurrent lends and returns, then check its invariants.
+
+Run from the project root:
+
+    python -m benchmarks.bench_concurrency --threads 1 2 4 8
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from library_management.library import Library
+
+from .common import make_items
+
+
+def stress(threads:int, items:list, members:int, operations:int) -> tuple:
+    """
+    Run a random lend/return workload from several threads.
+
+    :return: (operations per second, successful operations, rejected operations).
+    """
+    library = Library(thread_safe=True)
+    library.add_items(items)
+    member_ids = library.create_members(f"Member {number}" for number in range(members))
+    counts = {"ok": 0, "rejected": 0}
+    counts_lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def work(seed:int) -> None:
+        rng = random.Random(seed)
+        ok = rejected = 0
+        barrier.wait()
+        for _ in range(operations):
+            item = rng.choice(items)
+            holder = item.get_borrowed_by()
+            try:
+                if holder is None:
+                    library.lend_item(rng.choice(member_ids), item)
+                else:
+                    library.return_item(holder.get_id(), item)
+                ok += 1
+            except Exception:
+                rejected += 1
+        with counts_lock:
+            counts["ok"] += ok
+            counts["rejected"] += rejected
+
+    workers = [threading.Thread(target=work, args=(seed,)) for seed in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    check_invariants(library, items)
+
+    return threads * operations / elapsed, counts["ok"], counts["rejected"]
+
+
+def check_invariants(library:Library, items:list) -> None:
+    """
+    Verify every loan is recorded consistently on the item, the member and the due-date index.
+
+    :raises AssertionError: If an item is held by two members or the records disagree.
+    """
+    borrowers = {item.get_borrowed_by() for item in items if item.get_is_borrowed()}
+    holders = {}
+    for member in borrowers:
+        for info in member.get_borrowed_items():
+            assert info["id"] not in holders, f"item {info['id']} held twice"
+            holders[info["id"]] = member.get_id()
+
+    for item in items:
+        if item.get_is_borrowed():
+            assert holders.get(item.get_id()) == item.get_borrowed_by().get_id(), \
+                f"item {item.get_id()} loan records disagree"
+        else:
+            assert item.get_id() not in holders, f"returned item {item.get_id()} still held"
+
+    overdue_or_due = library.get_items_due_within(days=5)
+    assert len(overdue_or_due) == sum(item.get_is_borrowed() for item in items), \
+        "due-date index disagrees with item loan state"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--items", type=int, default=1_000)
+    parser.add_argument("--members", type=int, default=100)
+    parser.add_argument("--operations", type=int, default=20_000, help="per thread")
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    print(f"{'threads':>8} {'ops/s':>10} {'ok':>9} {'rejected':>9}  invariants")
+    for threads in args.threads:
+        for item in items:
+            item.set_is_borrowed(False)
+            item.set_borrowed_by(None)
+            item.set_due_date(None)
+        throughput, ok, rejected = stress(threads, items, args.members, args.operations)
+        print(f"{threads:>8} {throughput:>10,.0f} {ok:>9} {rejected:>9}  ok")
+
+
+if __name__ == "__main__":
+    main()
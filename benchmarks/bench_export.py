@@ -0,0 +1,89 @@
+"""
+Compare the peak memory and time of a full catalog export, materialized vs. paginated.
+
+The JSON export runs twice, and the memory exports leave allocated on the
+items is reported per item. With --memoize the items keep their info and JSON
+bytes, see library_item.set_memoization, so the second export reuses them.
+Run from the project root:
+
+    python -m benchmarks.bench_export --items 200000
+    python -m benchmarks.bench_export --items 200000 --memoize
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from library_management.library import Library
+from library_management.library_item import set_memoization
+
+from .common import make_items, mark_borrowed
+
+
+def measure_peak(export) -> tuple:
+    """
+    Run an export under tracemalloc.
+
+    :return: The seconds taken and the peak bytes allocated while it ran.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    export()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=1_000)
+    parser.add_argument("--memoize", action="store_true", help="memoize item info and JSON bytes")
+    args = parser.parse_args()
+    set_memoization(args.memoize)
+
+    items = make_items(args.items)
+    mark_borrowed(items, ratio=0.3)
+    library = Library()
+    library.add_items(items)
+
+    def consume(infos):
+        count = 0
+        for _ in infos:
+            count += 1
+        return count
+
+    runs = {
+        "get_items()": lambda: consume(library.get_items()),
+        "iter_items()": lambda: consume(library.iter_items(page_size=args.page_size)),
+        "iter_items(fields)": lambda: consume(
+            library.iter_items(fields=("id", "title", "borrower_id"), page_size=args.page_size)
+        ),
+        "json.dumps(get_items)": lambda: json.dumps(library.get_items(), default=str),
+        "iter_items_json()": lambda: consume(library.iter_items_json(page_size=args.page_size)),
+        "iter_items_json() again": lambda: consume(library.iter_items_json(page_size=args.page_size)),
+    }
+
+    # Memory an export leaves allocated once it is done, e.g. memos kept on the items;
+    # measured first, before any export has built them.
+    gc.collect()
+    tracemalloc.start()
+    runs["get_items()"]()
+    runs["iter_items_json()"]()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'retained after exports':24} {retained / args.items:7.0f} B/item")
+
+    for name, export in runs.items():
+        elapsed, peak = measure_peak(export)
+        print(f"{name:24} {elapsed:7.2f} s  peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
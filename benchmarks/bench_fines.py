@@ -0,0 +1,67 @@
+"""
+Compare a per-item calculate_fine billing run against the batch fine engine.
+
+Run from the project root:
+
+    python -m benchmarks.bench_fines --loans 100000 500000
+"""
+
+import argparse
+import random
+from array import array
+from datetime import datetime, timedelta
+
+from library_management import fines
+from library_management.catalog_store import CatalogStore
+from library_management.library import Library
+from library_management.member import Member
+from library_management.timestamps import to_micros
+
+from .common import best_of, make_items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--loans", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--members", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"NumPy: {'yes' if fines.numpy is not None else 'no'}")
+    print(f"{'loans':>8} {'per item s':>11} {'Library s':>10} {'store s':>8} {'packed s':>9}")
+    for count in args.loans:
+        rng = random.Random(count)
+        members = [Member(f"Member {number}") for number in range(args.members)]
+        items = make_items(count)
+        now = datetime.now()
+        for item in items:
+            rng.choice(members).borrow_item(item, now - timedelta(days=rng.uniform(-30, 730)))
+
+        library = Library()
+        library.add_items(items)
+        store = CatalogStore()
+        for item in items:
+            store.add(item)
+
+        member_ids = [item.get_borrowed_by().get_id() for item in items]
+        due_dates = array("q", [to_micros(item.get_due_date()) for item in items])
+
+        def per_item():
+            totals = {}
+            for item in items:
+                member_id = item.get_borrowed_by().get_id()
+                totals[member_id] = totals.get(member_id, 0.0) + item.calculate_fine()
+            return totals
+
+        per_item_time = best_of(per_item, repeat=1)
+        library_time = best_of(library.calculate_fines, repeat=3)
+        store_time = best_of(lambda: store.calculate_fines(now), repeat=3)
+        packed_time = best_of(lambda: fines.total_fines(member_ids, due_dates, to_micros(now)), repeat=3)
+
+        print(
+            f"{count:>8} {per_item_time:>11.3f} {library_time:>10.3f} "
+            f"{store_time:>8.3f} {packed_time:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
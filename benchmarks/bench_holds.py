@@ -0,0 +1,71 @@
+"""
+Measure placing, cancelling and fulfilling holds as the number of outstanding holds grows.
+
+Every item is on loan and gets a waitlist of up to --queue-length members;
+the timed rounds place one more hold on an item, cancel it again, and
+return the item so it is handed to the first holder. Run from
+the project root:
+
+    python -m benchmarks.bench_holds --holds 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+
+from library_management.library import Library
+
+from .common import make_items
+
+
+def run(holds:int, queue_length:int, rounds:int) -> tuple:
+    """Build a library with a number of outstanding holds and time the hold operations in it."""
+    item_count = max(holds // queue_length, rounds)
+    items = make_items(item_count)
+    library = Library()
+    library.add_items(items)
+    borrower = library.create_member("Borrower")
+    library.lend_items(borrower, [item.get_id() for item in items])
+    member_ids = library.create_members(f"Member {number}" for number in range(queue_length + 1))
+
+    for item in items:
+        for member_id in member_ids[:holds // item_count]:
+            library.place_hold(member_id, item.get_id())
+
+    rng = random.Random(0)
+    sample = rng.sample(items, rounds)
+    extra = member_ids[-1]
+
+    start = time.perf_counter()
+    for item in sample:
+        library.place_hold(extra, item.get_id())
+    place = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for item in sample:
+        library.cancel_hold(extra, item.get_id())
+    cancel = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for item in sample:
+        library.return_item(borrower, item)
+    hand_off = (time.perf_counter() - start) / rounds
+
+    return place, cancel, hand_off
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--holds", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queue-length", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'holds':>8} {'place us':>9} {'cancel us':>10} {'hand-off us':>12}")
+    for holds in args.holds:
+        place, cancel, hand_off = run(holds, args.queue_length, args.rounds)
+        print(f"{holds:>8} {place * 1e6:>9.2f} {cancel * 1e6:>10.2f} {hand_off * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
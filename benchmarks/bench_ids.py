@@ -0,0 +1,44 @@
+"""
+Compare ID generation and bulk loading with snowflake and uuid4 IDs.
+
+Run from the project root:
+
+    python -m benchmarks.bench_ids --items 200000
+"""
+
+import argparse
+import time
+
+from library_management.ids import SnowflakeGenerator, Uuid4Generator, set_id_generator
+from library_management.library import Library
+
+from .common import best_of, make_items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'generator':<10} {'ns/id':>8} {'build s':>8} {'add_items s':>12}")
+    for name, generator in (("uuid4", Uuid4Generator()), ("snowflake", SnowflakeGenerator())):
+        previous = set_id_generator(generator)
+        try:
+            per_id = best_of(lambda: [generator.new_id() for _ in range(100_000)]) / 100_000
+
+            start = time.perf_counter()
+            items = make_items(args.items)
+            build = time.perf_counter() - start
+
+            library = Library()
+            start = time.perf_counter()
+            library.add_items(items)
+            load = time.perf_counter() - start
+        finally:
+            set_id_generator(previous)
+
+        print(f"{name:<10} {per_id * 1e9:>8.0f} {build:>8.2f} {load:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure the per-call overhead of instrumentation, disabled and enabled.
+
+Run from the project root:
+
+    python -m benchmarks.bench_instrumentation --calls 1000000
+"""
+
+import argparse
+import sys
+from contextlib import nullcontext
+
+from library_management.instrumentation import Instrumentation
+from library_management.library import Library
+
+from .common import best_of, make_items
+
+# Budget for the disabled path, in nanoseconds per call.
+DISABLED_BUDGET_NS = 50
+
+
+def per_call_ns(library:Library, item_id:str, calls:int) -> float:
+    """Return the fastest per-call time of a cheap point lookup, in nanoseconds."""
+    get_borrower_id = library.get_borrower_id
+
+    def loop():
+        for _ in range(calls):
+            get_borrower_id(item_id)
+
+    return best_of(loop, repeat=7) / calls * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    item = make_items(1)[0]
+
+    def library_with(instrumentation=None, detach=False) -> Library:
+        library = Library(instrumentation=instrumentation)
+        library.add_item(item)
+        if detach:
+            Instrumentation.detach(library)
+        return library
+
+    plain = per_call_ns(library_with(), item.get_id(), args.calls)
+    disabled = per_call_ns(library_with(Instrumentation(), detach=True), item.get_id(), args.calls)
+    enabled = per_call_ns(library_with(Instrumentation()), item.get_id(), args.calls)
+    traced = per_call_ns(
+        library_with(Instrumentation(tracer=lambda name: nullcontext())), item.get_id(), args.calls
+    )
+
+    print(f"plain:                {plain:8.1f} ns/call")
+    for name, timing in (("disabled (detached)", disabled), ("enabled", enabled), ("enabled + tracer", traced)):
+        print(f"{name + ':':<21} {timing:8.1f} ns/call  overhead {timing - plain:+8.1f} ns")
+
+    overhead = disabled - plain
+    verdict = "within" if overhead < DISABLED_BUDGET_NS else "over"
+    print(f"disabled overhead {overhead:+.1f} ns is {verdict} the {DISABLED_BUDGET_NS} ns budget")
+    sys.exit(0 if overhead < DISABLED_BUDGET_NS else 1)
+
+
+if __name__ == "__main__":
+    main()
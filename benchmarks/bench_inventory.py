@@ -0,0 +1,97 @@
+"""
+Compare one Book object per copy against shared Titles with lightweight Copies.
+
+Every title gets --copies copies. The baseline builds a full Book per copy,
+as loading a catalog row per copy does, so each copy holds its own strings;
+the inventory model holds the bibliographic fields once per Title. Also
+times counting the available copies of a title by scanning its search hits
+against reading the Title's counters. Run from the project root:
+
+    python -m benchmarks.bench_inventory --titles 20000 --copies 5
+"""
+
+import argparse
+import random
+import time
+
+from library_management.inventory import Title
+from library_management.library import Library
+from library_management.library_item import Book
+
+from .bench_memory import measure
+from .common import WORDS, AUTHORS
+
+
+def make_fields(titles:int, seed:int = 0) -> list[tuple]:
+    """Draw the word lists, author, year and ISBN of every title."""
+    rng = random.Random(seed)
+    return [
+        ([rng.choice(WORDS) for _ in range(3)], rng.choice(AUTHORS), rng.randint(1900, 2024), f"978-{number:010d}")
+        for number in range(titles)
+    ]
+
+
+def build_books(fields:list, copies:int) -> list:
+    """Build a full Book per copy, each with strings of its own as if parsed from its own row."""
+    return [
+        Book(" ".join(words), str(year), author.encode().decode(), isbn.encode().decode())
+        for words, author, year, isbn in fields
+        for _ in range(copies)
+    ]
+
+
+def build_titles(fields:list, copies:int) -> tuple:
+    """Build a Title per title and its Copies."""
+    titles = [Title(Book, " ".join(words), str(year), author, isbn) for words, author, year, isbn in fields]
+    return titles, [copy for title in titles for copy in title.new_copies(copies)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--titles", type=int, default=20_000)
+    parser.add_argument("--copies", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+
+    fields = make_fields(args.titles)
+    count = args.titles * args.copies
+
+    books, book_bytes = measure(lambda: build_books(fields, args.copies))
+    (titles, copies), copy_bytes = measure(lambda: build_titles(fields, args.copies))
+    print(f"Book per copy:    {book_bytes / count:8.1f} bytes/copy")
+    print(f"Title + Copy:     {copy_bytes / count:8.1f} bytes/copy")
+
+    baseline = Library()
+    baseline.add_items(books)
+    library = Library()
+    library.add_items(copies)
+    member_id = library.create_member("Benchmark")
+    baseline_member_id = baseline.create_member("Benchmark")
+    rng = random.Random(0)
+    for title in rng.sample(titles, len(titles) // 2):
+        library.lend_title(member_id, title.get_id())
+    for book in books[::args.copies * 2]:
+        baseline.lend_item(baseline_member_id, book)
+
+    sample = rng.sample(range(args.titles), min(args.queries, args.titles))
+
+    start = time.perf_counter()
+    for number in sample:
+        words, author, year, isbn = fields[number]
+        sum(
+            1 for item in baseline.search_item(" ".join(words))
+            if item.get_ISBN() == isbn and not item.get_is_borrowed()
+        )
+    scan = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    for number in sample:
+        library.get_availability(titles[number].get_id())
+    counters = (time.perf_counter() - start) / len(sample)
+
+    print(f"availability by search + scan: {scan * 1e6:10.2f} us/query")
+    print(f"availability by counters:      {counters * 1e6:10.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure the memory cost per catalog item with tracemalloc.
+
+Run from the project root:
+
+    python -m benchmarks.bench_memory --items 100000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from library_management.catalog_store import CatalogStore
+
+from .common import make_items
+
+
+def measure(build) -> tuple:
+    """
+    Run a builder under tracemalloc.
+
+    :return: The built object and the bytes it still holds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return built, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args()
+
+    items, object_bytes = measure(lambda: make_items(args.items))
+
+    def build_store():
+        store = CatalogStore()
+        for item in items:
+            store.add(item)
+        return store
+
+    store, store_bytes = measure(build_store)
+
+    print(f"LibraryItem objects: {object_bytes / args.items:8.1f} bytes/item")
+    print(f"CatalogStore:        {store_bytes / len(store):8.1f} bytes/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Compare the indexed overdue queries against a full catalog scan.
+
+Run from the project root:
+
+    python -m benchmarks.bench_overdue --sizes 10000 100000 1000000
+"""
+
+import argparse
+
+from library_management.library import Library
+
+from .common import best_of, make_items, mark_borrowed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--loan-ratio", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"{'items':>10} {'loans':>8} {'scan ms':>10} {'overdue ms':>11} {'due<=3d ms':>11}")
+    for size in args.sizes:
+        items = make_items(size)
+        borrowed = mark_borrowed(items, args.loan_ratio)
+        library = Library()
+        for item in items:
+            library.add_item(item)
+
+        scan = best_of(
+            lambda: [item for item in items if item.get_is_borrowed() and item.is_overdue()]
+        )
+        overdue = best_of(library.get_overdue_items)
+        due_soon = best_of(lambda: library.get_items_due_within(days=3))
+
+        print(
+            f"{size:>10} {len(borrowed):>8} {scan * 1e3:>10.2f} "
+            f"{overdue * 1e3:>11.3f} {due_soon * 1e3:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
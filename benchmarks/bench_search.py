@@ -0,0 +1,80 @@
+"""
+Compare ranked search against fuzzy matching by scanning every item.
+
+Queries are catalog titles with a typo in one word. The scan matches them the
+way a caller without an index would: edit distance of every query word to
+every word of every title. Run from the project root:
+
+    python -m benchmarks.bench_search --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+from library_management.library import Library
+from library_management.search_index import _TOKEN_PATTERN, _edit_distance, _max_edits
+
+from .common import make_items
+
+
+def misspell(title:str, rng:random.Random) -> str:
+    """Swap two adjacent characters inside the longest word of a title."""
+    word = max(title.split(), key=len)
+    if len(word) < 5:
+        return title
+    position = rng.randrange(len(word) - 1)
+    typo = word[:position] + word[position + 1] + word[position] + word[position + 2:]
+
+    return title.replace(word, typo, 1)
+
+
+def scan(items:list, query:str, limit:int) -> list:
+    """Rank items by the number of query words found in their title within the typo allowance."""
+    terms = _TOKEN_PATTERN.findall(query.lower())
+    scored = []
+    for item in items:
+        words = _TOKEN_PATTERN.findall(item.get_title().lower())
+        hits = sum(
+            any(_edit_distance(term, word, _max_edits(len(term))) <= _max_edits(len(term)) for word in words)
+            for term in terms
+        )
+        if hits:
+            scored.append((hits, item))
+    scored.sort(key=lambda entry: entry[0], reverse=True)
+
+    return [item for _, item in scored[:limit]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-queries", type=int, default=3,
+                        help="queries timed with the scan, which is far slower")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'items':>9} {'ranked ms':>10} {'scan ms':>10} {'speedup':>9}")
+    for size in args.sizes:
+        items = make_items(size)
+        library = Library()
+        library.add_items(items)
+        rng = random.Random(size)
+        queries = [misspell(rng.choice(items).get_title(), rng) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        for query in queries:
+            library.search_item(query, "ranked", args.limit)
+        ranked = (time.perf_counter() - start) / len(queries) * 1e3
+
+        start = time.perf_counter()
+        for query in queries[:args.scan_queries]:
+            scan(items, query, args.limit)
+        scanned = (time.perf_counter() - start) / args.scan_queries * 1e3
+
+        print(f"{size:>9,} {ranked:>10.2f} {scanned:>10.1f} {scanned / ranked:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
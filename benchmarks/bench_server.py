@@ -0,0 +1,155 @@
+"""
+Load-test the HTTP/JSON service with concurrent clients, reporting requests per second and p99 latency.
+
+Each client registers a member and alternately lends and returns items of
+its own slice of the catalog, so every operation succeeds. The same
+workload runs with a new connection per request, over one kept-alive
+connection per client, and in POST /batch round trips. Without --url an
+in-process server is started over a synthetic catalog. Run from the project
+root:
+
+    python -m benchmarks.bench_server --clients 1 4 16 --requests 2000
+    python -m benchmarks.bench_server --url http://127.0.0.1:8080 --modes keep-alive batch
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from library_management.library import Library
+from library_management.server import LibraryHTTPServer
+
+from .common import make_items, percentile
+
+
+MODES = ("close", "keep-alive", "batch")
+
+
+def call(connection:http.client.HTTPConnection, method:str, path:str, payload = None, close:bool = False):
+    """Send one request and return its decoded JSON body."""
+    headers = {"Connection": "close"} if close else {}
+    body = None if payload is None else json.dumps(payload)
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    data = response.read()
+    if response.status >= 400:
+        raise RuntimeError(f"{method} {path} failed with {response.status}: {data.decode()}")
+
+    return json.loads(data)
+
+
+def operations(member_id:str, item_ids:list, count:int) -> list:
+    """Build a client's workload: each item of its slice is lent, then returned, leaving none on loan."""
+    result = []
+    count -= count % 2
+    lent = set()
+    for number in range(count):
+        item_id = item_ids[(number // 2) % len(item_ids)]
+        op = "return" if item_id in lent else "lend"
+        lent.symmetric_difference_update((item_id,))
+        result.append({"op": op, "member_id": member_id, "item_id": item_id})
+
+    return result
+
+
+def run(host:str, port:int, mode:str, workloads:list, batch_size:int) -> tuple:
+    """
+    Run every client's workload in its own thread.
+
+    :return: (requests per second, operations per second, p50 and p99 request latency in ms).
+    """
+    latencies = []
+    latencies_lock = threading.Lock()
+    barrier = threading.Barrier(len(workloads) + 1)
+
+    def work(workload:list) -> None:
+        timings = []
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        barrier.wait()
+        if mode == "batch":
+            for start in range(0, len(workload), batch_size):
+                began = time.perf_counter()
+                call(connection, "POST", "/batch", {"operations": workload[start:start + batch_size]})
+                timings.append(time.perf_counter() - began)
+        else:
+            close = mode == "close"
+            for operation in workload:
+                began = time.perf_counter()
+                call(connection, "POST", "/" + operation["op"], operation, close)
+                if close:
+                    connection.close()
+                timings.append(time.perf_counter() - began)
+        connection.close()
+        with latencies_lock:
+            latencies.extend(timings)
+
+    workers = [threading.Thread(target=work, args=(workload,)) for workload in workloads]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    total_operations = sum(len(workload) for workload in workloads)
+    return (
+        len(latencies) / elapsed,
+        total_operations / elapsed,
+        percentile(latencies, 0.50) * 1e3,
+        percentile(latencies, 0.99) * 1e3,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="server to test; an in-process one is started if omitted")
+    parser.add_argument("--items", type=int, default=10_000, help="catalog size of the in-process server")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=2_000, help="operations per client")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        library = Library(thread_safe=True)
+        library.add_items(make_items(args.items))
+        server = LibraryHTTPServer(("127.0.0.1", 0), library)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+
+    try:
+        setup = http.client.HTTPConnection(host, port, timeout=30)
+        item_ids = [item["id"] for item in call(setup, "GET", "/items") if not item["is_borrowed"]]
+        clients = max(args.clients)
+        member_ids = [call(setup, "POST", "/members", {"name": f"Load {number}"})["id"] for number in range(clients)]
+        setup.close()
+        if len(item_ids) < clients:
+            parser.error(f"the catalog needs at least {clients} available items.")
+
+        slice_size = len(item_ids) // clients
+        print(f"{'clients':>8} {'mode':>10} {'req/s':>10} {'ops/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for count in args.clients:
+            workloads = [
+                operations(member_ids[number], item_ids[number * slice_size:(number + 1) * slice_size], args.requests)
+                for number in range(count)
+            ]
+            for mode in args.modes:
+                requests_rate, operations_rate, p50, p99 = run(host, port, mode, workloads, args.batch_size)
+                print(f"{count:>8} {mode:>10} {requests_rate:>10,.0f} {operations_rate:>10,.0f} "
+                      f"{p50:>8.2f} {p99:>8.2f}")
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
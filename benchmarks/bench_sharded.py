@@ -0,0 +1,83 @@
+"""
+Compare a single-process Library with ShardedLibrary on scans and point operations.
+
+Substring searches and overdue queries scan every item, so spreading the
+catalog over worker processes lets them run on several cores at once. Point
+operations pay a round trip to a worker instead. Run from the project root:
+
+    python -m benchmarks.bench_sharded --items 200000 --shards 1 2 4
+"""
+
+import argparse
+import os
+import random
+import time
+
+from library_management.library import Library
+from library_management.sharded_library import ShardedLibrary
+
+from .common import AUTHORS, make_items, mark_borrowed
+
+
+def measure(library, items:list, operations:int, searches:int) -> dict:
+    """
+    Time lend/return pairs, substring searches and overdue queries.
+
+    :return: Microseconds per lend/return pair, and milliseconds per search and overdue query.
+    """
+    member_id = library.create_member("Benchmark")
+    rng = random.Random(0)
+    available = [item for item in items if not item.get_is_borrowed()]
+    sample = rng.sample(available, min(operations, len(available)))
+
+    start = time.perf_counter()
+    for item in sample:
+        library.lend_item(member_id, item)
+        library.return_item(member_id, item)
+    lend_return = (time.perf_counter() - start) / len(sample) * 1e6
+
+    keywords = [rng.choice(AUTHORS)[4:] for _ in range(searches)]
+    start = time.perf_counter()
+    for keyword in keywords:
+        library.search_item(keyword, "substring")
+    search = (time.perf_counter() - start) / searches * 1e3
+
+    start = time.perf_counter()
+    for _ in range(searches):
+        library.get_overdue_items()
+    overdue = (time.perf_counter() - start) / searches * 1e3
+
+    return {"lend_return_us": lend_return, "search_ms": search, "overdue_ms": overdue}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--operations", type=int, default=2_000, help="lend/return pairs")
+    parser.add_argument("--searches", type=int, default=20)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    mark_borrowed(items, 0.1)
+    print(f"{os.cpu_count()} CPU(s), {args.items:,} items")
+    print(f"{'library':<12} {'load s':>8} {'lend+return us':>15} {'search ms':>10} {'overdue ms':>11}")
+
+    candidates = [("single", Library)] + [
+        (f"{shards} shard(s)", lambda shards=shards: ShardedLibrary(shards=shards))
+        for shards in args.shards
+    ]
+    for name, factory in candidates:
+        library = factory()
+        start = time.perf_counter()
+        library.add_items(items)
+        load = time.perf_counter() - start
+
+        result = measure(library, items, args.operations, args.searches)
+        library.close()
+        print(f"{name:<12} {load:>8.2f} {result['lend_return_us']:>15.1f} "
+              f"{result['search_ms']:>10.1f} {result['overdue_ms']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
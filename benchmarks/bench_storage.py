@@ -0,0 +1,77 @@
+"""
+Measure write-ahead logging throughput and cold-start replay time.
+
+The WAL is snapshotted automatically once it passes --snapshot-threshold
+operations, which bounds the replay; pass 0 to replay the whole log. Run
+from the project root:
+
+    python -m benchmarks.bench_storage --operations 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+from library_management.library import Library
+from library_management.storage import FileStorage, SQLiteStorage
+
+from .common import make_items
+
+
+def run(name:str, make_storage, operations:int) -> None:
+    """Log a lend/return workload, then time reopening the library."""
+    items = make_items(max(operations // 10, 1))
+
+    library = Library(storage=make_storage())
+    start = time.perf_counter()
+    library.add_items(items)
+    member_ids = library.create_members(f"Member {number}" for number in range(1_000))
+    logged = len(items) + len(member_ids)
+    cycle = 0
+    while logged < operations:
+        item = items[cycle % len(items)]
+        member_id = member_ids[cycle % len(member_ids)]
+        library.lend_item(member_id, item)
+        library.return_item(member_id, item)
+        logged += 2
+        cycle += 1
+    library.close()
+    write_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Library(storage=make_storage()).close()
+    restore_seconds = time.perf_counter() - start
+
+    print(
+        f"{name:>8} {logged:>10} ops  write {logged / write_seconds:>10,.0f} ops/s"
+        f"  restore {restore_seconds:>7.2f} s ({logged / restore_seconds:,.0f} ops/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operations", type=int, default=200_000)
+    parser.add_argument("--group-size", type=int, default=256)
+    parser.add_argument("--snapshot-threshold", type=int, default=100_000,
+                        help="WAL operations before an automatic snapshot; 0 disables them")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        run(
+            "wal",
+            lambda: FileStorage(
+                directory, group_size=args.group_size, snapshot_threshold=args.snapshot_threshold or None
+            ),
+            args.operations
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        run(
+            "sqlite",
+            lambda: SQLiteStorage(f"{directory}/library.db", group_size=args.group_size),
+            args.operations
+        )
+
+
+if __name__ == "__main__":
+    main()
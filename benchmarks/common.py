@@ -0,0 +1,85 @@
+"""Shared helpers for the benchmark scripts."""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from library_management.library_item import Book, Magazine, DVD
+from library_management.member import Member
+
+
+WORDS = (
+    "art", "history", "of", "the", "modern", "python", "garden", "river", "night",
+    "science", "ocean", "city", "war", "peace", "music", "data", "journey", "light",
+)
+AUTHORS = tuple(f"Author {number}" for number in range(5_000))
+
+
+def make_items(count:int, seed:int = 0) -> list:
+    """
+    Build a synthetic catalog of Book, Magazine and DVD objects.
+
+    :param count: Number of items to build.
+    :param seed: Seed for the random generator, for reproducible catalogs.
+    :return: A list of LibraryItem objects.
+    """
+    rng = random.Random(seed)
+    items = []
+    for number in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(3))
+        author = rng.choice(AUTHORS)
+        year = str(rng.randint(1900, 2024))
+        kind = number % 3
+        if kind == 0:
+            items.append(Book(title, year, author, ISBN=f"978-{number:010d}"))
+        elif kind == 1:
+            items.append(Magazine(title, year, author, issue_no=str(number % 12 + 1)))
+        else:
+            items.append(DVD(title, year, author, duration=f"{rng.randint(1, 3)}h"))
+
+    return items
+
+
+def mark_borrowed(items:list, ratio:float, seed:int = 0) -> list:
+    """
+    Put a fraction of items on loan with due dates spread around now.
+
+    Loans are set directly on the items, so they are indexed when the items
+    are added to a Library afterwards.
+
+    :param items: The items to draw loans from.
+    :param ratio: Fraction of items to put on loan.
+    :param seed: Seed for the random generator.
+    :return: The borrowed items.
+    """
+    rng = random.Random(seed)
+    member = Member(name="Benchmark")
+    now = datetime.now()
+    borrowed = rng.sample(items, int(len(items) * ratio))
+    for item in borrowed:
+        item.set_is_borrowed(True)
+        item.set_borrowed_by(member)
+        item.set_due_date(now + timedelta(days=rng.uniform(-30, 30)))
+
+    return borrowed
+
+
+def best_of(func, repeat:int = 5) -> float:
+    """
+    Time a callable several times.
+
+    :return: The fastest run in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def percentile(samples:list, fraction:float) -> float:
+    """Return the given percentile of a list of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
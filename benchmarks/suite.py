@@ -0,0 +1,383 @@
+"""
+Benchmark the library_management hot paths and compare runs for regressions.
+
+Each size builds a synthetic catalog and member base, then times the core
+Library operations, reporting throughput, latency percentiles and the peak
+memory each benchmark allocates. Run from the project root:
+
+    python -m benchmarks.suite run --sizes 1000 100000 --output baseline.json
+    python -m benchmarks.suite compare baseline.json candidate.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from library_management.library import Library
+
+from .common import AUTHORS, make_items, mark_borrowed, percentile
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then left out.
+    resource = None
+
+
+LOAN_RATIO = 0.1
+MEMBER_RATIO = 0.1
+MEMORY_OPS = 1_000
+WARMUP_OPS = 200
+
+
+def build_fixture(size:int, seed:int) -> dict:
+    """
+    Build a library holding a synthetic catalog and member base.
+
+    A tenth of the items start on loan to detached members, with due dates
+    spread around now, so overdue and fine benchmarks have work to do.
+
+    :param size: Number of catalog items.
+    :param seed: Seed for the synthetic data.
+    :return: A dict with the library, its items, registered member IDs,
+             the borrowed items, the items available to lend, and a seeded Random.
+    """
+    items = make_items(size, seed)
+    borrowed = mark_borrowed(items, LOAN_RATIO, seed)
+    borrowed_ids = {item.get_id() for item in borrowed}
+
+    library = Library()
+    library.add_items(items)
+    member_ids = library.create_members(
+        f"Member {number}" for number in range(max(10, int(size * MEMBER_RATIO)))
+    )
+
+    return {
+        "library": library,
+        "items": items,
+        "member_ids": member_ids,
+        "borrowed": borrowed,
+        "available": [item for item in items if item.get_id() not in borrowed_ids],
+        "rng": random.Random(seed),
+    }
+
+
+def timed(operation, arguments) -> list:
+    """
+    Call an operation once per argument tuple, timing each call.
+
+    :return: The latency of every call in seconds.
+    """
+    clock = time.perf_counter
+    latencies = []
+    for args in arguments:
+        start = clock()
+        operation(*args)
+        latencies.append(clock() - start)
+
+    return latencies
+
+
+def bench_add_item(fixture:dict, count:int) -> list:
+    """Add new items one at a time, then remove them again untimed."""
+    library = fixture["library"]
+    items = make_items(count, seed=fixture["rng"].randrange(2 ** 32))
+    latencies = timed(library.add_item, ((item,) for item in items))
+    for item in items:
+        library.remove_item(item.get_id())
+
+    return latencies
+
+
+def bench_search_exact(fixture:dict, count:int) -> list:
+    """Search whole titles of random catalog items."""
+    items, rng = fixture["items"], fixture["rng"]
+    keywords = [rng.choice(items).get_title() for _ in range(count)]
+
+    return timed(fixture["library"].search_item, ((keyword,) for keyword in keywords))
+
+
+def bench_search_prefix(fixture:dict, count:int) -> list:
+    """
+    Search random item IDs without their last character.
+
+    Time-ordered IDs share their leading characters across a whole catalog, so
+    only a prefix this long stays selective: it matches at most 16 items.
+    """
+    items, rng = fixture["items"], fixture["rng"]
+    keywords = [rng.choice(items).get_id()[:-1] for _ in range(count)]
+
+    return timed(fixture["library"].search_item, ((keyword, "prefix") for keyword in keywords))
+
+
+def bench_search_substring(fixture:dict, count:int) -> list:
+    """Search fragments of author names."""
+    rng = fixture["rng"]
+    keywords = [rng.choice(AUTHORS)[4:] for _ in range(count)]
+
+    return timed(fixture["library"].search_item, ((keyword, "substring") for keyword in keywords))
+
+
+def bench_search_ranked(fixture:dict, count:int) -> list:
+    """Rank the top 10 matches of titles with one character swapped."""
+    items, rng = fixture["items"], fixture["rng"]
+    keywords = []
+    for _ in range(count):
+        title = rng.choice(items).get_title()
+        position = rng.randrange(len(title) - 1)
+        keywords.append(title[:position] + title[position + 1] + title[position] + title[position + 2:])
+
+    return timed(fixture["library"].search_item, ((keyword, "ranked", 10) for keyword in keywords))
+
+
+def bench_lend_return(fixture:dict, count:int) -> list:
+    """Lend available items to random members, then return them, timing each call."""
+    library, rng = fixture["library"], fixture["rng"]
+    loans = [
+        (rng.choice(fixture["member_ids"]), item)
+        for item in rng.sample(fixture["available"], min(count, len(fixture["available"])))
+    ]
+
+    return timed(library.lend_item, loans) + timed(library.return_item, loans)
+
+
+def bench_get_items(fixture:dict, count:int) -> list:
+    """Materialize the whole catalog listing."""
+    return timed(fixture["library"].get_items, [()] * count)
+
+
+def bench_iter_items(fixture:dict, count:int) -> list:
+    """Stream the whole catalog listing page by page, projecting three fields."""
+    library = fixture["library"]
+
+    def consume():
+        for _ in library.iter_items(fields=("id", "title", "borrower_id")):
+            pass
+
+    return timed(consume, [()] * count)
+
+
+def bench_get_overdue_items(fixture:dict, count:int) -> list:
+    """List the overdue items."""
+    return timed(fixture["library"].get_overdue_items, [()] * count)
+
+
+def bench_calculate_fine(fixture:dict, count:int) -> list:
+    """Calculate the fine of random borrowed items one at a time."""
+    borrowed, rng = fixture["borrowed"], fixture["rng"]
+    items = [rng.choice(borrowed) for _ in range(count)] if borrowed else []
+
+    return timed(lambda item: item.calculate_fine(), ((item,) for item in items))
+
+
+def bench_calculate_fines(fixture:dict, count:int) -> list:
+    """Calculate the fines of every member in one batch."""
+    return timed(fixture["library"].calculate_fines, [()] * count)
+
+
+# Benchmark functions by name, with whether they scan the whole library.
+# Point benchmarks run once per sample; scans run --scan-repeat times.
+BENCHMARKS = {
+    "add_item": (bench_add_item, False),
+    "search_exact": (bench_search_exact, False),
+    "search_prefix": (bench_search_prefix, False),
+    "search_substring": (bench_search_substring, False),
+    "search_ranked": (bench_search_ranked, False),
+    "lend_return": (bench_lend_return, False),
+    "calculate_fine": (bench_calculate_fine, False),
+    "get_items": (bench_get_items, True),
+    "iter_items": (bench_iter_items, True),
+    "get_overdue_items": (bench_get_overdue_items, True),
+    "calculate_fines": (bench_calculate_fines, True),
+}
+
+
+def peak_memory(benchmark, fixture:dict, count:int) -> int:
+    """
+    Run a benchmark again under tracemalloc.
+
+    :return: The peak number of bytes allocated above what was live before the run.
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    benchmark(fixture, count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak - baseline
+
+
+def summarize(size:int, name:str, latencies:list, peak_bytes) -> dict:
+    """Reduce the latencies of one benchmark run to a result record."""
+    seconds = sum(latencies)
+    micros = [latency * 1e6 for latency in latencies] or [0.0]
+
+    return {
+        "size": size,
+        "benchmark": name,
+        "ops": len(latencies),
+        "seconds": seconds,
+        "throughput": len(latencies) / seconds if seconds else 0.0,
+        "p50_us": percentile(micros, 0.50),
+        "p90_us": percentile(micros, 0.90),
+        "p99_us": percentile(micros, 0.99),
+        "max_us": max(micros),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run(args) -> int:
+    """Run the suite for every size and write the results as JSON."""
+    names = args.benchmarks or list(BENCHMARKS)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": [],
+        "fixtures": [],
+    }
+
+    print(f"{'size':>9} {'benchmark':<18} {'ops':>7} {'ops/s':>12} {'p50 us':>10} "
+          f"{'p99 us':>10} {'peak MiB':>9}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        fixture = build_fixture(size, args.seed)
+        report["fixtures"].append({
+            "size": size,
+            "members": len(fixture["member_ids"]),
+            "loans": len(fixture["borrowed"]),
+            "build_seconds": time.perf_counter() - start,
+        })
+
+        for name in names:
+            benchmark, scan = BENCHMARKS[name]
+            count = args.scan_repeat if scan else min(args.samples, size)
+            if not scan:
+                benchmark(fixture, min(count, WARMUP_OPS))
+            # Keep the round with the lowest median; slower rounds mostly measure
+            # interference from the rest of the machine.
+            latencies = min(
+                (benchmark(fixture, count) for _ in range(args.rounds)),
+                key=lambda round_latencies: percentile(round_latencies, 0.50) if round_latencies else 0.0
+            )
+            peak_bytes = None if args.no_memory else peak_memory(
+                benchmark, fixture, count if scan else min(count, MEMORY_OPS)
+            )
+            result = summarize(size, name, latencies, peak_bytes)
+            report["results"].append(result)
+
+            peak = "-" if peak_bytes is None else f"{peak_bytes / 2 ** 20:.2f}"
+            print(f"{size:>9} {name:<18} {result['ops']:>7} {result['throughput']:>12,.0f} "
+                  f"{result['p50_us']:>10.1f} {result['p99_us']:>10.1f} {peak:>9}")
+
+        del fixture
+        gc.collect()
+
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        scale = 1 if sys.platform == "darwin" else 1024
+        report["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"results written to {args.output}")
+
+    return 0
+
+
+def compare(args) -> int:
+    """
+    Compare two result files and flag regressions.
+
+    A benchmark regresses when its median latency, or its peak memory, grows
+    by more than the threshold. The median is used rather than throughput,
+    which a few slow outliers can swing on short runs.
+
+    :return: 1 if any benchmark regressed, else 0.
+    """
+    with open(args.baseline) as file:
+        baseline = {(r["size"], r["benchmark"]): r for r in json.load(file)["results"]}
+    with open(args.candidate) as file:
+        candidate = json.load(file)["results"]
+
+    regressions = 0
+    print(f"{'size':>9} {'benchmark':<18} {'ops/s':>9} {'p50':>9} {'p99':>9} {'memory':>9}")
+    for result in candidate:
+        before = baseline.get((result["size"], result["benchmark"]))
+        if before is None:
+            continue
+
+        throughput = _change(before["throughput"], result["throughput"])
+        p50 = _change(before["p50_us"], result["p50_us"])
+        p99 = _change(before["p99_us"], result["p99_us"])
+        memory = _change(before["peak_bytes"], result["peak_bytes"])
+
+        flags = []
+        if p50 is not None and p50 > args.threshold:
+            flags.append("slower")
+        if memory is not None and memory > args.threshold:
+            flags.append("more memory")
+        regressions += bool(flags)
+
+        print(f"{result['size']:>9} {result['benchmark']:<18} {_percent(throughput):>9} "
+              f"{_percent(p50):>9} {_percent(p99):>9} {_percent(memory):>9}  {', '.join(flags)}")
+
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+
+    return 1 if regressions else 0
+
+
+def _change(before, after):
+    """Return the relative change from before to after, or None if it is undefined."""
+    if before is None or after is None or not before:
+        return None
+
+    return after / before - 1
+
+
+def _percent(change) -> str:
+    """Format a relative change for the comparison table."""
+    return "-" if change is None else f"{change:+.1%}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    run_parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS))
+    run_parser.add_argument("--samples", type=int, default=10_000,
+                            help="timed calls per point benchmark")
+    run_parser.add_argument("--scan-repeat", type=int, default=5,
+                            help="timed calls per whole-library benchmark")
+    run_parser.add_argument("--rounds", type=int, default=3,
+                            help="times each benchmark is repeated; the fastest round is kept")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--no-memory", action="store_true",
+                            help="skip the tracemalloc pass")
+    run_parser.add_argument("--output", help="JSON file to write the results to")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="relative change counted as a regression")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
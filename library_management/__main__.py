@@ -0,0 +1,47 @@
+"""
+Command line entry point.
+
+    python -m library_management serve --port 8080 --storage data/ --catalog catalog.csv
+"""
+
+import argparse
+
+from .library import Library
+from .loader import load_items
+from .server import serve
+from .storage import FileStorage
+
+
+def main(argv:list = None) -> None:
+    """
+    Parse the command line and run the chosen command.
+
+    :param argv: The arguments, sys.argv[1:] if omitted.
+    """
+    parser = argparse.ArgumentParser(prog="python -m library_management", description="Library management system.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="serve a library over HTTP/JSON")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    serve_parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    serve_parser.add_argument("--storage", help="directory persisting the library (snapshot + write-ahead log)")
+    serve_parser.add_argument("--catalog", help="CSV or JSONL catalog export to load at startup")
+    serve_parser.add_argument("--page-size", type=int, default=1_000, help="items per streamed chunk of GET /items")
+    serve_parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    storage = None if args.storage is None else FileStorage(args.storage)
+    library = Library(storage=storage, thread_safe=True)
+    try:
+        if args.catalog is not None:
+            count = load_items(library, args.catalog)
+            print(f"Loaded {count} items from {args.catalog}")
+
+        print(f"Serving on http://{args.host}:{args.port}")
+        serve(library, args.host, args.port, args.page_size, args.verbose)
+    finally:
+        library.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from .change_feed import LoanEvent
+from .circulation_log import CirculationEvent
+from .inventory import Title
+from .library import Library
+from .library_item import LibraryItem
+
+
+class AsyncLibrary:
+    """
+    asyncio facade over a thread-safe Library.
+
+    Every call runs on a thread pool, so it never blocks the loop. Even point
+    operations (lend, return, lookups by ID) take the library's lock or
+    stripes, which a scan, an add_items batch, a snapshot or a disk sync on
+    another thread may hold for a long time. Cancelling an awaiting task
+    abandons its result; a call already running on the pool finishes in the
+    background. iter_items fetches large results a page at a time and stops
+    at the next page when cancelled.
+
+    Attributes:
+        __library (Library): The wrapped library.
+        __executor (Executor): Pool the library calls run on.
+        __owns_executor (bool): Whether close() should shut the pool down.
+    """
+
+    def __init__(self, library:Library = None, executor = None, max_workers:int = 8):
+        """
+        Initialize a new AsyncLibrary instance.
+
+        :param library: The library to wrap. It must have been created with
+                        thread_safe=True. A new thread-safe Library is used if omitted.
+        :param executor: Optional concurrent.futures executor to run calls on.
+        :param max_workers: Size of the thread pool created when no executor is given.
+        :raises ValueError: If the library is not thread-safe.
+        """
+        if library is not None and not library.get_is_thread_safe():
+            raise ValueError("library must be created with thread_safe=True.")
+
+        self.__library = Library(thread_safe=True) if library is None else library
+        self.__owns_executor = executor is None
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="library"
+        ) if executor is None else executor
+
+    def get_library(self) -> Library:
+        """Return the wrapped library."""
+        return self.__library
+
+    async def __call(self, method, *args, **kwargs):
+        """Run a library method on the executor and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, partial(method, *args, **kwargs))
+
+    async def add_item(self, item:LibraryItem) -> None:
+        """Awaitable Library.add_item."""
+        await self.__call(self.__library.add_item, item)
+
+    async def add_items(self, items, batch_size:int = 10_000) -> int:
+        """Awaitable Library.add_items."""
+        return await self.__call(self.__library.add_items, items, batch_size)
+
+    async def remove_item(self, item_id:str) -> None:
+        """Awaitable Library.remove_item."""
+        await self.__call(self.__library.remove_item, item_id)
+
+    async def get_item(self, item_id:str) -> LibraryItem:
+        """Awaitable Library.get_item."""
+        return await self.__call(self.__library.get_item, item_id)
+
+    async def search_item(self, keyword:str, mode:str = "exact", limit:int = None) -> list[LibraryItem]:
+        """Awaitable Library.search_item."""
+        return await self.__call(self.__library.search_item, keyword, mode, limit)
+
+    async def search_ranked(self, keyword:str, limit:int = 10) -> list[tuple[LibraryItem, float]]:
+        """Awaitable Library.search_ranked."""
+        return await self.__call(self.__library.search_ranked, keyword, limit)
+
+    async def get_items(self, fields:tuple = None) -> list[dict]:
+        """Awaitable Library.get_items."""
+        return await self.__call(self.__library.get_items, fields)
+
+    async def get_items_page(
+            self,
+            cursor:str = None,
+            limit:int = 100,
+            fields:tuple = None
+    ) -> tuple[list[dict], str]:
+        """Awaitable Library.get_items_page."""
+        return await self.__call(self.__library.get_items_page, cursor, limit, fields)
+
+    async def iter_items(self, chunk_size:int = 1_000, fields:tuple = None):
+        """
+        Asynchronously iterate over the information of all items, page by page.
+
+        Each page is fetched on the thread pool when the previous one has been
+        consumed, so only one page is held in memory at a time.
+
+        :param chunk_size: Maximum number of item dicts per yielded list.
+        :param fields: Optional names of the keys to include, see LibraryItem.get_field.
+        :return: An async generator of lists of item dicts.
+        """
+        cursor = None
+        while True:
+            page, cursor = await self.get_items_page(cursor, chunk_size, fields)
+            if page:
+                yield page
+            if cursor is None:
+                return
+
+    async def create_member(self, name:str) -> str:
+        """Awaitable Library.create_member."""
+        return await self.__call(self.__library.create_member, name)
+
+    async def create_members(self, names) -> list[str]:
+        """Awaitable Library.create_members."""
+        return await self.__call(self.__library.create_members, names)
+
+    async def get_members(self, fields:tuple = None) -> list[dict]:
+        """Awaitable Library.get_members."""
+        return await self.__call(self.__library.get_members, fields)
+
+    async def get_members_page(
+            self,
+            cursor:str = None,
+            limit:int = 100,
+            fields:tuple = None
+    ) -> tuple[list[dict], str]:
+        """Awaitable Library.get_members_page."""
+        return await self.__call(self.__library.get_members_page, cursor, limit, fields)
+
+    async def lend_item(self, member_id:str, item:LibraryItem) -> None:
+        """Awaitable Library.lend_item."""
+        await self.__call(self.__library.lend_item, member_id, item)
+
+    async def return_item(self, member_id:str, item:LibraryItem) -> str:
+        """Awaitable Library.return_item."""
+        return await self.__call(self.__library.return_item, member_id, item)
+
+    async def lend_items(self, member_id:str, item_ids, atomic:bool = True) -> list[str]:
+        """Awaitable Library.lend_items."""
+        return await self.__call(self.__library.lend_items, member_id, item_ids, atomic)
+
+    async def return_items(self, member_id:str, item_ids, atomic:bool = True) -> list[str]:
+        """Awaitable Library.return_items."""
+        return await self.__call(self.__library.return_items, member_id, item_ids, atomic)
+
+    async def place_hold(self, member_id:str, item_id:str) -> int:
+        """Awaitable Library.place_hold."""
+        return await self.__call(self.__library.place_hold, member_id, item_id)
+
+    async def cancel_hold(self, member_id:str, item_id:str) -> None:
+        """Awaitable Library.cancel_hold."""
+        await self.__call(self.__library.cancel_hold, member_id, item_id)
+
+    async def get_hold_queue(self, item_id:str) -> list[str]:
+        """Awaitable Library.get_hold_queue."""
+        return await self.__call(self.__library.get_hold_queue, item_id)
+
+    async def get_held_item_ids(self, member_id:str) -> list[str]:
+        """Awaitable Library.get_held_item_ids."""
+        return await self.__call(self.__library.get_held_item_ids, member_id)
+
+    async def add_copies(self, title:Title, count:int = 1) -> list[str]:
+        """Awaitable Library.add_copies."""
+        return await self.__call(self.__library.add_copies, title, count)
+
+    async def get_availability(self, title_id:str) -> tuple[int, int]:
+        """Awaitable Library.get_availability."""
+        return await self.__call(self.__library.get_availability, title_id)
+
+    async def lend_title(self, member_id:str, title_id:str) -> str:
+        """Awaitable Library.lend_title."""
+        return await self.__call(self.__library.lend_title, member_id, title_id)
+
+    async def get_borrower_id(self, item_id:str) -> str:
+        """Awaitable Library.get_borrower_id."""
+        return await self.__call(self.__library.get_borrower_id, item_id)
+
+    async def get_borrowed_item_ids(self, member_id:str) -> list[str]:
+        """Awaitable Library.get_borrowed_item_ids."""
+        return await self.__call(self.__library.get_borrowed_item_ids, member_id)
+
+    async def get_loan_count(self, member_id:str) -> int:
+        """Awaitable Library.get_loan_count."""
+        return await self.__call(self.__library.get_loan_count, member_id)
+
+    async def get_overdue_items(self) -> list[LibraryItem]:
+        """Awaitable Library.get_overdue_items."""
+        return await self.__call(self.__library.get_overdue_items)
+
+    async def get_items_due_within(self, days:int) -> list[LibraryItem]:
+        """Awaitable Library.get_items_due_within."""
+        return await self.__call(self.__library.get_items_due_within, days)
+
+    async def subscribe(self, kinds:tuple = None) -> int:
+        """Awaitable Library.subscribe; the first subscription schedules every open loan."""
+        return await self.__call(self.__library.subscribe, kinds)
+
+    async def poll_events(self, subscription_id:int, moment:datetime = None, limit:int = None) -> list[LoanEvent]:
+        """Awaitable Library.poll_events."""
+        return await self.__call(self.__library.poll_events, subscription_id, moment, limit)
+
+    async def unsubscribe(self, subscription_id:int) -> None:
+        """Awaitable Library.unsubscribe."""
+        await self.__call(self.__library.unsubscribe, subscription_id)
+
+    async def get_loan_history(
+            self,
+            item_id:str = None,
+            member_id:str = None,
+            start:datetime = None,
+            end:datetime = None
+    ) -> list[CirculationEvent]:
+        """Awaitable Library.get_loan_history."""
+        return await self.__call(self.__library.get_loan_history, item_id, member_id, start, end)
+
+    async def get_circulation_summary(self, n:int = 10) -> dict:
+        """Awaitable Library.get_circulation_summary."""
+        return await self.__call(self.__library.get_circulation_summary, n)
+
+    async def close(self) -> None:
+        """Close the wrapped library and shut down the thread pool if this facade created it."""
+        await self.__call(self.__library.close)
+        if self.__owns_executor:
+            self.__executor.shutdown(wait=False)
@@ -0,0 +1,221 @@
+from array import array
+from datetime import datetime
+
+from .fines import total_fines
+from .library_item import LibraryItem, ITEM_TYPES
+from .timestamps import from_micros, to_micros, NO_TIMESTAMP
+
+
+class StringPool:
+    """
+    Interns strings into dense integer codes.
+
+    Attributes:
+        __codes (dict): Maps strings to their codes.
+        __strings (list): Strings by code.
+    """
+
+    def __init__(self):
+        """Initialize an empty StringPool."""
+        self.__codes = {}
+        self.__strings = []
+
+    def __len__(self) -> int:
+        """Return the number of distinct strings."""
+        return len(self.__strings)
+
+    def encode(self, value:str) -> int:
+        """
+        Return the code of a string, interning it on first sight.
+
+        :param value: The string to encode.
+        """
+        code = self.__codes.get(value)
+        if code is None:
+            code = len(self.__strings)
+            self.__codes[value] = code
+            self.__strings.append(value)
+
+        return code
+
+    def decode(self, code:int) -> str:
+        """Return the string stored under a code."""
+        return self.__strings[code]
+
+
+class CatalogStore:
+    """
+    Columnar store for library items.
+
+    Each field lives in its own packed array, with titles, authors, years and
+    detail fields interned through a shared StringPool. Items are materialized
+    as LibraryItem views only when requested; a view is a detached copy, so
+    loan changes must go through set_loan/clear_loan.
+
+    Attributes:
+        __strings (StringPool): Interned string values.
+        __ids (list): Item IDs by row, None for removed rows.
+        __rows (dict): Maps item IDs to rows.
+        __free (list): Rows of removed items, reused by the next items added.
+        __kinds (array): Index into ITEM_TYPES by row.
+        __titles (array): Title codes by row.
+        __authors (array): Author name codes by row.
+        __years (array): Publication year codes by row.
+        __details (array): Detail field codes by row.
+        __borrowed (bytearray): Borrowed flag by row.
+        __due_dates (array): Due dates in microseconds since the epoch by row.
+        __borrowers (dict): Maps rows of borrowed items to Member objects.
+    """
+
+    def __init__(self):
+        """Initialize an empty CatalogStore."""
+        self.__strings = StringPool()
+        self.__ids = []
+        self.__rows = {}
+        self.__free = []
+        self.__kinds = array("B")
+        self.__titles = array("L")
+        self.__authors = array("L")
+        self.__years = array("L")
+        self.__details = array("L")
+        self.__borrowed = bytearray()
+        self.__due_dates = array("q")
+        self.__borrowers = {}
+
+    def __len__(self) -> int:
+        """Return the number of stored items."""
+        return len(self.__rows)
+
+    def __contains__(self, item_id:str) -> bool:
+        """Return if an item ID is stored."""
+        return item_id in self.__rows
+
+    def __iter__(self):
+        """Iterate over the stored item IDs in insertion order."""
+        return iter(self.__rows)
+
+    def get_row_count(self) -> int:
+        """Return the number of rows in the columns, including the free rows of removed items."""
+        return len(self.__ids)
+
+    def add(self, item:LibraryItem) -> None:
+        """
+        Store an item, replacing any item stored under the same ID.
+
+        :param item: The LibraryItem object to store.
+        :raises ValueError: If the item's kind is not one of ITEM_TYPES.
+        """
+        if item.get_kind() not in ITEM_TYPES:
+            raise ValueError(f"{type(item).__name__} items cannot be stored.")
+
+        if item.get_id() in self.__rows:
+            self.remove(item.get_id())
+
+        encode = self.__strings.encode
+        kind = ITEM_TYPES.index(item.get_kind())
+        title = encode(item.get_title())
+        author = encode(item.get_author())
+        year = encode(item.get_pub_year())
+        detail = encode(item.get_detail())
+
+        if self.__free:
+            # Fill the row of a removed item, so churn does not grow the columns.
+            row = self.__free.pop()
+            self.__ids[row] = item.get_id()
+            self.__kinds[row] = kind
+            self.__titles[row] = title
+            self.__authors[row] = author
+            self.__years[row] = year
+            self.__details[row] = detail
+        else:
+            row = len(self.__ids)
+            self.__ids.append(item.get_id())
+            self.__kinds.append(kind)
+            self.__titles.append(title)
+            self.__authors.append(author)
+            self.__years.append(year)
+            self.__details.append(detail)
+            self.__borrowed.append(0)
+            self.__due_dates.append(NO_TIMESTAMP)
+        self.__rows[item.get_id()] = row
+
+        if item.get_is_borrowed():
+            self.set_loan(item.get_id(), item.get_borrowed_by(), item.get_due_date())
+
+    def remove(self, item_id:str) -> None:
+        """
+        Remove an item. Its row is freed for the next item added.
+
+        :param item_id: The unique identifier of the item.
+        :raises KeyError: If no item with the given ID is stored.
+        """
+        row = self.__rows.pop(item_id)
+        self.__ids[row] = None
+        self.__borrowers.pop(row, None)
+        self.__borrowed[row] = 0
+        self.__due_dates[row] = NO_TIMESTAMP
+        self.__free.append(row)
+
+    def set_loan(self, item_id:str, member, due_date) -> None:
+        """
+        Record an item as borrowed.
+
+        :param item_id: The unique identifier of the item.
+        :param member: The Member object who borrowed the item.
+        :param due_date: The due date of the loan.
+        :raises KeyError: If no item with the given ID is stored.
+        """
+        row = self.__rows[item_id]
+        self.__borrowed[row] = 1
+        self.__due_dates[row] = to_micros(due_date)
+        self.__borrowers[row] = member
+
+    def clear_loan(self, item_id:str) -> None:
+        """
+        Record an item as returned.
+
+        :param item_id: The unique identifier of the item.
+        :raises KeyError: If no item with the given ID is stored.
+        """
+        row = self.__rows[item_id]
+        self.__borrowed[row] = 0
+        self.__due_dates[row] = NO_TIMESTAMP
+        self.__borrowers.pop(row, None)
+
+    def get_item(self, item_id:str) -> LibraryItem:
+        """
+        Materialize a stored item.
+
+        :param item_id: The unique identifier of the item.
+        :return: A new LibraryItem (or subclass) object carrying the stored state.
+        :raises KeyError: If no item with the given ID is stored.
+        """
+        row = self.__rows[item_id]
+        decode = self.__strings.decode
+
+        return ITEM_TYPES[self.__kinds[row]].from_fields(
+            title=decode(self.__titles[row]),
+            pub_year=decode(self.__years[row]),
+            author_name=decode(self.__authors[row]),
+            detail=decode(self.__details[row]),
+            is_borrowed=bool(self.__borrowed[row]),
+            borrowed_by=self.__borrowers.get(row),
+            due_date=from_micros(self.__due_dates[row]),
+            item_id=item_id
+        )
+
+    def calculate_fines(self, moment:datetime) -> dict:
+        """
+        Calculate the fines owed by every borrowing member straight from the packed due dates.
+
+        :param moment: The time to calculate the fines at.
+        :return: A dict mapping member IDs to their total fine; members owing nothing are left out.
+        """
+        rows = [row for row, member in self.__borrowers.items() if member is not None]
+        due_dates = self.__due_dates
+
+        return total_fines(
+            [self.__borrowers[row].get_id() for row in rows],
+            array("q", [due_dates[row] for row in rows]),
+            to_micros(moment)
+        )
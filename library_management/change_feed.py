@@ -0,0 +1,219 @@
+from collections import deque
+from datetime import datetime
+from itertools import count
+
+from .fines import DAY_MICROS, FINE_TIERS, fine_for_days
+from .timer_wheel import TimerWheel
+from .timestamps import from_micros
+
+
+OVERDUE = "overdue"
+
+# Milestones of a loan in the order they are crossed: the kind of event
+# emitted and the whole days past the due date it is crossed at.
+MILESTONES = ((OVERDUE, 0), *FINE_TIERS)
+EVENT_KINDS = tuple(kind for kind, _ in MILESTONES)
+
+
+class LoanEvent:
+    """
+    Represents a loan crossing its due date or moving into the next fine tier.
+
+    Attributes:
+        __kind (str): One of EVENT_KINDS: "overdue", or the name of the fine tier entered.
+        __item_id (str): The unique identifier of the borrowed item.
+        __member_id (str): The unique ID of the borrowing member.
+        __due_date (datetime): The due date of the loan.
+        __moment (datetime): When the loan crossed the milestone.
+        __days_overdue (int): Whole days past the due date at the milestone.
+    """
+
+    __slots__ = ("__kind", "__item_id", "__member_id", "__due_date", "__moment", "__days_overdue")
+
+    def __init__(self, kind:str, item_id:str, member_id:str, due_date:datetime, moment:datetime, days_overdue:int):
+        """Initialize a new LoanEvent instance."""
+        self.__kind = kind
+        self.__item_id = item_id
+        self.__member_id = member_id
+        self.__due_date = due_date
+        self.__moment = moment
+        self.__days_overdue = days_overdue
+
+    def __repr__(self) -> str:
+        return f"LoanEvent({self.__kind!r}, {self.__item_id!r}, {self.__member_id!r}, {self.__moment!r})"
+
+    def get_kind(self) -> str:
+        """Return the kind of the event, one of EVENT_KINDS."""
+        return self.__kind
+
+    def get_item_id(self) -> str:
+        """Return the unique identifier of the borrowed item."""
+        return self.__item_id
+
+    def get_member_id(self) -> str:
+        """Return the unique ID of the borrowing member."""
+        return self.__member_id
+
+    def get_due_date(self) -> datetime:
+        """Return the due date of the loan."""
+        return self.__due_date
+
+    def get_moment(self) -> datetime:
+        """Return when the loan crossed the milestone."""
+        return self.__moment
+
+    def get_fine(self) -> float:
+        """Return the fine of the loan as it crossed the milestone, see fines.fine_for_days."""
+        return fine_for_days(self.__days_overdue)
+
+    def get_info(self) -> dict:
+        """
+        Retrieve the event as a dictionary.
+
+        :return: Dictionary containing 'kind', 'item_id', 'member_id', 'due_date', 'moment' and 'fine' keys.
+        """
+        return {
+            "kind": self.__kind,
+            "item_id": self.__item_id,
+            "member_id": self.__member_id,
+            "due_date": self.__due_date,
+            "moment": self.__moment,
+            "fine": self.get_fine(),
+        }
+
+
+class ChangeFeed:
+    """
+    Turns open loans into LoanEvents as they cross their due dates and fine tiers.
+
+    Only the next milestone of every loan is scheduled in a TimerWheel; when it
+    fires, the loan's following milestone is scheduled in turn. Advancing the
+    feed therefore costs time proportional to the events it emits, however
+    many loans are open. Every subscription has its own queue, so subscribers
+    polling at different rates each see every event once.
+
+    Attributes:
+        __wheel (TimerWheel): Next milestone of every tracked loan, keyed by item ID, with
+                              (member_id, due_date, milestone) payloads.
+        __subscriptions (dict): Maps subscription IDs to (kinds, deque of pending events) tuples.
+        __subscription_ids (count): Supplies the IDs of new subscriptions.
+    """
+
+    def __init__(self, tick:int = 60_000_000):
+        """
+        Initialize a new ChangeFeed without loans or subscriptions.
+
+        :param tick: Bucket width of the timer wheel in microseconds, see TimerWheel.
+        """
+        self.__wheel = TimerWheel(tick)
+        self.__subscriptions = {}
+        self.__subscription_ids = count(1)
+
+    def __len__(self) -> int:
+        """Return the number of loans with a milestone still ahead."""
+        return len(self.__wheel)
+
+    def get_subscription_count(self) -> int:
+        """Return the number of open subscriptions."""
+        return len(self.__subscriptions)
+
+    def track(self, item_id:str, member_id:str, due_date:int, moment:int) -> None:
+        """
+        Start following a loan, replacing any loan of the same item.
+
+        Milestones the loan had already crossed at the moment are not reported.
+
+        :param item_id: The unique identifier of the borrowed item.
+        :param member_id: The unique ID of the borrowing member.
+        :param due_date: The due date in microseconds since the epoch.
+        :param moment: The current time in microseconds since the epoch.
+        """
+        for milestone, (_, days) in enumerate(MILESTONES):
+            deadline = due_date + days * DAY_MICROS
+            if deadline > moment:
+                self.__wheel.schedule(item_id, deadline, (member_id, due_date, milestone))
+                return
+
+        self.__wheel.cancel(item_id)
+
+    def untrack(self, item_id:str) -> None:
+        """
+        Stop following the loan of an item, e.g. once it is returned.
+
+        :param item_id: The unique identifier of the item.
+        """
+        self.__wheel.cancel(item_id)
+
+    def subscribe(self, kinds:tuple = None) -> int:
+        """
+        Open a subscription receiving the events emitted from now on.
+
+        :param kinds: Optional kinds of events to receive, see EVENT_KINDS. All kinds if omitted.
+        :return: The ID of the subscription.
+        :raises ValueError: If a kind is unknown.
+        """
+        kinds = EVENT_KINDS if kinds is None else tuple(kinds)
+        for kind in kinds:
+            if kind not in EVENT_KINDS:
+                raise ValueError(f"{kind} is not a loan event kind.")
+
+        subscription_id = next(self.__subscription_ids)
+        self.__subscriptions[subscription_id] = (frozenset(kinds), deque())
+        return subscription_id
+
+    def unsubscribe(self, subscription_id:int) -> None:
+        """
+        Close a subscription, dropping its pending events.
+
+        :raises KeyError: If the subscription does not exist.
+        """
+        if self.__subscriptions.pop(subscription_id, None) is None:
+            raise KeyError(f"subscription {subscription_id} does not exist.")
+
+    def poll(self, subscription_id:int, moment:int, limit:int = None) -> list[LoanEvent]:
+        """
+        Advance the feed to a moment and take the pending events of a subscription.
+
+        :param subscription_id: The ID returned by subscribe.
+        :param moment: The current time in microseconds since the epoch.
+        :param limit: Optional maximum number of events to take; the rest stay pending.
+        :return: LoanEvents in the order their milestones were crossed.
+        :raises KeyError: If the subscription does not exist.
+        """
+        subscription = self.__subscriptions.get(subscription_id)
+        if subscription is None:
+            raise KeyError(f"subscription {subscription_id} does not exist.")
+
+        self.advance(moment)
+        pending = subscription[1]
+        taken = len(pending) if limit is None else min(limit, len(pending))
+
+        return [pending.popleft() for _ in range(taken)]
+
+    def advance(self, moment:int) -> int:
+        """
+        Emit the events of every milestone crossed up to a moment to the subscriptions.
+
+        :param moment: The current time in microseconds since the epoch.
+        :return: The number of events emitted.
+        """
+        events = []
+        expired = self.__wheel.expire(moment)
+        while expired:
+            for deadline, item_id, (member_id, due_date, milestone) in expired:
+                kind, days = MILESTONES[milestone]
+                events.append(
+                    LoanEvent(kind, item_id, member_id, from_micros(due_date), from_micros(deadline), days)
+                )
+                if milestone + 1 < len(MILESTONES):
+                    next_deadline = due_date + MILESTONES[milestone + 1][1] * DAY_MICROS
+                    self.__wheel.schedule(item_id, next_deadline, (member_id, due_date, milestone + 1))
+
+            # Loans polled after a long pause may have crossed several milestones.
+            expired = self.__wheel.expire(moment)
+
+        events.sort(key=LoanEvent.get_moment)
+        for kinds, pending in self.__subscriptions.values():
+            pending.extend(event for event in events if event.get_kind() in kinds)
+
+        return len(events)
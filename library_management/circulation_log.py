@@ -0,0 +1,473 @@
+import os
+import struct
+import zlib
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+
+from .fines import DAY_MICROS
+from .storage import LEND_ITEM, RETURN_ITEM, encode, decode
+from .timestamps import from_micros, NO_TIMESTAMP
+
+
+SEGMENT_MAGIC = b"LMSCIRC1"
+SEGMENT_SUFFIX = ".seg"
+
+# Kind (LEND_ITEM or RETURN_ITEM), moment, item id, member id, due date.
+EVENT_SCHEMA = "Bqssq"
+EVENT_KINDS = (LEND_ITEM, RETURN_ITEM)
+
+# Magic, then the numbers of the first and last segments the file covers:
+# a compacted file replaces every segment of that range.
+_HEADER = struct.Struct("<8sqq")
+# Length and CRC32 of one event, as in the write-ahead log.
+_FRAME = struct.Struct("<II")
+
+
+class CirculationEvent:
+    """
+    Represents an item being lent to or returned by a member.
+
+    Attributes:
+        __kind (int): LEND_ITEM or RETURN_ITEM.
+        __moment (int): When the event happened, in microseconds since the epoch.
+        __item_id (str): The unique identifier of the item.
+        __member_id (str): The unique ID of the member.
+        __due (int): Due date of a lend in microseconds since the epoch, NO_TIMESTAMP for a return.
+    """
+
+    __slots__ = ("__kind", "__moment", "__item_id", "__member_id", "__due")
+
+    def __init__(self, kind:int, moment:int, item_id:str, member_id:str, due:int = NO_TIMESTAMP):
+        """Initialize a new CirculationEvent instance."""
+        self.__kind = kind
+        self.__moment = moment
+        self.__item_id = item_id
+        self.__member_id = member_id
+        self.__due = due
+
+    def __repr__(self) -> str:
+        kind = "lend" if self.__kind == LEND_ITEM else "return"
+        return f"CirculationEvent({kind!r}, {self.__item_id!r}, {self.__member_id!r}, {self.get_moment()!r})"
+
+    def get_kind(self) -> int:
+        """Return the kind of the event, LEND_ITEM or RETURN_ITEM."""
+        return self.__kind
+
+    def is_lend(self) -> bool:
+        """Return if the event is a lend rather than a return."""
+        return self.__kind == LEND_ITEM
+
+    def get_moment(self) -> datetime:
+        """Return when the event happened."""
+        return from_micros(self.__moment)
+
+    def get_item_id(self) -> str:
+        """Return the unique identifier of the item."""
+        return self.__item_id
+
+    def get_member_id(self) -> str:
+        """Return the unique ID of the member."""
+        return self.__member_id
+
+    def get_due_date(self) -> datetime:
+        """Return the due date of a lend, or None for a return."""
+        return from_micros(self.__due)
+
+    def get_info(self) -> dict:
+        """
+        Retrieve the event as a dictionary.
+
+        :return: Dictionary containing 'kind' ("lend" or "return"), 'moment', 'item_id',
+                 'member_id' and 'due_date' keys.
+        """
+        return {
+            "kind": "lend" if self.__kind == LEND_ITEM else "return",
+            "moment": self.get_moment(),
+            "item_id": self.__item_id,
+            "member_id": self.__member_id,
+            "due_date": self.get_due_date(),
+        }
+
+
+class _Segment:
+    """
+    A run of consecutive events with posting lists by item and by member.
+
+    Attributes:
+        __first (int): Number of the first segment this one covers; lower than __number once compacted.
+        __number (int): Number of the segment, which orders segments in time.
+        __records (list): (kind, moment, item_id, member_id, due) tuples in time order.
+        __by_item (dict): Maps item IDs to the positions of their events in __records.
+        __by_member (dict): Maps member IDs to the positions of their events in __records.
+    """
+
+    __slots__ = ("__first", "__number", "__records", "__by_item", "__by_member")
+
+    def __init__(self, first:int, number:int, records:list = ()):
+        """Initialize a new _Segment instance holding records, in time order."""
+        self.__first = first
+        self.__number = number
+        self.__records = []
+        self.__by_item = {}
+        self.__by_member = {}
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        """Return the number of events in the segment."""
+        return len(self.__records)
+
+    def get_first(self) -> int:
+        """Return the number of the first segment this one covers."""
+        return self.__first
+
+    def get_number(self) -> int:
+        """Return the number of the segment."""
+        return self.__number
+
+    def get_records(self) -> list:
+        """Return the event records, in time order."""
+        return self.__records
+
+    def get_start(self) -> int:
+        """Return the moment of the first event."""
+        return self.__records[0][1]
+
+    def get_item_ids(self):
+        """Return the IDs of the items with events in the segment."""
+        return self.__by_item.keys()
+
+    def get_member_ids(self):
+        """Return the IDs of the members with events in the segment."""
+        return self.__by_member.keys()
+
+    def append(self, record:tuple) -> None:
+        """Add an event record, which must not be earlier than the last one."""
+        position = len(self.__records)
+        self.__records.append(record)
+        self.__by_item.setdefault(record[2], []).append(position)
+        self.__by_member.setdefault(record[3], []).append(position)
+
+    def select(self, item_id:str, member_id:str, start:int, end:int) -> list:
+        """Return the records of an item and/or member with moments in [start, end)."""
+        records = self.__records
+        if item_id is not None:
+            positions = self.__by_item.get(item_id, ())
+        elif member_id is not None:
+            positions = self.__by_member.get(member_id, ())
+        else:
+            moments = [record[1] for record in records]
+            positions = range(bisect_left(moments, start), bisect_left(moments, end))
+
+        return [
+            records[position] for position in positions
+            if start <= records[position][1] < end
+            and (member_id is None or records[position][3] == member_id)
+        ]
+
+
+class CirculationLog:
+    """
+    Append-only log of lend and return events, kept in time-ordered segments.
+
+    Events are appended to the open segment, which is sealed once it holds
+    segment_size events or spans segment_span microseconds. Every segment has
+    posting lists by item and by member, and the log keeps, per item and per
+    member, the segments they appear in. A query for an item, a member or a
+    time window therefore only visits the segments that can match, found by
+    binary search, and never scans the whole log.
+
+    With a directory, every segment is a file of CRC-framed events; the open
+    segment is flushed by flush() and close(), and a torn tail is dropped on
+    load. compact() drops events older than a cutoff and merges small sealed
+    segments; each merged file records the range of segments it replaces, so
+    a crash halfway through compaction never duplicates events.
+
+    Attributes:
+        __directory (Path): Directory of the segment files, or None for a log kept in memory only.
+        __segment_size (int): Number of events that seals a segment.
+        __segment_span (int): Time span in microseconds that seals a segment.
+        __segments (list): The segments in time order; the last one is open for appends.
+        __starts (list): Moment of the first event of every segment, for binary search.
+        __item_segments (dict): Maps item IDs to the ascending positions in __segments of the segments they appear in.
+        __member_segments (dict): Maps member IDs to the ascending positions in __segments of the segments they appear in.
+        __last_moment (int): Moment of the latest event; earlier moments appended later are clamped to it.
+        __file (file): The open segment's file, or None.
+        __size (int): Number of events in the log.
+    """
+
+    def __init__(self, directory = None, segment_size:int = 4_096, segment_span:int = DAY_MICROS):
+        """
+        Initialize a new CirculationLog, loading the segments already in the directory.
+
+        :param directory: Optional directory of the segment files; created if missing.
+                          The log is kept in memory only if omitted.
+        :param segment_size: Number of events that seals a segment.
+        :param segment_span: Time span in microseconds that seals a segment.
+        :raises ValueError: If segment_size or segment_span is not positive, or a
+                            segment file is not a circulation log segment.
+        """
+        if segment_size < 1 or segment_span < 1:
+            raise ValueError("segment_size and segment_span must be positive.")
+
+        self.__directory = None if directory is None else Path(directory)
+        self.__segment_size = segment_size
+        self.__segment_span = segment_span
+        self.__segments = []
+        self.__starts = []
+        self.__item_segments = {}
+        self.__member_segments = {}
+        self.__last_moment = NO_TIMESTAMP
+        self.__file = None
+        self.__size = 0
+
+        if self.__directory is not None:
+            self.__directory.mkdir(parents=True, exist_ok=True)
+            self.__load()
+
+    def __len__(self) -> int:
+        """Return the number of events in the log."""
+        return self.__size
+
+    def get_segment_count(self) -> int:
+        """Return the number of segments, including the open one."""
+        return len(self.__segments)
+
+    def append(self, kind:int, item_id:str, member_id:str, moment:int, due:int = NO_TIMESTAMP) -> None:
+        """
+        Record a lend or return at the end of the log.
+
+        :param kind: LEND_ITEM or RETURN_ITEM.
+        :param item_id: The unique identifier of the item.
+        :param member_id: The unique ID of the member.
+        :param moment: When it happened, in microseconds since the epoch. Moments earlier than
+                       the latest event are recorded as that event's, keeping the log in time order.
+        :param due: Due date of a lend in microseconds since the epoch.
+        :raises ValueError: If kind is not one of EVENT_KINDS.
+        """
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"{kind} is not a circulation event kind.")
+
+        moment = max(moment, self.__last_moment)
+        segment = self.__segments[-1] if self.__segments else None
+        if segment is None or len(segment) >= self.__segment_size \
+                or moment - segment.get_start() >= self.__segment_span:
+            segment = self.__open_segment(moment)
+
+        record = (kind, moment, item_id, member_id, due)
+        position = len(self.__segments) - 1
+        if item_id not in segment.get_item_ids():
+            self.__item_segments.setdefault(item_id, []).append(position)
+        if member_id not in segment.get_member_ids():
+            self.__member_segments.setdefault(member_id, []).append(position)
+        segment.append(record)
+        self.__last_moment = moment
+        self.__size += 1
+
+        if self.__file is not None:
+            self.__file.write(self.__frame(record))
+
+    def query(self, item_id:str = None, member_id:str = None, start:int = None, end:int = None) -> list[CirculationEvent]:
+        """
+        Find the events of an item and/or member within a time window.
+
+        :param item_id: Optional item to restrict the events to.
+        :param member_id: Optional member to restrict the events to.
+        :param start: Optional start of the window in microseconds since the epoch, inclusive.
+        :param end: Optional end of the window in microseconds since the epoch, exclusive.
+        :return: The matching CirculationEvents, in time order.
+        """
+        start = NO_TIMESTAMP if start is None else start
+        end = 2 ** 63 - 1 if end is None else end
+
+        # Segments that may hold events of the window: the one the start falls in, up to the last starting before the end.
+        low = max(bisect_right(self.__starts, start) - 1, 0)
+        high = bisect_left(self.__starts, end)
+
+        if item_id is not None:
+            positions = self.__item_segments.get(item_id, ())
+        elif member_id is not None:
+            positions = self.__member_segments.get(member_id, ())
+        else:
+            positions = range(len(self.__segments))
+
+        events = []
+        for position in positions[bisect_left(positions, low):bisect_left(positions, high)]:
+            events.extend(
+                CirculationEvent(*record)
+                for record in self.__segments[position].select(item_id, member_id, start, end)
+            )
+
+        return events
+
+    def compact(self, before:int = None) -> int:
+        """
+        Drop old events and merge consecutive sealed segments into segments of up to segment_size events.
+
+        The open segment is left as it is.
+
+        :param before: Optional cutoff in microseconds since the epoch; earlier events are dropped.
+        :return: The number of events dropped.
+        """
+        self.flush()
+        sealed, open_segment = self.__segments[:-1], self.__segments[-1:]
+
+        dropped = 0
+        compacted = []
+        run = []
+        records = []
+
+        for segment in sealed:
+            kept = segment.get_records()
+            if before is not None and kept[0][1] < before:
+                kept = [record for record in kept if record[1] >= before]
+                dropped += len(segment) - len(kept)
+
+            if run and len(records) + len(kept) > self.__segment_size:
+                compacted.append(self.__merge(run, records))
+                run, records = [], []
+            run.append(segment)
+            records.extend(kept)
+
+        if run:
+            compacted.append(self.__merge(run, records))
+
+        self.__segments = [segment for segment in compacted if len(segment)] + open_segment
+        self.__size -= dropped
+        self.__reindex()
+
+        return dropped
+
+    def flush(self) -> None:
+        """Make the events of the open segment durable, if the log has a directory."""
+        if self.__file is not None:
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+
+    def close(self) -> None:
+        """Flush and close the open segment's file."""
+        if self.__file is not None:
+            self.flush()
+            self.__file.close()
+            self.__file = None
+
+    def __merge(self, run:list, records:list) -> _Segment:
+        """
+        Replace a run of sealed segments by one holding records, rewriting their files.
+
+        :return: The new segment, empty if every event was dropped.
+        """
+        first, last = run[0], run[-1]
+        if len(run) == 1 and len(records) == len(first):
+            return first
+
+        merged = _Segment(first.get_first(), last.get_number(), records)
+        if self.__directory is not None:
+            path = self.__path(merged.get_number())
+            if records:
+                self.__write_segment(path, merged)
+            else:
+                path.unlink()
+
+            # The merged file covers the run, so a crash here leaves the older files stale, not duplicated.
+            for segment in run[:-1]:
+                self.__path(segment.get_number()).unlink()
+
+        return merged
+
+    def __open_segment(self, moment:int) -> _Segment:
+        """Seal the open segment and start a new one at a moment."""
+        number = self.__segments[-1].get_number() + 1 if self.__segments else 1
+        segment = _Segment(number, number)
+        self.__segments.append(segment)
+        self.__starts.append(moment)
+
+        if self.__directory is not None:
+            self.close()
+            self.__file = open(self.__path(number), "wb")
+            self.__file.write(_HEADER.pack(SEGMENT_MAGIC, number, number))
+
+        return segment
+
+    def __reindex(self) -> None:
+        """Rebuild the segment lookups after the segments have changed."""
+        self.__starts = [segment.get_start() for segment in self.__segments]
+        self.__item_segments = {}
+        self.__member_segments = {}
+        for position, segment in enumerate(self.__segments):
+            for item_id in segment.get_item_ids():
+                self.__item_segments.setdefault(item_id, []).append(position)
+            for member_id in segment.get_member_ids():
+                self.__member_segments.setdefault(member_id, []).append(position)
+
+    def __path(self, number:int) -> Path:
+        """Return the path of the file of a segment."""
+        return self.__directory / f"{number:012d}{SEGMENT_SUFFIX}"
+
+    @staticmethod
+    def __frame(record:tuple) -> bytes:
+        """Encode an event record with its length and checksum."""
+        body = encode(EVENT_SCHEMA, record)
+        return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+    def __write_segment(self, path:Path, segment:_Segment) -> None:
+        """Atomically write a sealed segment's file."""
+        parts = [_HEADER.pack(SEGMENT_MAGIC, segment.get_first(), segment.get_number())]
+        parts.extend(self.__frame(record) for record in segment.get_records())
+
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "wb") as file:
+            file.write(b"".join(parts))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    def __read_segment(self, path:Path) -> tuple:
+        """Return the (segment, valid_length) of a segment file, stopping at a torn tail."""
+        buffer = memoryview(path.read_bytes())
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f"{path} is not a circulation log segment.")
+
+        magic, first, number = _HEADER.unpack_from(buffer, 0)
+        if magic != SEGMENT_MAGIC:
+            raise ValueError(f"{path} is not a circulation log segment.")
+
+        segment = _Segment(first, number)
+        offset = _HEADER.size
+        while offset + _FRAME.size <= len(buffer):
+            length, checksum = _FRAME.unpack_from(buffer, offset)
+            body = buffer[offset + _FRAME.size:offset + _FRAME.size + length]
+            if len(body) < length or zlib.crc32(body) != checksum:
+                break  # torn write at the tail
+
+            record, _ = decode(EVENT_SCHEMA, body)
+            segment.append(record)
+            offset += _FRAME.size + length
+
+        return segment, offset
+
+    def __load(self) -> None:
+        """Read the segment files, dropping those a compacted file replaced, and reopen the last one."""
+        for temporary in self.__directory.glob("*.tmp"):
+            temporary.unlink()
+
+        segments = []
+        valid_length = 0
+        for path in sorted(self.__directory.glob(f"*{SEGMENT_SUFFIX}"), reverse=True):
+            segment, length = self.__read_segment(path)
+            if (segments and segment.get_number() >= segments[-1].get_first()) or not len(segment):
+                path.unlink()  # left behind by an interrupted compaction, or never written to
+                continue
+            if not segments:
+                valid_length = length
+            segments.append(segment)
+
+        self.__segments = segments[::-1]
+        self.__size = sum(len(segment) for segment in self.__segments)
+        self.__reindex()
+        if self.__segments:
+            self.__last_moment = self.__segments[-1].get_records()[-1][1]
+            self.__file = open(self.__path(self.__segments[-1].get_number()), "r+b")
+            self.__file.truncate(valid_length)
+            self.__file.seek(valid_length)
@@ -0,0 +1,371 @@
+from array import array
+
+from .inventory import Copy
+from .library_item import LibraryItem
+
+
+class TopK:
+    """
+    Counts keys by increments of one and lists the most frequent ones, in the Space-Saving way.
+
+    Keys with the same count share a bucket, and the non-empty buckets form a
+    linked list in count order (the stream-summary structure), so counting a
+    key and finding the least frequent one are O(1), and listing the top n
+    keys is O(n). Without a capacity every key is kept and the counts are
+    exact. With one, once it is reached a new key replaces a least frequent
+    key and inherits its count, which it may overestimate by at most that
+    count; any key counted more often than total/capacity times is kept.
+
+    Attributes:
+        __capacity (int): Maximum number of keys kept, or None to keep all.
+        __counts (dict): Maps the kept keys to their counts.
+        __errors (dict): Maps keys that replaced another to the count they inherited.
+        __buckets (dict): Maps counts to dicts used as insertion-ordered sets of their keys.
+        __higher (dict): Maps each bucket count, and 0 for the head, to the next higher bucket count, None for the highest.
+        __lower (dict): Maps each bucket count, and None for the tail, to the next lower bucket count, 0 for the lowest.
+        __total (int): Sum of every increment, including those of replaced keys.
+    """
+
+    def __init__(self, capacity:int = None):
+        """
+        Initialize an empty TopK.
+
+        :param capacity: Maximum number of keys kept. Every key is kept, with exact counts, if omitted.
+        :raises ValueError: If capacity is not positive.
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be positive.")
+
+        self.__capacity = capacity
+        self.__counts = {}
+        self.__errors = {}
+        self.__buckets = {}
+        self.__higher = {0: None}
+        self.__lower = {}
+        self.__total = 0
+
+    def __len__(self) -> int:
+        """Return the number of keys kept."""
+        return len(self.__counts)
+
+    def get_total(self) -> int:
+        """Return the number of increments counted."""
+        return self.__total
+
+    def get_count(self, key) -> int:
+        """
+        Return the count of a key, 0 if it is not kept.
+
+        :param key: The counted key.
+        """
+        return self.__counts.get(key, 0)
+
+    def get_error(self, key) -> int:
+        """
+        Return by how much the count of a key may be overestimated, 0 if it is exact.
+
+        :param key: The counted key.
+        """
+        return self.__errors.get(key, 0)
+
+    def add(self, key) -> None:
+        """
+        Count one occurrence of a key.
+
+        :param key: Hashable key to count.
+        """
+        self.__total += 1
+        count = self.__counts.get(key)
+        if count is None:
+            count = 0
+            if self.__capacity is not None and len(self.__counts) >= self.__capacity:
+                count = self.__replace_least_frequent(key)
+
+        higher = count + 1
+        if higher not in self.__buckets:
+            self.__link_after(count, higher)
+        self.__buckets[higher][key] = None
+        self.__counts[key] = higher
+
+        if count:
+            bucket = self.__buckets[count]
+            del bucket[key]
+            if not bucket:
+                self.__unlink(count)
+
+    def top(self, n:int) -> list[tuple]:
+        """
+        List the most frequent keys.
+
+        :param n: Maximum number of keys to list.
+        :return: (key, count) tuples, most frequent first; keys with equal counts in the order they reached it.
+        """
+        result = []
+        count = self.__max_count()
+        while count and len(result) < n:
+            for key in self.__buckets[count]:
+                result.append((key, count))
+                if len(result) == n:
+                    break
+            count = self.__lower[count]
+
+        return result
+
+    def __max_count(self) -> int:
+        """Return the highest count, 0 if no key is kept."""
+        return self.__lower.get(None, 0)
+
+    def __replace_least_frequent(self, key) -> int:
+        """Drop a least frequent key in favour of a new one, returning the count the new key inherits."""
+        count = self.__higher[0]
+        bucket = self.__buckets[count]
+        victim, _ = bucket.popitem()
+        del self.__counts[victim]
+        self.__errors.pop(victim, None)
+
+        bucket[key] = None
+        self.__errors[key] = count
+        return count
+
+    def __link_after(self, count:int, higher:int) -> None:
+        """Create the empty bucket of a count right above an existing bucket, or above the head for 0."""
+        following = self.__higher[count]
+        self.__buckets[higher] = {}
+        self.__higher[count] = higher
+        self.__higher[higher] = following
+        self.__lower[higher] = count
+        self.__lower[following] = higher
+
+    def __unlink(self, count:int) -> None:
+        """Drop the empty bucket of a count."""
+        del self.__buckets[count]
+        lower = self.__lower.pop(count)
+        following = self.__higher.pop(count)
+        self.__higher[lower] = following
+        self.__lower[following] = lower
+
+
+class CountMinSketch:
+    """
+    Approximate counts of any number of keys in a fixed amount of memory.
+
+    Every key is hashed to one counter per row and counted in all of them; its
+    estimate is the smallest of those counters. Estimates never fall below
+    the true count, and exceed it by more than 2 * total / width with a
+    probability of at most 2 ** -depth.
+
+    Attributes:
+        __width (int): Number of counters per row.
+        __depth (int): Number of rows.
+        __counters (array): The depth rows of width signed 64-bit counters, one after the other.
+    """
+
+    def __init__(self, width:int = 16_384, depth:int = 4):
+        """
+        Initialize a new CountMinSketch with every counter at zero.
+
+        :param width: Number of counters per row; the error shrinks as it grows.
+        :param depth: Number of rows; the chance of exceeding the error shrinks as it grows.
+        :raises ValueError: If width or depth is not positive.
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive.")
+
+        self.__width = width
+        self.__depth = depth
+        self.__counters = array("q", bytes(8 * width * depth))
+
+    def get_size(self) -> int:
+        """Return the memory taken by the counters, in bytes."""
+        return self.__counters.itemsize * len(self.__counters)
+
+    def add(self, key, count:int = 1) -> None:
+        """
+        Count occurrences of a key.
+
+        :param key: Hashable key to count.
+        :param count: Number of occurrences.
+        """
+        counters = self.__counters
+        for index in self.__indexes(key):
+            counters[index] += count
+
+    def estimate(self, key) -> int:
+        """
+        Estimate the count of a key.
+
+        :param key: The counted key.
+        :return: An estimate no lower than the true count.
+        """
+        counters = self.__counters
+        return min(counters[index] for index in self.__indexes(key))
+
+    def __indexes(self, key) -> list[int]:
+        """Return the counter of a key in every row, derived from two halves of its mixed hash."""
+        # Spread hashes that differ in few bits, like those of small ints, over all 64 bits.
+        hashed = (hash(key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        low = hashed & 0xFFFFFFFF
+        high = (hashed >> 32) | 1
+        width = self.__width
+        return [row * width + (low + row * high) % width for row in range(self.__depth)]
+
+
+def _normalize(text:str) -> str:
+    """Fold the case and collapse the whitespace of a title or author name."""
+    return " ".join(text.split()).casefold()
+
+
+def title_key(item:LibraryItem) -> str:
+    """
+    Return the key loans of an item are counted under.
+
+    Copies count towards their Title, by its ID. Other items count towards
+    their normalized title and author, e.g. "dune / frank herbert", so every
+    physical item of a work adds up under one readable key.
+
+    :param item: The lent LibraryItem.
+    """
+    if isinstance(item, Copy):
+        return item.get_record().get_id()
+
+    return f"{_normalize(item.get_title())} / {_normalize(item.get_author())}"
+
+
+class CirculationStats:
+    """
+    Incremental circulation aggregates for dashboards: loans per title and
+    per author, the most borrowed titles and authors, and the loans currently
+    open per item kind.
+
+    Every counter is updated as loans start and end, so no query scans the
+    catalog. In the exact mode every title and author is counted. The
+    approximate mode bounds memory for very large catalogs: the top lists
+    keep only a fixed number of keys (see TopK), and the counts of other
+    titles and authors are estimated by count-min sketches.
+
+    Attributes:
+        __titles (TopK): Lends per title key, see title_key.
+        __authors (TopK): Lends per author name.
+        __title_counts (CountMinSketch): Estimated lends per title key in the approximate mode, or None.
+        __author_counts (CountMinSketch): Estimated lends per author name in the approximate mode, or None.
+        __active (dict): Maps item kind names, e.g. "Book", to the number of open loans.
+    """
+
+    def __init__(self, approximate:bool = False, capacity:int = 1_000, width:int = 16_384, depth:int = 4):
+        """
+        Initialize a new CirculationStats instance with every count at zero.
+
+        :param approximate: Whether to bound memory by approximating counts.
+        :param capacity: Number of titles and of authors kept for the top lists in the approximate mode.
+        :param width: Counters per row of the count-min sketches, see CountMinSketch.
+        :param depth: Rows of the count-min sketches, see CountMinSketch.
+        """
+        self.__titles = TopK(capacity if approximate else None)
+        self.__authors = TopK(capacity if approximate else None)
+        self.__title_counts = CountMinSketch(width, depth) if approximate else None
+        self.__author_counts = CountMinSketch(width, depth) if approximate else None
+        self.__active = {}
+
+    def is_approximate(self) -> bool:
+        """Return if counts are approximated to bound memory."""
+        return self.__title_counts is not None
+
+    def record_lend(self, item:LibraryItem) -> None:
+        """
+        Count a lend of an item towards its title and author.
+
+        :param item: The lent LibraryItem.
+        """
+        key = title_key(item)
+        author = item.get_author()
+        self.__titles.add(key)
+        self.__authors.add(author)
+        if self.__title_counts is not None:
+            self.__title_counts.add(key)
+            self.__author_counts.add(author)
+
+    def loan_started(self, item:LibraryItem) -> None:
+        """
+        Count an open loan of an item's kind.
+
+        :param item: The borrowed LibraryItem.
+        """
+        kind = item.get_kind().__name__
+        self.__active[kind] = self.__active.get(kind, 0) + 1
+
+    def loan_ended(self, item:LibraryItem) -> None:
+        """
+        Stop counting an open loan of an item's kind.
+
+        :param item: The returned or removed LibraryItem.
+        """
+        kind = item.get_kind().__name__
+        remaining = self.__active.get(kind, 0) - 1
+        if remaining > 0:
+            self.__active[kind] = remaining
+        else:
+            self.__active.pop(kind, None)
+
+    def get_lend_count(self) -> int:
+        """Return the number of lends counted."""
+        return self.__titles.get_total()
+
+    def get_title_loans(self, title_id:str) -> int:
+        """
+        Return the number of lends of a title, an upper estimate in the approximate mode.
+
+        :param title_id: The title key, see title_key: a Title ID, or a normalized "title / author".
+        """
+        if self.__title_counts is not None:
+            return self.__title_counts.estimate(title_id)
+
+        return self.__titles.get_count(title_id)
+
+    def get_author_loans(self, author_name:str) -> int:
+        """
+        Return the number of lends of an author's items, an upper estimate in the approximate mode.
+
+        :param author_name: The name of the author.
+        """
+        if self.__author_counts is not None:
+            return self.__author_counts.estimate(author_name)
+
+        return self.__authors.get_count(author_name)
+
+    def get_top_titles(self, n:int = 10) -> list[tuple[str, int]]:
+        """
+        List the most lent titles.
+
+        :param n: Maximum number of titles to list.
+        :return: (title key, lends) tuples, most lent first.
+        """
+        return self.__titles.top(n)
+
+    def get_top_authors(self, n:int = 10) -> list[tuple[str, int]]:
+        """
+        List the most lent authors.
+
+        :param n: Maximum number of authors to list.
+        :return: (author name, lends) tuples, most lent first.
+        """
+        return self.__authors.top(n)
+
+    def get_active_loans(self) -> dict:
+        """Return a dictionary mapping item kind names, e.g. "Book", to their number of open loans."""
+        return dict(self.__active)
+
+    def get_summary(self, n:int = 10) -> dict:
+        """
+        Retrieve every aggregate at once.
+
+        :param n: Maximum number of titles and of authors to list.
+        :return: Dictionary containing 'lends', 'top_titles', 'top_authors', 'active_loans'
+                 and 'approximate' keys.
+        """
+        return {
+            "lends": self.get_lend_count(),
+            "top_titles": self.get_top_titles(n),
+            "top_authors": self.get_top_authors(n),
+            "active_loans": self.get_active_loans(),
+            "approximate": self.is_approximate(),
+        }
@@ -0,0 +1,417 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from .storage import item_record
+
+
+COLUMNAR_MAGIC = b"LMSCOL02"
+# Files written before title IDs were stored, still read with their copies as plain items.
+_LEGACY_COLUMNAR_MAGIC = b"LMSCOL01"
+
+# Magic, byte order of the columns (1 little, 0 big endian), item count, member count.
+_HEADER = struct.Struct("<8sB7xqq")
+# Offset and length of one section.
+_SECTION = struct.Struct("<qq")
+_ALIGNMENT = 8
+
+# Code of a missing value in dictionary-encoded columns.
+NO_CODE = 0xFFFFFFFF
+# Member row of items that are not on loan.
+NO_MEMBER = -1
+
+# Sections in file order. A string column is stored as three sections: row
+# offsets into the UTF-8 data (one more than there are rows), the data, and
+# a byte per row that is 1 for None.
+_STRING_COLUMNS = (
+    "item_ids", "item_titles", "item_years", "item_details",
+    "authors", "member_ids", "member_names",
+)
+_LEGACY_SECTIONS = (
+    "item_kinds", "item_author_codes", "item_borrowers", "item_due_dates", "member_registered",
+    *(f"{column}_{part}" for column in _STRING_COLUMNS for part in ("offsets", "data", "nulls")),
+)
+# Title IDs of copies repeat for every copy and are dictionary encoded like authors.
+SECTIONS = (
+    *_LEGACY_SECTIONS,
+    "item_title_codes", "title_ids_offsets", "title_ids_data", "title_ids_nulls",
+)
+
+
+def sort_key(identifier:str) -> tuple:
+    """Return the key item rows are ordered by: case-insensitive, as Library pages items."""
+    return str(identifier).lower(), identifier
+
+
+def _member_key(identifier:str) -> str:
+    """Return the key member rows are ordered by: the plain ID, as Library pages members."""
+    return identifier
+
+
+def _string_column(values:list) -> tuple:
+    """Encode strings into (offsets, data, nulls) sections."""
+    offsets = array("q", [0])
+    data = bytearray()
+    nulls = bytearray(len(values))
+    for row, value in enumerate(values):
+        if value is None:
+            nulls[row] = 1
+        else:
+            data += str(value).encode("utf-8")
+        offsets.append(len(data))
+
+    return offsets, data, nulls
+
+
+def _dictionary_column(values:list) -> tuple:
+    """Encode repeated strings as (dictionary mapping each to its code, codes), NO_CODE for None."""
+    dictionary = {}
+    codes = array("I")
+    for value in values:
+        if value is None:
+            codes.append(NO_CODE)
+        else:
+            codes.append(dictionary.setdefault(value, len(dictionary)))
+
+    return dictionary, codes
+
+
+def write_columnar(path, members, items) -> None:
+    """
+    Write members and items to a columnar snapshot file.
+
+    Every field is stored as its own packed column, with rows ordered by ID as
+    Library pages them, so
+    readers can find a row by binary search. Author names and the title IDs
+    of copies repeat heavily and are dictionary encoded. Loans are stored on the item rows as the row of
+    the borrowing member and the due date; borrowers that are not registered
+    members get member rows of their own, flagged as unregistered. The file is
+    written to a temporary path and moved into place, so readers never see a
+    partial snapshot.
+
+    :param path: Path of the file to write.
+    :param members: The registered Member objects.
+    :param items: The LibraryItem objects, see storage.item_record for the supported classes.
+    :raises ValueError: If an item's class cannot be stored.
+    """
+    records = sorted((item_record(item) for item in items), key=lambda record: sort_key(record[1]))
+
+    names = {member.get_id(): member.get_name() for member in members}
+    registered = set(names)
+    for record in records:
+        if record[6] is not None and record[6] not in names:
+            names[record[6]] = record[7]
+    member_ids = sorted(names)
+    member_rows = {member_id: row for row, member_id in enumerate(member_ids)}
+
+    authors, author_codes = _dictionary_column([record[4] for record in records])
+    title_ids, title_codes = _dictionary_column([record[9] for record in records])
+
+    columns = {
+        "item_kinds": array("B", [record[0] for record in records]),
+        "item_author_codes": author_codes,
+        "item_borrowers": array(
+            "q", [NO_MEMBER if record[6] is None else member_rows[record[6]] for record in records]
+        ),
+        "item_due_dates": array("q", [record[8] for record in records]),
+        "member_registered": bytearray(member_id in registered for member_id in member_ids),
+        "item_title_codes": title_codes,
+    }
+    for column, values in (
+            ("item_ids", [record[1] for record in records]),
+            ("item_titles", [record[2] for record in records]),
+            ("item_years", [record[3] for record in records]),
+            ("item_details", [record[5] for record in records]),
+            ("authors", list(authors)),
+            ("member_ids", member_ids),
+            ("member_names", [names[member_id] for member_id in member_ids]),
+            ("title_ids", list(title_ids)),
+    ):
+        columns[f"{column}_offsets"], columns[f"{column}_data"], columns[f"{column}_nulls"] = \
+            _string_column(values)
+
+    path = Path(path)
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    with open(temporary, "wb") as file:
+        offset = _HEADER.size + _SECTION.size * len(SECTIONS)
+        directory = []
+        for name in SECTIONS:
+            offset += -offset % _ALIGNMENT
+            length = len(memoryview(columns[name]).cast("B"))
+            directory.append(_SECTION.pack(offset, length))
+            offset += length
+
+        file.write(_HEADER.pack(COLUMNAR_MAGIC, sys.byteorder == "little", len(records), len(member_ids)))
+        file.write(b"".join(directory))
+        for name in SECTIONS:
+            file.write(bytes(-file.tell() % _ALIGNMENT))
+            file.write(memoryview(columns[name]).cast("B"))
+
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+class _StringView:
+    """
+    Read-only view of a string column inside a mapped snapshot.
+
+    Attributes:
+        __offsets (memoryview): Start offset of every row in data, plus the end offset.
+        __data (memoryview): The UTF-8 encoded strings back to back.
+        __nulls (memoryview): 1 for rows holding None.
+    """
+
+    def __init__(self, offsets:memoryview, data:memoryview, nulls:memoryview):
+        """Initialize a new _StringView over the three sections of a column."""
+        self.__offsets = offsets
+        self.__data = data
+        self.__nulls = nulls
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.__nulls)
+
+    def __getitem__(self, row:int) -> str:
+        """Decode the string stored in a row, or None."""
+        if self.__nulls[row]:
+            return None
+
+        return str(self.__data[self.__offsets[row]:self.__offsets[row + 1]], "utf-8")
+
+
+class ColumnarSnapshot:
+    """
+    Memory-mapped reader of a file written by write_columnar.
+
+    Opening only maps the file and reads its header; rows are decoded when
+    they are accessed, so the operating system pages in just the parts of the
+    file that are used. Files of the former version, without title IDs, are
+    read with every title ID None.
+
+    Attributes:
+        __file (file): The open snapshot file.
+        __map (mmap): The file mapped read-only.
+        __views (list): Every memoryview over the mapping, released on close.
+        __item_count (int): Number of item rows.
+        __member_count (int): Number of member rows.
+        __columns (dict): Maps names of fixed-width sections to typed memoryviews.
+        __strings (dict): Maps names of string columns to _StringView objects.
+    """
+
+    FORMATS = {
+        "item_kinds": "B",
+        "item_author_codes": "I",
+        "item_borrowers": "q",
+        "item_due_dates": "q",
+        "member_registered": "B",
+        "item_title_codes": "I",
+    }
+
+    def __init__(self, path):
+        """
+        Map a snapshot file.
+
+        :param path: Path of a file written by write_columnar.
+        :raises ValueError: If the file is not a columnar snapshot, or was written
+                            on a machine of the other byte order.
+        """
+        self.__file = open(path, "rb")
+        self.__views = []
+        try:
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__file.close()
+            raise ValueError(f"{path} is not a columnar snapshot.") from None
+
+        try:
+            self.__open(path)
+        except Exception:
+            self.close()
+            raise
+
+    def __open(self, path) -> None:
+        """Read the header and directory and set up the column views."""
+        if len(self.__map) < _HEADER.size:
+            raise ValueError(f"{path} is not a columnar snapshot.")
+
+        magic, little_endian, self.__item_count, self.__member_count = _HEADER.unpack_from(self.__map, 0)
+        if magic not in (COLUMNAR_MAGIC, _LEGACY_COLUMNAR_MAGIC):
+            raise ValueError(f"{path} is not a columnar snapshot.")
+        names = SECTIONS if magic == COLUMNAR_MAGIC else _LEGACY_SECTIONS
+        if len(self.__map) < _HEADER.size + _SECTION.size * len(names):
+            raise ValueError(f"{path} is not a columnar snapshot.")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError(f"{path} was written with the other byte order.")
+
+        whole = memoryview(self.__map)
+        self.__views.append(whole)
+        sections = {}
+        for number, name in enumerate(names):
+            offset, length = _SECTION.unpack_from(self.__map, _HEADER.size + _SECTION.size * number)
+            if offset + length > len(self.__map):
+                raise ValueError(f"{path} is truncated.")
+            view = whole[offset:offset + length]
+            if name.endswith("_offsets"):
+                view = view.cast("q")
+            elif name in self.FORMATS:
+                view = view.cast(self.FORMATS[name])
+            self.__views.append(view)
+            sections[name] = view
+
+        self.__columns = {name: sections[name] for name in self.FORMATS if name in sections}
+        self.__strings = {
+            column: _StringView(
+                sections[f"{column}_offsets"], sections[f"{column}_data"], sections[f"{column}_nulls"]
+            )
+            for column in (*_STRING_COLUMNS, "title_ids") if f"{column}_data" in sections
+        }
+
+    def __enter__(self) -> "ColumnarSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_item_count(self) -> int:
+        """Return the number of items in the snapshot."""
+        return self.__item_count
+
+    def get_member_count(self) -> int:
+        """Return the number of member rows, including unregistered borrowers."""
+        return self.__member_count
+
+    @staticmethod
+    def __find(column:_StringView, identifier:str, key_of) -> int:
+        """Binary search an ID column ordered by key_of, returning the row or -1."""
+        key = key_of(identifier)
+        low, high = 0, len(column)
+        while low < high:
+            middle = (low + high) // 2
+            if key_of(column[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low if low < len(column) and column[low] == identifier else -1
+
+    def find_item(self, item_id:str) -> int:
+        """
+        Return the row of an item, or -1 if it is not in the snapshot.
+
+        :param item_id: The unique identifier of the item.
+        """
+        return self.__find(self.__strings["item_ids"], item_id, sort_key)
+
+    def find_member(self, member_id:str) -> int:
+        """
+        Return the row of a member, or -1 if it is not in the snapshot.
+
+        :param member_id: The unique ID of the member.
+        """
+        return self.__find(self.__strings["member_ids"], member_id, _member_key)
+
+    def first_item_after(self, item_id:str = None) -> int:
+        """
+        Return the first item row ordered after an ID, which need not be in the snapshot.
+
+        :param item_id: The ID to resume after, or None for the first row.
+        """
+        return self.__first_after(self.__strings["item_ids"], item_id, sort_key)
+
+    def first_member_after(self, member_id:str = None) -> int:
+        """
+        Return the first member row ordered after an ID, which need not be in the snapshot.
+
+        :param member_id: The ID to resume after, or None for the first row.
+        """
+        return self.__first_after(self.__strings["member_ids"], member_id, _member_key)
+
+    @staticmethod
+    def __first_after(column:_StringView, identifier:str, key_of) -> int:
+        """Binary search the first row of an ID column ordered by key_of whose key is above the ID's."""
+        if identifier is None:
+            return 0
+
+        key = key_of(identifier)
+        low, high = 0, len(column)
+        while low < high:
+            middle = (low + high) // 2
+            if key_of(column[middle]) <= key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def get_item_id(self, row:int) -> str:
+        """Return the ID of the item in a row."""
+        return self.__strings["item_ids"][row]
+
+    def get_item_record(self, row:int) -> tuple:
+        """
+        Decode one item row.
+
+        :param row: The row, from 0 to get_item_count() - 1.
+        :return: A tuple laid out as storage.SCHEMAS[ADD_ITEM].
+        """
+        author_code = self.__columns["item_author_codes"][row]
+        title_codes = self.__columns.get("item_title_codes")
+        title_code = NO_CODE if title_codes is None else title_codes[row]
+        borrower = self.__columns["item_borrowers"][row]
+        strings = self.__strings
+
+        return (
+            self.__columns["item_kinds"][row],
+            strings["item_ids"][row],
+            strings["item_titles"][row],
+            strings["item_years"][row],
+            None if author_code == NO_CODE else strings["authors"][author_code],
+            strings["item_details"][row],
+            None if borrower == NO_MEMBER else strings["member_ids"][borrower],
+            None if borrower == NO_MEMBER else strings["member_names"][borrower],
+            self.__columns["item_due_dates"][row],
+            None if title_code == NO_CODE else strings["title_ids"][title_code],
+        )
+
+    def get_borrower_row(self, row:int) -> int:
+        """Return the member row of the borrower of the item in a row, or NO_MEMBER."""
+        return self.__columns["item_borrowers"][row]
+
+    def get_due_date(self, row:int) -> int:
+        """Return the due date of the item in a row in microseconds, or NO_TIMESTAMP."""
+        return self.__columns["item_due_dates"][row]
+
+    def get_member_record(self, row:int) -> tuple:
+        """
+        Decode one member row.
+
+        :param row: The row, from 0 to get_member_count() - 1.
+        :return: An (id, name, registered) tuple.
+        """
+        return (
+            self.__strings["member_ids"][row],
+            self.__strings["member_names"][row],
+            bool(self.__columns["member_registered"][row]),
+        )
+
+    def iter_item_records(self):
+        """Iterate over the decoded item rows in order, see get_item_record."""
+        return (self.get_item_record(row) for row in range(self.__item_count))
+
+    def iter_member_records(self):
+        """Iterate over the decoded member rows in order, see get_member_record."""
+        return (self.get_member_record(row) for row in range(self.__member_count))
+
+    def close(self) -> None:
+        """Release the column views and unmap the file. Calling close again has no effect."""
+        for view in reversed(self.__views):
+            view.release()
+        self.__views = []
+
+        if not self.__map.closed:
+            self.__map.close()
+        self.__file.close()
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from .sorted_list import SortedList
+
+
+class DueDateIndex:
+    """
+    Keeps the borrowed items of a library ordered by due date.
+
+    Range queries start from a bisection into the sorted entries, so they cost
+    O(log n + k) for k matching loans instead of a scan over the whole catalog.
+
+    Attributes:
+        __entries (SortedList): (due_date, item_id) tuples in due date order.
+        __due_dates (dict): Maps item IDs to their indexed due date.
+    """
+
+    def __init__(self):
+        """Initialize an empty DueDateIndex."""
+        self.__entries = SortedList()
+        self.__due_dates = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed loans."""
+        return len(self.__due_dates)
+
+    def __contains__(self, item_id:str) -> bool:
+        """Return if an item ID is indexed."""
+        return item_id in self.__due_dates
+
+    def add(self, item_id:str, due_date:datetime) -> None:
+        """
+        Index a loan under its due date, replacing any previous entry for the item.
+
+        :param item_id: The unique identifier of the borrowed item.
+        :param due_date: The due date of the loan.
+        """
+        self.discard(item_id)
+        self.__due_dates[item_id] = due_date
+        self.__entries.add((due_date, item_id))
+
+    def add_many(self, loans) -> None:
+        """
+        Index many loans at once with a single sort.
+
+        :param loans: Iterable of (item_id, due_date) tuples.
+        """
+        loans = dict(loans)
+        for item_id in loans:
+            if item_id in self.__due_dates:
+                self.discard(item_id)
+
+        self.__due_dates.update(loans)
+        self.__entries.update((due_date, item_id) for item_id, due_date in loans.items())
+
+    def discard(self, item_id:str) -> None:
+        """
+        Drop the loan of an item from the index, if present.
+
+        :param item_id: The unique identifier of the item.
+        """
+        due_date = self.__due_dates.pop(item_id, None)
+        if due_date is not None:
+            self.__entries.remove((due_date, item_id))
+
+    def due_before(self, moment:datetime) -> list[str]:
+        """
+        Return the IDs of items due strictly before a moment, earliest first.
+
+        :param moment: The exclusive upper bound.
+        """
+        item_ids = []
+        for due_date, item_id in self.__entries:
+            if due_date >= moment:
+                break
+            item_ids.append(item_id)
+
+        return item_ids
+
+    def due_between(self, start:datetime, end:datetime) -> list[str]:
+        """
+        Return the IDs of items due within an inclusive range, earliest first.
+
+        :param start: The inclusive lower bound.
+        :param end: The inclusive upper bound.
+        """
+        item_ids = []
+        for due_date, item_id in self.__entries.irange((start,)):
+            if due_date > end:
+                break
+            item_ids.append(item_id)
+
+        return item_ids
@@ -0,0 +1,93 @@
+from array import array
+from datetime import timedelta
+
+from .timestamps import MICROSECOND
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; the pure-Python path gives the same results.
+    numpy = None
+
+
+DAILY_FINE = 15
+MONTHLY_FINE = 500
+YEARLY_FINE = 10_000
+
+DAY_MICROS = timedelta(days=1) // MICROSECOND
+
+# Names of the fine tiers and the whole days overdue each starts at, see fine_for_days.
+FINE_TIERS = (("daily", 1), ("monthly", 30), ("yearly", 365))
+
+# Below this many loans, converting to NumPy arrays costs more than it saves.
+NUMPY_THRESHOLD = 1_000
+
+
+def fine_for_days(days_overdue:int) -> float:
+    """
+    Return the fine for an item overdue by a number of whole days.
+
+    Up to 29 days are charged daily, up to 364 days per whole 30-day month,
+    and anything longer at the flat yearly rate.
+
+    :param days_overdue: Whole days past the due date; zero or less means not overdue.
+    :return: The fine amount in float currency units.
+    """
+    if days_overdue < 1:
+        return float(0)
+
+    elif days_overdue < 30:
+        return float(DAILY_FINE * days_overdue)
+
+    elif days_overdue < 365:
+        return float(MONTHLY_FINE * (days_overdue // 30))
+
+    else:
+        return float(YEARLY_FINE)
+
+
+def calculate_fines(due_dates, moment:int) -> array:
+    """
+    Calculate the fines of many loans against a single reference moment.
+
+    Whole days overdue are floored exactly like timedelta.days, so every fine
+    equals LibraryItem.calculate_fine evaluated at that moment. Large batches
+    are computed with NumPy when it is installed.
+
+    :param due_dates: Sequence of due dates in microseconds since the epoch,
+                      e.g. an array("q"). NO_TIMESTAMP is not allowed.
+    :param moment: The reference moment in microseconds since the epoch.
+    :return: An array("d") of fines, one per due date.
+    """
+    if numpy is not None and len(due_dates) >= NUMPY_THRESHOLD:
+        due = numpy.frombuffer(due_dates, dtype=numpy.int64) if isinstance(due_dates, array) \
+            else numpy.asarray(due_dates, dtype=numpy.int64)
+        days = (moment - due) // DAY_MICROS
+        fines = numpy.where(
+            days < 1, 0,
+            numpy.where(
+                days < 30, DAILY_FINE * days,
+                numpy.where(days < 365, MONTHLY_FINE * (days // 30), YEARLY_FINE)
+            )
+        )
+        result = array("d")
+        result.frombytes(fines.astype(numpy.float64).tobytes())
+        return result
+
+    return array("d", [fine_for_days((moment - due) // DAY_MICROS) for due in due_dates])
+
+
+def total_fines(member_ids, due_dates, moment:int) -> dict:
+    """
+    Sum the fines of many loans per member.
+
+    :param member_ids: Sequence of borrowing member IDs, parallel to due_dates.
+    :param due_dates: Sequence of due dates in microseconds since the epoch.
+    :param moment: The reference moment in microseconds since the epoch.
+    :return: A dict mapping member IDs to their total fine; members owing nothing are left out.
+    """
+    totals = {}
+    for member_id, fine in zip(member_ids, calculate_fines(due_dates, moment)):
+        if fine:
+            totals[member_id] = totals.get(member_id, 0.0) + fine
+
+    return totals
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+
+
+class HoldQueue:
+    """
+    First-come, first-served waitlists of members holding items, indexed both ways.
+
+    Every item's waitlist is an OrderedDict, so placing a hold, cancelling any
+    hold and taking the next holder are all O(1) however long the queues grow.
+
+    Attributes:
+        __queues (dict): Maps item IDs to OrderedDicts of the member IDs waiting for them, first in line first.
+        __holds (dict): Maps member IDs to dicts used as insertion-ordered sets of the
+                        item IDs they wait for. Members without holds have no entry.
+        __size (int): Number of outstanding holds.
+    """
+
+    def __init__(self):
+        """Initialize an empty HoldQueue."""
+        self.__queues = {}
+        self.__holds = {}
+        self.__size = 0
+
+    def __len__(self) -> int:
+        """Return the number of outstanding holds."""
+        return self.__size
+
+    def __contains__(self, item_id:str) -> bool:
+        """Return if anyone waits for an item."""
+        return item_id in self.__queues
+
+    def place(self, item_id:str, member_id:str) -> int:
+        """
+        Put a member at the end of an item's waitlist.
+
+        :param item_id: The unique identifier of the item.
+        :param member_id: The unique ID of the waiting member.
+        :return: The member's position in the waitlist, 1 for the front.
+        :raises ValueError: If the member already waits for the item.
+        """
+        queue = self.__queues.get(item_id)
+        if queue is None:
+            queue = self.__queues[item_id] = OrderedDict()
+        elif member_id in queue:
+            raise ValueError(f"member {member_id} already holds item {item_id}.")
+
+        queue[member_id] = None
+        self.__holds.setdefault(member_id, {})[item_id] = None
+        self.__size += 1
+
+        return len(queue)
+
+    def cancel(self, item_id:str, member_id:str) -> bool:
+        """
+        Take a member off an item's waitlist.
+
+        :param item_id: The unique identifier of the item.
+        :param member_id: The unique ID of the waiting member.
+        :return: Whether the member was waiting.
+        """
+        queue = self.__queues.get(item_id)
+        if queue is None or member_id not in queue:
+            return False
+
+        del queue[member_id]
+        if not queue:
+            del self.__queues[item_id]
+        self.__forget(member_id, item_id)
+
+        return True
+
+    def peek_next(self, item_id:str) -> str:
+        """
+        Return the member at the front of an item's waitlist, without removing them.
+
+        :param item_id: The unique identifier of the item.
+        :return: The member ID, or None if nobody waits for the item.
+        """
+        queue = self.__queues.get(item_id)
+        return next(iter(queue)) if queue else None
+
+    def pop_next(self, item_id:str) -> str:
+        """
+        Remove and return the member at the front of an item's waitlist.
+
+        :param item_id: The unique identifier of the item.
+        :return: The member ID, or None if nobody waits for the item.
+        """
+        queue = self.__queues.get(item_id)
+        if queue is None:
+            return None
+
+        member_id, _ = queue.popitem(last=False)
+        if not queue:
+            del self.__queues[item_id]
+        self.__forget(member_id, item_id)
+
+        return member_id
+
+    def discard_item(self, item_id:str) -> list[str]:
+        """
+        Drop the whole waitlist of an item, e.g. once it is removed from the library.
+
+        :param item_id: The unique identifier of the item.
+        :return: The IDs of the members that were waiting, first in line first.
+        """
+        member_ids = list(self.__queues.pop(item_id, ()))
+        for member_id in member_ids:
+            self.__forget(member_id, item_id)
+
+        return member_ids
+
+    def get_queue(self, item_id:str) -> list[str]:
+        """
+        Return the IDs of the members waiting for an item, first in line first.
+
+        :param item_id: The unique identifier of the item.
+        """
+        return list(self.__queues.get(item_id, ()))
+
+    def count(self, item_id:str) -> int:
+        """
+        Return the number of members waiting for an item.
+
+        :param item_id: The unique identifier of the item.
+        """
+        return len(self.__queues.get(item_id, ()))
+
+    def get_item_ids(self, member_id:str) -> list[str]:
+        """
+        Return the IDs of the items a member waits for, in the order the holds were placed.
+
+        :param member_id: The unique ID of the member.
+        """
+        return list(self.__holds.get(member_id, ()))
+
+    def __forget(self, member_id:str, item_id:str) -> None:
+        """Drop a hold from the member index and the count."""
+        self.__size -= 1
+        items = self.__holds[member_id]
+        del items[item_id]
+        if not items:
+            del self.__holds[member_id]
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+
+class IdGenerator:
+    """Produces unique string identifiers for new items and members."""
+
+    def new_id(self) -> str:
+        """Return a new unique identifier."""
+        raise NotImplementedError
+
+
+class Uuid4Generator(IdGenerator):
+    """Random 36-character uuid4 strings, as used before time-ordered IDs."""
+
+    def new_id(self) -> str:
+        """Return a new random uuid4 string."""
+        return str(uuid4())
+
+
+class SnowflakeGenerator(IdGenerator):
+    """
+    Time-ordered 64-bit IDs rendered as 16 lowercase hex characters.
+
+    The bits hold, from the top, the milliseconds since 2024-01-01 (42 bits),
+    a node number (10 bits) and a per-millisecond sequence (12 bits). IDs from
+    one generator increase strictly, and the fixed width makes their string
+    order match their numeric order, so new IDs land at the end of sorted
+    indexes. When the sequence runs out within a millisecond, the clock is
+    borrowed from the next one rather than waiting.
+
+    Attributes:
+        __node (int): Node number distinguishing concurrent generators.
+        __last (int): Millisecond of the most recent ID.
+        __sequence (int): Sequence number of the most recent ID within __last.
+        __lock (Lock): Serializes ID generation between threads.
+    """
+
+    EPOCH = datetime(2024, 1, 1)
+    EPOCH_MS = (EPOCH - datetime(1970, 1, 1)) // timedelta(milliseconds=1)
+    NODE_BITS = 10
+    SEQUENCE_BITS = 12
+    MAX_NODE = (1 << NODE_BITS) - 1
+    MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+    def __init__(self, node:int = None):
+        """
+        Initialize a new SnowflakeGenerator instance.
+
+        :param node: Node number from 0 to 1023. Defaults to the low bits of the process
+                     ID, and is then re-derived in processes forked from this one.
+        :raises ValueError: If the node number is out of range.
+        """
+        if node is not None and not 0 <= node <= self.MAX_NODE:
+            raise ValueError(f"node must be between 0 and {self.MAX_NODE}.")
+
+        self.__node = os.getpid() & self.MAX_NODE if node is None else node
+        self.__last = -1
+        self.__sequence = 0
+        self.__lock = threading.Lock()
+
+        if node is None and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self.__reset_node)
+
+    def __reset_node(self) -> None:
+        """Give a forked child process its own node number."""
+        self.__node = os.getpid() & self.MAX_NODE
+        self.__lock = threading.Lock()
+
+    def get_node(self) -> int:
+        """Return the node number of the generator."""
+        return self.__node
+
+    def new_id(self) -> str:
+        """Return a new time-ordered identifier."""
+        with self.__lock:
+            now = time.time_ns() // 1_000_000 - self.EPOCH_MS
+            if now > self.__last:
+                self.__last = now
+                self.__sequence = 0
+            elif self.__sequence < self.MAX_SEQUENCE:
+                self.__sequence += 1
+            else:
+                self.__last += 1
+                self.__sequence = 0
+
+            value = (
+                (self.__last << (self.NODE_BITS + self.SEQUENCE_BITS))
+                | (self.__node << self.SEQUENCE_BITS)
+                | self.__sequence
+            )
+
+        return f"{value:016x}"
+
+    @classmethod
+    def get_timestamp(cls, identifier:str) -> datetime:
+        """
+        Return the creation time encoded in an ID, to the millisecond.
+
+        :param identifier: An ID made by a SnowflakeGenerator.
+        :raises ValueError: If the identifier is not a 16-character hex string.
+        """
+        if len(identifier) != 16:
+            raise ValueError(f"{identifier!r} is not a snowflake ID.")
+
+        milliseconds = int(identifier, 16) >> (cls.NODE_BITS + cls.SEQUENCE_BITS)
+        return cls.EPOCH + timedelta(milliseconds=milliseconds)
+
+
+_generator = SnowflakeGenerator()
+
+
+def new_id() -> str:
+    """Return a new identifier from the current generator."""
+    return _generator.new_id()
+
+
+def get_id_generator() -> IdGenerator:
+    """Return the generator used for new items and members."""
+    return _generator
+
+
+def set_id_generator(generator:IdGenerator) -> IdGenerator:
+    """
+    Replace the generator used for new items and members.
+
+    IDs from different generators can live in the same library: all are plain
+    strings, looked up and searched the same way.
+
+    :param generator: The new generator, e.g. Uuid4Generator() for the former random IDs.
+    :return: The previous generator.
+    :raises ValueError: If generator is not an IdGenerator.
+    """
+    global _generator
+
+    if not isinstance(generator, IdGenerator):
+        raise ValueError("generator must be a valid IdGenerator object.")
+
+    previous, _generator = _generator, generator
+    return previous
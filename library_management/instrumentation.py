@@ -0,0 +1,268 @@
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+
+# Histogram bucket upper bounds in seconds, from single microseconds up to
+# whole-catalog scans.
+DEFAULT_BUCKETS = (
+    0.000_001, 0.000_002_5, 0.000_005, 0.000_01, 0.000_025, 0.000_05,
+    0.000_1, 0.000_25, 0.000_5, 0.001, 0.002_5, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Methods instrumented by default, by class name. Classes not listed get
+# all their public methods that are not generators.
+DEFAULT_OPERATIONS = {
+    "Member": ("borrow_item", "return_item", "get_borrowed_items"),
+}
+
+
+class OperationStats:
+    """
+    Call, error and latency statistics of one instrumented operation.
+
+    Each thread records into its own shard, so observing a call takes no lock;
+    the shards are merged when the statistics are read.
+
+    Attributes:
+        __bounds (tuple): Upper bounds of the latency histogram buckets, in seconds.
+        __local (local): Holds the shard of the current thread.
+        __shards (list): Shards of all threads, each a [buckets, sum, errors] list where
+                         buckets has one count per bound plus an overflow bucket and
+                         errors maps exception class names to counts.
+        __lock (Lock): Guards the registration of new shards.
+    """
+
+    def __init__(self, bounds:tuple = DEFAULT_BUCKETS):
+        """
+        Initialize empty statistics.
+
+        :param bounds: Ascending upper bounds of the histogram buckets, in seconds.
+        """
+        self.__bounds = tuple(bounds)
+        self.__local = threading.local()
+        self.__shards = []
+        self.__lock = threading.Lock()
+
+    def observe(self, seconds:float, error:BaseException = None) -> None:
+        """
+        Record one call.
+
+        :param seconds: How long the call took.
+        :param error: The exception the call raised, if any.
+        """
+        try:
+            shard = self.__local.shard
+        except AttributeError:
+            shard = self.__local.shard = [[0] * (len(self.__bounds) + 1), 0.0, {}]
+            with self.__lock:
+                self.__shards.append(shard)
+
+        shard[0][bisect_left(self.__bounds, seconds)] += 1
+        shard[1] += seconds
+        if error is not None:
+            errors = shard[2]
+            name = type(error).__name__
+            errors[name] = errors.get(name, 0) + 1
+
+    def __snapshot(self) -> list:
+        """Return a copy of the shards of all threads."""
+        with self.__lock:
+            return [(list(buckets), total, dict(errors)) for buckets, total, errors in self.__shards]
+
+    def get_calls(self) -> int:
+        """Return the number of recorded calls."""
+        return sum(sum(buckets) for buckets, _, _ in self.__snapshot())
+
+    def get_errors(self) -> dict:
+        """Return the error counts by exception class name."""
+        merged = {}
+        for _, _, errors in self.__snapshot():
+            for name, count in errors.items():
+                merged[name] = merged.get(name, 0) + count
+
+        return merged
+
+    def get_sum(self) -> float:
+        """Return the total recorded latency in seconds."""
+        return sum(total for _, total, _ in self.__snapshot())
+
+    def get_histogram(self) -> list[tuple]:
+        """
+        Return the cumulative latency histogram.
+
+        :return: (upper bound, count) pairs, ending with (float("inf"), total calls).
+        """
+        counts = [sum(column) for column in zip(*(buckets for buckets, _, _ in self.__snapshot()))]
+        if not counts:
+            counts = [0] * (len(self.__bounds) + 1)
+
+        histogram = []
+        total = 0
+        for bound, count in zip(self.__bounds + (float("inf"),), counts):
+            total += count
+            histogram.append((bound, total))
+
+        return histogram
+
+
+class Instrumentation:
+    """
+    Records per-operation call counts, error counts and latency histograms.
+
+    Methods are wrapped on individual instances with attach, so objects that
+    were never attached, or have been detached, run their plain methods with
+    no added cost at all.
+
+    Attributes:
+        __stats (dict): Maps (class name, method name) pairs to OperationStats.
+        __tracer (callable): Optional span hook, see __init__.
+        __buckets (tuple): Histogram bucket bounds for new operations.
+        __lock (Lock): Guards the creation of new OperationStats.
+    """
+
+    def __init__(self, tracer = None, buckets:tuple = DEFAULT_BUCKETS):
+        """
+        Initialize a new Instrumentation instance.
+
+        :param tracer: Optional callable taking a span name such as "Library.lend_item"
+                       and returning a context manager that spans the call, e.g.
+                       an OpenTelemetry tracer's start_as_current_span.
+        :param buckets: Ascending upper bounds of the latency histogram buckets, in seconds.
+        """
+        self.__stats = {}
+        self.__tracer = tracer
+        self.__buckets = tuple(buckets)
+        self.__lock = threading.Lock()
+
+    def attach(self, target, operations:tuple = None) -> None:
+        """
+        Instrument methods of an object.
+
+        Generator methods are skipped by default, as only creating the generator
+        would be timed.
+
+        :param target: The object to instrument, e.g. a Library or Member.
+        :param operations: Names of the methods to wrap. Defaults to the entry for the
+                           object's class in DEFAULT_OPERATIONS, or to all its public methods.
+        :raises AttributeError: If an operation is not a method of the object.
+        """
+        cls = type(target)
+        if operations is None:
+            operations = DEFAULT_OPERATIONS.get(cls.__name__) or tuple(
+                name for name, member in inspect.getmembers(cls, inspect.isfunction)
+                if not name.startswith("_") and not inspect.isgeneratorfunction(member)
+            )
+
+        for name in operations:
+            method = getattr(target, name)
+            if hasattr(method, "__wrapped__"):
+                continue
+            setattr(target, name, self.__wrap(cls.__name__, name, method))
+
+    @staticmethod
+    def detach(target) -> None:
+        """
+        Remove all instrumentation from an object.
+
+        :param target: An object previously passed to attach.
+        """
+        for name, value in list(vars(target).items()):
+            if callable(value) and hasattr(value, "__wrapped__"):
+                delattr(target, name)
+
+    def get_stats(self, class_name:str, operation:str) -> OperationStats:
+        """
+        Return the statistics of an operation.
+
+        :param class_name: Name of the instrumented class, e.g. "Library".
+        :param operation: Name of the method.
+        :raises KeyError: If the operation was never instrumented.
+        """
+        return self.__stats[(class_name, operation)]
+
+    def __stats_for(self, class_name:str, operation:str) -> OperationStats:
+        """Return the statistics of an operation, creating them on first use."""
+        key = (class_name, operation)
+        with self.__lock:
+            stats = self.__stats.get(key)
+            if stats is None:
+                stats = self.__stats[key] = OperationStats(self.__buckets)
+
+        return stats
+
+    def __wrap(self, class_name:str, operation:str, method):
+        """Return a wrapper recording every call of a bound method."""
+        observe = self.__stats_for(class_name, operation).observe
+        tracer = self.__tracer
+        span_name = f"{class_name}.{operation}"
+        clock = time.perf_counter
+
+        @wraps(method)
+        def instrumented(*args, **kwargs):
+            start = clock()
+            try:
+                if tracer is None:
+                    result = method(*args, **kwargs)
+                else:
+                    with tracer(span_name):
+                        result = method(*args, **kwargs)
+            except BaseException as error:
+                observe(clock() - start, error)
+                raise
+
+            observe(clock() - start)
+            return result
+
+        return instrumented
+
+    def to_prometheus(self) -> str:
+        """
+        Export all statistics in the Prometheus text exposition format.
+
+        :return: The metric families library_operation_calls_total,
+                 library_operation_errors_total and library_operation_duration_seconds.
+        """
+        with self.__lock:
+            stats = sorted(self.__stats.items())
+
+        calls = [
+            "# HELP library_operation_calls_total Calls of instrumented operations.",
+            "# TYPE library_operation_calls_total counter",
+        ]
+        errors = [
+            "# HELP library_operation_errors_total Calls of instrumented operations that raised.",
+            "# TYPE library_operation_errors_total counter",
+        ]
+        durations = [
+            "# HELP library_operation_duration_seconds Latency of instrumented operations.",
+            "# TYPE library_operation_duration_seconds histogram",
+        ]
+
+        for (class_name, operation), operation_stats in stats:
+            labels = f'class="{_escape(class_name)}",operation="{_escape(operation)}"'
+            histogram = operation_stats.get_histogram()
+            count = histogram[-1][1]
+
+            calls.append(f"library_operation_calls_total{{{labels}}} {count}")
+            for error, error_count in sorted(operation_stats.get_errors().items()):
+                errors.append(
+                    f'library_operation_errors_total{{{labels},error="{_escape(error)}"}} {error_count}'
+                )
+            for bound, bucket_count in histogram:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                durations.append(
+                    f'library_operation_duration_seconds_bucket{{{labels},le="{le}"}} {bucket_count}'
+                )
+            durations.append(f"library_operation_duration_seconds_sum{{{labels}}} {operation_stats.get_sum()!r}")
+            durations.append(f"library_operation_duration_seconds_count{{{labels}}} {count}")
+
+        return "\n".join(calls + errors + durations) + "\n"
+
+
+def _escape(value:str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
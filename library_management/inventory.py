@@ -0,0 +1,275 @@
+from .ids import new_id
+from .library_item import LibraryItem, ITEM_TYPES
+
+
+class Title:
+    """
+    Represents the bibliographic record shared by every copy of a title, with its availability counters.
+
+    The record is held once however many copies the library owns; the copies
+    only carry their loan state. A Library keeps the counters current as its
+    copies are added, lent, returned and removed, so asking how many copies
+    are on the shelf is O(1).
+
+    Attributes:
+        __title_id (str): Unique identifier of the title.
+        __kind (type): Class of the copies' items, one of ITEM_TYPES, e.g. Book.
+        __title (str): Title of the work.
+        __pub_year (str): Year the work was published.
+        __author_name (str): Name of the author who created the work.
+        __detail (str): Value of the kind's detail field, e.g. the ISBN of a Book.
+        __copies (dict): Maps the IDs of the copies in a library to the Copy objects.
+        __available (list): Copies not on loan, in no particular order.
+        __positions (dict): Maps the IDs of the available copies to their index in __available.
+        __numbers (int): Number of copy IDs handed out by new_copies.
+    """
+
+    __slots__ = (
+        "__title_id",
+        "__kind",
+        "__title",
+        "__pub_year",
+        "__author_name",
+        "__detail",
+        "__copies",
+        "__available",
+        "__positions",
+        "__numbers",
+    )
+
+    def __init__(
+            self,
+            kind:type,
+            title:str,
+            pub_year:str,
+            author_name:str,
+            detail:str = None,
+            title_id:str = None
+    ):
+        """
+        Initialize a new Title instance without copies.
+
+        :param kind: Class of the copies' items, one of ITEM_TYPES, e.g. Book.
+        :param title: Title of the work.
+        :param pub_year: Year the work was published.
+        :param author_name: Name of the work's author.
+        :param detail: Value of the kind's detail field, e.g. the ISBN of a Book.
+        :param title_id: Unique identifier to reuse. A new one is generated if omitted.
+        :raises ValueError: If kind is not one of ITEM_TYPES.
+        """
+        if kind not in ITEM_TYPES:
+            raise ValueError("kind must be one of the library item classes.")
+
+        self.__title_id = new_id() if title_id is None else title_id
+        self.__kind = kind
+        self.__title = title
+        self.__pub_year = pub_year
+        self.__author_name = author_name
+        self.__detail = detail
+        self.__copies = {}
+        self.__available = []
+        self.__positions = {}
+        self.__numbers = 0
+
+    def get_id(self) -> str:
+        """Return the unique ID of the title."""
+        return self.__title_id
+
+    def get_kind(self) -> type:
+        """Return the class of the copies' items."""
+        return self.__kind
+
+    def get_title(self) -> str:
+        """Return the title of the work."""
+        return self.__title
+
+    def get_pub_year(self) -> str:
+        """Return the publication year of the work."""
+        return self.__pub_year
+
+    def get_author(self) -> str:
+        """Return the author name of the work."""
+        return self.__author_name
+
+    def get_detail(self):
+        """Return the value of the kind's detail field, or None if the kind has none."""
+        return self.__detail
+
+    def get_copy_count(self) -> int:
+        """Return the number of copies in the library."""
+        return len(self.__copies)
+
+    def get_available_count(self) -> int:
+        """Return the number of copies in the library that are not on loan."""
+        return len(self.__available)
+
+    def get_copy_ids(self) -> list[str]:
+        """Return the IDs of the copies in the library, in the order they were added."""
+        return list(self.__copies)
+
+    def get_available_copy(self):
+        """Return a copy that is not on loan, or None if every copy is out."""
+        return self.__available[-1] if self.__available else None
+
+    def get_info(self) -> dict:
+        """
+        Retrieve the bibliographic details and availability of the title.
+
+        :return: A dictionary containing the title's ID, title, author, publication year,
+                 detail field, and the numbers of copies and of available copies.
+        """
+        info = {
+            "id": self.__title_id,
+            "title": self.__title,
+            "author_name": self.__author_name,
+            "pub_year": self.__pub_year,
+        }
+        if self.__kind.DETAIL_FIELD is not None:
+            info[self.__kind.DETAIL_FIELD] = self.__detail
+        info["copies"] = len(self.__copies)
+        info["available"] = len(self.__available)
+
+        return info
+
+    def new_copies(self, count:int = 1) -> list["Copy"]:
+        """
+        Build new copies of the title, numbered after the title's ID.
+
+        The copies are counted once they are added to a library.
+
+        :param count: Number of copies to build.
+        :return: A list of Copy objects with IDs of the form "<title ID>.<number>".
+        :raises ValueError: If count is negative.
+        """
+        if count < 0:
+            raise ValueError("count must not be negative.")
+
+        first = self.__numbers + 1
+        self.__numbers += count
+
+        return [Copy(self, item_id=f"{self.__title_id}.{number}") for number in range(first, first + count)]
+
+    def _attach(self, copy:"Copy") -> None:
+        """
+        Count a copy added to a library, as available unless it is on loan.
+
+        Copies numbered by new_copies, e.g. restored from storage, advance the
+        numbering so that later copies get new IDs.
+        """
+        prefix, _, number = copy.get_id().rpartition(".")
+        if prefix == self.__title_id and number.isdigit():
+            self.__numbers = max(self.__numbers, int(number))
+
+        self.__copies[copy.get_id()] = copy
+        if not copy.get_is_borrowed():
+            self._check_in(copy)
+
+    def _detach(self, copy:"Copy") -> None:
+        """Stop counting a copy removed from a library."""
+        self._check_out(copy)
+        self.__copies.pop(copy.get_id(), None)
+
+    def _check_out(self, copy:"Copy") -> None:
+        """Take a copy off the available list, if it is on it."""
+        index = self.__positions.pop(copy.get_id(), None)
+        if index is None:
+            return
+
+        # Swap the last available copy into the freed slot to keep removal O(1).
+        last = self.__available.pop()
+        if index < len(self.__available):
+            self.__available[index] = last
+            self.__positions[last.get_id()] = index
+
+    def _check_in(self, copy:"Copy") -> None:
+        """Put a counted copy on the available list, if it is not on it yet."""
+        copy_id = copy.get_id()
+        if copy_id in self.__copies and copy_id not in self.__positions:
+            self.__positions[copy_id] = len(self.__available)
+            self.__available.append(copy)
+
+
+class Copy(LibraryItem):
+    """
+    Represents one copy of a Title: a library item holding only its own ID and loan state.
+
+    The bibliographic fields are the very objects held by the Title, so any
+    number of copies share one set of strings. Copies behave like items of
+    the title's kind towards the library, its indexes and its storage, which
+    keeps the title's ID with each copy so restored copies share a Title again.
+
+    Attributes:
+        __record (Title): The title this is a copy of.
+    """
+
+    __slots__ = ("__record",)
+
+    def __init__(
+            self,
+            record:Title,
+            is_borrowed=False,
+            borrowed_by=None,
+            due_date=None,
+            item_id=None
+    ):
+        """
+        Initialize a new Copy instance.
+
+        :param record: The Title this is a copy of.
+        :param is_borrowed: Whether the copy is currently borrowed.
+        :param borrowed_by: The Member object who borrowed the copy.
+        :param due_date: The due date for the borrowed copy.
+        :param item_id: Unique identifier to reuse. A new one is generated if omitted.
+        """
+        super().__init__(
+            record.get_title(),
+            record.get_pub_year(),
+            record.get_author(),
+            is_borrowed,
+            borrowed_by,
+            due_date,
+            item_id
+        )
+        self.__record = record
+
+    @property
+    def DETAIL_FIELD(self) -> str:
+        """Name of the detail field of the title's kind."""
+        return self.__record.get_kind().DETAIL_FIELD
+
+    def get_record(self) -> Title:
+        """Return the Title this is a copy of."""
+        return self.__record
+
+    def get_kind(self) -> type:
+        """Return the class of the title's items, which the copy is stored and exported as."""
+        return self.__record.get_kind()
+
+    def get_detail(self):
+        """Return the value of the title's detail field."""
+        return self.__record.get_detail()
+
+    def get_field(self, field:str):
+        """
+        Retrieve the value of a single get_info key, including "title_id".
+
+        :param field: The name of the key.
+        :return: The value get_info would hold under that key.
+        :raises KeyError: If the field is unknown.
+        """
+        if field == "title_id":
+            return self.__record.get_id()
+
+        return super().get_field(field)
+
+    def _build_info(self) -> dict:
+        """
+        Extend the parent _build_info() with the title's detail field and ID.
+
+        :return: A dictionary containing the copy's details.
+        """
+        info = super()._build_info()
+        if self.DETAIL_FIELD is not None:
+            info[self.DETAIL_FIELD] = self.__record.get_detail()
+        info["title_id"] = self.__record.get_id()
+        return info
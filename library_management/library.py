@@ -1,5 +1,73 @@
-from .library_item import LibraryItem
+import threading
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import groupby, islice
+from operator import itemgetter
+
+from .change_feed import ChangeFeed, LoanEvent
+from .circulation_log import CirculationEvent, CirculationLog
+from .circulation_stats import CirculationStats
+from .columnar import ColumnarSnapshot, write_columnar
+from .due_date_index import DueDateIndex
+from .hold_queue import HoldQueue
+from .instrumentation import Instrumentation
+from .inventory import Copy, Title
+from .library_item import LibraryItem, ITEM_TYPES, items_to_json
+from .loan_index import LoanIndex
+from .loan_table import LoanTable
+from .locking import NullStripedLock, StripedLock, null_lock
 from .member import Member
+from .result_cache import ResultCache
+from .search_index import SearchIndex
+from .sorted_list import SortedList
+from .storage import (
+    Storage, item_record, ADD_ITEM, REMOVE_ITEM, CREATE_MEMBER, LEND_ITEM, RETURN_ITEM
+)
+from .timestamps import from_micros, to_micros, NO_TIMESTAMP
+
+
+# Outcomes reported per item by Library.lend_items and Library.return_items.
+LENT = "lent"
+RETURNED = "returned"
+UNKNOWN_ITEM = "unknown item"
+DUPLICATE = "duplicate"
+ALREADY_ON_LOAN = "already on loan"
+NOT_ON_LOAN = "not on loan to member"
+# The item was valid, but an atomic batch was rejected because of another item.
+NOT_APPLIED = "not applied"
+
+def _encode_cursor(kind:str, key:str) -> str:
+    """Wrap the last key of a page into an opaque cursor string."""
+    return urlsafe_b64encode(f"{kind}:{key}".encode()).decode("ascii")
+
+
+def _decode_cursor(kind:str, cursor:str) -> str:
+    """
+    Unwrap the key stored in a cursor made by _encode_cursor.
+
+    :raises ValueError: If the cursor is malformed or belongs to another listing.
+    """
+    try:
+        prefix, separator, key = urlsafe_b64decode(cursor.encode("ascii")).decode().partition(":")
+    except (AttributeError, ValueError):
+        raise ValueError("invalid cursor.") from None
+
+    if prefix != kind or not separator:
+        raise ValueError("invalid cursor.")
+
+    return key
+
+
+def _copy_infos(infos:list) -> list[dict]:
+    """Copy a cached list of info dicts, including the borrower dicts nested in them."""
+    copies = [info.copy() for info in infos]
+    for info in copies:
+        borrowed_by = info.get("borrowed_by")
+        if borrowed_by is not None:
+            info["borrowed_by"] = borrowed_by.copy()
+
+    return copies
 
 
 class Library:
@@ -9,13 +77,97 @@ class Library:
     Attributes:
         __items (dict): Maps item IDs to LibraryItem objects.
         __members (dict): Maps member IDs to Member objects.
+        __member_ids (SortedList): Member IDs in order, used to page through members.
+        __index (SearchIndex): Inverted index over item IDs, titles and authors.
+        __due_dates (DueDateIndex): Borrowed items ordered by due date.
+        __loans (LoanTable): Open loans packed for batch fine calculation.
+        __holders (LoanIndex): Open loans by item ID and by member ID.
+        __storage (Storage): Persistence backend receiving every mutation, or None.
+        __stripes (StripedLock): Per-item and per-member locks serializing lend and return.
+        __lock (RLock): Guards the shared dicts, indexes and storage backend.
+        __instrumentation (Instrumentation): Records metrics of this library and its members, or None.
+        __cache (ResultCache): Caches search and listing results, or None.
+        __version (int): Bumped by every mutation, so cached results of earlier versions are not reused.
+        __feed (ChangeFeed): Follows open loans for the subscriptions to loan events, or None without any.
+        __waitlists (HoldQueue): Members holding items on loan, first come first served.
+        __titles (dict): Maps title IDs to the Titles of the Copy items in the collection.
+        __circulation_log (CirculationLog): Records every lend and return made through the library, or None.
+        __stats (CirculationStats): Aggregates lends and open loans for dashboards, or None.
     """
 
 
-    def __init__(self):
-        """Initialize a new Library instance."""
+    def __init__(
+            self,
+            storage:Storage = None,
+            thread_safe:bool = False,
+            instrumentation:Instrumentation = None,
+            cache:ResultCache = None,
+            circulation_log:CirculationLog = None,
+            circulation_stats:CirculationStats = None
+    ):
+        """
+        Initialize a new Library instance.
+
+        :param storage: Optional persistence backend. The state it holds is restored
+                        first, and every later mutation is appended to it.
+        :param thread_safe: Whether the library will be shared between threads. Lends
+                            and returns then lock only the item and member involved, so
+                            different items circulate in parallel, and the shared
+                            structures are guarded by a short-lived lock.
+        :param instrumentation: Optional Instrumentation recording the calls of this
+                                library and of every member it registers. Restoring
+                                from storage is not recorded.
+        :param cache: Optional ResultCache for search_item (except exact lookups),
+                      search_ranked, get_items and get_members. Mutations through the library invalidate it; changes
+                      made directly on items or members are only seen after the next one.
+        :param circulation_log: Optional CirculationLog recording every lend and return, so
+                                loan history can be queried by item, member and time window.
+                                Restoring from storage is not recorded again.
+        :param circulation_stats: Optional CirculationStats kept up to date with every lend
+                                  and every loan opened or closed. Lends restored from storage
+                                  are not counted, the loans they leave open are.
+        """
         self.__items = {}
         self.__members = {}
+        self.__member_ids = SortedList()
+        self.__index = SearchIndex()
+        self.__due_dates = DueDateIndex()
+        self.__loans = LoanTable()
+        self.__holders = LoanIndex()
+        self.__storage = None
+        self.__stripes = StripedLock() if thread_safe else NullStripedLock()
+        self.__lock = threading.RLock() if thread_safe else null_lock()
+        self.__cache = cache
+        self.__version = 0
+        self.__feed = None
+        self.__waitlists = HoldQueue()
+        self.__titles = {}
+        self.__circulation_log = None
+        self.__stats = None
+
+        self.__instrumentation = None
+
+        if storage is not None:
+            self.__restore(storage)
+            self.__storage = storage
+
+        self.__circulation_log = circulation_log
+
+        if circulation_stats is not None:
+            self.__stats = circulation_stats
+            for item in self.__items.values():
+                if item.get_id() in self.__holders:
+                    circulation_stats.loan_started(item)
+
+        if instrumentation is not None:
+            self.__instrumentation = instrumentation
+            instrumentation.attach(self)
+            for member in self.__members.values():
+                instrumentation.attach(member)
+
+    def get_is_thread_safe(self) -> bool:
+        """Return whether the library was created with thread_safe=True and may be shared between threads."""
+        return not isinstance(self.__stripes, NullStripedLock)
 
     def add_item(self, item:LibraryItem) -> None:
         """
@@ -27,7 +179,65 @@ class Library:
         if not isinstance(item, LibraryItem):
             raise ValueError("item must be a valid LibraryItem object.")
 
-        self.__items[item.get_id()]=item
+        with self.__stripes.hold(item.get_id()), self.__lock:
+            previous = self.__items.get(item.get_id())
+            if previous is not None:
+                self.__on_returned(previous)
+                self.__unshelve(previous)
+
+            self.__items[item.get_id()]=item
+            self.__index.add(item.get_id(), item.get_title(), item.get_author())
+            self.__shelve(item)
+            if item.get_is_borrowed():
+                self.__on_lent(item)
+
+            self.__version += 1
+            self.__log_item(item)
+            self.__snapshot_if_due()
+
+    def add_items(self, items, batch_size:int = 10_000) -> int:
+        """
+        Add many LibraryItems to the library's collection.
+
+        Items are consumed in batches. Each batch is validated as a whole before
+        any of it is added, and the indexes are filled once per batch.
+
+        :param items: Iterable of LibraryItem objects.
+        :param batch_size: Number of items validated and indexed together.
+        :return: The number of items added.
+        :raises ValueError: If a batch holds an object that is not a valid LibraryItem instance.
+        """
+        items = iter(items)
+        added = 0
+
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                return added
+
+            if not all(isinstance(item, LibraryItem) for item in batch):
+                raise ValueError("items must all be valid LibraryItem objects.")
+
+            with self.__lock:
+                for item in batch:
+                    previous = self.__items.get(item.get_id())
+                    if previous is not None:
+                        self.__on_returned(previous)
+                        self.__unshelve(previous)
+
+                self.__items.update((item.get_id(), item) for item in batch)
+                self.__index.add_many(
+                    (item.get_id(), item.get_title(), item.get_author()) for item in batch
+                )
+                for item in batch:
+                    self.__shelve(item)
+                self.__on_lent_many([item for item in batch if item.get_is_borrowed()])
+                self.__version += 1
+                added += len(batch)
+
+                for item in batch:
+                    self.__log_item(item)
+                self.__snapshot_if_due()
 
     def remove_item(self, item_id:str) -> None:
         """
@@ -36,52 +246,305 @@ class Library:
         :param item_id: The unique identifier of the item to remove.
         :raises KeyError: If no item with the given ID exists in the library.
         """
-        item = self.__items.get(item_id)
+        with self.__stripes.hold(item_id), self.__lock:
+            item = self.__items.get(item_id)
+            if item is None:
+                raise KeyError(f"item with the {item_id} does not exist.")
+
+            del self.__items[item_id]
+            self.__index.remove(item_id)
+            self.__on_returned(item)
+            self.__unshelve(item)
+            self.__waitlists.discard_item(item_id)
+            self.__version += 1
+            self.__log(REMOVE_ITEM, item_id)
+            self.__snapshot_if_due()
+
+    def get_item(self, item_id:str) -> LibraryItem:
+        """
+        Retrieve an item by its ID.
+
+        :param item_id: The unique identifier of the item.
+        :return: The LibraryItem object.
+        :raises KeyError: If no item with the given ID exists in the library.
+        """
+        with self.__lock:
+            item = self.__items.get(item_id)
+
         if item is None:
             raise KeyError(f"item with the {item_id} does not exist.")
 
-        del self.__items[item_id]
+        return item
 
     def search_item(
             self,
-            keyword:str
+            keyword:str,
+            mode:str = "exact",
+            limit:int = None
     ) -> list[LibraryItem]:
         """
         Search the library's collection for items matching a keyword in their
         ID, title, or author name.
 
         :param keyword: The search term to look for.
+        :param mode: "exact" (default) matches whole field values, "prefix" matches the
+                     start of a field or word, "substring" matches anywhere in the title
+                     or author, and "ranked" matches the words of the keyword against
+                     titles and authors despite typos, most relevant first. All modes
+                     but "exact" ignore case.
+        :param limit: Optional maximum number of items to return; 0 returns none.
         :return: A list of LibraryItem objects matching the keyword.
+        :raises ValueError: If mode is not a supported search mode or limit is negative.
         """
+        if mode == "exact":
+            # A single dict lookup, cheaper than going through the cache.
+            with self.__lock:
+                item_ids = self.__index.search(keyword, mode, limit)
+
+                return [self.__items[item_id] for item_id in item_ids]
+
+        key = ("search_item", keyword, mode, limit)
+        with self.__lock:
+            version = self.__version
+            cached = self.__cached(key, version)
+            if cached is not None:
+                return list(cached)
+
+            item_ids = self.__index.search(keyword, mode, limit)
+            items = [self.__items[item_id] for item_id in item_ids]
+
+        return self.__cache_result(key, version, items, list)
+
+    def search_ranked(self, keyword:str, limit:int = 10) -> list[tuple[LibraryItem, float]]:
+        """
+        Find the items whose titles and authors best match the words of a keyword,
+        tolerating typos, see SearchIndex.rank.
+
+        :param keyword: The words to look for, in any case.
+        :param limit: Maximum number of results, or None for all matches.
+        :return: (item, relevance score) pairs, most relevant first.
+        :raises ValueError: If limit is negative.
+        """
+        key = ("search_ranked", keyword, limit)
+        with self.__lock:
+            version = self.__version
+            cached = self.__cached(key, version)
+            if cached is not None:
+                return list(cached)
+
+            ranked = self.__index.rank(keyword, limit)
+            results = [(self.__items[item_id], score) for item_id, score in ranked]
 
-        return [item for item in filter(
-               lambda item: keyword in [item.get_id(), item.get_title(), item.get_author()],
-                self.__items.values()
-            )]
+        return self.__cache_result(key, version, results, list)
+
+    def get_items(self, fields:tuple = None) -> list[dict]:
+        """
+        Return information about all items in the library, in the order they were added.
+
+        The whole list is built at once; prefer iter_items or get_items_page for
+        large catalogs.
+
+        :param fields: Optional names of the keys to include, see LibraryItem.get_field.
+        """
+        key = ("get_items", None if fields is None else tuple(fields))
+        with self.__lock:
+            version = self.__version
+            cached = self.__cached(key, version)
+            if cached is None:
+                items = list(self.__items.values())
+
+        if cached is not None:
+            return _copy_infos(cached)
+
+        return self.__cache_result(key, version, [item.get_info(fields) for item in items], _copy_infos)
+
+    def get_items_page(
+            self,
+            cursor:str = None,
+            limit:int = 100,
+            fields:tuple = None
+    ) -> tuple[list[dict], str]:
+        """
+        Return one page of item information, ordered by item ID ignoring case.
 
-    def get_items(self) -> list[dict]:
-        """Return information about all items in the library."""
-        return [item.get_info() for item in self.__items.values()]
+        Paging is keyed on the last ID returned, so items added or removed between
+        calls neither shift nor repeat the pages that follow.
 
-    def create_member(self, name:str) -> str:
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: Maximum number of items on the page.
+        :param fields: Optional names of the keys to include, see LibraryItem.get_field.
+        :return: The page and the cursor of the next one, which is None after the last page.
+        :raises ValueError: If the cursor is invalid or limit is not positive.
+        """
+        return self.__page("item", self.__index.iter_ids, self.__items, cursor, limit, fields)
+
+    def iter_items(self, fields:tuple = None, page_size:int = 1_000):
+        """
+        Lazily iterate over the information of all items, ordered as get_items_page.
+
+        Only one page of dictionaries is alive at a time, and the library is only
+        locked while each page is collected.
+
+        :param fields: Optional names of the keys to include, see LibraryItem.get_field.
+        :param page_size: Number of items fetched per page.
+        :return: A generator of item dictionaries.
+        """
+        cursor = None
+        while True:
+            page, cursor = self.get_items_page(cursor, page_size, fields)
+            yield from page
+            if cursor is None:
+                return
+
+    def iter_items_json(self, page_size:int = 1_000):
+        """
+        Stream all items as one JSON array of their get_info objects, ordered as get_items_page.
+
+        Each page is serialized in one call, see items_to_json, and nothing is kept
+        on the items afterwards. The library is only locked while each page is
+        collected.
+
+        :param page_size: Number of items serialized per chunk.
+        :return: A generator of bytes chunks which concatenate to the JSON array.
+        :raises ValueError: If page_size is not positive.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+
+        after = None
+        separator = b"["
+        while True:
+            with self.__lock:
+                item_ids = list(islice(self.__index.iter_ids(after), page_size))
+                page = [self.__items[item_id] for item_id in item_ids]
+
+            if not page:
+                yield b"]" if separator == b"," else b"[]"
+                return
+
+            # Drop the brackets of the page's array; the chunks share one array.
+            yield separator + items_to_json(page)[1:-1]
+            separator = b","
+            after = item_ids[-1]
+
+    def create_member(self, name:str, member_id:str = None) -> str:
         """
         Create and register a new member in the library.
 
         :param name: The name of the new member.
+        :param member_id: Unique ID to give the member, e.g. to register the same member
+                          in several libraries. A new one is generated if omitted.
         :return : The unique ID of the created member.
-        :raises ValueError: If provided name is not a string.
+        :raises ValueError: If provided name is not a string, or member_id is already registered.
         """
         if not isinstance(name, str):
             raise ValueError(f"{name} have to be of type string.")
 
-        member = Member(name=name)
-        self.__members[member.get_id()]=member
+        member = Member(name=name, member_id=member_id)
+        if self.__instrumentation is not None:
+            self.__instrumentation.attach(member)
+        with self.__lock:
+            if member.get_id() in self.__members:
+                raise ValueError(f"member with the {member_id} already exists.")
+
+            self.__members[member.get_id()]=member
+            self.__member_ids.add(member.get_id())
+            self.__version += 1
+            self.__log(CREATE_MEMBER, member.get_id(), name)
+            self.__snapshot_if_due()
 
         return member.get_id()
 
-    def get_members(self) -> list[dict]:
-        """Return information about all registered library members."""
-        return [member.get_info() for member in self.__members.values()]
+    def create_members(self, names, member_ids = None) -> list[str]:
+        """
+        Create and register many members at once.
+
+        All names are validated before any member is registered.
+
+        :param names: Iterable of member names.
+        :param member_ids: Optional unique IDs to give the members, in the same order as names.
+                           New ones are generated if omitted.
+        :return: The unique IDs of the created members, in input order.
+        :raises ValueError: If any provided name is not a string, or the member IDs do not match
+                            the names one to one or are already registered.
+        """
+        names = list(names)
+        for name in names:
+            if not isinstance(name, str):
+                raise ValueError(f"{name} have to be of type string.")
+
+        member_ids = [None] * len(names) if member_ids is None else list(member_ids)
+        given_ids = [member_id for member_id in member_ids if member_id is not None]
+        if len(member_ids) != len(names) or len(set(given_ids)) != len(given_ids):
+            raise ValueError("member_ids must hold one distinct ID per name.")
+
+        members = [Member(name=name, member_id=member_id) for name, member_id in zip(names, member_ids)]
+        if self.__instrumentation is not None:
+            for member in members:
+                self.__instrumentation.attach(member)
+        with self.__lock:
+            for member in members:
+                if member.get_id() in self.__members:
+                    raise ValueError(f"member with the {member.get_id()} already exists.")
+
+            self.__members.update((member.get_id(), member) for member in members)
+            self.__member_ids.update(member.get_id() for member in members)
+            self.__version += 1
+            for member in members:
+                self.__log(CREATE_MEMBER, member.get_id(), member.get_name())
+            self.__snapshot_if_due()
+
+        return [member.get_id() for member in members]
+
+    def get_members(self, fields:tuple = None) -> list[dict]:
+        """
+        Return information about all registered library members.
+
+        :param fields: Optional names of the keys to include, see Member.get_field.
+        """
+        key = ("get_members", None if fields is None else tuple(fields))
+        with self.__lock:
+            version = self.__version
+            cached = self.__cached(key, version)
+            if cached is None:
+                members = list(self.__members.values())
+
+        if cached is not None:
+            return _copy_infos(cached)
+
+        return self.__cache_result(key, version, [member.get_info(fields) for member in members], _copy_infos)
+
+    def get_members_page(
+            self,
+            cursor:str = None,
+            limit:int = 100,
+            fields:tuple = None
+    ) -> tuple[list[dict], str]:
+        """
+        Return one page of member information, ordered by member ID.
+
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: Maximum number of members on the page.
+        :param fields: Optional names of the keys to include, see Member.get_field.
+        :return: The page and the cursor of the next one, which is None after the last page.
+        :raises ValueError: If the cursor is invalid or limit is not positive.
+        """
+        return self.__page("member", self.__member_ids_after, self.__members, cursor, limit, fields)
+
+    def iter_members(self, fields:tuple = None, page_size:int = 1_000):
+        """
+        Lazily iterate over the information of all members, ordered as get_members_page.
+
+        :param fields: Optional names of the keys to include, see Member.get_field.
+        :param page_size: Number of members fetched per page.
+        :return: A generator of member dictionaries.
+        """
+        cursor = None
+        while True:
+            page, cursor = self.get_members_page(cursor, page_size, fields)
+            yield from page
+            if cursor is None:
+                return
 
 
     def lend_item(self, member_id:str, item:LibraryItem) -> None:
@@ -90,40 +553,881 @@ class Library:
 
         :param member_id: The unique ID of the member borrowing the item.
         :param item: The LibraryItem object to lend.
-        :raises Exception: If the member or item does not exist in the library.
+        :raises Exception: If the member or item does not exist in the library, or the
+                           item is already on loan.
         """
-        if member_id not in self.__members:
-            raise Exception("Member with that id does not exist.")
+        with self.__stripes.hold(member_id, item.get_id()):
+            if member_id not in self.__members:
+                raise Exception("Member with that id does not exist.")
+
+            if item.get_id() not in self.__items:
+                raise Exception("Item does not exist in library.")
 
-        if item.get_id() not in self.__items:
-            raise Exception("Item does not exist in library.")
+            member = self.__members.get(member_id)
+            if item.get_is_borrowed() and item.get_borrowed_by() is not member:
+                raise Exception("Item is already on loan.")
 
-        member = self.__members.get(member_id)
-        member.borrow_item(item)
+            # Lend under the lock that logs the loan, so no snapshot falls in between.
+            with self.__lock:
+                member.borrow_item(item)
+                self.__on_lent(item)
+                self.__version += 1
+                self.__log(LEND_ITEM, member_id, item.get_id(), to_micros(item.get_due_date()))
+                self.__record(LEND_ITEM, member_id, [item])
+                self.__snapshot_if_due()
 
-    def return_item(self, member_id:str, item:LibraryItem) -> None:
+    def return_item(self, member_id:str, item:LibraryItem) -> str:
         """
         Process the return of a borrowed library item.
 
+        If members hold the item, it is lent straight to the first of them.
+
         :param member_id: The unique ID of the member returning the item.
         :param item: The LibraryItem object to be returned.
+        :return: The ID of the member the item was handed to, or None if nobody held it.
         :raises Exception: If the member or item does not exist in the library.
         """
+        with self.__return_stripes(member_id, [item.get_id()]):
+            if member_id not in self.__members:
+                raise Exception("Member with that id does not exist.")
+
+            if item.get_id() not in self.__items:
+                raise Exception("Item does not exist in library.")
+
+            member = self.__members.get(member_id)
+            with self.__lock:
+                member.return_item(item)
+                self.__on_returned(item)
+                self.__version += 1
+                self.__log(RETURN_ITEM, member_id, item.get_id())
+                self.__record(RETURN_ITEM, member_id, [item])
+                handed_to = self.__hand_off(item)
+                self.__snapshot_if_due()
+
+                return handed_to
+
+    def lend_items(self, member_id:str, item_ids, atomic:bool = True) -> list[str]:
+        """
+        Lend a basket of items to a registered member in one call.
+
+        The whole basket is validated first and then applied under a single lock
+        acquisition, with one index update and one storage group for all loans,
+        which makes it much faster than lending the items one by one. All loans
+        of the basket share the same due date.
+
+        :param member_id: The unique ID of the member borrowing the items.
+        :param item_ids: Iterable of the IDs of the items to lend.
+        :param atomic: Whether to lend nothing if any item cannot be lent. Otherwise
+                       the items that can be lent are, and the others are skipped.
+        :return: The outcome of every item in input order: LENT, UNKNOWN_ITEM,
+                 DUPLICATE, ALREADY_ON_LOAN, or NOT_APPLIED for valid items of a
+                 rejected atomic basket.
+        :raises Exception: If the member does not exist in the library.
+        """
+        item_ids = list(item_ids)
+        with self.__stripes.hold(member_id, *item_ids):
+            member = self.__members.get(member_id)
+            if member is None:
+                raise Exception("Member with that id does not exist.")
+
+            items, outcomes = self.__check_basket(
+                item_ids, lambda item: ALREADY_ON_LOAN if item.get_is_borrowed() else LENT
+            )
+            if not self.__accept_basket(outcomes, LENT, atomic):
+                return outcomes
+
+            lent = [item for item, outcome in zip(items, outcomes) if outcome == LENT]
+            with self.__lock:
+                member.borrow_items(lent)
+                due_date = lent[0].get_due_date()
+                self.__on_lent_many(lent, member_id, due_date)
+                self.__version += 1
+                if self.__storage is not None:
+                    due = to_micros(due_date)
+                    self.__storage.append_many(LEND_ITEM, [(member_id, item.get_id(), due) for item in lent])
+                self.__record(LEND_ITEM, member_id, lent)
+                self.__snapshot_if_due()
+
+            return outcomes
+
+    def return_items(self, member_id:str, item_ids, atomic:bool = True) -> list[str]:
+        """
+        Return a basket of items borrowed by a member in one call, see lend_items.
+
+        Returned items that members hold are lent straight to the first of them,
+        as in return_item.
+
+        :param member_id: The unique ID of the member returning the items.
+        :param item_ids: Iterable of the IDs of the items to return.
+        :param atomic: Whether to return nothing if any item cannot be returned. Otherwise
+                       the items that can be returned are, and the others are skipped.
+        :return: The outcome of every item in input order: RETURNED, UNKNOWN_ITEM,
+                 DUPLICATE, NOT_ON_LOAN, or NOT_APPLIED for valid items of a
+                 rejected atomic basket.
+        :raises Exception: If the member does not exist in the library.
+        """
+        item_ids = list(item_ids)
+        with self.__return_stripes(member_id, item_ids):
+            member = self.__members.get(member_id)
+            if member is None:
+                raise Exception("Member with that id does not exist.")
+
+            items, outcomes = self.__check_basket(
+                item_ids, lambda item: RETURNED if item.get_borrowed_by() is member else NOT_ON_LOAN
+            )
+            if not self.__accept_basket(outcomes, RETURNED, atomic):
+                return outcomes
+
+            returned = [item for item, outcome in zip(items, outcomes) if outcome == RETURNED]
+            with self.__lock:
+                member.return_items(returned)
+                self.__on_returned_many([item.get_id() for item in returned])
+                self.__version += 1
+                if self.__storage is not None:
+                    self.__storage.append_many(RETURN_ITEM, [(member_id, item.get_id()) for item in returned])
+                self.__record(RETURN_ITEM, member_id, returned)
+                for item in returned:
+                    self.__hand_off(item)
+                self.__snapshot_if_due()
+
+            return outcomes
+
+    def place_hold(self, member_id:str, item_id:str) -> int:
+        """
+        Put a member on the waitlist of an item on loan.
+
+        The item is lent to the member automatically once it is returned and
+        everyone ahead in the waitlist has been served. Holds are kept in memory
+        only; the loans they turn into are persisted like any other.
+
+        :param member_id: The unique ID of the member placing the hold.
+        :param item_id: The unique identifier of the item.
+        :return: The member's position in the waitlist, 1 for the front.
+        :raises Exception: If the member or item does not exist in the library, the item
+                           is not on loan, or the member already borrows or holds it.
+        """
+        with self.__stripes.hold(member_id, item_id), self.__lock:
+            member = self.__members.get(member_id)
+            if member is None:
+                raise Exception("Member with that id does not exist.")
+
+            item = self.__items.get(item_id)
+            if item is None:
+                raise Exception("Item does not exist in library.")
+
+            if not item.get_is_borrowed():
+                raise Exception("Item is not on loan; lend it instead.")
+
+            if item.get_borrowed_by() is member:
+                raise Exception("Item already borrowed by you.")
+
+            try:
+                position = self.__waitlists.place(item_id, member_id)
+            except ValueError:
+                raise Exception("Item already held by you.") from None
+
+            return position
+
+    def cancel_hold(self, member_id:str, item_id:str) -> None:
+        """
+        Take a member off the waitlist of an item.
+
+        :param member_id: The unique ID of the member.
+        :param item_id: The unique identifier of the item.
+        :raises KeyError: If the member does not hold the item.
+        """
+        with self.__stripes.hold(member_id, item_id), self.__lock:
+            if not self.__waitlists.cancel(item_id, member_id):
+                raise KeyError(f"member {member_id} does not hold item {item_id}.")
+
+    def get_hold_queue(self, item_id:str) -> list[str]:
+        """
+        List the members waiting for an item.
+
+        :param item_id: The unique identifier of the item.
+        :return: The member IDs, first in line first; empty if nobody waits.
+        """
+        with self.__lock:
+            return self.__waitlists.get_queue(item_id)
+
+    def get_held_item_ids(self, member_id:str) -> list[str]:
+        """
+        List the items a member waits for.
+
+        :param member_id: The unique ID of the member.
+        :return: The item IDs, in the order the holds were placed.
+        """
+        with self.__lock:
+            return self.__waitlists.get_item_ids(member_id)
+
+    def add_copies(self, title:Title, count:int = 1) -> list[str]:
+        """
+        Add new copies of a title to the library's collection.
+
+        The title's bibliographic record is shared by all its copies, which
+        only hold their loan state, see inventory.Copy.
+
+        :param title: The Title to add copies of.
+        :param count: Number of copies to add.
+        :return: The IDs of the new copies.
+        :raises ValueError: If count is negative.
+        """
+        copies = title.new_copies(count)
+        self.add_items(copies)
+
+        return [copy.get_id() for copy in copies]
+
+    def get_title(self, title_id:str) -> Title:
+        """
+        Retrieve a title with copies in the library by its ID.
+
+        :param title_id: The unique identifier of the title.
+        :return: The Title object.
+        :raises KeyError: If the library holds no copy of the title.
+        """
+        with self.__lock:
+            record = self.__titles.get(title_id)
+
+        if record is None:
+            raise KeyError(f"title with the {title_id} does not exist.")
+
+        return record
+
+    def get_availability(self, title_id:str) -> tuple[int, int]:
+        """
+        Count the copies of a title in O(1), from counters kept up to date by lends and returns.
+
+        :param title_id: The unique identifier of the title.
+        :return: The number of copies not on loan and the number of copies in the library.
+        :raises KeyError: If the library holds no copy of the title.
+        """
+        with self.__lock:
+            record = self.get_title(title_id)
+            return record.get_available_count(), record.get_copy_count()
+
+    def lend_title(self, member_id:str, title_id:str) -> str:
+        """
+        Lend any available copy of a title to a registered member.
+
+        The copy is checked and lent under its stripe, so concurrent callers
+        never pick the same copy.
+
+        :param member_id: The unique ID of the member borrowing the copy.
+        :param title_id: The unique identifier of the title.
+        :return: The ID of the copy lent.
+        :raises KeyError: If the library holds no copy of the title.
+        :raises Exception: If the member does not exist, or every copy of the title is on loan.
+        """
         if member_id not in self.__members:
             raise Exception("Member with that id does not exist.")
 
-        if item.get_id() not in self.__items:
-            raise Exception("Item does not exist in library.")
+        while True:
+            with self.__lock:
+                copy = self.get_title(title_id).get_available_copy()
+
+            if copy is None:
+                raise Exception("No copy of the title is available.")
+
+            # Another caller may lend or remove the copy before its stripe is held; pick again if so.
+            with self.__stripes.hold(member_id, copy.get_id()):
+                if not copy.get_is_borrowed() and self.__items.get(copy.get_id()) is copy:
+                    self.lend_item(member_id, copy)
+                    return copy.get_id()
+
+    def get_borrower_id(self, item_id:str) -> str:
+        """
+        Find who holds an item, from the loan index alone.
+
+        :param item_id: The unique identifier of the item.
+        :return: The ID of the borrowing member, or None if the item is not on loan.
+        :raises KeyError: If no item with the given ID exists in the library.
+        """
+        with self.__lock:
+            if item_id not in self.__items:
+                raise KeyError(f"item with the {item_id} does not exist.")
 
-        member = self.__members.get(member_id)
-        member.return_item(item)
+            return self.__holders.get_holder(item_id)
+
+    def get_borrowed_item_ids(self, member_id:str) -> list[str]:
+        """
+        List the IDs of the items a member holds, in the order they were lent.
+
+        :param member_id: The unique ID of the member.
+        :return: A list of item IDs, empty if the member has no loans.
+        """
+        with self.__lock:
+            return self.__holders.get_item_ids(member_id)
+
+    def get_loan_count(self, member_id:str) -> int:
+        """
+        Count the items a member holds without materializing them.
+
+        :param member_id: The unique ID of the member.
+        :return: The number of open loans of the member.
+        """
+        with self.__lock:
+            return self.__holders.count(member_id)
 
     def get_overdue_items(self) -> list[LibraryItem]:
         """
         Retrieve all overdue library items.
 
-        :return: A list of LibraryItem objects that are overdue.
+        :return: A list of LibraryItem objects that are overdue, earliest due first.
+        """
+        with self.__lock:
+            item_ids = self.__due_dates.due_before(datetime.now())
+
+            return [self.__items[item_id] for item_id in item_ids]
+
+    def get_items_due_within(self, days:int) -> list[LibraryItem]:
+        """
+        Retrieve the borrowed items that are not yet overdue but fall due within a number of days.
+
+        :param days: The number of days to look ahead.
+        :return: A list of LibraryItem objects, earliest due first.
+        """
+        now = datetime.now()
+        with self.__lock:
+            item_ids = self.__due_dates.due_between(now, now + timedelta(days=days))
+
+            return [self.__items[item_id] for item_id in item_ids]
+
+    def calculate_fines(self, moment:datetime = None) -> dict:
+        """
+        Calculate the fines owed by every member in one batch.
+
+        All fines are computed against the same moment over the packed loan
+        table, with the same tiers as LibraryItem.calculate_fine.
+
+        :param moment: The time to calculate the fines at. Defaults to now.
+        :return: A dict mapping member IDs to their total fine; members owing nothing are left out.
+        """
+        moment = datetime.now() if moment is None else moment
+        with self.__lock:
+            return self.__loans.total_fines(to_micros(moment))
+
+    def subscribe(self, kinds:tuple = None) -> int:
+        """
+        Subscribe to loans crossing their due dates and moving into the next fine tier.
+
+        Events are produced by a timer wheel over the due dates, so polling costs
+        time proportional to the events returned rather than to the catalog. The
+        loans are only followed while at least one subscription is open.
+
+        :param kinds: Optional kinds of events to receive, see change_feed.EVENT_KINDS.
+                      All kinds if omitted.
+        :return: The ID of the subscription, to pass to poll_events.
+        :raises ValueError: If a kind is unknown.
+        """
+        with self.__lock:
+            feed = self.__feed
+            if feed is None:
+                feed = ChangeFeed()
+                now = to_micros(datetime.now())
+                for item_id, member_id, due_date in self.__loans:
+                    feed.track(item_id, member_id, due_date, now)
+
+            subscription_id = feed.subscribe(kinds)
+            self.__feed = feed
+
+            return subscription_id
+
+    def poll_events(self, subscription_id:int, moment:datetime = None, limit:int = None) -> list[LoanEvent]:
+        """
+        Take the loan events of a subscription up to a moment.
+
+        Each event is delivered once per subscription. Milestones crossed by loans
+        that were returned before being polled are not reported.
+
+        :param subscription_id: The ID returned by subscribe.
+        :param moment: The time to report milestones up to. Defaults to now.
+        :param limit: Optional maximum number of events to return; the rest stay pending.
+        :return: LoanEvents in the order their milestones were crossed.
+        :raises KeyError: If the subscription does not exist.
+        """
+        moment = datetime.now() if moment is None else moment
+        with self.__lock:
+            if self.__feed is None:
+                raise KeyError(f"subscription {subscription_id} does not exist.")
+
+            return self.__feed.poll(subscription_id, to_micros(moment), limit)
+
+    def unsubscribe(self, subscription_id:int) -> None:
+        """
+        Close a subscription, dropping its pending events.
+
+        :param subscription_id: The ID returned by subscribe.
+        :raises KeyError: If the subscription does not exist.
+        """
+        with self.__lock:
+            if self.__feed is None:
+                raise KeyError(f"subscription {subscription_id} does not exist.")
+
+            self.__feed.unsubscribe(subscription_id)
+            if not self.__feed.get_subscription_count():
+                self.__feed = None
+
+    def get_loan_history(
+            self,
+            item_id:str = None,
+            member_id:str = None,
+            start:datetime = None,
+            end:datetime = None
+    ) -> list[CirculationEvent]:
+        """
+        Find the lends and returns of an item and/or member within a time window.
+
+        Only the log segments that can hold matching events are read, see CirculationLog.
+
+        :param item_id: Optional item to restrict the history to.
+        :param member_id: Optional member to restrict the history to.
+        :param start: Optional start of the window, inclusive.
+        :param end: Optional end of the window, exclusive.
+        :return: CirculationEvents in the order they happened.
+        :raises ValueError: If the library keeps no circulation log.
+        """
+        if self.__circulation_log is None:
+            raise ValueError("the library keeps no circulation log.")
+
+        with self.__lock:
+            return self.__circulation_log.query(
+                item_id,
+                member_id,
+                None if start is None else to_micros(start),
+                None if end is None else to_micros(end)
+            )
+
+    def get_circulation_log(self) -> CirculationLog:
+        """Return the circulation log recording lends and returns, or None."""
+        return self.__circulation_log
+
+    def get_circulation_summary(self, n:int = 10) -> dict:
+        """
+        Retrieve the circulation aggregates without scanning the catalog, see CirculationStats.get_summary.
+
+        :param n: Maximum number of titles and of authors to list.
+        :return: Dictionary containing 'lends', 'top_titles', 'top_authors', 'active_loans'
+                 and 'approximate' keys.
+        :raises ValueError: If the library keeps no circulation statistics.
+        """
+        if self.__stats is None:
+            raise ValueError("the library keeps no circulation statistics.")
+
+        with self.__lock:
+            return self.__stats.get_summary(n)
+
+    def get_circulation_stats(self) -> CirculationStats:
+        """Return the circulation statistics kept up to date by the library, or None."""
+        return self.__stats
+
+    def get_version(self) -> int:
+        """
+        Return the version of the library, which every mutation through it increases.
+
+        :return: An integer that differs whenever items, members or loans changed.
+        """
+        with self.__lock:
+            return self.__version
+
+    def get_cache(self) -> ResultCache:
+        """Return the result cache of the library, or None if it has none."""
+        return self.__cache
+
+    def snapshot(self) -> None:
+        """
+        Persist the full library state to the storage backend, so that a later
+        restore no longer replays the operations logged so far.
+
+        :raises Exception: If the library has no storage backend.
+        """
+        if self.__storage is None:
+            raise Exception("Library has no storage backend.")
+
+        with self.__lock:
+            self.__storage.write_snapshot(self.__members.values(), self.__items.values())
+
+    def export_columnar(self, path) -> None:
+        """
+        Write all members, items and loans to a columnar snapshot file, see columnar.write_columnar.
+
+        The file can be opened instantly as a read-only SnapshotLibrary, or loaded
+        back with import_columnar.
+
+        :param path: Path of the file to write.
+        :raises ValueError: If an item's class cannot be stored.
+        """
+        with self.__lock:
+            members = list(self.__members.values())
+            items = list(self.__items.values())
+
+            write_columnar(path, members, items)
+
+    def import_columnar(self, path) -> int:
+        """
+        Load the members, items and loans of a columnar snapshot file into the library.
+
+        Loans of registered members are re-registered on the member's side; other
+        borrowers are restored as detached Member objects, as when restoring from storage.
+
+        :param path: Path of a file written by export_columnar.
+        :return: The number of items added. Items replace those with the same ID, as in add_items.
+        :raises ValueError: If the file is not a columnar snapshot, or one of its members
+                            is already registered.
+        """
+        with ColumnarSnapshot(path) as snapshot:
+            names, member_ids = [], []
+            for member_id, name, registered in snapshot.iter_member_records():
+                if registered:
+                    names.append(name)
+                    member_ids.append(member_id)
+
+            self.create_members(names, member_ids)
+
+            titles = {}
+            return self.add_items(self.__item_from_record(record, titles) for record in snapshot.iter_item_records())
+
+    def close(self) -> None:
+        """Flush pending operations and release the storage backend and circulation log, if any."""
+        with self.__lock:
+            if self.__storage is not None:
+                self.__storage.close()
+                self.__storage = None
+            if self.__circulation_log is not None:
+                self.__circulation_log.close()
+
+    def __page(self, kind:str, keys_after, objects:dict, cursor:str, limit:int, fields:tuple):
+        """
+        Collect one page of a listing under the lock and build its dictionaries outside it.
+
+        :param kind: Name of the listing, stored in its cursors.
+        :param keys_after: Callable iterating over the ordered keys after a given key, or all keys for None.
+        :param objects: Maps the keys to the objects to describe.
+        :return: The page and the cursor of the next one, or None after the last page.
+        """
+        if limit < 1:
+            raise ValueError("limit must be a positive integer.")
+
+        after = None if cursor is None else _decode_cursor(kind, cursor)
+        with self.__lock:
+            keys = list(islice(keys_after(after), limit + 1))
+            page = [objects[key] for key in keys[:limit]]
+
+        next_cursor = _encode_cursor(kind, keys[limit - 1]) if len(keys) > limit else None
+
+        return [obj.get_info(fields) for obj in page], next_cursor
+
+    @contextmanager
+    def __return_stripes(self, member_id:str, item_ids:list):
+        """
+        Hold the stripes of a member returning items, of the items, and of the
+        members first in line for them, who the items may be handed off to.
+
+        Waitlists only change under their item's stripe, so the first holders
+        are looked up, their stripes taken along with the others, and the
+        lookup repeated in case a hold changed in between. Taking every stripe
+        at once keeps them in index order, so this cannot deadlock.
+
+        :param member_id: The unique ID of the member returning the items.
+        :param item_ids: The IDs of the returned items.
+        """
+        while True:
+            holders = self.__first_holders(item_ids)
+            with self.__stripes.hold(member_id, *item_ids, *holders):
+                if self.__first_holders(item_ids) == holders:
+                    yield
+                    return
+
+    def __first_holders(self, item_ids:list) -> list[str]:
+        """Return the IDs of the members first in line for some items."""
+        with self.__lock:
+            holders = [self.__waitlists.peek_next(item_id) for item_id in item_ids]
+
+        return [member_id for member_id in holders if member_id is not None]
+
+    def __hand_off(self, item:LibraryItem) -> str:
+        """
+        Lend a just returned item to the first member holding it, if any.
+
+        The caller holds the stripes of the item and of that member, see __return_stripes.
+
+        :return: The ID of the new borrower, or None.
+        """
+        member_id = self.__waitlists.pop_next(item.get_id())
+        if member_id is None:
+            return None
+
+        self.__members[member_id].borrow_item(item)
+        self.__on_lent(item)
+        self.__log(LEND_ITEM, member_id, item.get_id(), to_micros(item.get_due_date()))
+        self.__record(LEND_ITEM, member_id, [item])
+
+        return member_id
+
+    def __check_basket(self, item_ids:list, check) -> tuple[list, list[str]]:
+        """
+        Validate every item of a lend_items or return_items basket.
+
+        :param check: Callable returning the outcome of an existing item.
+        :return: The items, None for unknown IDs, and their outcomes.
+        """
+        with self.__lock:
+            items = [self.__items.get(item_id) for item_id in item_ids]
+
+        outcomes = []
+        seen = set()
+        for item_id, item in zip(item_ids, items):
+            if item is None:
+                outcomes.append(UNKNOWN_ITEM)
+            elif item_id in seen:
+                outcomes.append(DUPLICATE)
+            else:
+                outcomes.append(check(item))
+            seen.add(item_id)
+
+        return items, outcomes
+
+    @staticmethod
+    def __accept_basket(outcomes:list[str], success:str, atomic:bool) -> bool:
+        """
+        Decide if a validated basket is applied, marking the valid items of a rejected one NOT_APPLIED.
+
+        :return: Whether any item is to be applied.
+        """
+        if atomic and any(outcome != success for outcome in outcomes):
+            outcomes[:] = [NOT_APPLIED if outcome == success else outcome for outcome in outcomes]
+            return False
+
+        return success in outcomes
+
+    def __cached(self, key:tuple, version:int):
+        """Return the result cached for a query at a version, or None."""
+        if self.__cache is None:
+            return None
+
+        return self.__cache.get(key, version)
+
+    def __cache_result(self, key:tuple, version:int, result, copy):
+        """
+        Cache a freshly computed result, if the library has a cache.
+
+        :param copy: Callable copying the result, so callers never hold the cached object itself.
+        :return: The result, or a copy of it when it was cached.
         """
-        items = self.__items.values()
+        if self.__cache is None:
+            return result
+
+        self.__cache.put(key, version, result)
+        return copy(result)
+
+    def __member_ids_after(self, after:str = None):
+        """Iterate over the member IDs in order, optionally resuming after a given ID."""
+        if after is None:
+            return iter(self.__member_ids)
+
+        return (member_id for member_id in self.__member_ids.irange(after) if member_id != after)
+
+    def __log(self, operation:int, *record) -> None:
+        """Append an operation to the storage backend, if any."""
+        if self.__storage is not None:
+            self.__storage.append(operation, record)
+
+    def __snapshot_if_due(self) -> None:
+        """
+        Write a snapshot if the storage backend asks for one, see Storage.needs_snapshot.
+
+        Called with the lock held once an operation is applied and logged in full,
+        so the snapshot covers exactly the operations logged so far.
+        """
+        if self.__storage is not None and self.__storage.needs_snapshot():
+            self.__storage.write_snapshot(self.__members.values(), self.__items.values())
+
+    def __log_item(self, item:LibraryItem) -> None:
+        """Append an ADD_ITEM operation to the storage backend, if any."""
+        if self.__storage is not None:
+            self.__storage.append(ADD_ITEM, item_record(item))
+
+    def __record(self, kind:int, member_id:str, items:list) -> None:
+        """Append lends or returns of items by a member to the circulation log, and count lends, if enabled."""
+        if self.__stats is not None and kind == LEND_ITEM:
+            for item in items:
+                self.__stats.record_lend(item)
+
+        if self.__circulation_log is None:
+            return
+
+        moment = to_micros(datetime.now())
+        for item in items:
+            due = to_micros(item.get_due_date()) if kind == LEND_ITEM else NO_TIMESTAMP
+            self.__circulation_log.append(kind, item.get_id(), member_id, moment, due)
+
+    def __restore(self, storage:Storage) -> None:
+        """Rebuild the library from a storage backend's snapshot and operations."""
+        members, items, operations = storage.load()
+
+        for member_id, name in members:
+            self.__members[member_id] = Member(name, member_id=member_id)
+        self.__member_ids.update(self.__members)
+
+        titles = {}
+        self.add_items(self.__item_from_record(record, titles) for record in items)
+
+        for operation, group in groupby(operations, key=itemgetter(0)):
+            if operation == ADD_ITEM:
+                self.add_items(self.__item_from_record(record, titles) for _, record in group)
+                continue
+
+            for _, record in group:
+                if operation == REMOVE_ITEM:
+                    self.remove_item(record[0])
+                elif operation == CREATE_MEMBER:
+                    self.__members[record[0]] = Member(record[1], member_id=record[0])
+                    self.__member_ids.add(record[0])
+                elif operation == LEND_ITEM:
+                    member_id, item_id, due = record
+                    item = self.__items[item_id]
+                    self.__members[member_id].borrow_item(item, from_micros(due))
+                    self.__on_lent(item)
+                elif operation == RETURN_ITEM:
+                    self.return_item(record[0], self.__items[record[1]])
+
+    def __item_from_record(self, record:tuple, titles:dict) -> LibraryItem:
+        """
+        Build an item from an ADD_ITEM record.
+
+        Records with a title ID become copies of that title, shared with the other
+        copies restored in the same pass. Loans held by registered members are
+        re-registered on the member's side; other borrowers are restored as
+        detached Member objects.
+
+        :param record: A tuple laid out as storage.SCHEMAS[ADD_ITEM].
+        :param titles: Maps title IDs to the Titles restored so far.
+        """
+        kind, item_id, title, pub_year, author_name, detail, borrower_id, borrower_name, due, title_id = record
+        if title_id is None:
+            item = ITEM_TYPES[kind].from_fields(title, pub_year, author_name, detail, item_id=item_id)
+        else:
+            title_record = titles.get(title_id) or self.__titles.get(title_id)
+            if title_record is None:
+                title_record = Title(ITEM_TYPES[kind], title, pub_year, author_name, detail, title_id=title_id)
+            titles[title_id] = title_record
+            item = Copy(title_record, item_id=item_id)
+
+        member = self.__members.get(borrower_id)
+        if member is not None:
+            member.borrow_item(item, from_micros(due))
+        elif borrower_id is not None:
+            item.set_is_borrowed(True)
+            item.set_borrowed_by(Member(borrower_name, member_id=borrower_id))
+            item.set_due_date(from_micros(due))
+
+        return item
+
+    def __shelve(self, item:LibraryItem) -> None:
+        """Count an item added to the collection towards its title's availability, if it is a Copy."""
+        if isinstance(item, Copy):
+            record = item.get_record()
+            record._attach(item)
+            self.__titles[record.get_id()] = record
+
+    def __unshelve(self, item:LibraryItem) -> None:
+        """Stop counting an item leaving the collection, forgetting titles left without copies."""
+        if isinstance(item, Copy):
+            record = item.get_record()
+            record._detach(item)
+            if not record.get_copy_count():
+                self.__titles.pop(record.get_id(), None)
+
+    def __on_lent(self, item:LibraryItem) -> None:
+        """Update the loan indexes after an item has been lent."""
+        due_date = item.get_due_date()
+        borrower = item.get_borrowed_by()
+        if isinstance(item, Copy):
+            item.get_record()._check_out(item)
+
+        if due_date is not None:
+            self.__due_dates.add(item.get_id(), due_date)
+        if borrower is not None:
+            if self.__stats is not None and item.get_id() not in self.__holders:
+                self.__stats.loan_started(item)
+            self.__holders.add(item.get_id(), borrower.get_id())
+        if due_date is not None and borrower is not None:
+            self.__loans.set(item.get_id(), borrower.get_id(), to_micros(due_date))
+            if self.__feed is not None:
+                self.__feed.track(item.get_id(), borrower.get_id(), to_micros(due_date), to_micros(datetime.now()))
+
+    def __on_lent_many(self, items:list, member_id:str = None, due_date:datetime = None) -> None:
+        """
+        Update the loan indexes for a batch of borrowed items in one pass.
+
+        :param items: The borrowed items.
+        :param member_id: The ID of the member who borrowed every item, given with due_date
+                          when the loans share both, as in lend_items, to update the holder
+                          and loan indexes in bulk.
+        :param due_date: The due date of every loan, given with member_id.
+        """
+        shared = member_id is not None and due_date is not None
+        now = to_micros(datetime.now())
+        self.__due_dates.add_many(
+            (item.get_id(), item.get_due_date())
+            for item in items if item.get_due_date() is not None
+        )
+        for item in items:
+            if isinstance(item, Copy):
+                item.get_record()._check_out(item)
+
+            borrower = item.get_borrowed_by()
+            if borrower is None:
+                continue
+
+            if self.__stats is not None and item.get_id() not in self.__holders:
+                self.__stats.loan_started(item)
+            if item.get_due_date() is not None and self.__feed is not None:
+                self.__feed.track(item.get_id(), borrower.get_id(), to_micros(item.get_due_date()), now)
+            if shared:
+                continue
+
+            self.__holders.add(item.get_id(), borrower.get_id())
+            if item.get_due_date() is not None:
+                self.__loans.set(item.get_id(), borrower.get_id(), to_micros(item.get_due_date()))
+
+        if shared:
+            item_ids = [item.get_id() for item in items]
+            self.__holders.add_many(item_ids, member_id)
+            self.__loans.set_many(item_ids, member_id, to_micros(due_date))
+
+    def __on_returned(self, item:LibraryItem) -> None:
+        """Update the loan indexes after an item has been returned or removed."""
+        if isinstance(item, Copy):
+            item.get_record()._check_in(item)
+        if self.__stats is not None and item.get_id() in self.__holders:
+            self.__stats.loan_ended(item)
+        self.__due_dates.discard(item.get_id())
+        self.__loans.discard(item.get_id())
+        self.__holders.discard(item.get_id())
+        if self.__feed is not None:
+            self.__feed.untrack(item.get_id())
+
+    def __on_returned_many(self, item_ids:list) -> None:
+        """Update the loan indexes after a batch of items has been returned."""
+        discard_due_date = self.__due_dates.discard
+        discard_loan = self.__loans.discard
+        discard_holder = self.__holders.discard
+        if self.__stats is not None:
+            for item_id in item_ids:
+                if item_id in self.__holders:
+                    self.__stats.loan_ended(self.__items[item_id])
+
+        for item_id in item_ids:
+            discard_due_date(item_id)
+            discard_loan(item_id)
+            discard_holder(item_id)
+
+        if self.__titles:
+            for item_id in item_ids:
+                item = self.__items.get(item_id)
+                if isinstance(item, Copy):
+                    item.get_record()._check_in(item)
 
-        return [item for item in items if item.is_overdue()]
+        if self.__feed is not None:
+            for item_id in item_ids:
+                self.__feed.untrack(item_id)
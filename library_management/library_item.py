@@ -1,6 +1,66 @@
+import json
 from datetime import datetime
-from uuid import uuid4
 
+from .fines import fine_for_days
+from .ids import new_id
+
+
+def _json_default(value):
+    """Encode the values json cannot: datetimes become ISO 8601 strings."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    raise TypeError(f"{type(value).__name__} is not JSON serializable.")
+
+
+# Shared encoder for the JSON exports; json.dumps would build a new one per call.
+_JSON_ENCODER = json.JSONEncoder(default=_json_default, separators=(",", ":"), ensure_ascii=False)
+
+
+# Whether items memoize their get_info and to_json results, see set_memoization.
+_memoize = False
+
+
+def get_memoization() -> bool:
+    """Return whether items memoize their get_info and to_json results."""
+    return _memoize
+
+
+def set_memoization(enabled:bool) -> bool:
+    """
+    Turn the memoization of item info and JSON bytes on or off for every item.
+
+    When on, an item builds its full get_info dictionary and its to_json bytes
+    once and keeps them until its loan state changes, so repeated exports of
+    an unchanged catalog build nothing. This costs memory on every exported
+    item for as long as it is unchanged, so it is off by default. Turning it
+    off stops using and keeping the memos; those already kept are dropped as
+    the items change.
+
+    :param enabled: Whether to memoize.
+    :return: The previous setting.
+    """
+    global _memoize
+
+    previous, _memoize = _memoize, bool(enabled)
+    return previous
+
+
+def items_to_json(items:list) -> bytes:
+    """
+    Serialize the full get_info dictionaries of items to one compact UTF-8 JSON array.
+
+    The whole list goes through the encoder in a single call, which is much
+    cheaper than encoding the items one by one and joining the results. With
+    memoization on, the memoized bytes of each item are joined instead.
+
+    :param items: The LibraryItem objects to serialize.
+    :return: The JSON array as bytes.
+    """
+    if _memoize:
+        return b"[" + b",".join([item.to_json() for item in items]) + b"]"
+
+    return _JSON_ENCODER.encode([item._build_info() for item in items]).encode()
 
 
 class LibraryItem:
@@ -15,8 +75,24 @@ class LibraryItem:
         __is_borrowed (bool): Indicates whether the item is currently borrowed.
         __borrowed_by (Member): The member in possession of the item.
         __due_date (datetime): The due date for returning the borrowed item.
+        __info (dict): Memoized get_info() result, or None, see set_memoization.
+        __json (bytes): Memoized to_json() result, or None, see set_memoization.
     """
 
+    __slots__ = (
+        "__item_id",
+        "__title",
+        "__author_name",
+        "__pub_year",
+        "__is_borrowed",
+        "__borrowed_by",
+        "__due_date",
+        "__info",
+        "__json",
+    )
+
+    # Name of the subclass-specific detail field, e.g. "ISBN" for Book.
+    DETAIL_FIELD = None
 
     def __init__(
             self,
@@ -25,7 +101,8 @@ class LibraryItem:
             author_name:str,
             is_borrowed:bool = False,
             borrowed_by = None,
-            due_date = None
+            due_date = None,
+            item_id:str = None
     ):
         """
         Initialize a new LibraryItem instance.
@@ -36,27 +113,58 @@ class LibraryItem:
         :param is_borrowed: Whether the item is currently borrowed.
         :param borrowed_by: The Member object who borrowed the item, if any.
         :param due_date: The due date for the borrowed item, if applicable.
+        :param item_id: Unique identifier to reuse, e.g. when restoring an item. A new one is made by
+                        the current ID generator if omitted, see ids.set_id_generator.
         """
 
-        self.__item_id = str(uuid4())
+        self.__item_id = new_id() if item_id is None else item_id
         self.__title = title
         self.__author_name = author_name
         self.__pub_year = pub_year #Publish year
         self.__is_borrowed = is_borrowed
         self.__borrowed_by = borrowed_by
         self.__due_date = due_date
+        self.__info = None
+        self.__json = None
 
 
-    def get_info(self) -> dict:
+    def get_info(self, fields:tuple = None) -> dict:
         """
         Retrieve detailed information about the library item.
 
+        With memoization on, see set_memoization, the full dictionary is built
+        once until the loan state changes; each call returns a copy of it.
+
+        :param fields: Optional names of the keys to include. Only those values are
+                       built, see get_field. All details are returned if omitted.
         :return: A dictionary containing the item's details such as ID, title, author,
                  publication year, borrowed status, borrower info, and due date.
+        :raises KeyError: If a requested field is unknown.
+        """
+        if fields is not None:
+            return {field: self.get_field(field) for field in fields}
+
+        if not _memoize:
+            return self._build_info()
+
+        info = self.__info
+        if info is None:
+            info = self.__memoize("info", self._build_info)
+
+        info = info.copy()
+        if self.__borrowed_by is not None:
+            info["borrowed_by"] = info["borrowed_by"].copy()
+
+        return info
+
+    def _build_info(self) -> dict:
         """
+        Build the full get_info dictionary. Subclasses extend it with their detail field.
 
+        :return: A new dictionary.
+        """
         borrowed_by = self.__borrowed_by if self.__borrowed_by is None else self.__borrowed_by.get_info()
-        info = {
+        return {
             "id": self.__item_id,
             "title": self.__title,
             "author_name": self.__author_name,
@@ -66,12 +174,127 @@ class LibraryItem:
             "due_date":self.__due_date
         }
 
-        return info
+    def to_json(self) -> bytes:
+        """
+        Serialize the full get_info dictionary to compact UTF-8 JSON, due dates as ISO 8601 strings.
+
+        With memoization on, see set_memoization, the bytes are kept until the
+        loan state changes; the dictionary is not kept for this, only the
+        smaller bytes. Use items_to_json to serialize many items at once.
+
+        :return: The JSON object as bytes.
+        """
+        if not _memoize:
+            return _JSON_ENCODER.encode(self._build_info()).encode()
+
+        encoded = self.__json
+        if encoded is None:
+            info = self.__info
+            encoded = self.__memoize(
+                "json", lambda: _JSON_ENCODER.encode(self._build_info() if info is None else info).encode()
+            )
+
+        return encoded
+
+    def __memoize(self, name:str, build):
+        """
+        Build a get_info or to_json result and keep it, unless the loan state changed meanwhile.
+
+        A setter running on another thread while the result is built either
+        changes the state before it is read again here, or invalidates after
+        the result is kept; a stale result is never left behind.
+
+        :param name: "info" or "json".
+        :param build: Callable returning the result.
+        :return: The result.
+        """
+        state = (self.__is_borrowed, self.__borrowed_by, self.__due_date)
+        result = build()
+        if name == "info":
+            self.__info = result
+        else:
+            self.__json = result
+        if (self.__is_borrowed, self.__borrowed_by, self.__due_date) != state:
+            self._invalidate()
+
+        return result
+
+    def _invalidate(self) -> None:
+        """Drop the memoized get_info and to_json results after a change of state."""
+        self.__info = None
+        self.__json = None
+
+    def get_field(self, field:str):
+        """
+        Retrieve the value of a single get_info key.
+
+        Besides the get_info keys, "borrower_id" gives the ID of the borrowing member
+        without building the nested member dictionary.
+
+        :param field: The name of the key.
+        :return: The value get_info would hold under that key.
+        :raises KeyError: If the field is unknown.
+        """
+        if field == "id":
+            return self.__item_id
+        if field == "title":
+            return self.__title
+        if field == "author_name":
+            return self.__author_name
+        if field == "pub_year":
+            return self.__pub_year
+        if field == "is_borrowed":
+            return self.__is_borrowed
+        if field == "borrowed_by":
+            return self.__borrowed_by if self.__borrowed_by is None else self.__borrowed_by.get_info()
+        if field == "borrower_id":
+            return self.__borrowed_by if self.__borrowed_by is None else self.__borrowed_by.get_id()
+        if field == "due_date":
+            return self.__due_date
+        if field is not None and field == self.DETAIL_FIELD:
+            return self.get_detail()
+
+        raise KeyError(f"{field} is not a field of {type(self).__name__}.")
+
+    @classmethod
+    def from_fields(
+            cls,
+            title:str,
+            pub_year:str,
+            author_name:str,
+            detail:str = None,
+            is_borrowed:bool = False,
+            borrowed_by = None,
+            due_date = None,
+            item_id:str = None
+    ) -> "LibraryItem":
+        """
+        Build an item of this class from flat fields, as stored by columnar or serialized catalogs.
+
+        :param detail: Value of the subclass-specific detail field, ignored by LibraryItem itself.
+        :return: A new instance of the class.
+        """
+        if cls.DETAIL_FIELD is None:
+            return cls(title, pub_year, author_name, is_borrowed, borrowed_by, due_date, item_id)
+
+        return cls(title, pub_year, author_name, detail, is_borrowed, borrowed_by, due_date, item_id)
 
     def get_id(self) -> str:
         """Return the unique ID of the item."""
         return self.__item_id
 
+    def get_kind(self) -> type:
+        """Return the class the item is stored and exported as, one of ITEM_TYPES for the built-in kinds."""
+        return type(self)
+
+    def get_pub_year(self) -> str:
+        """Return the publication year of the item."""
+        return self.__pub_year
+
+    def get_detail(self):
+        """Return the value of the subclass-specific detail field, or None for a plain LibraryItem."""
+        return None
+
     def get_due_date(self) -> datetime:
         """Return the due date of the item."""
         return self.__due_date
@@ -99,6 +322,7 @@ class LibraryItem:
         :param value: True if the item is borrowed, False otherwise.
         """
         self.__is_borrowed = value
+        self._invalidate()
 
     def set_due_date(self, value) -> None:
         """
@@ -107,6 +331,7 @@ class LibraryItem:
         :param value: A datetime object representing the new due date.
         """
         self.__due_date = value
+        self._invalidate()
 
     def set_borrowed_by(self, value) -> None:
         """
@@ -115,6 +340,7 @@ class LibraryItem:
         :param value: The Member object who borrowed the item, or None if returned.
         """
         self.__borrowed_by = value
+        self._invalidate()
 
     def is_overdue(self) -> bool:
         """
@@ -138,25 +364,10 @@ class LibraryItem:
         if not self.get_is_borrowed():
             raise Exception("Cannot calculate fine: item has not been borrowed.")
 
-        DAILY_FINE = 15
-        MONTHLY_FINE = 500
-        YEARLY_FINE = 10_000
-
         current_date = datetime.now()
         days_overdue = (current_date - self.__due_date).days
 
-        if days_overdue < 1:
-            return float(0)
-
-        elif days_overdue < 30:
-            return float(DAILY_FINE * days_overdue)
-
-        elif days_overdue < 365:
-            months_overdue = days_overdue // 30
-            return float(MONTHLY_FINE * months_overdue)
-
-        else:
-            return float(YEARLY_FINE)
+        return fine_for_days(days_overdue)
 
 
 class Book(LibraryItem):
@@ -166,6 +377,11 @@ class Book(LibraryItem):
     Attributes:
         __ISBN (str): The International Standard Book Number of the book.
     """
+
+    __slots__ = ("__ISBN",)
+
+    DETAIL_FIELD = "ISBN"
+
     def __init__(
             self,
             title:str,
@@ -175,7 +391,7 @@ class Book(LibraryItem):
             is_borrowed=False,
             borrowed_by=None,
             due_date=None,
-
+            item_id=None
     ):
         """
         Initialize a new Book instance.
@@ -187,6 +403,7 @@ class Book(LibraryItem):
         :param is_borrowed: Whether the book is currently borrowed.
         :param borrowed_by: The Member object who borrowed the book.
         :param due_date: The due date for the borrowed book.
+        :param item_id: Unique identifier to reuse. A new one is generated if omitted.
         """
         super().__init__(
             title,
@@ -194,18 +411,27 @@ class Book(LibraryItem):
             author_name,
             is_borrowed,
             borrowed_by,
-            due_date
+            due_date,
+            item_id
         )
         self.__ISBN = ISBN
 
-    def get_info(self) -> dict:
+    def get_ISBN(self) -> str:
+        """Return the ISBN of the book."""
+        return self.__ISBN
+
+    def get_detail(self) -> str:
+        """Return the ISBN, the book's detail field."""
+        return self.__ISBN
+
+    def _build_info(self) -> dict:
         """
-        Extend the parent get_info() with ISBN.
+        Extend the parent _build_info() with ISBN.
 
         :return: A dictionary containing the book's details.
         """
 
-        info = super().get_info()
+        info = super()._build_info()
         info["ISBN"] = self.__ISBN
         return info
 
@@ -216,6 +442,11 @@ class Magazine(LibraryItem):
     Attributes:
         __issue_no (str): The issue number of the magazine.
     """
+
+    __slots__ = ("__issue_no",)
+
+    DETAIL_FIELD = "issue_no"
+
     def __init__(
             self,
             title:str,
@@ -224,7 +455,8 @@ class Magazine(LibraryItem):
             issue_no:str,
             is_borrowed=False,
             borrowed_by=None,
-            due_date=None
+            due_date=None,
+            item_id=None
     ):
         """
         Initialize a new Magazine instance.
@@ -236,6 +468,7 @@ class Magazine(LibraryItem):
         :param is_borrowed: Whether the magazine is currently borrowed.
         :param borrowed_by: The Member object who borrowed the magazine.
         :param due_date: The due date for the borrowed magazine.
+        :param item_id: Unique identifier to reuse. A new one is generated if omitted.
         """
 
         super().__init__(
@@ -245,17 +478,26 @@ class Magazine(LibraryItem):
             is_borrowed,
             borrowed_by,
             due_date,
+            item_id
         )
         self.__issue_no = issue_no
 
-    def get_info(self) -> dict:
+    def get_issue_no(self) -> str:
+        """Return the issue_no of the magazine."""
+        return self.__issue_no
+
+    def get_detail(self) -> str:
+        """Return the issue_no, the magazine's detail field."""
+        return self.__issue_no
+
+    def _build_info(self) -> dict:
         """
-        Extend the parent get_info() with issue_no.
+        Extend the parent _build_info() with issue_no.
 
         :return: A dictionary containing the magazine's details.
         """
 
-        info = super().get_info()
+        info = super()._build_info()
         info["issue_no"] = self.__issue_no
         return info
 
@@ -266,6 +508,11 @@ class DVD(LibraryItem):
     Attributes:
         __duration (str): The duration of the DVD content.
     """
+
+    __slots__ = ("__duration",)
+
+    DETAIL_FIELD = "duration"
+
     def __init__(
             self,
             title:str,
@@ -274,7 +521,8 @@ class DVD(LibraryItem):
             duration:str,
             is_borrowed=False,
             borrowed_by=None,
-            due_date=None
+            due_date=None,
+            item_id=None
     ):
         """
         Initialize a new DVD instance.
@@ -286,6 +534,7 @@ class DVD(LibraryItem):
         :param is_borrowed: Whether the DVD is currently borrowed.
         :param borrowed_by: The Member object who borrowed the DVD.
         :param due_date: The due date for the borrowed DVD.
+        :param item_id: Unique identifier to reuse. A new one is generated if omitted.
         """
         super().__init__(
             title,
@@ -293,17 +542,30 @@ class DVD(LibraryItem):
             author_name,
             is_borrowed,
             borrowed_by,
-            due_date
+            due_date,
+            item_id
         )
         self.__duration = duration
 
-    def get_info(self) -> dict:
+    def get_duration(self) -> str:
+        """Return the duration of the DVD."""
+        return self.__duration
+
+    def get_detail(self) -> str:
+        """Return the duration, the DVD's detail field."""
+        return self.__duration
+
+    def _build_info(self) -> dict:
         """
-        Extend the parent get_info() with duration.
+        Extend the parent _build_info() with duration.
 
         :return: A dictionary containing the DVD's details.
         """
 
-        info = super().get_info()
+        info = super()._build_info()
         info["duration"] = self.__duration
-        return info
\ No newline at end of file
+        return info
+
+
+# Item classes by kind code, as used by the columnar and serialized catalog formats.
+ITEM_TYPES = (LibraryItem, Book, Magazine, DVD)
@@ -0,0 +1,114 @@
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+
+from .library_item import ITEM_TYPES
+
+
+ITEM_CLASSES = {item_type.__name__: item_type for item_type in ITEM_TYPES}
+REQUIRED_FIELDS = ("type", "title", "pub_year", "author_name")
+
+
+def _validate(batch:list, first_number:int) -> None:
+    """
+    Check a batch of catalog records before any item is built from it.
+
+    :param batch: The record dicts to check.
+    :param first_number: The 1-based record number of the first record, for error messages.
+    :raises ValueError: If a record has an unknown type or misses a required field.
+    """
+    for number, record in enumerate(batch, start=first_number):
+        item_class = ITEM_CLASSES.get(record.get("type"))
+        if item_class is None:
+            raise ValueError(f"record {number}: unknown item type {record.get('type')!r}.")
+
+        required = REQUIRED_FIELDS if item_class.DETAIL_FIELD is None \
+            else REQUIRED_FIELDS + (item_class.DETAIL_FIELD,)
+        missing = [field for field in required if record.get(field) in (None, "")]
+        if missing:
+            raise ValueError(f"record {number}: missing {', '.join(missing)}.")
+
+
+def build_items(records, batch_size:int = 10_000):
+    """
+    Build Book, Magazine, DVD or LibraryItem objects from catalog records.
+
+    Records are dicts with the keys "type", "title", "pub_year", "author_name",
+    the type's detail field ("ISBN", "issue_no" or "duration") and an optional
+    "id". They are validated a batch at a time, before any item of the batch
+    is built.
+
+    :param records: Iterable of record dicts.
+    :param batch_size: Number of records validated together.
+    :return: A generator of LibraryItem objects.
+    :raises ValueError: If a record is invalid.
+    """
+    records = iter(records)
+    first_number = 1
+
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+
+        _validate(batch, first_number)
+        first_number += len(batch)
+
+        for record in batch:
+            item_class = ITEM_CLASSES[record["type"]]
+            yield item_class.from_fields(
+                title=record["title"],
+                pub_year=record["pub_year"],
+                author_name=record["author_name"],
+                detail=record.get(item_class.DETAIL_FIELD),
+                item_id=record.get("id") or None
+            )
+
+
+def read_csv(file, batch_size:int = 10_000):
+    """
+    Stream catalog items from a CSV file with a header row.
+
+    :param file: An open text file.
+    :param batch_size: Number of records validated together.
+    :return: A generator of LibraryItem objects.
+    """
+    return build_items(csv.DictReader(file), batch_size)
+
+
+def read_jsonl(file, batch_size:int = 10_000):
+    """
+    Stream catalog items from a file holding one JSON object per line.
+
+    :param file: An open text file.
+    :param batch_size: Number of records validated together.
+    :return: A generator of LibraryItem objects.
+    """
+    return build_items((json.loads(line) for line in file if line.strip()), batch_size)
+
+
+READERS = {
+    ".csv": read_csv,
+    ".jsonl": read_jsonl,
+    ".ndjson": read_jsonl,
+}
+
+
+def load_items(library, path, batch_size:int = 10_000) -> int:
+    """
+    Load a CSV or JSONL catalog export into a library.
+
+    :param library: The Library to add the items to.
+    :param path: Path of the export; the format is picked from its suffix.
+    :param batch_size: Number of records validated and indexed together.
+    :return: The number of items added.
+    :raises ValueError: If the file suffix is not supported or a record is invalid.
+    """
+    path = Path(path)
+    reader = READERS.get(path.suffix.lower())
+    if reader is None:
+        raise ValueError(f"unsupported catalog format {path.suffix!r}.")
+
+    with path.open(newline="", encoding="utf-8") as file:
+        return library.add_items(reader(file, batch_size), batch_size)
@@ -0,0 +1,87 @@
+class LoanIndex:
+    """
+    Bidirectional index of open loans by item and by member, keyed on IDs only.
+
+    Attributes:
+        __holders (dict): Maps borrowed item IDs to the ID of the member holding them.
+        __loans (dict): Maps member IDs to dicts used as insertion-ordered sets of
+                        the item IDs they hold. Members without loans have no entry.
+    """
+
+    def __init__(self):
+        """Initialize an empty LoanIndex."""
+        self.__holders = {}
+        self.__loans = {}
+
+    def __len__(self) -> int:
+        """Return the number of open loans."""
+        return len(self.__holders)
+
+    def __contains__(self, item_id:str) -> bool:
+        """Return if an item has an open loan."""
+        return item_id in self.__holders
+
+    def add(self, item_id:str, member_id:str) -> None:
+        """
+        Record that a member holds an item, replacing any previous holder.
+
+        :param item_id: The unique identifier of the borrowed item.
+        :param member_id: The unique ID of the borrowing member.
+        """
+        self.discard(item_id)
+        self.__holders[item_id] = member_id
+        self.__loans.setdefault(member_id, {})[item_id] = None
+
+    def add_many(self, item_ids:list, member_id:str) -> None:
+        """
+        Record that a member holds many items, replacing any previous holders.
+
+        :param item_ids: The unique identifiers of the borrowed items.
+        :param member_id: The unique ID of the borrowing member.
+        """
+        for item_id in item_ids:
+            if item_id in self.__holders:
+                self.discard(item_id)
+
+        self.__holders.update(dict.fromkeys(item_ids, member_id))
+        self.__loans.setdefault(member_id, {}).update(dict.fromkeys(item_ids))
+
+    def discard(self, item_id:str) -> None:
+        """
+        Drop the loan of an item, if present.
+
+        :param item_id: The unique identifier of the item.
+        """
+        member_id = self.__holders.pop(item_id, None)
+        if member_id is None:
+            return
+
+        items = self.__loans[member_id]
+        del items[item_id]
+        if not items:
+            del self.__loans[member_id]
+
+    def get_holder(self, item_id:str) -> str:
+        """
+        Return the ID of the member holding an item.
+
+        :param item_id: The unique identifier of the item.
+        :return: The member ID, or None if the item is not on loan.
+        """
+        return self.__holders.get(item_id)
+
+    def get_item_ids(self, member_id:str) -> list[str]:
+        """
+        Return the IDs of the items a member holds, in the order they were lent.
+
+        :param member_id: The unique ID of the member.
+        """
+        return list(self.__loans.get(member_id, ()))
+
+    def count(self, member_id:str) -> int:
+        """
+        Return the number of items a member holds.
+
+        :param member_id: The unique ID of the member.
+        """
+        return len(self.__loans.get(member_id, ()))
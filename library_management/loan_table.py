@@ -0,0 +1,128 @@
+from array import array
+
+from .catalog_store import StringPool
+from .fines import calculate_fines, numpy, NUMPY_THRESHOLD
+
+
+class LoanTable:
+    """
+    Open loans packed into parallel integer columns for batch fine calculation.
+
+    Rows stay dense: removing a loan moves the last row into its place, so the
+    columns can be handed to calculate_fines (and NumPy) as they are.
+
+    Attributes:
+        __rows (dict): Maps item IDs to their row.
+        __item_ids (list): Item IDs by row.
+        __due_dates (array): Due dates in microseconds since the epoch by row.
+        __borrowers (array): Borrowing member codes by row.
+        __members (StringPool): Interns member IDs into borrower codes.
+    """
+
+    def __init__(self):
+        """Initialize an empty LoanTable."""
+        self.__rows = {}
+        self.__item_ids = []
+        self.__due_dates = array("q")
+        self.__borrowers = array("q")
+        self.__members = StringPool()
+
+    def __len__(self) -> int:
+        """Return the number of open loans."""
+        return len(self.__rows)
+
+    def __contains__(self, item_id:str) -> bool:
+        """Return if an item has an open loan."""
+        return item_id in self.__rows
+
+    def __iter__(self):
+        """Iterate over the open loans as (item_id, member_id, due_date) tuples, due dates in microseconds."""
+        decode = self.__members.decode
+        return (
+            (item_id, decode(code), due_date)
+            for item_id, code, due_date in zip(self.__item_ids, self.__borrowers, self.__due_dates)
+        )
+
+    def set(self, item_id:str, member_id:str, due_date:int) -> None:
+        """
+        Record the loan of an item, replacing any previous loan of it.
+
+        :param item_id: The unique identifier of the borrowed item.
+        :param member_id: The unique ID of the borrowing member.
+        :param due_date: The due date in microseconds since the epoch.
+        """
+        code = self.__members.encode(member_id)
+        row = self.__rows.get(item_id)
+        if row is not None:
+            self.__due_dates[row] = due_date
+            self.__borrowers[row] = code
+            return
+
+        self.__rows[item_id] = len(self.__item_ids)
+        self.__item_ids.append(item_id)
+        self.__due_dates.append(due_date)
+        self.__borrowers.append(code)
+
+    def set_many(self, item_ids:list, member_id:str, due_date:int) -> None:
+        """
+        Record the loans of many items to one member with the same due date, e.g. a checkout basket.
+
+        :param item_ids: The unique identifiers of the borrowed items.
+        :param member_id: The unique ID of the borrowing member.
+        :param due_date: The due date in microseconds since the epoch.
+        """
+        new_ids = [item_id for item_id in item_ids if item_id not in self.__rows]
+        if len(new_ids) < len(item_ids):
+            for item_id in item_ids:
+                if item_id in self.__rows:
+                    self.set(item_id, member_id, due_date)
+
+        code = self.__members.encode(member_id)
+        self.__rows.update(zip(new_ids, range(len(self.__item_ids), len(self.__item_ids) + len(new_ids))))
+        self.__item_ids.extend(new_ids)
+        self.__due_dates.extend([due_date] * len(new_ids))
+        self.__borrowers.extend([code] * len(new_ids))
+
+    def discard(self, item_id:str) -> None:
+        """
+        Drop the loan of an item, if present.
+
+        :param item_id: The unique identifier of the item.
+        """
+        row = self.__rows.pop(item_id, None)
+        if row is None:
+            return
+
+        last_item_id = self.__item_ids.pop()
+        last_due_date = self.__due_dates.pop()
+        last_borrower = self.__borrowers.pop()
+        if row < len(self.__item_ids):
+            self.__item_ids[row] = last_item_id
+            self.__due_dates[row] = last_due_date
+            self.__borrowers[row] = last_borrower
+            self.__rows[last_item_id] = row
+
+    def total_fines(self, moment:int) -> dict:
+        """
+        Sum the fines of all open loans per member at a single moment.
+
+        :param moment: The reference moment in microseconds since the epoch.
+        :return: A dict mapping member IDs to their total fine; members owing nothing are left out.
+        """
+        fines = calculate_fines(self.__due_dates, moment)
+        decode = self.__members.decode
+
+        if numpy is not None and len(fines) >= NUMPY_THRESHOLD:
+            sums = numpy.bincount(
+                numpy.frombuffer(self.__borrowers, dtype=numpy.int64),
+                weights=numpy.frombuffer(fines, dtype=numpy.float64)
+            )
+            codes = numpy.flatnonzero(sums)
+            return dict(zip(map(decode, codes.tolist()), sums[codes].tolist()))
+
+        totals = {}
+        for code, fine in zip(self.__borrowers, fines):
+            if fine:
+                totals[code] = totals.get(code, 0.0) + fine
+
+        return {decode(code): total for code, total in totals.items()}
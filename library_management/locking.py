@@ -0,0 +1,73 @@
+import threading
+from contextlib import nullcontext
+
+
+_NO_LOCK = nullcontext()
+
+
+class _StripeGuard:
+    """Context manager holding a sorted set of stripe locks."""
+
+    __slots__ = ("__locks",)
+
+    def __init__(self, locks:list):
+        """
+        Initialize a new _StripeGuard instance.
+
+        :param locks: The locks to hold, in acquisition order.
+        """
+        self.__locks = locks
+
+    def __enter__(self) -> None:
+        for lock in self.__locks:
+            lock.acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        for lock in reversed(self.__locks):
+            lock.release()
+
+
+class StripedLock:
+    """
+    Fixed pool of re-entrant locks that keys are hashed onto.
+
+    Operations on different keys usually land on different stripes and run in
+    parallel, while the memory cost stays constant however many keys exist.
+    Stripes are always acquired in index order, so holding several keys at
+    once cannot deadlock.
+
+    Attributes:
+        __locks (list): The stripe locks.
+    """
+
+    def __init__(self, stripes:int = 64):
+        """
+        Initialize a new StripedLock instance.
+
+        :param stripes: Number of locks in the pool.
+        """
+        self.__locks = [threading.RLock() for _ in range(stripes)]
+
+    def hold(self, *keys) -> _StripeGuard:
+        """
+        Return a context manager holding the stripes of every given key.
+
+        :param keys: Hashable keys, e.g. item and member IDs.
+        """
+        stripes = len(self.__locks)
+        indices = sorted({hash(key) % stripes for key in keys})
+
+        return _StripeGuard([self.__locks[index] for index in indices])
+
+
+class NullStripedLock:
+    """Stand-in for StripedLock when a library is only used from one thread."""
+
+    def hold(self, *keys):
+        """Return a context manager that does nothing."""
+        return _NO_LOCK
+
+
+def null_lock():
+    """Return a context manager that does nothing, standing in for a threading lock."""
+    return _NO_LOCK
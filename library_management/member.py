@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from uuid import uuid4
+from .ids import new_id
 from .library_item import LibraryItem
 
 
@@ -13,13 +13,15 @@ class Member:
         __borrowed_items (dict): Maps borrowed item IDs to LibraryItem objects.
     """
 
-    def __init__(self, name:str):
+    def __init__(self, name:str, member_id:str = None):
         """
         Initialize a new Member instance.
 
         :param name: The name of the member.
+        :param member_id: Unique identifier to reuse, e.g. when restoring a member. A new one is made by
+                          the current ID generator if omitted, see ids.set_id_generator.
         """
-        self.__member_id = str(uuid4())
+        self.__member_id = new_id() if member_id is None else member_id
         self.__name = name
         self.__borrowed_items = {}
 
@@ -32,6 +34,14 @@ class Member:
 
         return [item.get_info() for item in self.__borrowed_items.values()]
 
+    def get_borrowed_item_ids(self) -> list[str]:
+        """
+        Retrieve the IDs of the items borrowed by the member, without building their information.
+
+        :return: A list of item IDs.
+        """
+        return list(self.__borrowed_items)
+
     def get_id(self) -> str:
         """
         Retrieve the unique ID of the member.
@@ -41,18 +51,37 @@ class Member:
 
         return self.__member_id
 
-    def get_info(self) -> dict:
+    def get_info(self, fields:tuple = None) -> dict:
         """
         Retrieve basic information about the member.
 
+        :param fields: Optional names of the keys to include. Both are returned if omitted.
         :return: Dictionary containing 'id' and 'name' keys.
+        :raises KeyError: If a requested field is unknown.
         """
+        if fields is not None:
+            return {field: self.get_field(field) for field in fields}
 
         return {
             "id": self.__member_id,
             "name":self.__name
         }
 
+    def get_field(self, field:str):
+        """
+        Retrieve the value of a single get_info key.
+
+        :param field: The name of the key.
+        :return: The value get_info would hold under that key.
+        :raises KeyError: If the field is unknown.
+        """
+        if field == "id":
+            return self.__member_id
+        if field == "name":
+            return self.__name
+
+        raise KeyError(f"{field} is not a field of Member.")
+
     def __calculate_due_date(self) -> datetime:
         """
         Calculate the due date of the borrowed item, which is four days from the current date.
@@ -61,11 +90,16 @@ class Member:
         """
         return datetime.now() + timedelta(days=4)
 
-    def borrow_item(self, item:LibraryItem) -> None:
+    def get_name(self) -> str:
+        """Return the name of the member."""
+        return self.__name
+
+    def borrow_item(self, item:LibraryItem, due_date:datetime = None) -> None:
         """
         Borrow library item and add it to the member's borrowed items.
 
         :param item: The LibraryItem object to borrow.
+        :param due_date: Due date to use instead of the default loan period, e.g. when restoring a loan.
         :raises Exception: If the item has already been borrowed by the member.
         """
         if item.get_id() in self.__borrowed_items:
@@ -73,10 +107,30 @@ class Member:
 
         item.set_is_borrowed(True)
         item.set_borrowed_by(self)
-        item.set_due_date(self.__calculate_due_date())
+        item.set_due_date(self.__calculate_due_date() if due_date is None else due_date)
 
         self.__borrowed_items[item.get_id()] = item
 
+    def borrow_items(self, items:list, due_date:datetime = None) -> None:
+        """
+        Borrow many library items with the same due date.
+
+        :param items: The LibraryItem objects to borrow.
+        :param due_date: Due date to use instead of the default loan period.
+        :raises Exception: If any of the items has already been borrowed by the member;
+                           none is borrowed then.
+        """
+        for item in items:
+            if item.get_id() in self.__borrowed_items:
+                raise Exception("Item already borrowed by you.")
+
+        due_date = self.__calculate_due_date() if due_date is None else due_date
+        for item in items:
+            item.set_is_borrowed(True)
+            item.set_borrowed_by(self)
+            item.set_due_date(due_date)
+            self.__borrowed_items[item.get_id()] = item
+
     def return_item(self, item:LibraryItem) -> None:
         """
         Return a borrowed library item.
@@ -91,4 +145,21 @@ class Member:
         item.set_borrowed_by(None)
         item.set_due_date(None)
 
-        del self.__borrowed_items[item.get_id()]
\ No newline at end of file
+        del self.__borrowed_items[item.get_id()]
+
+    def return_items(self, items:list) -> None:
+        """
+        Return many borrowed library items.
+
+        :param items: The LibraryItem objects to return.
+        :raises Exception: If the member has not borrowed one of the items; none is returned then.
+        """
+        for item in items:
+            if item.get_id() not in self.__borrowed_items:
+                raise Exception("Your have not borrowed this item.")
+
+        for item in items:
+            item.set_is_borrowed(False)
+            item.set_borrowed_by(None)
+            item.set_due_date(None)
+            del self.__borrowed_items[item.get_id()]
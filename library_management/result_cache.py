@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of query results, each tagged with the library version it was computed at.
+
+    A Library bumps its version on every mutation, so a result cached at an
+    older version is never returned again; it is dropped when next looked up
+    or when it falls off the LRU end. Entries can also expire after a time to
+    live.
+
+    Attributes:
+        __max_entries (int): Maximum number of cached results.
+        __ttl (float): Seconds a result stays valid, or None to keep it until invalidated.
+        __clock (callable): Returns the current time in seconds, for the time to live.
+        __entries (OrderedDict): Maps keys to (version, expiry, result) tuples, least recently used first.
+        __hits (int): Lookups answered from the cache.
+        __misses (int): Lookups that found no usable result.
+        __evictions (int): Results dropped to make room for new ones.
+        __invalidations (int): Results dropped because the library changed since they were computed.
+        __expirations (int): Results dropped because their time to live ran out.
+        __lock (Lock): Guards the entries and counters.
+    """
+
+    def __init__(self, max_entries:int = 1_024, ttl:float = None, clock = time.monotonic):
+        """
+        Initialize an empty ResultCache.
+
+        :param max_entries: Maximum number of cached results.
+        :param ttl: Optional number of seconds after which a result is recomputed even
+                    if the library did not change.
+        :param clock: Callable returning the current time in seconds.
+        :raises ValueError: If max_entries is not positive or ttl is not positive.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds.")
+
+        self.__max_entries = max_entries
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__invalidations = 0
+        self.__expirations = 0
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached results, including ones not yet known to be stale."""
+        return len(self.__entries)
+
+    def get(self, key, version:int):
+        """
+        Look up the result cached for a key at a library version.
+
+        :param key: Hashable description of the query.
+        :param version: The current version of the library.
+        :return: The cached result, or None if there is no usable one.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            cached_version, expiry, result = entry
+            if cached_version != version:
+                del self.__entries[key]
+                self.__invalidations += 1
+                self.__misses += 1
+                return None
+
+            if expiry is not None and self.__clock() >= expiry:
+                del self.__entries[key]
+                self.__expirations += 1
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return result
+
+    def put(self, key, version:int, result) -> None:
+        """
+        Cache the result of a query, evicting the least recently used results if full.
+
+        :param key: Hashable description of the query.
+        :param version: The library version the result was computed at.
+        :param result: The result; it must not be changed afterwards.
+        """
+        expiry = None if self.__ttl is None else self.__clock() + self.__ttl
+        with self.__lock:
+            self.__entries[key] = (version, expiry, result)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached results, keeping the statistics."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Return the cache statistics.
+
+        :return: A dict with the hits, misses, evictions, invalidations and expirations
+                 counted so far, the hit_rate among all lookups and the current size.
+        """
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hit_rate": self.__hits / lookups if lookups else 0.0,
+                "evictions": self.__evictions,
+                "invalidations": self.__invalidations,
+                "expirations": self.__expirations,
+                "size": len(self.__entries),
+            }
@@ -0,0 +1,528 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+from .sorted_list import SortedList
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+NGRAM_SIZE = 3
+
+# BM25 term frequency saturation and length normalization.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _post(postings:dict, key, value) -> bool:
+    """
+    Add a value to the posting list stored under key.
+
+    :return: True if a new posting list was created for key.
+    """
+    bucket = postings.get(key)
+    if bucket is None:
+        postings[key] = {value: None}
+        return True
+
+    bucket[value] = None
+    return False
+
+
+def _unpost(postings:dict, key, value) -> bool:
+    """
+    Remove a value from the posting list stored under key.
+
+    :return: True if the posting list became empty and was dropped.
+    """
+    bucket = postings.get(key)
+    if bucket is None:
+        return False
+
+    bucket.pop(value, None)
+    if not bucket:
+        del postings[key]
+        return True
+
+    return False
+
+
+def _ngrams(text:str) -> set:
+    """Return the distinct character n-grams of a lowercase string."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _word_grams(word:str) -> set:
+    """Return the n-grams of a word padded with boundary marks, so short words have some too."""
+    return _ngrams(f"${word}$")
+
+
+def _max_edits(length:int) -> int:
+    """Return the number of typos tolerated in a query word of the given length."""
+    if length <= 4:
+        return 0
+    if length <= 8:
+        return 1
+    return 2
+
+
+def _check_limit(limit:int) -> None:
+    """
+    Validate the maximum number of search results.
+
+    :raises ValueError: If limit is negative.
+    """
+    if limit is not None and limit < 0:
+        raise ValueError("limit must not be negative.")
+
+
+def _edit_distance(source:str, target:str, limit:int) -> int:
+    """
+    Return the edit distance between two strings, counting insertions, deletions,
+    substitutions and swaps of adjacent characters as one edit each.
+
+    :param limit: Largest distance of interest; limit + 1 is returned as soon as the
+                  distance is known to exceed it.
+    """
+    before_previous = None
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (source[i - 1] != target[j - 1]),
+            )
+            if (i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                value = min(value, before_previous[j - 2] + 1)
+            current[j] = value
+
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1
+        before_previous, previous = previous, current
+
+    return min(previous[-1], limit + 1)
+
+
+class SearchIndex:
+    """
+    Inverted index over the ID, title and author name of library items.
+
+    Titles and authors repeat heavily across a catalog, so the word and n-gram
+    postings point at distinct lowercase texts rather than at items; only the
+    text-to-items map grows with the catalog. Posting lists are dicts used as
+    insertion-ordered sets, so results come back in the order items were indexed.
+
+    Ranked search treats every distinct title and author as a document scored
+    with BM25. Query words are matched with typo tolerance through a trigram
+    index over the vocabulary, which grows far slower than the catalog, so a
+    query never compares itself against every item.
+
+    Attributes:
+        __exact (dict): Maps exact titles and author names to the IDs of items holding them.
+        __texts (dict): Maps lowercase titles and authors to item IDs.
+        __tokens (dict): Maps lowercase words and whole texts to the texts containing them,
+                         with the number of times the word occurs in each.
+        __sorted_tokens (SortedList): Distinct tokens, used for prefix lookups.
+        __sorted_ids (SortedList): Lowercase item IDs, used for prefix lookups.
+        __ngrams (dict): Maps character trigrams to the texts containing them.
+        __fields (dict): Maps item IDs to the (title, author) pair indexed for them.
+        __lengths (dict): Maps texts to their number of words.
+        __total_words (int): Sum of the word counts of all texts.
+        __words (dict): Maps the words of all texts to the number of texts holding them.
+        __word_grams (dict): Maps padded trigrams to the words containing them.
+        __author_counts (dict): Maps texts to the number of items holding them as author
+                                name but not as title.
+    """
+
+    MODES = ("exact", "prefix", "substring", "ranked")
+
+    def __init__(self):
+        """Initialize an empty SearchIndex."""
+        self.__exact = {}
+        self.__texts = {}
+        self.__tokens = {}
+        self.__sorted_tokens = SortedList()
+        self.__sorted_ids = SortedList()
+        self.__ngrams = {}
+        self.__fields = {}
+        self.__lengths = {}
+        self.__total_words = 0
+        self.__words = {}
+        self.__word_grams = {}
+        self.__author_counts = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self.__fields)
+
+    def __contains__(self, item_id:str) -> bool:
+        """Return if an item ID is indexed."""
+        return item_id in self.__fields
+
+    @staticmethod
+    def __lowercase_texts(title, author) -> set:
+        """Return the lowercase titles and authors of an item."""
+        return {str(value).lower() for value in (title, author) if value}
+
+    @staticmethod
+    def __author_text(title, author):
+        """Return the lowercase author of an item, or None if it is missing or equals the title."""
+        if not author:
+            return None
+
+        text = str(author).lower()
+        return None if title and str(title).lower() == text else text
+
+    def __count_author(self, title, author, change:int) -> None:
+        """Adjust how many items hold the author text of an item only as author."""
+        text = self.__author_text(title, author)
+        if text is not None:
+            count = self.__author_counts.get(text, 0) + change
+            if count:
+                self.__author_counts[text] = count
+            else:
+                del self.__author_counts[text]
+
+    def add(self, item_id:str, title, author) -> None:
+        """
+        Index an item under its ID, title and author name.
+
+        Re-adding an already indexed ID replaces its previous entry.
+
+        :param item_id: The unique identifier of the item.
+        :param title: Title of the item.
+        :param author: Author name of the item.
+        """
+        if item_id in self.__fields:
+            self.remove(item_id)
+
+        self.__fields[item_id] = (title, author)
+        self.__sorted_ids.add((str(item_id).lower(), item_id))
+        self.__count_author(title, author, 1)
+
+        for value in (title, author):
+            _post(self.__exact, value, item_id)
+
+        for text in self.__lowercase_texts(title, author):
+            if _post(self.__texts, text, item_id):
+                self.__add_text(text)
+
+    def add_many(self, entries) -> None:
+        """
+        Index many items at once.
+
+        New tokens and IDs are merged into the sorted prefix lists in a single
+        sort rather than one insertion each.
+
+        :param entries: Iterable of (item_id, title, author) tuples.
+        """
+        entries = {item_id: (title, author) for item_id, title, author in entries}
+        for item_id in entries:
+            if item_id in self.__fields:
+                self.remove(item_id)
+
+        new_ids = []
+        new_tokens = []
+        fields, exact, texts = self.__fields, self.__exact, self.__texts
+
+        for item_id, (title, author) in entries.items():
+            fields[item_id] = (title, author)
+            new_ids.append((str(item_id).lower(), item_id))
+            self.__count_author(title, author, 1)
+
+            for value in (title, author):
+                exact.setdefault(value, {})[item_id] = None
+
+            for text in self.__lowercase_texts(title, author):
+                bucket = texts.get(text)
+                if bucket is None:
+                    texts[text] = {item_id: None}
+                    new_tokens.extend(self.__add_text(text, sort=False))
+                else:
+                    bucket[item_id] = None
+
+        self.__sorted_ids.update(new_ids)
+        self.__sorted_tokens.update(new_tokens)
+
+    def remove(self, item_id:str) -> None:
+        """
+        Drop an item from the index.
+
+        :param item_id: The unique identifier of the item.
+        :raises KeyError: If the item is not indexed.
+        """
+        title, author = self.__fields.pop(item_id)
+        self.__sorted_ids.remove((str(item_id).lower(), item_id))
+        self.__count_author(title, author, -1)
+
+        for value in (title, author):
+            _unpost(self.__exact, value, item_id)
+
+        for text in self.__lowercase_texts(title, author):
+            if _unpost(self.__texts, text, item_id):
+                self.__remove_text(text)
+
+    def __add_text(self, text:str, sort:bool = True) -> list[str]:
+        """
+        Index the words and n-grams of a newly seen text.
+
+        :param sort: Whether to insert new tokens into the sorted prefix list.
+        :return: The tokens seen for the first time.
+        """
+        new_tokens = []
+        words = _TOKEN_PATTERN.findall(text)
+        counts = Counter(words)
+        for token in {text, *counts}:
+            if _post(self.__tokens, token, text):
+                new_tokens.append(token)
+                if sort:
+                    self.__sorted_tokens.add(token)
+            self.__tokens[token][text] = counts.get(token, 1)
+
+        for gram in _ngrams(text):
+            _post(self.__ngrams, gram, text)
+
+        self.__lengths[text] = len(words)
+        self.__total_words += len(words)
+        for word in counts:
+            held = self.__words.get(word, 0)
+            if not held:
+                for gram in _word_grams(word):
+                    _post(self.__word_grams, gram, word)
+            self.__words[word] = held + 1
+
+        return new_tokens
+
+    def __remove_text(self, text:str) -> None:
+        """Drop the words and n-grams of a text no item holds any more."""
+        words = set(_TOKEN_PATTERN.findall(text))
+        for token in {text, *words}:
+            if _unpost(self.__tokens, token, text):
+                self.__sorted_tokens.remove(token)
+
+        for gram in _ngrams(text):
+            _unpost(self.__ngrams, gram, text)
+
+        self.__total_words -= self.__lengths.pop(text)
+        for word in words:
+            held = self.__words.pop(word) - 1
+            if held:
+                self.__words[word] = held
+            else:
+                for gram in _word_grams(word):
+                    _unpost(self.__word_grams, gram, word)
+
+    def iter_ids(self, after:str = None):
+        """
+        Iterate over the indexed item IDs in case-insensitive order.
+
+        :param after: Optional ID to resume after. It does not need to be indexed
+                      any more, so iteration can resume past a removed item.
+        :return: An iterator of item IDs.
+        """
+        if after is None:
+            return (item_id for _, item_id in self.__sorted_ids)
+
+        start = (str(after).lower(), after)
+        return (key[1] for key in self.__sorted_ids.irange(start) if key != start)
+
+    def search(self, keyword:str, mode:str = "exact", limit:int = None) -> list[str]:
+        """
+        Look up the IDs of items matching a keyword.
+
+        :param keyword: The search term to look for.
+        :param mode: "exact" matches whole ID, title or author values, "prefix" matches
+                     the start of an ID, title, author or any word in them,
+                     "substring" matches anywhere in a title or author, and "ranked"
+                     matches words of a title or author despite typos, best match
+                     first, see rank. All modes but "exact" ignore case.
+        :param limit: Optional maximum number of IDs to return; 0 returns none.
+        :return: A list of matching item IDs.
+        :raises ValueError: If mode is not a supported search mode or limit is negative.
+        """
+        _check_limit(limit)
+        if mode == "exact":
+            matches = self.__exact.get(keyword, {})
+            if keyword in self.__fields:
+                item_ids = [keyword, *(item_id for item_id in matches if item_id != keyword)]
+            else:
+                item_ids = list(matches)
+        elif mode == "prefix":
+            item_ids = self.__search_prefix(keyword.lower())
+        elif mode == "substring":
+            item_ids = self.__search_substring(keyword.lower())
+        elif mode == "ranked":
+            return [item_id for item_id, _ in self.rank(keyword, limit)]
+        else:
+            raise ValueError(f"mode must be one of {', '.join(self.MODES)}.")
+
+        return item_ids if limit is None else item_ids[:limit]
+
+    def rank(self, query:str, limit:int = None) -> list[tuple[str, float]]:
+        """
+        Find the items best matching the words of a query.
+
+        Every query word matches indexed words within a few typos: none for words
+        of up to 4 characters, one for up to 8 and two beyond, where swapping two
+        adjacent characters counts as one. Each distinct title and author is scored
+        with BM25, a match with typos weighing less than an exact one, and an item
+        scores the sum of its title and author scores.
+
+        :param query: The words to look for, in any case.
+        :param limit: Optional maximum number of results. Scoring stops early once no
+                      remaining item can enter the results.
+        :return: (item ID, score) pairs, highest score first; ties keep indexing order.
+        :raises ValueError: If limit is negative.
+        """
+        _check_limit(limit)
+        text_scores = self.__score_texts(_TOKEN_PATTERN.findall(query.lower()))
+        if not text_scores or limit == 0:
+            return []
+
+        ranked = sorted(text_scores.items(), key=lambda entry: entry[1], reverse=True)
+        best_title, best_author = self.__best_by_field(text_scores)
+        results = []
+        seen = set()
+        for text, score in ranked:
+            # Items not seen yet hold no text scored above this one, so their title
+            # and author each score at most this much, and at most the best of their field.
+            bound = min(score, best_title) + min(score, best_author)
+            if limit is not None and len(results) == limit and bound <= results[0][0]:
+                break
+
+            for item_id in self.__texts[text]:
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+
+                total = sum(
+                    text_scores.get(item_text, 0.0)
+                    for item_text in self.__lowercase_texts(*self.__fields[item_id])
+                )
+                entry = (total, -len(seen), item_id)
+                if limit is None or len(results) < limit:
+                    heapq.heappush(results, entry)
+                elif entry > results[0]:
+                    heapq.heapreplace(results, entry)
+
+        results.sort(reverse=True)
+        return [(item_id, total) for total, _, item_id in results]
+
+    def __best_by_field(self, text_scores:dict) -> tuple[float, float]:
+        """Return the best score of a text held as a title, and of one held only as an author."""
+        best_title = best_author = 0.0
+        for text, score in text_scores.items():
+            authors = self.__author_counts.get(text, 0)
+            if authors:
+                best_author = max(best_author, score)
+            if len(self.__texts[text]) > authors:
+                best_title = max(best_title, score)
+
+        return best_title, best_author
+
+    def __score_texts(self, terms:list) -> dict:
+        """Return the BM25 score of every text matching any of the query terms."""
+        document_count = len(self.__texts)
+        if not document_count:
+            return {}
+
+        average_length = self.__total_words / document_count
+        scores = {}
+        for term in dict.fromkeys(terms):
+            term_scores = {}
+            for word, weight in self.__expand(term):
+                texts = self.__tokens[word]
+                idf = math.log(1 + (document_count - len(texts) + 0.5) / (len(texts) + 0.5))
+                for text, frequency in texts.items():
+                    if self.__lengths[text] == 0:
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.__lengths[text] / average_length)
+                    score = weight * idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    if score > term_scores.get(text, 0.0):
+                        term_scores[text] = score
+
+            for text, score in term_scores.items():
+                scores[text] = scores.get(text, 0.0) + score
+
+        return scores
+
+    def __expand(self, term:str) -> list[tuple[str, float]]:
+        """
+        Return the indexed words within the typo allowance of a query term.
+
+        Every edit changes at most NGRAM_SIZE + 1 padded trigrams, so a word within
+        the allowance shares enough trigrams with the term to be found through the
+        trigram postings; only those candidates get their edit distance computed.
+
+        :return: (word, weight) pairs, weighing 1 for the term itself and less per edit.
+        """
+        edits = _max_edits(len(term))
+        if not edits:
+            return [(term, 1.0)] if term in self.__words else []
+
+        grams = _word_grams(term)
+        shared = {}
+        for gram in grams:
+            for word in self.__word_grams.get(gram, ()):
+                shared[word] = shared.get(word, 0) + 1
+
+        needed = len(grams) - (NGRAM_SIZE + 1) * edits
+        matches = []
+        for word, count in shared.items():
+            if count < needed or abs(len(word) - len(term)) > edits:
+                continue
+            distance = 0 if word == term else _edit_distance(term, word, edits)
+            if distance <= edits:
+                matches.append((word, 1.0 / (1 + distance)))
+
+        return matches
+
+    def __items_of(self, texts) -> list[str]:
+        """Return the IDs of the items holding any of the given texts."""
+        matches = {}
+        for text in texts:
+            matches.update(self.__texts[text])
+
+        return list(matches)
+
+    def __search_prefix(self, prefix:str) -> list[str]:
+        """Return the IDs of items having an ID or token starting with prefix."""
+        matches = {}
+        for lowered_id, item_id in self.__sorted_ids.irange((prefix,)):
+            if not lowered_id.startswith(prefix):
+                break
+            matches[item_id] = None
+
+        texts = {}
+        for token in self.__sorted_tokens.irange(prefix):
+            if not token.startswith(prefix):
+                break
+            texts.update(self.__tokens[token])
+
+        matches.update(dict.fromkeys(self.__items_of(texts)))
+
+        return list(matches)
+
+    def __search_substring(self, query:str) -> list[str]:
+        """Return the IDs of items whose title or author contains query."""
+        if len(query) < NGRAM_SIZE:
+            # Too short for the trigram index: scan the distinct texts instead.
+            return self.__items_of(text for text in self.__texts if query in text)
+
+        postings = []
+        for gram in _ngrams(query):
+            texts = self.__ngrams.get(gram)
+            if texts is None:
+                return []
+            postings.append(texts)
+
+        postings.sort(key=len)
+        smallest, rest = postings[0], postings[1:]
+
+        return self.__items_of(
+            text for text in smallest
+            if query in text and all(text in texts for texts in rest)
+        )
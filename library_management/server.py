@@ -0,0 +1,340 @@
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .library import Library
+from .library_item import _JSON_ENCODER, ITEM_TYPES, items_to_json
+
+
+# Item classes by the "kind" names accepted by POST /items.
+ITEM_KINDS = {item_class.__name__: item_class for item_class in ITEM_TYPES}
+
+MAX_BODY_SIZE = 8 * 1024 * 1024
+MAX_BATCH_SIZE = 1_000
+
+# JSON names of the Python types fields are checked against.
+_JSON_TYPES = {str: "string", list: "array", dict: "object"}
+
+# Message of the error the library raises for an unknown member ID.
+_UNKNOWN_MEMBER = "Member with that id does not exist."
+
+
+class RequestError(Exception):
+    """
+    Raised while handling a request to answer it with an error status.
+
+    Attributes:
+        status (HTTPStatus): The status of the error response.
+    """
+
+    def __init__(self, status:HTTPStatus, message:str):
+        """Initialize a new RequestError instance."""
+        super().__init__(message)
+        self.status = status
+
+
+def _encode(value) -> bytes:
+    """Serialize a value to compact UTF-8 JSON."""
+    return _JSON_ENCODER.encode(value).encode()
+
+
+def _refusal(error:Exception) -> RequestError:
+    """Turn an error raised by a lend or return into a request error: 404 for an unknown member, else 409."""
+    status = HTTPStatus.NOT_FOUND if str(error) == _UNKNOWN_MEMBER else HTTPStatus.CONFLICT
+    return RequestError(status, str(error))
+
+
+def _require(payload:dict, **fields:type) -> list:
+    """
+    Return the values of required fields of a JSON object, checking their types.
+
+    :param payload: The decoded JSON value.
+    :param fields: The required field names, mapped to the type their values must have.
+    :return: The values of the fields, in the order they were given.
+    :raises RequestError: If the payload is not an object, or a field is missing or of the wrong type.
+    """
+    if not isinstance(payload, dict):
+        raise RequestError(HTTPStatus.BAD_REQUEST, "expected a JSON object.")
+
+    missing = [field for field in fields if payload.get(field) is None]
+    if missing:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"missing field(s): {', '.join(missing)}.")
+
+    for field, kind in fields.items():
+        _check_type(field, payload[field], kind)
+
+    return [payload[field] for field in fields]
+
+
+def _check_type(field:str, value, kind:type) -> None:
+    """
+    Check the type of a JSON field's value.
+
+    :raises RequestError: If the value is not of the given type.
+    """
+    if not isinstance(value, kind):
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"field {field} must be of type {_JSON_TYPES[kind]}.")
+
+
+def _parse_limit(limit):
+    """
+    Parse the maximum number of search results, given as an integer or a string of digits.
+
+    :return: The limit, or None if it is not given.
+    :raises RequestError: If the limit is not a positive integer.
+    """
+    if limit is None:
+        return None
+
+    if isinstance(limit, str) and limit.isdigit():
+        limit = int(limit)
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "limit must be a positive integer.")
+
+    return limit
+
+
+class LibraryHTTPServer(ThreadingHTTPServer):
+    """
+    HTTP/JSON service over a thread-safe Library, one thread per connection.
+
+    Connections are kept alive between requests (HTTP/1.1), the catalog is
+    streamed with chunked transfer encoding straight from
+    Library.iter_items_json, and POST /batch runs many lend, return and
+    search operations in one round trip.
+
+    Endpoints:
+        GET  /items                 Every item, as a streamed JSON array.
+        GET  /items/<id>            One item.
+        GET  /search?q=&mode=&limit=  Items matching a keyword, see Library.search_item.
+        GET  /members               Every member.
+        POST /items                 {"kind", "title", "pub_year", "author_name", "detail"} -> {"id"}
+        POST /members               {"name"} -> {"id"}
+        POST /lend                  {"member_id", "item_id"} -> {"due_date"}, 404 for an unknown member or item,
+                                    409 if the library refuses
+        POST /return                {"member_id", "item_id"} -> {"handed_to"}, 404 for an unknown member or item,
+                                    409 if the library refuses
+        POST /batch                 {"operations": [{"op": "lend" | "return" | "search", ...}]}
+                                    -> {"results": [{"ok": true, ...} | {"ok": false, "error"}]}
+
+    Attributes:
+        library (Library): The served library.
+        page_size (int): Number of items serialized per streamed chunk.
+        verbose (bool): Whether every request is logged to stderr.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address:tuple, library:Library, page_size:int = 1_000, verbose:bool = False):
+        """
+        Initialize a new LibraryHTTPServer and bind it.
+
+        :param address: (host, port) to listen on; port 0 picks a free port.
+        :param library: The Library to serve. It should be thread-safe.
+        :param page_size: Number of items serialized per streamed chunk of GET /items.
+        :param verbose: Whether to log every request to stderr.
+        """
+        self.library = library
+        self.page_size = page_size
+        self.verbose = verbose
+        super().__init__(address, LibraryRequestHandler)
+
+
+class LibraryRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of one connection to a LibraryHTTPServer."""
+
+    protocol_version = "HTTP/1.1"
+    # Buffer each response into a single write, and send it without waiting on Nagle's algorithm.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Answer GET requests."""
+        self.__dispatch(self.__get)
+
+    def do_POST(self) -> None:
+        """Answer POST requests."""
+        self.__dispatch(self.__post)
+
+    def log_message(self, format:str, *args) -> None:
+        """Log requests only if the server is verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def __dispatch(self, handler) -> None:
+        """Run a handler, answering errors with a JSON error object."""
+        url = urlsplit(self.path)
+        try:
+            handler(url.path.rstrip("/") or "/", parse_qs(url.query))
+        except RequestError as error:
+            self.__send_json(error.status, _encode({"error": str(error)}))
+        except (ValueError, TypeError) as error:
+            # Arguments the library refused.
+            self.__send_json(HTTPStatus.BAD_REQUEST, _encode({"error": str(error)}))
+
+    def __get(self, path:str, query:dict) -> None:
+        """Route a GET request."""
+        library = self.server.library
+
+        if path == "/items":
+            self.__send_stream(library.iter_items_json(self.server.page_size))
+        elif path.startswith("/items/"):
+            self.__send_json(HTTPStatus.OK, self.__get_item(unquote(path[len("/items/"):])).to_json())
+        elif path == "/search":
+            keyword = query.get("q", [None])[0]
+            if keyword is None:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "missing query parameter q.")
+            limit = query.get("limit", [None])[0]
+            items = self.__search(keyword, query.get("mode", ["exact"])[0], limit)
+            self.__send_json(HTTPStatus.OK, items_to_json(items))
+        elif path == "/members":
+            self.__send_json(HTTPStatus.OK, _encode(library.get_members()))
+        else:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"no such resource {path}.")
+
+    def __post(self, path:str, query:dict) -> None:
+        """Route a POST request."""
+        payload = self.__read_json()
+        library = self.server.library
+
+        if path == "/items":
+            kind, title, pub_year, author_name = _require(
+                payload, kind=str, title=str, pub_year=str, author_name=str
+            )
+            item_class = ITEM_KINDS.get(kind)
+            if item_class is None:
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"unknown item kind {kind}.")
+            detail = payload.get("detail")
+            if detail is not None:
+                _check_type("detail", detail, str)
+            item = item_class.from_fields(title, pub_year, author_name, detail)
+            library.add_item(item)
+            self.__send_json(HTTPStatus.CREATED, _encode({"id": item.get_id()}))
+        elif path == "/members":
+            (name,) = _require(payload, name=str)
+            self.__send_json(HTTPStatus.CREATED, _encode({"id": library.create_member(name)}))
+        elif path == "/lend":
+            self.__send_json(HTTPStatus.OK, _encode(self.__lend(payload)))
+        elif path == "/return":
+            self.__send_json(HTTPStatus.OK, _encode(self.__return(payload)))
+        elif path == "/batch":
+            (operations,) = _require(payload, operations=list)
+            if len(operations) > MAX_BATCH_SIZE:
+                raise RequestError(
+                    HTTPStatus.BAD_REQUEST, f"operations must be a list of at most {MAX_BATCH_SIZE}."
+                )
+            results = [self.__run_operation(operation) for operation in operations]
+            self.__send_json(HTTPStatus.OK, b'{"results":[' + b",".join(results) + b"]}")
+        else:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"no such resource {path}.")
+
+    def __run_operation(self, operation) -> bytes:
+        """Run one operation of a batch, returning its encoded result; failures do not stop the batch."""
+        try:
+            (op,) = _require(operation, op=str)
+            if op == "lend":
+                return _encode({"ok": True, **self.__lend(operation)})
+            if op == "return":
+                return _encode({"ok": True, **self.__return(operation)})
+            if op == "search":
+                (keyword,) = _require(operation, keyword=str)
+                items = self.__search(keyword, operation.get("mode", "exact"), operation.get("limit"))
+                return b'{"ok":true,"items":' + items_to_json(items) + b"}"
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"unknown operation {op}.")
+        except (RequestError, ValueError, TypeError) as error:
+            return _encode({"ok": False, "error": str(error)})
+
+    def __lend(self, payload:dict) -> dict:
+        """Lend an item, returning its due date."""
+        member_id, item_id = _require(payload, member_id=str, item_id=str)
+        item = self.__get_item(item_id)
+        try:
+            self.server.library.lend_item(member_id, item)
+        except Exception as error:
+            raise _refusal(error) from None
+
+        return {"due_date": item.get_due_date()}
+
+    def __return(self, payload:dict) -> dict:
+        """Return an item, reporting the member it was handed to, if any."""
+        member_id, item_id = _require(payload, member_id=str, item_id=str)
+        item = self.__get_item(item_id)
+        try:
+            handed_to = self.server.library.return_item(member_id, item)
+        except Exception as error:
+            raise _refusal(error) from None
+
+        return {"handed_to": handed_to}
+
+    def __search(self, keyword:str, mode:str, limit) -> list:
+        """Search the library, turning bad arguments into request errors."""
+        _check_type("mode", mode, str)
+        limit = _parse_limit(limit)
+        try:
+            return self.server.library.search_item(keyword, mode, limit)
+        except ValueError as error:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(error)) from None
+
+    def __get_item(self, item_id:str):
+        """Return an item of the library by its ID."""
+        try:
+            return self.server.library.get_item(item_id)
+        except KeyError:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"item {item_id} does not exist.") from None
+
+    def __read_json(self):
+        """Read and parse the JSON body of the request."""
+        length = self.headers.get("Content-Length") or "0"
+        if not length.isdigit():
+            # The body cannot be told apart from the next request.
+            self.close_connection = True
+            raise RequestError(HTTPStatus.BAD_REQUEST, "invalid Content-Length.")
+
+        length = int(length)
+        if length > MAX_BODY_SIZE:
+            # The unread body would be taken for the next request.
+            self.close_connection = True
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large.")
+
+        try:
+            return json.loads(self.rfile.read(length)) if length else {}
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "request body is not valid JSON.") from None
+
+    def __send_json(self, status:HTTPStatus, body:bytes) -> None:
+        """Send a complete JSON response."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def __send_stream(self, chunks) -> None:
+        """Send a JSON response as it is produced, with chunked transfer encoding."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            if chunk:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def serve(library:Library, host:str = "127.0.0.1", port:int = 8080, page_size:int = 1_000,
+          verbose:bool = False) -> None:
+    """
+    Serve a library over HTTP until interrupted.
+
+    :param library: The Library to serve. It should be thread-safe.
+    :param host: Interface to listen on.
+    :param port: Port to listen on.
+    :param page_size: Number of items serialized per streamed chunk of GET /items.
+    :param verbose: Whether to log every request to stderr.
+    """
+    with LibraryHTTPServer((host, port), library, page_size, verbose) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,381 @@
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+from datetime import datetime
+from itertools import chain, islice
+
+from .ids import new_id
+from .library import Library
+from .library_item import LibraryItem
+
+
+def _serve(connection) -> None:
+    """
+    Run one shard: apply (method, args) requests to a private Library until None arrives.
+
+    Lends and returns name the item by ID, and are applied to the shard's own
+    copy of the item. Every request is answered with (True, result) or
+    (False, exception).
+    """
+    library = Library()
+    while True:
+        request = connection.recv()
+        if request is None:
+            library.close()
+            connection.close()
+            return
+
+        method, args = request
+        try:
+            if method in ("lend_item", "return_item"):
+                member_id, item_id = args
+                result = getattr(library, method)(member_id, library.get_item(item_id))
+            else:
+                result = getattr(library, method)(*args)
+        except Exception as error:
+            connection.send((False, error))
+        else:
+            connection.send((True, result))
+
+
+class ShardedLibrary:
+    """
+    Library partitioned across worker processes, each owning a private Library.
+
+    Items live on the shard picked by the crc32 of their ID. Members are
+    registered on every shard under the same ID, so a lend or return runs
+    entirely on the shard owning the item, with that shard's own checks.
+    Searches and due date queries are sent to all shards at once and their
+    results merged.
+
+    Items and dicts returned by queries are copies made in the shard process;
+    changing them does not change the library, and the item passed to
+    lend_item or return_item only identifies the item by its ID.
+
+    Attributes:
+        __connections (list): Pipe ends connected to the shard processes.
+        __processes (list): The shard processes.
+        __locks (list): One lock per shard, keeping each request paired with its response.
+    """
+
+    def __init__(self, shards:int = None, start_method:str = None):
+        """
+        Initialize a new ShardedLibrary instance and start its shard processes.
+
+        :param shards: Number of shard processes. Defaults to the number of CPUs.
+        :param start_method: Optional multiprocessing start method, e.g. "spawn".
+        :raises ValueError: If shards is not positive.
+        """
+        shards = (os.cpu_count() or 1) if shards is None else shards
+        if shards < 1:
+            raise ValueError("shards must be a positive integer.")
+
+        context = multiprocessing.get_context(start_method)
+        self.__connections = []
+        self.__processes = []
+        self.__locks = []
+
+        for _ in range(shards):
+            connection, child_connection = context.Pipe()
+            process = context.Process(target=_serve, args=(child_connection,), daemon=True)
+            process.start()
+            child_connection.close()
+
+            self.__connections.append(connection)
+            self.__processes.append(process)
+            self.__locks.append(threading.Lock())
+
+    def get_shard_count(self) -> int:
+        """Return the number of shards."""
+        return len(self.__connections)
+
+    def shard_of(self, item_id:str) -> int:
+        """
+        Return the index of the shard owning an item.
+
+        :param item_id: The unique identifier of the item.
+        """
+        return zlib.crc32(item_id.encode()) % len(self.__connections)
+
+    def __call(self, shard:int, method:str, *args):
+        """Run a Library method on one shard and return its result, re-raising its error."""
+        with self.__locks[shard]:
+            self.__connections[shard].send((method, args))
+            ok, result = self.__connections[shard].recv()
+
+        if not ok:
+            raise result
+
+        return result
+
+    def __scatter(self, requests:dict) -> dict:
+        """
+        Run Library methods on several shards in parallel.
+
+        All requests are sent before any response is read. If shards fail, the
+        first error is raised once every response has been collected.
+
+        :param requests: Maps shard indexes to (method, args) pairs.
+        :return: A dict mapping the shard indexes to their results.
+        """
+        shards = sorted(requests)
+        for shard in shards:
+            self.__locks[shard].acquire()
+
+        try:
+            for shard in shards:
+                self.__connections[shard].send(requests[shard])
+            responses = {shard: self.__connections[shard].recv() for shard in shards}
+        finally:
+            for shard in shards:
+                self.__locks[shard].release()
+
+        for ok, result in responses.values():
+            if not ok:
+                raise result
+
+        return {shard: result for shard, (_, result) in responses.items()}
+
+    def __broadcast(self, method:str, *args) -> list:
+        """Run the same Library method on every shard, returning the results in shard order."""
+        results = self.__scatter({shard: (method, args) for shard in range(len(self.__connections))})
+        return [results[shard] for shard in range(len(self.__connections))]
+
+    def add_item(self, item:LibraryItem) -> None:
+        """
+        Add a new LibraryItem to the shard owning its ID.
+
+        :param item: The LibraryItem object to add.
+        :raises ValueError: If the provided item is not a valid LibraryItem instance.
+        """
+        if not isinstance(item, LibraryItem):
+            raise ValueError("item must be a valid LibraryItem object.")
+
+        self.__call(self.shard_of(item.get_id()), "add_item", item)
+
+    def add_items(self, items, batch_size:int = 10_000) -> int:
+        """
+        Add many LibraryItems, loading every batch into all shards in parallel.
+
+        :param items: Iterable of LibraryItem objects.
+        :param batch_size: Number of items validated and distributed together.
+        :return: The number of items added.
+        :raises ValueError: If a batch holds an object that is not a valid LibraryItem instance.
+        """
+        items = iter(items)
+        added = 0
+
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                return added
+
+            if not all(isinstance(item, LibraryItem) for item in batch):
+                raise ValueError("items must all be valid LibraryItem objects.")
+
+            partitions = {}
+            for item in batch:
+                partitions.setdefault(self.shard_of(item.get_id()), []).append(item)
+
+            results = self.__scatter(
+                {shard: ("add_items", (partition,)) for shard, partition in partitions.items()}
+            )
+            added += sum(results.values())
+
+    def remove_item(self, item_id:str) -> None:
+        """
+        Remove a LibraryItem from its shard.
+
+        :param item_id: The unique identifier of the item to remove.
+        :raises KeyError: If no item with the given ID exists in the library.
+        """
+        self.__call(self.shard_of(item_id), "remove_item", item_id)
+
+    def get_item(self, item_id:str) -> LibraryItem:
+        """
+        Retrieve a copy of an item by its ID.
+
+        :param item_id: The unique identifier of the item.
+        :raises KeyError: If no item with the given ID exists in the library.
+        """
+        return self.__call(self.shard_of(item_id), "get_item", item_id)
+
+    def search_item(self, keyword:str, mode:str = "exact", limit:int = None) -> list[LibraryItem]:
+        """
+        Search all shards in parallel, see Library.search_item.
+
+        :return: Copies of the matching items, grouped by shard, or most relevant
+                 first in "ranked" mode.
+        :raises ValueError: If mode is not a supported search mode.
+        """
+        if mode == "ranked":
+            return [item for item, _ in self.search_ranked(keyword, limit)]
+
+        items = chain.from_iterable(self.__broadcast("search_item", keyword, mode, limit))
+        return list(items if limit is None else islice(items, limit))
+
+    def search_ranked(self, keyword:str, limit:int = 10) -> list[tuple[LibraryItem, float]]:
+        """
+        Rank items on all shards in parallel and merge the best matches, see Library.search_ranked.
+
+        Each shard scores against the word frequencies of its own part of the
+        catalog, which closely match the whole catalog's once shards are large.
+
+        :return: (item copy, relevance score) pairs, most relevant first.
+        """
+        ranked = heapq.merge(
+            *self.__broadcast("search_ranked", keyword, limit),
+            key=lambda entry: entry[1],
+            reverse=True
+        )
+        return list(ranked if limit is None else islice(ranked, limit))
+
+    def get_items(self, fields:tuple = None) -> list[dict]:
+        """
+        Return information about all items, grouped by shard.
+
+        :param fields: Optional names of the keys to include, see LibraryItem.get_field.
+        """
+        return list(chain.from_iterable(self.__broadcast("get_items", fields)))
+
+    def create_member(self, name:str) -> str:
+        """
+        Create a new member and register it on every shard.
+
+        :param name: The name of the new member.
+        :return: The unique ID of the created member.
+        :raises ValueError: If provided name is not a string.
+        """
+        if not isinstance(name, str):
+            raise ValueError(f"{name} have to be of type string.")
+
+        member_id = new_id()
+        self.__broadcast("create_member", name, member_id)
+
+        return member_id
+
+    def create_members(self, names) -> list[str]:
+        """
+        Create many members and register them on every shard.
+
+        :param names: Iterable of member names.
+        :return: The unique IDs of the created members, in input order.
+        :raises ValueError: If any provided name is not a string.
+        """
+        names = list(names)
+        for name in names:
+            if not isinstance(name, str):
+                raise ValueError(f"{name} have to be of type string.")
+
+        member_ids = [new_id() for _ in names]
+        self.__broadcast("create_members", names, member_ids)
+
+        return member_ids
+
+    def get_members(self, fields:tuple = None) -> list[dict]:
+        """
+        Return information about all registered members.
+
+        :param fields: Optional names of the keys to include, see Member.get_field.
+        """
+        return self.__call(0, "get_members", fields)
+
+    def lend_item(self, member_id:str, item:LibraryItem) -> None:
+        """
+        Lend an item to a registered member on the shard owning the item.
+
+        :param member_id: The unique ID of the member borrowing the item.
+        :param item: The item to lend, or a copy of it; only its ID is used.
+        :raises Exception: If the member or item does not exist in the library, or the
+                           item is already on loan.
+        """
+        self.__call(self.shard_of(item.get_id()), "lend_item", member_id, item.get_id())
+
+    def return_item(self, member_id:str, item:LibraryItem) -> None:
+        """
+        Process the return of a borrowed item on the shard owning it.
+
+        :param member_id: The unique ID of the member returning the item.
+        :param item: The item to return, or a copy of it; only its ID is used.
+        :raises Exception: If the member or item does not exist in the library.
+        """
+        self.__call(self.shard_of(item.get_id()), "return_item", member_id, item.get_id())
+
+    def get_borrower_id(self, item_id:str) -> str:
+        """
+        Find who holds an item.
+
+        :param item_id: The unique identifier of the item.
+        :return: The ID of the borrowing member, or None if the item is not on loan.
+        :raises KeyError: If no item with the given ID exists in the library.
+        """
+        return self.__call(self.shard_of(item_id), "get_borrower_id", item_id)
+
+    def get_borrowed_item_ids(self, member_id:str) -> list[str]:
+        """
+        List the IDs of the items a member holds, grouped by shard.
+
+        :param member_id: The unique ID of the member.
+        """
+        return list(chain.from_iterable(self.__broadcast("get_borrowed_item_ids", member_id)))
+
+    def get_loan_count(self, member_id:str) -> int:
+        """
+        Count the items a member holds across all shards.
+
+        :param member_id: The unique ID of the member.
+        """
+        return sum(self.__broadcast("get_loan_count", member_id))
+
+    def get_overdue_items(self) -> list[LibraryItem]:
+        """
+        Retrieve copies of all overdue items, earliest due first.
+        """
+        return self.__merge_by_due_date(self.__broadcast("get_overdue_items"))
+
+    def get_items_due_within(self, days:int) -> list[LibraryItem]:
+        """
+        Retrieve copies of the borrowed items falling due within a number of days, earliest due first.
+
+        :param days: The number of days to look ahead.
+        """
+        return self.__merge_by_due_date(self.__broadcast("get_items_due_within", days))
+
+    @staticmethod
+    def __merge_by_due_date(results:list) -> list[LibraryItem]:
+        """Merge per-shard lists already ordered by due date."""
+        return list(heapq.merge(*results, key=lambda item: item.get_due_date()))
+
+    def calculate_fines(self, moment:datetime = None) -> dict:
+        """
+        Calculate the fines owed by every member across all shards.
+
+        :param moment: The time to calculate the fines at. Defaults to now.
+        :return: A dict mapping member IDs to their total fine; members owing nothing are left out.
+        """
+        moment = datetime.now() if moment is None else moment
+        totals = {}
+        for fines in self.__broadcast("calculate_fines", moment):
+            for member_id, fine in fines.items():
+                totals[member_id] = totals.get(member_id, 0.0) + fine
+
+        return totals
+
+    def close(self) -> None:
+        """Stop the shard processes. Calling close again has no effect."""
+        for shard, connection in enumerate(self.__connections):
+            with self.__locks[shard]:
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass
+                connection.close()
+
+        for process in self.__processes:
+            process.join()
+
+        self.__connections = []
+        self.__processes = []
+        self.__locks = []
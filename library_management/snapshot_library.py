@@ -0,0 +1,172 @@
+from datetime import datetime
+
+from .columnar import ColumnarSnapshot, NO_MEMBER
+from .library import _decode_cursor, _encode_cursor
+from .library_item import LibraryItem, ITEM_TYPES
+from .member import Member
+from .timestamps import NO_TIMESTAMP, from_micros, to_micros
+
+
+class SnapshotLibrary:
+    """
+    Read-only library served straight from a columnar snapshot, see Library.export_columnar.
+
+    Opening maps the file without reading its rows, so even a very large catalog
+    is available at once; each call decodes only the rows it returns. Items are
+    built on every access and are detached: changing them does not change the
+    snapshot, and their borrowers are Member objects that do not track the loan.
+
+    Attributes:
+        __snapshot (ColumnarSnapshot): The mapped snapshot file.
+    """
+
+    def __init__(self, path):
+        """
+        Open a columnar snapshot.
+
+        :param path: Path of a file written by Library.export_columnar.
+        :raises ValueError: If the file is not a columnar snapshot.
+        """
+        self.__snapshot = ColumnarSnapshot(path)
+
+    def __enter__(self) -> "SnapshotLibrary":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_item_count(self) -> int:
+        """Return the number of items in the snapshot."""
+        return self.__snapshot.get_item_count()
+
+    def get_member_count(self) -> int:
+        """Return the number of registered members in the snapshot."""
+        return sum(registered for _, _, registered in self.__snapshot.iter_member_records())
+
+    def get_item(self, item_id:str) -> LibraryItem:
+        """
+        Retrieve an item by its ID.
+
+        :param item_id: The unique identifier of the item.
+        :return: A new LibraryItem object holding the item's fields.
+        :raises KeyError: If no item with the given ID exists in the snapshot.
+        """
+        return self.__item(self.__find_item(item_id))
+
+    def get_borrower_id(self, item_id:str) -> str:
+        """
+        Find who holds an item without building it.
+
+        :param item_id: The unique identifier of the item.
+        :return: The ID of the borrowing member, or None if the item is not on loan.
+        :raises KeyError: If no item with the given ID exists in the snapshot.
+        """
+        borrower = self.__snapshot.get_borrower_row(self.__find_item(item_id))
+        if borrower == NO_MEMBER:
+            return None
+
+        return self.__snapshot.get_member_record(borrower)[0]
+
+    def get_items(self, fields:tuple = None) -> list[dict]:
+        """
+        Return information about all items, ordered by item ID ignoring case.
+
+        :param fields: Optional names of the keys to include, see LibraryItem.get_field.
+        """
+        return list(self.iter_items(fields))
+
+    def get_items_page(
+            self,
+            cursor:str = None,
+            limit:int = 100,
+            fields:tuple = None
+    ) -> tuple[list[dict], str]:
+        """
+        Return one page of item information, with the same cursors as Library.get_items_page.
+
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: Maximum number of items on the page.
+        :param fields: Optional names of the keys to include, see LibraryItem.get_field.
+        :return: The page and the cursor of the next one, which is None after the last page.
+        :raises ValueError: If the cursor is invalid or limit is not positive.
+        """
+        if limit < 1:
+            raise ValueError("limit must be a positive integer.")
+
+        after = None if cursor is None else _decode_cursor("item", cursor)
+        start = self.__snapshot.first_item_after(after)
+        end = min(start + limit, self.__snapshot.get_item_count())
+        page = [self.__item(row).get_info(fields) for row in range(start, end)]
+        if end == self.__snapshot.get_item_count():
+            return page, None
+
+        return page, _encode_cursor("item", self.__snapshot.get_item_id(end - 1))
+
+    def iter_items(self, fields:tuple = None):
+        """
+        Lazily iterate over the information of all items, ordered as get_items_page.
+
+        :param fields: Optional names of the keys to include, see LibraryItem.get_field.
+        :return: A generator of item dictionaries.
+        """
+        for row in range(self.__snapshot.get_item_count()):
+            yield self.__item(row).get_info(fields)
+
+    def get_members(self, fields:tuple = None) -> list[dict]:
+        """
+        Return information about all registered members, ordered by member ID.
+
+        :param fields: Optional names of the keys to include, see Member.get_field.
+        """
+        return [
+            Member(name, member_id=member_id).get_info(fields)
+            for member_id, name, registered in self.__snapshot.iter_member_records()
+            if registered
+        ]
+
+    def get_overdue_items(self, moment:datetime = None) -> list[LibraryItem]:
+        """
+        Retrieve all overdue items by scanning the due date column.
+
+        :param moment: The time to compare due dates with. Defaults to now.
+        :return: A list of LibraryItem objects, earliest due first.
+        """
+        now = to_micros(datetime.now() if moment is None else moment)
+        snapshot = self.__snapshot
+        rows = [
+            row for row in range(snapshot.get_item_count())
+            if NO_TIMESTAMP != snapshot.get_due_date(row) < now
+        ]
+        rows.sort(key=snapshot.get_due_date)
+
+        return [self.__item(row) for row in rows]
+
+    def close(self) -> None:
+        """Unmap the snapshot file. Calling close again has no effect."""
+        self.__snapshot.close()
+
+    def __find_item(self, item_id:str) -> int:
+        """Return the row of an item, raising KeyError like Library if it is missing."""
+        row = self.__snapshot.find_item(item_id)
+        if row < 0:
+            raise KeyError(f"item with the {item_id} does not exist.")
+
+        return row
+
+    def __item(self, row:int) -> LibraryItem:
+        """Build a detached item from one row of the snapshot."""
+        kind, item_id, title, pub_year, author_name, detail, borrower_id, borrower_name, due, _ = \
+            self.__snapshot.get_item_record(row)
+        if borrower_id is None:
+            return ITEM_TYPES[kind].from_fields(title, pub_year, author_name, detail, item_id=item_id)
+
+        return ITEM_TYPES[kind].from_fields(
+            title,
+            pub_year,
+            author_name,
+            detail,
+            is_borrowed=True,
+            borrowed_by=Member(borrower_name, member_id=borrower_id),
+            due_date=from_micros(due),
+            item_id=item_id
+        )
@@ -0,0 +1,136 @@
+from bisect import bisect_left, insort
+from itertools import chain
+
+
+class SortedList:
+    """
+    Sorted collection of comparable values split into bounded chunks.
+
+    A flat sorted list pays an O(n) memory move on every insert, which dominates
+    once an index holds millions of entries. Chunking keeps each insert or
+    removal bounded by the chunk size.
+
+    Attributes:
+        __chunks (list): Sorted lists of values; every chunk sorts after the previous one.
+        __maxes (list): The largest value of each chunk.
+        __size (int): Total number of stored values.
+    """
+
+    LOAD = 512
+
+    def __init__(self, values=()):
+        """
+        Initialize a new SortedList instance.
+
+        :param values: Optional iterable of initial values.
+        """
+        self.__chunks = []
+        self.__maxes = []
+        self.__size = 0
+        self.update(values)
+
+    def __len__(self) -> int:
+        """Return the number of stored values."""
+        return self.__size
+
+    def __iter__(self):
+        """Iterate over the values in ascending order."""
+        for chunk in self.__chunks:
+            yield from chunk
+
+    def update(self, values) -> None:
+        """
+        Add many values at once.
+
+        Large batches are merged with a single sort of the whole collection;
+        batches small relative to the collection are inserted one by one.
+
+        :param values: Iterable of values to add.
+        """
+        values = list(values)
+        if len(values) < self.__size // 8:
+            for value in values:
+                self.add(value)
+            return
+
+        values.extend(chain.from_iterable(self.__chunks))
+        values.sort()
+        load = self.LOAD
+        self.__chunks = [values[i:i + load] for i in range(0, len(values), load)]
+        self.__maxes = [chunk[-1] for chunk in self.__chunks]
+        self.__size = len(values)
+
+    def add(self, value) -> None:
+        """
+        Insert a value, keeping the collection sorted.
+
+        :param value: The value to insert.
+        """
+        chunks, maxes = self.__chunks, self.__maxes
+        self.__size += 1
+
+        if not chunks:
+            chunks.append([value])
+            maxes.append(value)
+            return
+
+        position = bisect_left(maxes, value)
+        if position == len(maxes):
+            position -= 1
+            chunks[position].append(value)
+            maxes[position] = value
+        else:
+            insort(chunks[position], value)
+
+        chunk = chunks[position]
+        if len(chunk) > 2 * self.LOAD:
+            tail = chunk[self.LOAD:]
+            del chunk[self.LOAD:]
+            maxes[position] = chunk[-1]
+            chunks.insert(position + 1, tail)
+            maxes.insert(position + 1, tail[-1])
+
+    def remove(self, value) -> None:
+        """
+        Remove one occurrence of a value.
+
+        :param value: The value to remove.
+        :raises ValueError: If the value is not present.
+        """
+        chunks, maxes = self.__chunks, self.__maxes
+        position = bisect_left(maxes, value)
+        if position == len(maxes):
+            raise ValueError(f"{value!r} is not in the list.")
+
+        chunk = chunks[position]
+        index = bisect_left(chunk, value)
+        if chunk[index] != value:
+            raise ValueError(f"{value!r} is not in the list.")
+
+        del chunk[index]
+        self.__size -= 1
+
+        if chunk:
+            maxes[position] = chunk[-1]
+        else:
+            del chunks[position]
+            del maxes[position]
+
+    def irange(self, start):
+        """
+        Iterate in ascending order over the values greater than or equal to start.
+
+        :param start: The inclusive lower bound.
+        """
+        chunks = self.__chunks
+        position = bisect_left(self.__maxes, start)
+        if position == len(chunks):
+            return
+
+        index = bisect_left(chunks[position], start)
+        while position < len(chunks):
+            chunk = chunks[position]
+            for value_index in range(index, len(chunk)):
+                yield chunk[value_index]
+            position += 1
+            index = 0
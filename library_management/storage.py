@@ -0,0 +1,637 @@
+import os
+import sqlite3
+import struct
+import zlib
+from pathlib import Path
+
+from .inventory import Copy
+from .library_item import LibraryItem, ITEM_TYPES
+from .timestamps import to_micros, NO_TIMESTAMP
+
+
+# Operation codes recorded in the write-ahead log.
+ADD_ITEM = 1
+REMOVE_ITEM = 2
+CREATE_MEMBER = 3
+LEND_ITEM = 4
+RETURN_ITEM = 5
+
+# Field layout of each operation: "B" unsigned byte, "s" optional string, "q" signed 64-bit int.
+# ADD_ITEM: kind, id, title, pub_year, author_name, detail, borrower id, borrower name, due date,
+# and the title ID of a Copy.
+SCHEMAS = {
+    ADD_ITEM: "Bsssssssqs",
+    REMOVE_ITEM: "s",
+    CREATE_MEMBER: "ss",
+    LEND_ITEM: "ssq",
+    RETURN_ITEM: "ss",
+}
+
+_BYTE = struct.Struct("<B")
+_LENGTH = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FRAME = struct.Struct("<II")
+_HEADER = struct.Struct("<8sq")
+_NONE_LENGTH = 0xFFFFFFFF
+
+SNAPSHOT_MAGIC = b"LMSSNAP2"
+WAL_MAGIC = b"LMSWAL02"
+
+# Files written before ADD_ITEM records carried a title ID; they are still read.
+_LEGACY_SNAPSHOT_MAGIC = b"LMSSNAP1"
+_LEGACY_WAL_MAGIC = b"LMSWAL01"
+_LEGACY_ADD_ITEM = "Bsssssssq"
+
+
+def item_record(item:LibraryItem) -> tuple:
+    """
+    Flatten an item into an ADD_ITEM record.
+
+    :param item: The LibraryItem object to flatten.
+    :return: A tuple laid out as SCHEMAS[ADD_ITEM]; the title ID is None unless the item is a Copy.
+    :raises ValueError: If the item's kind is not one of ITEM_TYPES.
+    """
+    if item.get_kind() not in ITEM_TYPES:
+        raise ValueError(f"{type(item).__name__} items cannot be stored.")
+
+    borrower = item.get_borrowed_by() if item.get_is_borrowed() else None
+    due_date = item.get_due_date() if item.get_is_borrowed() else None
+
+    return (
+        ITEM_TYPES.index(item.get_kind()),
+        item.get_id(),
+        item.get_title(),
+        item.get_pub_year(),
+        item.get_author(),
+        item.get_detail(),
+        None if borrower is None else borrower.get_id(),
+        None if borrower is None else borrower.get_name(),
+        to_micros(due_date),
+        item.get_record().get_id() if isinstance(item, Copy) else None,
+    )
+
+
+def _add_item_decoder(schema:str):
+    """Return a decoder of ADD_ITEM records in the given layout, padding legacy records with no title ID."""
+    decode = _layout(schema).decode
+    if schema == SCHEMAS[ADD_ITEM]:
+        return decode
+
+    def decode_legacy(buffer, offset:int = 0) -> tuple:
+        record, offset = decode(buffer, offset)
+        return record + (None,), offset
+
+    return decode_legacy
+
+
+class _Layout:
+    """
+    Binary layout of one schema: a fixed-size struct holding every byte and int
+    field plus the length of every string field, followed by the string bytes.
+
+    Packing the fixed part with a single struct call keeps decoding cheap
+    enough to replay millions of WAL records.
+
+    Attributes:
+        __codes (str): The schema string.
+        __fixed (struct.Struct): Struct of the fixed-size part.
+        __strings (tuple): Positions of the string fields in the schema.
+    """
+
+    def __init__(self, schema:str):
+        """
+        Initialize a new _Layout instance.
+
+        :param schema: Field layout, see SCHEMAS.
+        """
+        self.__codes = schema
+        self.__fixed = struct.Struct("<" + schema.replace("s", "I"))
+        self.__strings = tuple(index for index, code in enumerate(schema) if code == "s")
+
+    def encode(self, values) -> bytes:
+        """Pack values; non-string values in string fields are stored as their str()."""
+        fixed = []
+        strings = []
+        for code, value in zip(self.__codes, values):
+            if code != "s":
+                fixed.append(value)
+            elif value is None:
+                fixed.append(_NONE_LENGTH)
+            else:
+                data = str(value).encode("utf-8")
+                fixed.append(len(data))
+                strings.append(data)
+
+        return self.__fixed.pack(*fixed) + b"".join(strings)
+
+    def decode(self, buffer, offset:int = 0) -> tuple:
+        """Unpack values, returning a (values, next_offset) tuple."""
+        values = list(self.__fixed.unpack_from(buffer, offset))
+        offset += self.__fixed.size
+
+        # Only the string fields need a second look: their slot holds the length.
+        for index in self.__strings:
+            length = values[index]
+            if length == _NONE_LENGTH:
+                values[index] = None
+            else:
+                end = offset + length
+                values[index] = str(buffer[offset:end], "utf-8")
+                offset = end
+
+        return tuple(values), offset
+
+
+_LAYOUTS = {}
+
+
+def _layout(schema:str) -> _Layout:
+    """Return the cached layout of a schema."""
+    layout = _LAYOUTS.get(schema)
+    if layout is None:
+        layout = _LAYOUTS[schema] = _Layout(schema)
+
+    return layout
+
+
+def encode(schema:str, values) -> bytes:
+    """
+    Pack values according to a schema string.
+
+    Non-string values in string fields are stored as their str().
+
+    :param schema: Field layout, see SCHEMAS.
+    :param values: The values to pack, one per schema character.
+    """
+    return _layout(schema).encode(values)
+
+
+def decode(schema:str, buffer, offset:int = 0) -> tuple:
+    """
+    Unpack values packed by encode().
+
+    :param schema: Field layout, see SCHEMAS.
+    :param buffer: Bytes-like object holding the packed values.
+    :param offset: Position of the first field in buffer.
+    :return: A (values, next_offset) tuple.
+    """
+    return _layout(schema).decode(buffer, offset)
+
+
+def cancel_loan_churn(operations:list) -> list:
+    """
+    Drop LEND_ITEM/RETURN_ITEM pairs that leave no trace in the final state.
+
+    A return that directly follows the lend of the same item by the same
+    member, with no other operation on that item in between, cancels out.
+
+    :param operations: (operation, record) pairs in log order.
+    :return: The remaining operations, in log order.
+    """
+    operations = list(operations)
+    open_lends = {}
+
+    for position, (operation, record) in enumerate(operations):
+        if operation == LEND_ITEM:
+            open_lends[record[1]] = position
+        elif operation == RETURN_ITEM:
+            lent_at = open_lends.pop(record[1], None)
+            if lent_at is not None and operations[lent_at][1][0] == record[0]:
+                operations[lent_at] = None
+                operations[position] = None
+        elif operation == ADD_ITEM:
+            open_lends.pop(record[1], None)
+        elif operation == REMOVE_ITEM:
+            open_lends.pop(record[0], None)
+
+    return [entry for entry in operations if entry is not None]
+
+
+def _frame(operation:int, record:tuple) -> bytes:
+    """Encode one operation as a WAL frame: its length and CRC32, then the operation code and record."""
+    body = _BYTE.pack(operation) + encode(SCHEMAS[operation], record)
+    return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+class Storage:
+    """
+    Base class of the persistence backends used by Library.
+
+    A backend receives every mutating operation through append() and hands the
+    persisted state back through load() when a Library is reopened.
+    """
+
+    def load(self) -> tuple:
+        """
+        Read the persisted state.
+
+        :return: A (members, items, operations) tuple: (id, name) member tuples,
+                 ADD_ITEM records, and (operation, record) pairs to replay on top.
+        """
+        raise NotImplementedError
+
+    def append(self, operation:int, record:tuple) -> None:
+        """
+        Persist one operation.
+
+        :param operation: One of the operation codes, e.g. LEND_ITEM.
+        :param record: The operation's fields, laid out as SCHEMAS[operation].
+        """
+        raise NotImplementedError
+
+    def append_many(self, operation:int, records:list) -> None:
+        """
+        Persist many operations of one kind, which backends commit together.
+
+        :param operation: One of the operation codes, e.g. LEND_ITEM.
+        :param records: The operations' fields, each laid out as SCHEMAS[operation].
+        """
+        for record in records:
+            self.append(operation, record)
+
+    def needs_snapshot(self) -> bool:
+        """Return if enough operations were logged since the last snapshot that the library should write one."""
+        return False
+
+    def write_snapshot(self, members, items) -> None:
+        """
+        Persist the full state so that earlier operations no longer need replaying.
+
+        :param members: Iterable of Member objects.
+        :param items: Iterable of LibraryItem objects.
+        """
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Make every appended operation durable."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush and release the backend."""
+        self.flush()
+
+
+class FileStorage(Storage):
+    """
+    Binary snapshot plus append-only write-ahead log, kept in one directory.
+
+    WAL records are framed with their length and a CRC32, so a torn tail left
+    by a crash is detected and dropped on load. Appends are buffered and
+    written with one fsync per group of group_size operations (group commit);
+    flush() forces the pending group out.
+
+    The snapshot and the WAL carry a generation number. A snapshot covers
+    every WAL generation up to its own, so a crash between writing a snapshot
+    and starting the next WAL never replays an operation twice.
+
+    Replaying the WAL is what makes a cold start slow, so needs_snapshot asks
+    the Library for a new snapshot once the WAL holds snapshot_threshold
+    operations, or as many operations as the last snapshot held records if
+    that is more. A restore then replays at most that many operations, and
+    the cost of writing snapshots stays proportional to the operations logged.
+
+    Attributes:
+        __snapshot_path (Path): Path of the snapshot file.
+        __wal_path (Path): Path of the write-ahead log.
+        __group_size (int): Number of operations written per fsync.
+        __snapshot_threshold (int): Operations logged before a snapshot is due, or None to never ask.
+        __pending (list): Encoded WAL frames not yet written.
+        __generation (int): Generation of the current WAL.
+        __wal (file): The WAL opened for appending, or None until the first append.
+        __wal_operations (int): Number of operations in the current WAL, including pending ones.
+        __snapshot_records (int): Number of members and items in the last snapshot.
+    """
+
+    SNAPSHOT_FILE = "snapshot.bin"
+    WAL_FILE = "wal.bin"
+
+    def __init__(self, directory, group_size:int = 64, snapshot_threshold:int = 100_000):
+        """
+        Initialize a new FileStorage instance.
+
+        :param directory: Directory holding the snapshot and WAL; created if missing.
+        :param group_size: Number of operations buffered before each write and fsync.
+        :param snapshot_threshold: Minimum number of operations logged before a snapshot is due,
+                                   see needs_snapshot. None leaves snapshots to Library.snapshot.
+        :raises ValueError: If snapshot_threshold is not positive.
+        """
+        if snapshot_threshold is not None and snapshot_threshold < 1:
+            raise ValueError("snapshot_threshold must be positive.")
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        self.__snapshot_path = directory / self.SNAPSHOT_FILE
+        self.__wal_path = directory / self.WAL_FILE
+        self.__group_size = group_size
+        self.__snapshot_threshold = snapshot_threshold
+        self.__pending = []
+        self.__generation = 0
+        self.__wal = None
+        self.__wal_operations = 0
+        self.__snapshot_records = 0
+
+    def load(self) -> tuple:
+        """Read the snapshot and the WAL operations that follow it."""
+        members, items, covered = self.__read_snapshot()
+        generation, operations, logged, valid_length = self.__read_wal()
+        self.__snapshot_records = len(members) + len(items)
+
+        if generation is None or generation <= covered:
+            self.__start_wal(covered + 1)
+            operations = []
+        else:
+            self.__generation = generation
+            self.__wal = open(self.__wal_path, "r+b")
+            self.__wal.truncate(valid_length)
+            self.__wal.seek(valid_length)
+            self.__wal_operations = logged
+
+        return members, items, operations
+
+    def needs_snapshot(self) -> bool:
+        """Return if the WAL holds enough operations that replaying it costs more than writing a snapshot."""
+        if self.__snapshot_threshold is None:
+            return False
+
+        return self.__wal_operations >= max(self.__snapshot_threshold, self.__snapshot_records)
+
+    def __read_snapshot(self) -> tuple:
+        """Return the (members, items, covered_generation) stored in the snapshot."""
+        if not self.__snapshot_path.exists():
+            return [], [], 0
+
+        buffer = memoryview(self.__snapshot_path.read_bytes())
+        magic, covered = _HEADER.unpack_from(buffer, 0)
+        if magic not in (SNAPSHOT_MAGIC, _LEGACY_SNAPSHOT_MAGIC):
+            raise ValueError(f"{self.__snapshot_path} is not a library snapshot.")
+        decode_item = _add_item_decoder(SCHEMAS[ADD_ITEM] if magic == SNAPSHOT_MAGIC else _LEGACY_ADD_ITEM)
+
+        offset = _HEADER.size
+        (member_count,) = _INT.unpack_from(buffer, offset)
+        offset += 8
+        members = []
+        for _ in range(member_count):
+            member, offset = decode(SCHEMAS[CREATE_MEMBER], buffer, offset)
+            members.append(member)
+
+        (item_count,) = _INT.unpack_from(buffer, offset)
+        offset += 8
+        items = []
+        for _ in range(item_count):
+            item, offset = decode_item(buffer, offset)
+            items.append(item)
+
+        return members, items, covered
+
+    def __read_wal(self) -> tuple:
+        """Return the WAL's (generation, operations without loan churn, operations logged, valid_length)."""
+        if not self.__wal_path.exists():
+            return None, [], 0, 0
+
+        buffer = memoryview(self.__wal_path.read_bytes())
+        if len(buffer) < _HEADER.size:
+            return None, [], 0, 0
+
+        magic, generation = _HEADER.unpack_from(buffer, 0)
+        if magic not in (WAL_MAGIC, _LEGACY_WAL_MAGIC):
+            raise ValueError(f"{self.__wal_path} is not a library write-ahead log.")
+
+        decoders = [None] * (max(SCHEMAS) + 1)
+        for operation, schema in SCHEMAS.items():
+            decoders[operation] = _layout(schema).decode
+        if magic == _LEGACY_WAL_MAGIC:
+            decoders[ADD_ITEM] = _add_item_decoder(_LEGACY_ADD_ITEM)
+        crc32 = zlib.crc32
+        unpack_frame = _FRAME.unpack_from
+        frame_size = _FRAME.size
+        size = len(buffer)
+        operations = []
+        append = operations.append
+        offset = _HEADER.size
+        while offset + frame_size <= size:
+            length, checksum = unpack_frame(buffer, offset)
+            start = offset + frame_size
+            end = start + length
+            if end > size or crc32(buffer[start:end]) != checksum:
+                break  # torn write at the tail
+
+            operation = buffer[start]
+            append((operation, decoders[operation](buffer, start + 1)[0]))
+            offset = end
+
+        operations = cancel_loan_churn(operations)
+        if magic == _LEGACY_WAL_MAGIC:
+            # New records cannot be appended in the old layout; carry the log over to the new one.
+            self.__write_wal(generation, operations)
+            return generation, operations, len(operations), self.__wal_path.stat().st_size
+
+        return generation, operations, len(operations), offset
+
+    def __start_wal(self, generation:int) -> None:
+        """Atomically replace the WAL with an empty one of the given generation."""
+        if self.__wal is not None:
+            self.__wal.close()
+
+        self.__write_wal(generation, [])
+        self.__generation = generation
+        self.__wal = open(self.__wal_path, "ab")
+
+    def __write_wal(self, generation:int, operations:list) -> None:
+        """Atomically replace the WAL file with one of the given generation holding some operations."""
+        parts = [_HEADER.pack(WAL_MAGIC, generation)]
+        parts.extend(_frame(operation, record) for operation, record in operations)
+
+        temporary = self.__wal_path.with_suffix(".tmp")
+        with open(temporary, "wb") as file:
+            file.write(b"".join(parts))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.__wal_path)
+
+    def append(self, operation:int, record:tuple) -> None:
+        """Buffer one operation, writing the group once it is full."""
+        self.__pending.append(_frame(operation, record))
+        self.__wal_operations += 1
+
+        if len(self.__pending) >= self.__group_size:
+            self.flush()
+
+    def append_many(self, operation:int, records:list) -> None:
+        """Buffer many operations into the same group, so they are written and fsynced together."""
+        for record in records:
+            self.__pending.append(_frame(operation, record))
+            self.__wal_operations += 1
+
+        if len(self.__pending) >= self.__group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write and fsync the pending group of operations."""
+        if not self.__pending:
+            return
+
+        if self.__wal is None:
+            self.__start_wal(self.__generation + 1)
+
+        self.__wal.write(b"".join(self.__pending))
+        self.__wal.flush()
+        os.fsync(self.__wal.fileno())
+        self.__pending.clear()
+
+    def write_snapshot(self, members, items) -> None:
+        """Write a snapshot covering the current WAL, then start a new WAL."""
+        self.flush()
+        covered = self.__generation
+
+        parts = [_HEADER.pack(SNAPSHOT_MAGIC, covered)]
+        members = list(members)
+        parts.append(_INT.pack(len(members)))
+        parts.extend(
+            encode(SCHEMAS[CREATE_MEMBER], (member.get_id(), member.get_name()))
+            for member in members
+        )
+        items = list(items)
+        parts.append(_INT.pack(len(items)))
+        parts.extend(encode(SCHEMAS[ADD_ITEM], item_record(item)) for item in items)
+
+        temporary = self.__snapshot_path.with_suffix(".tmp")
+        with open(temporary, "wb") as file:
+            file.write(b"".join(parts))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.__snapshot_path)
+
+        self.__snapshot_records = len(members) + len(items)
+        self.__wal_operations = 0
+        self.__start_wal(covered + 1)
+
+    def close(self) -> None:
+        """Flush pending operations and close the WAL."""
+        self.flush()
+        if self.__wal is not None:
+            self.__wal.close()
+            self.__wal = None
+
+
+class SQLiteStorage(Storage):
+    """
+    Stores the library state in SQLite tables.
+
+    Operations are applied to the tables as they arrive, so load() returns the
+    current state directly and there is nothing to replay. A transaction is
+    committed every group_size operations.
+
+    Attributes:
+        __connection (sqlite3.Connection): The open database connection.
+        __group_size (int): Number of operations per committed transaction.
+        __pending (int): Operations applied since the last commit.
+    """
+
+    def __init__(self, path, group_size:int = 64):
+        """
+        Initialize a new SQLiteStorage instance.
+
+        :param path: Path of the database file, or ":memory:".
+        :param group_size: Number of operations applied per committed transaction.
+        """
+        self.__connection = sqlite3.connect(str(path))
+        self.__group_size = group_size
+        self.__pending = 0
+        self.__connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS members (
+                id TEXT PRIMARY KEY,
+                name TEXT
+            );
+            CREATE TABLE IF NOT EXISTS items (
+                id TEXT PRIMARY KEY,
+                kind INTEGER NOT NULL,
+                title TEXT,
+                pub_year TEXT,
+                author_name TEXT,
+                detail TEXT,
+                borrower_id TEXT,
+                borrower_name TEXT,
+                due INTEGER NOT NULL,
+                title_id TEXT
+            );
+            """
+        )
+        columns = [row[1] for row in self.__connection.execute("PRAGMA table_info(items)")]
+        if "title_id" not in columns:
+            # Databases written before copies kept their title.
+            self.__connection.execute("ALTER TABLE items ADD COLUMN title_id TEXT")
+
+    def load(self) -> tuple:
+        """Read the members and items tables."""
+        members = self.__connection.execute(
+            "SELECT id, name FROM members ORDER BY rowid"
+        ).fetchall()
+        items = self.__connection.execute(
+            "SELECT kind, id, title, pub_year, author_name, detail, borrower_id, borrower_name, due, title_id"
+            " FROM items ORDER BY rowid"
+        ).fetchall()
+
+        return members, items, []
+
+    def append(self, operation:int, record:tuple) -> None:
+        """Apply one operation to the tables."""
+        self.__apply(operation, record)
+
+        self.__pending += 1
+        if self.__pending >= self.__group_size:
+            self.flush()
+
+    def __apply(self, operation:int, record:tuple) -> None:
+        """Run the statement of one operation in the open transaction."""
+        execute = self.__connection.execute
+
+        if operation == ADD_ITEM:
+            execute(
+                "INSERT OR REPLACE INTO items (kind, id, title, pub_year, author_name, detail,"
+                " borrower_id, borrower_name, due, title_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                record
+            )
+        elif operation == REMOVE_ITEM:
+            execute("DELETE FROM items WHERE id = ?", record)
+        elif operation == CREATE_MEMBER:
+            execute("INSERT OR REPLACE INTO members VALUES (?, ?)", record)
+        elif operation == LEND_ITEM:
+            member_id, item_id, due = record
+            execute(
+                "UPDATE items SET borrower_id = ?,"
+                " borrower_name = (SELECT name FROM members WHERE id = ?), due = ?"
+                " WHERE id = ?",
+                (member_id, member_id, due, item_id)
+            )
+        elif operation == RETURN_ITEM:
+            execute(
+                "UPDATE items SET borrower_id = NULL, borrower_name = NULL, due = ? WHERE id = ?",
+                (NO_TIMESTAMP, record[1])
+            )
+        else:
+            raise ValueError(f"unknown operation {operation}.")
+
+    def append_many(self, operation:int, records:list) -> None:
+        """Apply many operations in the same transaction."""
+        for record in records:
+            self.__apply(operation, record)
+
+        self.__pending += len(records)
+        if self.__pending >= self.__group_size:
+            self.flush()
+
+    def write_snapshot(self, members, items) -> None:
+        """Commit pending operations; the tables already hold the full state."""
+        self.flush()
+
+    def flush(self) -> None:
+        """Commit the open transaction."""
+        self.__connection.commit()
+        self.__pending = 0
+
+    def close(self) -> None:
+        """Commit and close the connection."""
+        self.flush()
+        self.__connection.close()
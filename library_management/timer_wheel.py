@@ -0,0 +1,130 @@
+from heapq import heapify, heappop, heappush
+from operator import itemgetter
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel of keyed deadlines in integer microseconds.
+
+    Timers are hashed into buckets one tick wide. Only buckets holding timers
+    exist, and their numbers are kept in a heap, so expiring skips over empty
+    stretches of time at once: the cost of expire is proportional to the timers
+    it returns plus the buckets they came from, never to the number of timers
+    still pending or to the time elapsed.
+
+    Attributes:
+        __tick (int): Width of a bucket in microseconds.
+        __buckets (dict): Maps bucket numbers to dicts of key -> (deadline, payload).
+        __heap (list): Heap of bucket numbers; may also hold numbers of buckets emptied since.
+        __bucket_of (dict): Maps the key of every pending timer to its bucket number.
+    """
+
+    def __init__(self, tick:int = 60_000_000):
+        """
+        Initialize an empty TimerWheel.
+
+        :param tick: Width of a bucket in microseconds. Deadlines are exact whatever
+                     the tick; it only trades the number of buckets against their size.
+        :raises ValueError: If tick is not positive.
+        """
+        if tick < 1:
+            raise ValueError("tick must be a positive number of microseconds.")
+
+        self.__tick = tick
+        self.__buckets = {}
+        self.__heap = []
+        self.__bucket_of = {}
+
+    def __len__(self) -> int:
+        """Return the number of pending timers."""
+        return len(self.__bucket_of)
+
+    def __contains__(self, key) -> bool:
+        """Return if a timer is pending under a key."""
+        return key in self.__bucket_of
+
+    def schedule(self, key, deadline:int, payload = None) -> None:
+        """
+        Set a timer, replacing any timer pending under the same key.
+
+        :param key: Hashable key of the timer.
+        :param deadline: Moment the timer expires at, in microseconds.
+        :param payload: Value returned with the timer when it expires.
+        """
+        self.cancel(key)
+
+        number = deadline // self.__tick
+        bucket = self.__buckets.get(number)
+        if bucket is None:
+            bucket = self.__buckets[number] = {}
+            heappush(self.__heap, number)
+        bucket[key] = (deadline, payload)
+        self.__bucket_of[key] = number
+
+    def cancel(self, key) -> bool:
+        """
+        Drop the timer pending under a key, if any.
+
+        :param key: Key of the timer.
+        :return: Whether a timer was dropped.
+        """
+        number = self.__bucket_of.pop(key, None)
+        if number is None:
+            return False
+
+        bucket = self.__buckets[number]
+        del bucket[key]
+        if not bucket:
+            del self.__buckets[number]
+            # The heap keeps the number until it is reached; rebuild it before
+            # numbers of emptied buckets can outgrow the live ones.
+            if len(self.__heap) > 2 * len(self.__buckets) + 64:
+                self.__heap = list(self.__buckets)
+                heapify(self.__heap)
+
+        return True
+
+    def next_deadline(self) -> int:
+        """Return the earliest pending deadline, or None if no timer is pending."""
+        while self.__heap:
+            bucket = self.__buckets.get(self.__heap[0])
+            if bucket:
+                return min(deadline for deadline, _ in bucket.values())
+            heappop(self.__heap)
+
+        return None
+
+    def expire(self, moment:int) -> list[tuple]:
+        """
+        Remove and return every timer whose deadline is at or before a moment.
+
+        :param moment: The moment to expire timers up to, in microseconds.
+        :return: (deadline, key, payload) tuples, earliest deadline first.
+        """
+        last = moment // self.__tick
+        expired = []
+        while self.__heap and self.__heap[0] <= last:
+            number = self.__heap[0]
+            bucket = self.__buckets.get(number)
+            if bucket is None:
+                heappop(self.__heap)
+                continue
+
+            if number < last:
+                due = list(bucket)
+            else:
+                # The bucket of the moment itself expires only in part.
+                due = [key for key, (deadline, _) in bucket.items() if deadline <= moment]
+
+            for key in due:
+                deadline, payload = bucket.pop(key)
+                del self.__bucket_of[key]
+                expired.append((deadline, key, payload))
+
+            if bucket:
+                break
+            heappop(self.__heap)
+            del self.__buckets[number]
+
+        expired.sort(key=itemgetter(0))
+        return expired
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# Stands in for a missing datetime in packed integer columns.
+NO_TIMESTAMP = -(2 ** 63)
+
+
+def to_micros(value:datetime) -> int:
+    """
+    Convert a naive datetime to whole microseconds since the epoch.
+
+    The conversion is exact, unlike datetime.timestamp(), and does not depend
+    on the local timezone.
+
+    :param value: The datetime to convert, or None.
+    :return: Microseconds since 1970-01-01, or NO_TIMESTAMP for None.
+    """
+    if value is None:
+        return NO_TIMESTAMP
+
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_micros(value:int) -> datetime:
+    """
+    Convert microseconds since the epoch back to a naive datetime.
+
+    :param value: Microseconds since 1970-01-01, or NO_TIMESTAMP.
+    :return: The datetime, or None for NO_TIMESTAMP.
+    """
+    if value == NO_TIMESTAMP:
+        return None
+
+    return EPOCH + timedelta(microseconds=value)
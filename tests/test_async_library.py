@@ -0,0 +1,218 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+from library_management.async_library import AsyncLibrary
+from library_management.circulation_log import CirculationLog
+from library_management.circulation_stats import CirculationStats
+from library_management.inventory import Title
+from library_management.library import Library
+from library_management.library_item import Book, DVD
+from library_management.storage import Storage, LEND_ITEM
+
+import unittest
+
+
+class SlowStorage(Storage):
+    """Storage keeping nothing, whose lends wait until released as a slow disk sync would."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def load(self) -> tuple:
+        return [], [], []
+
+    def append(self, operation:int, record:tuple) -> None:
+        if operation == LEND_ITEM:
+            self.release.wait(5)
+
+    def flush(self) -> None:
+        pass
+
+
+class TestAsyncLibrary(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.library = AsyncLibrary(max_workers=2)
+
+        self.book = Book(
+            title="The Pragmatic Programmer",
+            pub_year="1999",
+            author_name="Andrew Hunt and David Thomas",
+            ISBN="978-0201616224"
+        )
+
+        self.dvd = DVD(
+            title="Inception",
+            pub_year="2010",
+            author_name="Christopher Nolan",
+            duration="2h:28m"
+        )
+
+        await self.library.add_items([self.book, self.dvd])
+
+    async def asyncTearDown(self):
+        await self.library.close()
+
+    async def test_lend_and_return(self):
+        member_id = await self.library.create_member("Patrick")
+
+        await self.library.lend_item(member_id, self.book)
+        self.assertEqual(await self.library.get_items_due_within(days=5), [self.book])
+
+        await self.library.return_item(member_id, self.book)
+        self.assertFalse(self.book.get_is_borrowed())
+        self.assertEqual(await self.library.get_overdue_items(), [])
+
+    async def test_baskets(self):
+        member_id = await self.library.create_member("Patrick")
+        basket = [self.book.get_id(), self.dvd.get_id()]
+
+        self.assertEqual(await self.library.lend_items(member_id, basket), ["lent", "lent"])
+        self.assertEqual(await self.library.return_items(member_id, basket), ["returned", "returned"])
+
+    async def test_holds(self):
+        patrick = await self.library.create_member("Patrick")
+        ama = await self.library.create_member("Ama")
+        await self.library.lend_item(patrick, self.book)
+
+        self.assertEqual(await self.library.place_hold(ama, self.book.get_id()), 1)
+        self.assertEqual(await self.library.get_hold_queue(self.book.get_id()), [ama])
+        self.assertEqual(await self.library.return_item(patrick, self.book), ama)
+        self.assertEqual(await self.library.get_held_item_ids(ama), [])
+
+    async def test_copies(self):
+        member_id = await self.library.create_member("Patrick")
+        title = Title(DVD, "Inception", "2010", "Christopher Nolan", "2h:28m")
+        copy_ids = await self.library.add_copies(title, 2)
+
+        self.assertIn(await self.library.lend_title(member_id, title.get_id()), copy_ids)
+        self.assertEqual(await self.library.get_availability(title.get_id()), (1, 2))
+
+    async def test_loan_history(self):
+        library = AsyncLibrary(Library(thread_safe=True, circulation_log=CirculationLog()), max_workers=1)
+        await library.add_item(self.book)
+        member_id = await library.create_member("Patrick")
+        await library.lend_item(member_id, self.book)
+
+        history = await library.get_loan_history(member_id=member_id)
+        self.assertEqual([event.get_item_id() for event in history], [self.book.get_id()])
+        await library.close()
+
+    async def test_circulation_summary(self):
+        library = AsyncLibrary(Library(thread_safe=True, circulation_stats=CirculationStats()), max_workers=1)
+        await library.add_item(self.dvd)
+        member_id = await library.create_member("Patrick")
+        await library.lend_item(member_id, self.dvd)
+
+        summary = await library.get_circulation_summary()
+        self.assertEqual(summary["active_loans"], {"DVD": 1})
+        await library.close()
+
+    async def test_loan_events(self):
+        subscription_id = await self.library.subscribe(kinds=("overdue",))
+        member_id = await self.library.create_member("Patrick")
+        await self.library.lend_item(member_id, self.book)
+
+        events = await self.library.poll_events(subscription_id, datetime.now() + timedelta(days=5))
+        self.assertEqual([event.get_item_id() for event in events], [self.book.get_id()])
+
+        await self.library.unsubscribe(subscription_id)
+
+    async def test_loan_lookups(self):
+        member_id = await self.library.create_member("Patrick")
+        await self.library.lend_item(member_id, self.book)
+
+        self.assertIs(await self.library.get_item(self.book.get_id()), self.book)
+        self.assertEqual(await self.library.get_borrower_id(self.book.get_id()), member_id)
+        self.assertEqual(await self.library.get_borrowed_item_ids(member_id), [self.book.get_id()])
+        self.assertEqual(await self.library.get_loan_count(member_id), 1)
+
+    async def test_requires_thread_safe_library(self):
+        with self.assertRaises(ValueError):
+            AsyncLibrary(Library())
+
+    async def test_mutations_do_not_block_the_loop(self):
+        storage = SlowStorage()
+        library = AsyncLibrary(Library(storage=storage, thread_safe=True), max_workers=1)
+        await library.add_item(self.book)
+        member_id = await library.create_member("Patrick")
+
+        lending = asyncio.create_task(library.lend_item(member_id, self.book))
+        await asyncio.sleep(0.05)
+        self.assertFalse(lending.done())
+
+        storage.release.set()
+        await lending
+        self.assertEqual(await library.get_borrower_id(self.book.get_id()), member_id)
+        await library.close()
+
+    async def test_loop_stays_responsive_during_add_items(self):
+        library = AsyncLibrary(max_workers=4)
+        member_id = await library.create_member("Patrick")
+        await library.add_item(self.book)
+        entered, release = threading.Event(), threading.Event()
+
+        class SlowDVD(DVD):
+            def get_title(self):
+                # Stall the add_items batch while it holds the library lock.
+                if not entered.is_set():
+                    entered.set()
+                    release.wait(5)
+                return super().get_title()
+
+        loop = asyncio.get_running_loop()
+        adding = asyncio.create_task(library.add_items([SlowDVD("Tenet", "2020", "Christopher Nolan", "2h:30m")]))
+        await loop.run_in_executor(None, entered.wait, 5)
+        lookup = asyncio.create_task(library.get_item(self.book.get_id()))
+        lending = asyncio.create_task(library.lend_item(member_id, self.book))
+
+        start = loop.time()
+        await asyncio.sleep(0.05)
+        self.assertLess(loop.time() - start, 1)
+        self.assertFalse(lookup.done() or lending.done())
+
+        release.set()
+        self.assertEqual(await adding, 1)
+        self.assertIs(await lookup, self.book)
+        await lending
+        self.assertEqual(await library.get_borrower_id(self.book.get_id()), member_id)
+        await library.close()
+
+    async def test_errors_propagate(self):
+        with self.assertRaises(Exception):
+            await self.library.lend_item("missing", self.book)
+
+        with self.assertRaises(KeyError):
+            await self.library.remove_item("missing")
+
+    async def test_search_and_listings(self):
+        self.assertEqual(await self.library.search_item("Inception"), [self.dvd])
+        self.assertEqual(len(await self.library.get_items()), 2)
+
+        await self.library.create_members(["Patrick", "Ama"])
+        self.assertEqual(len(await self.library.get_members()), 2)
+
+    async def test_iter_items_in_chunks(self):
+        chunks = [chunk async for chunk in self.library.iter_items(chunk_size=1)]
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(
+            {chunk[0]["id"] for chunk in chunks},
+            {self.book.get_id(), self.dvd.get_id()}
+        )
+
+    async def test_iter_items_with_fields(self):
+        chunks = [chunk async for chunk in self.library.iter_items(fields=("id",))]
+
+        self.assertEqual(
+            chunks,
+            [sorted([{"id": self.book.get_id()}, {"id": self.dvd.get_id()}], key=lambda info: info["id"])]
+        )
+
+    async def test_cancellation(self):
+        task = asyncio.ensure_future(self.library.get_items())
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+from library_management.catalog_store import CatalogStore, StringPool
+from library_management.library_item import LibraryItem, Book, Magazine, DVD
+from library_management.member import Member
+
+import unittest
+
+
+class TestStringPool(unittest.TestCase):
+
+    def test_encode_interns_strings(self):
+        pool = StringPool()
+        code = pool.encode("Rolf Dobelli")
+
+        self.assertEqual(pool.encode("Rolf Dobelli"), code)
+        self.assertNotEqual(pool.encode("Susan Goldberg"), code)
+        self.assertEqual(pool.decode(code), "Rolf Dobelli")
+        self.assertEqual(len(pool), 2)
+
+
+class TestCatalogStore(unittest.TestCase):
+
+    def setUp(self):
+        self.member = Member(name="Patrick")
+        self.store = CatalogStore()
+
+        self.book = Book(
+            title="The Pragmatic Programmer",
+            pub_year="1999",
+            author_name="Andrew Hunt and David Thomas",
+            ISBN="978-0201616224"
+        )
+
+        self.dvd = DVD(
+            title="Inception",
+            pub_year="2010",
+            author_name="Christopher Nolan",
+            duration="2h:28m",
+            is_borrowed=True,
+            borrowed_by=self.member,
+            due_date=datetime(2024, 5, 1, 9, 30)
+        )
+
+        self.store.add(self.book)
+        self.store.add(self.dvd)
+
+    def test_get_item_round_trips_fields(self):
+        book = self.store.get_item(self.book.get_id())
+        dvd = self.store.get_item(self.dvd.get_id())
+
+        self.assertIsInstance(book, Book)
+        self.assertEqual(book.get_info(), self.book.get_info())
+        self.assertIsInstance(dvd, DVD)
+        self.assertEqual(dvd.get_info(), self.dvd.get_info())
+        self.assertIs(dvd.get_borrowed_by(), self.member)
+
+    def test_loan_state(self):
+        due_date = datetime.now() + timedelta(days=4)
+        self.store.set_loan(self.book.get_id(), self.member, due_date)
+        self.store.clear_loan(self.dvd.get_id())
+
+        book = self.store.get_item(self.book.get_id())
+        dvd = self.store.get_item(self.dvd.get_id())
+
+        self.assertTrue(book.get_is_borrowed())
+        self.assertEqual(book.get_due_date(), due_date)
+        self.assertFalse(dvd.get_is_borrowed())
+        self.assertIsNone(dvd.get_borrowed_by())
+
+    def test_calculate_fines(self):
+        moment = datetime(2024, 5, 3, 9, 30)
+
+        self.assertEqual(self.store.calculate_fines(moment), {self.member.get_id(): 30.0})
+
+        self.store.clear_loan(self.dvd.get_id())
+        self.assertEqual(self.store.calculate_fines(moment), {})
+
+    def test_remove(self):
+        self.store.remove(self.book.get_id())
+
+        self.assertEqual(len(self.store), 1)
+        self.assertNotIn(self.book.get_id(), self.store)
+        self.assertEqual(list(self.store), [self.dvd.get_id()])
+
+        with self.assertRaises(KeyError):
+            self.store.get_item(self.book.get_id())
+
+    def test_reuses_rows_of_removed_items(self):
+        for _ in range(100):
+            self.store.remove(self.book.get_id())
+            self.store.add(self.book)
+            self.store.add(self.dvd)
+
+        self.assertEqual(self.store.get_row_count(), 2)
+        self.assertEqual(self.store.get_item(self.book.get_id()).get_info(), self.book.get_info())
+        self.assertEqual(self.store.get_item(self.dvd.get_id()).get_info(), self.dvd.get_info())
+
+        magazine = Magazine("National Geographic", "2023", "Susan Goldberg", "May 2023 Issue")
+        self.store.remove(self.dvd.get_id())
+        self.store.add(magazine)
+        restored = self.store.get_item(magazine.get_id())
+        self.assertEqual(self.store.get_row_count(), 2)
+        self.assertIsInstance(restored, Magazine)
+        self.assertEqual(restored.get_info(), magazine.get_info())
+        self.assertEqual(self.store.calculate_fines(datetime(2024, 5, 3)), {})
+        self.assertEqual(list(self.store), [self.book.get_id(), magazine.get_id()])
+
+    def test_rejects_unknown_item_types(self):
+        class Map(LibraryItem):
+            pass
+
+        with self.assertRaises(ValueError):
+            self.store.add(Map("Old Town", "1900", "Unknown"))
+
+    def test_plain_library_item_and_magazine(self):
+        item = LibraryItem("The Art of Thinking Clearly", "2013", "Rolf Dobelli")
+        magazine = Magazine("National Geographic", "2023", "Susan Goldberg", "May 2023 Issue")
+        self.store.add(item)
+        self.store.add(magazine)
+
+        self.assertEqual(self.store.get_item(item.get_id()).get_info(), item.get_info())
+        self.assertEqual(self.store.get_item(magazine.get_id()).get_info(), magazine.get_info())
@@ -0,0 +1,75 @@
+from library_management.change_feed import ChangeFeed, EVENT_KINDS
+from library_management.fines import DAY_MICROS, DAILY_FINE, MONTHLY_FINE, YEARLY_FINE
+from library_management.timestamps import from_micros
+
+import unittest
+
+
+class TestChangeFeed(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = ChangeFeed()
+        self.subscription = self.feed.subscribe()
+
+    def test_milestones_in_order(self):
+        self.feed.track("i-1", "m-1", 0, -1)
+        self.feed.track("i-2", "m-2", 28 * DAY_MICROS, -1)
+
+        events = self.feed.poll(self.subscription, 390 * DAY_MICROS)
+
+        self.assertEqual(
+            [(event.get_kind(), event.get_item_id()) for event in events],
+            [
+                ("overdue", "i-1"), ("daily", "i-1"), ("overdue", "i-2"), ("daily", "i-2"),
+                ("monthly", "i-1"), ("monthly", "i-2"), ("yearly", "i-1"),
+            ]
+        )
+        self.assertEqual(
+            [event.get_fine() for event in events if event.get_item_id() == "i-1"],
+            [0, DAILY_FINE, MONTHLY_FINE, YEARLY_FINE]
+        )
+        self.assertEqual(events[1].get_moment(), from_micros(DAY_MICROS))
+        self.assertEqual(events[0].get_info()["member_id"], "m-1")
+        self.assertEqual(len(self.feed), 1)
+
+    def test_events_are_delivered_once_per_subscription(self):
+        overdue_only = self.feed.subscribe(kinds=("overdue",))
+        self.feed.track("i-1", "m-1", 0, -1)
+
+        self.assertEqual(len(self.feed.poll(self.subscription, DAY_MICROS, limit=1)), 1)
+        self.assertEqual(len(self.feed.poll(self.subscription, DAY_MICROS)), 1)
+        self.assertEqual(self.feed.poll(self.subscription, DAY_MICROS), [])
+        self.assertEqual(
+            [event.get_kind() for event in self.feed.poll(overdue_only, 2 * DAY_MICROS)],
+            ["overdue"]
+        )
+
+    def test_milestones_crossed_before_tracking_are_skipped(self):
+        self.feed.track("i-1", "m-1", 0, 2 * DAY_MICROS)
+        self.feed.track("i-2", "m-2", 0, 400 * DAY_MICROS)
+
+        self.assertEqual(len(self.feed), 1)
+        self.assertEqual(
+            [event.get_kind() for event in self.feed.poll(self.subscription, 30 * DAY_MICROS)],
+            ["monthly"]
+        )
+
+    def test_untrack(self):
+        self.feed.track("i-1", "m-1", 0, -1)
+        self.feed.untrack("i-1")
+
+        self.assertEqual(self.feed.poll(self.subscription, DAY_MICROS), [])
+
+    def test_subscriptions(self):
+        self.assertEqual(EVENT_KINDS, ("overdue", "daily", "monthly", "yearly"))
+
+        with self.assertRaises(ValueError):
+            self.feed.subscribe(kinds=("weekly",))
+
+        self.feed.unsubscribe(self.subscription)
+        self.assertEqual(self.feed.get_subscription_count(), 0)
+
+        with self.assertRaises(KeyError):
+            self.feed.poll(self.subscription, 0)
+        with self.assertRaises(KeyError):
+            self.feed.unsubscribe(self.subscription)
@@ -0,0 +1,149 @@
+import os
+import tempfile
+
+from library_management.circulation_log import CirculationLog, SEGMENT_SUFFIX
+from library_management.fines import DAY_MICROS
+from library_management.storage import LEND_ITEM, RETURN_ITEM
+from library_management.timestamps import from_micros
+
+import unittest
+
+
+def fill(log:CirculationLog, days:int) -> None:
+    """Lend and return i-<day % 3> to m-<day % 2> once a day."""
+    for day in range(days):
+        moment = day * DAY_MICROS
+        log.append(LEND_ITEM, f"i-{day % 3}", f"m-{day % 2}", moment, moment + 4 * DAY_MICROS)
+        log.append(RETURN_ITEM, f"i-{day % 3}", f"m-{day % 2}", moment + 1)
+
+
+def keys(events:list) -> list:
+    return [(event.get_kind(), event.get_item_id(), event.get_member_id(), event.get_moment()) for event in events]
+
+
+class TestCirculationLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_segments_seal_by_size_and_span(self):
+        log = CirculationLog(segment_size=3, segment_span=10 * DAY_MICROS)
+        fill(log, 6)
+
+        self.assertEqual(len(log), 12)
+        self.assertEqual(log.get_segment_count(), 4)
+
+        log = CirculationLog(segment_span=DAY_MICROS)
+        fill(log, 6)
+        self.assertEqual(log.get_segment_count(), 6)
+
+    def test_query_by_item_member_and_window(self):
+        log = CirculationLog(segment_size=4)
+        fill(log, 30)
+
+        events = log.query(item_id="i-1")
+        self.assertEqual(len(events), 20)
+        self.assertTrue(all(event.get_item_id() == "i-1" for event in events))
+        self.assertEqual(events, sorted(events, key=lambda event: event.get_moment()))
+
+        events = log.query(item_id="i-1", start=3 * DAY_MICROS, end=10 * DAY_MICROS)
+        self.assertEqual(keys(events), [
+            (LEND_ITEM, "i-1", "m-0", from_micros(4 * DAY_MICROS)),
+            (RETURN_ITEM, "i-1", "m-0", from_micros(4 * DAY_MICROS + 1)),
+            (LEND_ITEM, "i-1", "m-1", from_micros(7 * DAY_MICROS)),
+            (RETURN_ITEM, "i-1", "m-1", from_micros(7 * DAY_MICROS + 1)),
+        ])
+        self.assertEqual(events[0].get_due_date(), from_micros(8 * DAY_MICROS))
+        self.assertIsNone(events[1].get_due_date())
+
+        self.assertEqual(len(log.query(member_id="m-1", start=0, end=4 * DAY_MICROS)), 4)
+        self.assertEqual(len(log.query(item_id="i-0", member_id="m-1")), 10)
+        self.assertEqual(len(log.query(start=DAY_MICROS + 1, end=2 * DAY_MICROS + 1)), 2)
+        self.assertEqual(log.query(item_id="missing"), [])
+        self.assertEqual(log.query(start=30 * DAY_MICROS), [])
+
+    def test_moments_stay_in_order(self):
+        log = CirculationLog()
+        log.append(LEND_ITEM, "i-1", "m-1", 10)
+        log.append(RETURN_ITEM, "i-1", "m-1", 5)
+
+        self.assertEqual([event.get_moment() for event in log.query()], [from_micros(10)] * 2)
+
+        with self.assertRaises(ValueError):
+            log.append(0, "i-1", "m-1", 20)
+
+    def test_compact(self):
+        log = CirculationLog(segment_size=4, segment_span=DAY_MICROS)
+        fill(log, 10)
+        self.assertEqual(log.get_segment_count(), 10)
+
+        self.assertEqual(log.compact(before=3 * DAY_MICROS), 6)
+        self.assertEqual(len(log), 14)
+        self.assertEqual(log.get_segment_count(), 4)
+        self.assertEqual(log.query(end=3 * DAY_MICROS), [])
+        self.assertEqual(len(log.query(item_id="i-0", start=3 * DAY_MICROS)), 6)
+
+        fill(log, 1)
+        self.assertEqual(len(log.query(item_id="i-0")), 8)
+
+    def test_persists_segments(self):
+        log = CirculationLog(self.directory.name, segment_size=4)
+        fill(log, 5)
+        log.close()
+
+        reopened = CirculationLog(self.directory.name, segment_size=4)
+        self.assertEqual(keys(reopened.query()), keys(log.query()))
+        reopened.append(LEND_ITEM, "i-9", "m-9", 9 * DAY_MICROS)
+        reopened.close()
+
+        self.assertEqual(len(CirculationLog(self.directory.name, segment_size=4)), 11)
+
+    def test_ignores_torn_tail(self):
+        log = CirculationLog(self.directory.name)
+        fill(log, 2)
+        log.close()
+
+        last = sorted(os.listdir(self.directory.name))[-1]
+        with open(os.path.join(self.directory.name, last), "ab") as file:
+            file.write(b"\x20\x00\x00\x00\x00")
+
+        reopened = CirculationLog(self.directory.name)
+        self.assertEqual(len(reopened), 4)
+        reopened.append(RETURN_ITEM, "i-1", "m-1", 3 * DAY_MICROS)
+        reopened.close()
+        self.assertEqual(len(CirculationLog(self.directory.name)), 5)
+
+    def test_persists_compaction(self):
+        log = CirculationLog(self.directory.name, segment_size=4, segment_span=DAY_MICROS)
+        fill(log, 10)
+        expected = keys(log.query(start=3 * DAY_MICROS))
+        log.compact(before=3 * DAY_MICROS)
+        log.close()
+
+        files = sorted(name for name in os.listdir(self.directory.name) if name.endswith(SEGMENT_SUFFIX))
+        self.assertEqual(len(files), 4)
+        self.assertEqual(keys(CirculationLog(self.directory.name).query()), expected)
+
+    def test_drops_segments_replaced_by_interrupted_compaction(self):
+        log = CirculationLog(self.directory.name, segment_size=4, segment_span=DAY_MICROS)
+        fill(log, 4)
+        log.close()
+        stale = {name: open(os.path.join(self.directory.name, name), "rb").read()
+                 for name in sorted(os.listdir(self.directory.name))[:2]}
+
+        log = CirculationLog(self.directory.name, segment_size=4, segment_span=DAY_MICROS)
+        log.compact()
+        log.close()
+        # As if the crash came right after writing the merged file.
+        for name, data in stale.items():
+            with open(os.path.join(self.directory.name, name), "wb") as file:
+                file.write(data)
+
+        self.assertEqual(len(CirculationLog(self.directory.name)), 8)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            CirculationLog(segment_size=0)
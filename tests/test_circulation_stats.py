@@ -0,0 +1,127 @@
+import random
+from collections import Counter
+
+from library_management.circulation_stats import TopK, CountMinSketch, CirculationStats, title_key
+from library_management.inventory import Title
+from library_management.library_item import Book, DVD
+
+import unittest
+
+
+def skewed_keys(count:int, seed:int = 0) -> list[int]:
+    rng = random.Random(seed)
+    return [int(rng.paretovariate(1.1)) for _ in range(count)]
+
+
+class TestTopK(unittest.TestCase):
+
+    def test_exact_without_capacity(self):
+        top = TopK()
+        keys = skewed_keys(5_000)
+        for key in keys:
+            top.add(key)
+
+        expected = Counter(keys)
+        self.assertEqual(len(top), len(expected))
+        self.assertEqual(top.get_total(), len(keys))
+        self.assertTrue(all(top.get_count(key) == count for key, count in expected.items()))
+        self.assertEqual([count for _, count in top.top(10)], [count for _, count in expected.most_common(10)])
+        self.assertEqual(top.get_error(1), 0)
+
+    def test_ties_in_order_reached(self):
+        top = TopK()
+        for key in ("a", "b", "c", "b", "a"):
+            top.add(key)
+
+        self.assertEqual(top.top(3), [("b", 2), ("a", 2), ("c", 1)])
+        self.assertEqual(top.top(0), [])
+        self.assertEqual(TopK().top(5), [])
+
+    def test_capacity_keeps_heavy_hitters(self):
+        top = TopK(capacity=20)
+        keys = skewed_keys(20_000)
+        for key in keys:
+            top.add(key)
+
+        expected = Counter(keys)
+        self.assertEqual(len(top), 20)
+        for key, count in expected.items():
+            if count > len(keys) / 20:
+                self.assertGreaterEqual(top.get_count(key), count)
+                self.assertLessEqual(top.get_count(key) - top.get_error(key), count)
+        self.assertEqual(top.top(1)[0][0], expected.most_common(1)[0][0])
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            TopK(capacity=0)
+
+
+class TestCountMinSketch(unittest.TestCase):
+
+    def test_estimates_bound_true_counts(self):
+        sketch = CountMinSketch(width=256, depth=4)
+        keys = skewed_keys(10_000)
+        for key in keys:
+            sketch.add(key)
+
+        for key, count in Counter(keys).items():
+            estimate = sketch.estimate(key)
+            self.assertGreaterEqual(estimate, count)
+            self.assertLessEqual(estimate, count + 2 * len(keys) / 256 * 2)
+
+        self.assertEqual(sketch.get_size(), 8 * 256 * 4)
+
+    def test_invalid_dimensions(self):
+        with self.assertRaises(ValueError):
+            CountMinSketch(width=0)
+
+
+class TestCirculationStats(unittest.TestCase):
+
+    def setUp(self):
+        self.book = Book("Dune", "1965", "Frank Herbert", "978-0441013593")
+        self.dvd = DVD("Inception", "2010", "Christopher Nolan", "2h:28m")
+        self.title = Title(Book, "Dune Messiah", "1969", "Frank Herbert", "978-0593098233")
+        self.copies = self.title.new_copies(2)
+
+    def exercise(self, stats:CirculationStats) -> None:
+        for item in (self.book, self.dvd, self.copies[0], self.copies[1], self.book):
+            stats.record_lend(item)
+            stats.loan_started(item)
+        stats.loan_ended(self.book)
+        stats.loan_ended(self.dvd)
+
+    def test_exact(self):
+        stats = CirculationStats()
+        self.exercise(stats)
+
+        self.assertEqual(title_key(self.copies[0]), self.title.get_id())
+        self.assertEqual(title_key(self.book), "dune / frank herbert")
+        self.assertEqual(stats.get_title_loans(self.title.get_id()), 2)
+        self.assertEqual(stats.get_title_loans("dune / frank herbert"), 2)
+        self.assertEqual(stats.get_author_loans("Frank Herbert"), 4)
+        self.assertEqual(stats.get_top_authors(1), [("Frank Herbert", 4)])
+        self.assertEqual(
+            stats.get_top_titles(2), [(self.title.get_id(), 2), ("dune / frank herbert", 2)]
+        )
+        self.assertEqual(stats.get_active_loans(), {"Book": 3})
+        self.assertEqual(stats.get_summary(1)["lends"], 5)
+        self.assertFalse(stats.get_summary()["approximate"])
+
+    def test_items_of_a_work_share_a_title_key(self):
+        stats = CirculationStats()
+        stats.record_lend(self.book)
+        stats.record_lend(Book("  DUNE ", "1990", "Frank  Herbert", "978-0441172719"))
+        stats.record_lend(Book("Dune", "1965", "Brian Herbert", "978-0000000000"))
+
+        self.assertEqual(stats.get_top_titles(), [("dune / frank herbert", 2), ("dune / brian herbert", 1)])
+
+    def test_approximate(self):
+        stats = CirculationStats(approximate=True, capacity=2, width=64, depth=2)
+        self.exercise(stats)
+
+        self.assertTrue(stats.is_approximate())
+        self.assertGreaterEqual(stats.get_title_loans(self.title.get_id()), 2)
+        self.assertGreaterEqual(stats.get_author_loans("Christopher Nolan"), 1)
+        self.assertEqual(stats.get_top_authors(1)[0][0], "Frank Herbert")
+        self.assertEqual(stats.get_active_loans(), {"Book": 3})
@@ -0,0 +1,106 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from library_management.columnar import ColumnarSnapshot, NO_MEMBER, write_columnar
+from library_management.inventory import Title
+from library_management.library_item import Book, Magazine, DVD
+from library_management.member import Member
+from library_management.storage import item_record
+from library_management.timestamps import NO_TIMESTAMP
+
+import unittest
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "catalog.col")
+
+        self.patrick = Member("Patrick", member_id="m-2")
+        self.visitor = Member("Visitor", member_id="m-1")
+        self.items = [
+            Book("Clean Code", "2008", "Robert Martin", "978-0132350884", item_id="b-2"),
+            Magazine("National Geographic", "2023", None, "May 2023 Issue", item_id="A-1"),
+            DVD("Inception", "2010", "Christopher Nolan", "2h:28m", item_id="a-3"),
+            Book("Clean Architecture", "2017", "Robert Martin", "978-0134494166", item_id="b-1"),
+        ]
+        self.patrick.borrow_item(self.items[0], datetime(2024, 1, 31, 12))
+        self.items[2].set_is_borrowed(True)
+        self.items[2].set_borrowed_by(self.visitor)
+        self.items[2].set_due_date(datetime.now() - timedelta(days=2))
+
+        write_columnar(self.path, [self.patrick], self.items)
+
+    def test_round_trip(self):
+        with ColumnarSnapshot(self.path) as snapshot:
+            records = list(snapshot.iter_item_records())
+
+            self.assertEqual(snapshot.get_item_count(), 4)
+            self.assertEqual(
+                records,
+                sorted((item_record(item) for item in self.items), key=lambda record: record[1].lower())
+            )
+            self.assertEqual(
+                list(snapshot.iter_member_records()),
+                [("m-1", "Visitor", False), ("m-2", "Patrick", True)]
+            )
+
+    def test_title_ids(self):
+        title = Title(DVD, "Inception", "2010", "Christopher Nolan", "2h:28m", title_id="t-1")
+        copies = title.new_copies(2)
+        write_columnar(self.path, [], self.items + copies)
+
+        with ColumnarSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.get_item_record(snapshot.find_item("t-1.2"))[9], "t-1")
+            self.assertEqual(
+                [record[9] for record in snapshot.iter_item_records()],
+                [None, None, None, None, "t-1", "t-1"]
+            )
+
+        # A file of the former version is read without title IDs.
+        with open(self.path, "r+b") as file:
+            file.write(b"LMSCOL01")
+        with ColumnarSnapshot(self.path) as snapshot:
+            record = snapshot.get_item_record(snapshot.find_item("t-1.1"))
+            self.assertEqual((record[2], record[9]), ("Inception", None))
+
+    def test_lookups(self):
+        with ColumnarSnapshot(self.path) as snapshot:
+            row = snapshot.find_item("b-2")
+
+            self.assertEqual(snapshot.get_item_record(row)[2], "Clean Code")
+            self.assertEqual(snapshot.get_member_record(snapshot.get_borrower_row(row))[0], "m-2")
+            self.assertEqual(snapshot.get_borrower_row(snapshot.find_item("b-1")), NO_MEMBER)
+            self.assertEqual(snapshot.get_due_date(snapshot.find_item("b-1")), NO_TIMESTAMP)
+            self.assertEqual(snapshot.find_item("a-1"), -1)
+            self.assertEqual(snapshot.find_member("m-3"), -1)
+            self.assertEqual(snapshot.first_item_after("a-2"), snapshot.find_item("a-3"))
+            self.assertEqual(snapshot.first_item_after(), 0)
+            self.assertEqual(snapshot.first_member_after("m-1"), 1)
+
+    def test_empty_catalog(self):
+        write_columnar(self.path, [], [])
+
+        with ColumnarSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.get_item_count(), 0)
+            self.assertEqual(list(snapshot.iter_item_records()), [])
+            self.assertEqual(snapshot.find_item("b-1"), -1)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot" * 100)
+
+        with self.assertRaises(ValueError):
+            ColumnarSnapshot(self.path)
+
+        open(self.path, "wb").close()
+        with self.assertRaises(ValueError):
+            ColumnarSnapshot(self.path)
+
+    def test_close_is_idempotent(self):
+        snapshot = ColumnarSnapshot(self.path)
+        snapshot.close()
+        snapshot.close()
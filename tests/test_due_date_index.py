@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from library_management.due_date_index import DueDateIndex
+
+import unittest
+
+
+class TestDueDateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.now = datetime(2024, 1, 10, 12, 0)
+        self.index = DueDateIndex()
+        self.index.add("late", self.now - timedelta(days=2))
+        self.index.add("later", self.now - timedelta(days=1))
+        self.index.add("soon", self.now + timedelta(days=1))
+        self.index.add("far", self.now + timedelta(days=30))
+
+    def test_due_before(self):
+        self.assertEqual(self.index.due_before(self.now), ["late", "later"])
+        self.assertEqual(self.index.due_before(self.now - timedelta(days=2)), [])
+
+    def test_due_between(self):
+        self.assertEqual(
+            self.index.due_between(self.now, self.now + timedelta(days=1)),
+            ["soon"]
+        )
+        self.assertEqual(
+            self.index.due_between(self.now - timedelta(days=2), self.now - timedelta(days=1)),
+            ["late", "later"]
+        )
+
+    def test_add_replaces_existing_entry(self):
+        self.index.add("far", self.now - timedelta(days=3))
+
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.due_before(self.now), ["far", "late", "later"])
+
+    def test_discard(self):
+        self.index.discard("late")
+        self.index.discard("missing")
+
+        self.assertNotIn("late", self.index)
+        self.assertEqual(self.index.due_before(self.now), ["later"])
+
+    def test_add_many(self):
+        self.index.add_many([
+            ("soon", self.now - timedelta(days=5)),
+            ("new", self.now - timedelta(hours=1)),
+        ])
+
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.index.due_before(self.now), ["soon", "late", "later", "new"])
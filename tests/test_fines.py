@@ -0,0 +1,63 @@
+from array import array
+from datetime import datetime, timedelta
+
+from library_management import fines
+from library_management.fines import calculate_fines, fine_for_days, total_fines, DAY_MICROS
+from library_management.library_item import Book
+from library_management.member import Member
+from library_management.timestamps import to_micros
+
+import unittest
+
+
+class TestFines(unittest.TestCase):
+
+    def setUp(self):
+        self.moment = datetime(2024, 6, 1, 12, 0)
+        self.offsets = [
+            timedelta(hours=-5), timedelta(hours=23, minutes=59), timedelta(days=1),
+            timedelta(days=29, hours=23), timedelta(days=30), timedelta(days=95),
+            timedelta(days=364, hours=12), timedelta(days=365), timedelta(days=900),
+        ]
+
+    def test_fine_for_days(self):
+        self.assertEqual(fine_for_days(0), 0.0)
+        self.assertEqual(fine_for_days(2), 30.0)
+        self.assertEqual(fine_for_days(60), 1_000.0)
+        self.assertEqual(fine_for_days(365), 10_000.0)
+
+    def test_calculate_fines_matches_timedelta_days(self):
+        due_dates = array("q", [to_micros(self.moment - offset) for offset in self.offsets])
+
+        self.assertEqual(
+            list(calculate_fines(due_dates, to_micros(self.moment))),
+            [fine_for_days(offset.days) for offset in self.offsets]
+        )
+
+    def test_calculate_fines_matches_calculate_fine(self):
+        member = Member("Patrick")
+        book = Book("Title", "2000", "Author", ISBN="1")
+        member.borrow_item(book, datetime.now() - timedelta(days=45))
+
+        fine, = calculate_fines([to_micros(book.get_due_date())], to_micros(datetime.now()))
+
+        self.assertEqual(fine, book.calculate_fine())
+
+    @unittest.skipIf(fines.numpy is None, "NumPy is not installed")
+    def test_numpy_path_matches(self):
+        moment = to_micros(self.moment)
+        due_dates = array("q", [moment - step * DAY_MICROS // 7 for step in range(5_000)])
+
+        self.assertEqual(
+            list(calculate_fines(due_dates, moment)),
+            [fine_for_days((moment - due) // DAY_MICROS) for due in due_dates]
+        )
+
+    def test_total_fines(self):
+        moment = to_micros(self.moment)
+        due_dates = [moment - 2 * DAY_MICROS, moment - 3 * DAY_MICROS, moment + DAY_MICROS]
+
+        self.assertEqual(
+            total_fines(["a", "a", "b"], due_dates, moment),
+            {"a": 75.0}
+        )
@@ -0,0 +1,54 @@
+from library_management.hold_queue import HoldQueue
+
+import unittest
+
+
+class TestHoldQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.holds = HoldQueue()
+
+    def test_first_come_first_served(self):
+        self.assertEqual(self.holds.place("i-1", "m-1"), 1)
+        self.assertEqual(self.holds.place("i-1", "m-2"), 2)
+        self.assertEqual(self.holds.place("i-2", "m-1"), 1)
+
+        self.assertEqual(self.holds.get_queue("i-1"), ["m-1", "m-2"])
+        self.assertEqual(self.holds.get_item_ids("m-1"), ["i-1", "i-2"])
+        self.assertEqual(len(self.holds), 3)
+
+        self.assertEqual(self.holds.peek_next("i-1"), "m-1")
+        self.assertEqual(self.holds.pop_next("i-1"), "m-1")
+        self.assertEqual(self.holds.pop_next("i-1"), "m-2")
+        self.assertIsNone(self.holds.peek_next("i-1"))
+        self.assertIsNone(self.holds.pop_next("i-1"))
+        self.assertNotIn("i-1", self.holds)
+        self.assertEqual(self.holds.get_item_ids("m-1"), ["i-2"])
+        self.assertEqual(self.holds.get_item_ids("m-2"), [])
+
+    def test_duplicate_hold(self):
+        self.holds.place("i-1", "m-1")
+
+        with self.assertRaises(ValueError):
+            self.holds.place("i-1", "m-1")
+        self.assertEqual(self.holds.count("i-1"), 1)
+
+    def test_cancel(self):
+        for member_id in ("m-1", "m-2", "m-3"):
+            self.holds.place("i-1", member_id)
+
+        self.assertTrue(self.holds.cancel("i-1", "m-2"))
+        self.assertFalse(self.holds.cancel("i-1", "m-2"))
+        self.assertFalse(self.holds.cancel("i-2", "m-1"))
+        self.assertEqual(self.holds.get_queue("i-1"), ["m-1", "m-3"])
+        self.assertEqual(len(self.holds), 2)
+
+    def test_discard_item(self):
+        self.holds.place("i-1", "m-1")
+        self.holds.place("i-1", "m-2")
+        self.holds.place("i-2", "m-2")
+
+        self.assertEqual(self.holds.discard_item("i-1"), ["m-1", "m-2"])
+        self.assertEqual(self.holds.discard_item("i-1"), [])
+        self.assertEqual(self.holds.get_item_ids("m-2"), ["i-2"])
+        self.assertEqual(len(self.holds), 1)
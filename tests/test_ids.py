@@ -0,0 +1,83 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from library_management.ids import (
+    SnowflakeGenerator, Uuid4Generator, get_id_generator, new_id, set_id_generator
+)
+from library_management.library import Library
+from library_management.library_item import Book
+
+import unittest
+
+
+class TestSnowflakeGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = SnowflakeGenerator(node=5)
+
+    def test_ids_are_fixed_width_and_increasing(self):
+        ids = [self.generator.new_id() for _ in range(10_000)]
+
+        self.assertTrue(all(len(identifier) == 16 for identifier in ids))
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_ids_encode_time_and_node(self):
+        identifier = self.generator.new_id()
+        created = SnowflakeGenerator.get_timestamp(identifier)
+
+        self.assertLess(abs(created - datetime.now(timezone.utc).replace(tzinfo=None)), timedelta(seconds=5))
+        self.assertEqual((int(identifier, 16) >> 12) & SnowflakeGenerator.MAX_NODE, 5)
+
+        with self.assertRaises(ValueError):
+            SnowflakeGenerator.get_timestamp("not-a-snowflake")
+
+    def test_node_range(self):
+        with self.assertRaises(ValueError):
+            SnowflakeGenerator(node=1024)
+
+    def test_unique_across_threads(self):
+        ids = []
+
+        def generate():
+            ids.extend(self.generator.new_id() for _ in range(2_000))
+
+        threads = [threading.Thread(target=generate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(ids)), 8_000)
+
+
+class TestIdGeneratorSelection(unittest.TestCase):
+
+    def tearDown(self):
+        set_id_generator(self.previous)
+
+    def test_uuid4_and_snowflake_ids_coexist(self):
+        snowflake_book = Book("Title", "2000", "Author", ISBN="1")
+        self.previous = set_id_generator(Uuid4Generator())
+        uuid_book = Book("Title", "2000", "Author", ISBN="2")
+
+        self.assertIsInstance(get_id_generator(), Uuid4Generator)
+        self.assertEqual(len(snowflake_book.get_id()), 16)
+        self.assertEqual(len(uuid_book.get_id()), 36)
+        self.assertEqual(len(new_id()), 36)
+
+        library = Library()
+        library.add_items([snowflake_book, uuid_book])
+
+        self.assertEqual(library.search_item(snowflake_book.get_id()), [snowflake_book])
+        self.assertEqual(library.search_item(uuid_book.get_id()), [uuid_book])
+        self.assertEqual(
+            library.search_item(uuid_book.get_id()[:8], mode="prefix"), [uuid_book]
+        )
+        self.assertIs(library.get_item(snowflake_book.get_id()), snowflake_book)
+
+    def test_rejects_other_objects(self):
+        self.previous = get_id_generator()
+
+        with self.assertRaises(ValueError):
+            set_id_generator(lambda: "id")
@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+
+from library_management.instrumentation import Instrumentation, OperationStats
+from library_management.library import Library
+from library_management.library_item import Book
+
+import unittest
+
+
+class TestOperationStats(unittest.TestCase):
+
+    def test_histogram_is_cumulative(self):
+        stats = OperationStats(bounds=(0.001, 0.01))
+        stats.observe(0.0005)
+        stats.observe(0.005)
+        stats.observe(0.5, ValueError())
+
+        self.assertEqual(stats.get_calls(), 3)
+        self.assertEqual(stats.get_errors(), {"ValueError": 1})
+        self.assertAlmostEqual(stats.get_sum(), 0.5055)
+        self.assertEqual(stats.get_histogram(), [(0.001, 1), (0.01, 2), (float("inf"), 3)])
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.spans = []
+
+        @contextmanager
+        def tracer(name):
+            self.spans.append(name)
+            yield
+
+        self.instrumentation = Instrumentation(tracer=tracer)
+        self.library = Library(instrumentation=self.instrumentation)
+
+        self.book = Book(
+            title="The Pragmatic Programmer",
+            pub_year="1999",
+            author_name="Andrew Hunt and David Thomas",
+            ISBN="978-0201616224"
+        )
+        self.library.add_item(self.book)
+
+    def test_records_calls_errors_and_spans(self):
+        member_id = self.library.create_member("Patrick")
+        self.library.lend_item(member_id, self.book)
+        with self.assertRaises(Exception):
+            self.library.lend_item("missing", self.book)
+
+        lend = self.instrumentation.get_stats("Library", "lend_item")
+        borrow = self.instrumentation.get_stats("Member", "borrow_item")
+
+        self.assertEqual(lend.get_calls(), 2)
+        self.assertEqual(lend.get_errors(), {"Exception": 1})
+        self.assertEqual(borrow.get_calls(), 1)
+        self.assertEqual(
+            self.spans,
+            ["Library.add_item", "Library.create_member", "Library.lend_item",
+             "Member.borrow_item", "Library.lend_item"]
+        )
+
+    def test_to_prometheus(self):
+        with self.assertRaises(KeyError):
+            self.library.remove_item("missing")
+
+        text = self.instrumentation.to_prometheus()
+
+        self.assertIn("# TYPE library_operation_duration_seconds histogram", text)
+        self.assertIn('library_operation_calls_total{class="Library",operation="add_item"} 1', text)
+        self.assertIn(
+            'library_operation_errors_total{class="Library",operation="remove_item",error="KeyError"} 1',
+            text
+        )
+        self.assertIn(
+            'library_operation_duration_seconds_bucket{class="Library",operation="add_item",le="+Inf"} 1',
+            text
+        )
+        self.assertTrue(text.endswith("\n"))
+
+    def test_detach_restores_plain_methods(self):
+        Instrumentation.detach(self.library)
+        self.library.search_item("The Pragmatic Programmer")
+
+        self.assertEqual(self.instrumentation.get_stats("Library", "search_item").get_calls(), 0)
+        self.assertEqual(self.library.search_item.__func__, Library.search_item)
+
+    def test_generators_are_not_wrapped(self):
+        self.assertEqual(list(self.library.iter_items(fields=("id",))), [{"id": self.book.get_id()}])
+        self.assertNotIn("iter_items", vars(self.library))
@@ -0,0 +1,92 @@
+from library_management.inventory import Title, Copy
+from library_management.library_item import Book, DVD, LibraryItem
+from library_management.member import Member
+from library_management.storage import item_record
+
+import unittest
+
+
+class TestInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.title = Title(
+            Book,
+            title="The Pragmatic Programmer",
+            pub_year="1999",
+            author_name="Andrew Hunt and David Thomas",
+            detail="978-0201616224"
+        )
+
+    def test_copies_share_the_record(self):
+        first, second = self.title.new_copies(2)
+
+        self.assertEqual(first.get_id(), f"{self.title.get_id()}.1")
+        self.assertEqual(second.get_id(), f"{self.title.get_id()}.2")
+        self.assertIs(first.get_title(), second.get_title())
+        self.assertIs(first.get_record(), self.title)
+        self.assertEqual(first.get_detail(), "978-0201616224")
+        self.assertEqual(self.title.new_copies(1)[0].get_id(), f"{self.title.get_id()}.3")
+
+    def test_copy_info(self):
+        copy = Copy(self.title, item_id="c-1")
+        info = copy.get_info()
+
+        self.assertEqual(info["ISBN"], "978-0201616224")
+        self.assertEqual(info["title_id"], self.title.get_id())
+        self.assertEqual(copy.get_field("ISBN"), "978-0201616224")
+        self.assertEqual(copy.get_field("title_id"), self.title.get_id())
+        self.assertEqual(copy.get_info(("id", "title")), {"id": "c-1", "title": "The Pragmatic Programmer"})
+
+    def test_copy_is_stored_as_its_kind(self):
+        copy = Copy(self.title, item_id="c-1")
+
+        self.assertIs(copy.get_kind(), Book)
+        self.assertEqual(item_record(copy)[:6], (1, "c-1", "The Pragmatic Programmer", "1999",
+                                                 "Andrew Hunt and David Thomas", "978-0201616224"))
+
+    def test_availability_counters(self):
+        copies = self.title.new_copies(3)
+        self.assertEqual(self.title.get_copy_count(), 0)
+
+        for copy in copies:
+            self.title._attach(copy)
+        self.assertEqual((self.title.get_available_count(), self.title.get_copy_count()), (3, 3))
+
+        self.title._check_out(copies[0])
+        self.title._check_out(copies[0])
+        self.title._check_out(copies[2])
+        self.assertEqual(self.title.get_available_count(), 1)
+        self.assertIs(self.title.get_available_copy(), copies[1])
+
+        self.title._check_out(copies[1])
+        self.assertIsNone(self.title.get_available_copy())
+
+        self.title._check_in(copies[2])
+        self.title._check_in(copies[2])
+        self.assertEqual(self.title.get_available_count(), 1)
+
+        self.title._detach(copies[2])
+        self.assertEqual((self.title.get_available_count(), self.title.get_copy_count()), (0, 2))
+        self.title._check_in(copies[2])
+        self.assertEqual(self.title.get_available_count(), 0)
+
+    def test_borrowed_copy_is_not_available(self):
+        copy = Copy(self.title, is_borrowed=True, borrowed_by=Member(name="Patrick"))
+        self.title._attach(copy)
+
+        self.assertEqual(self.title.get_info()["available"], 0)
+        self.assertEqual(self.title.get_info()["copies"], 1)
+
+    def test_kind_without_detail(self):
+        title = Title(LibraryItem, "Untitled", "2000", "Anonymous")
+
+        self.assertNotIn(None, title.get_info())
+        self.assertNotIn(None, Copy(title).get_info())
+        self.assertEqual(Title(DVD, "Inception", "2010", "Nolan", "2h").get_info()["duration"], "2h")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Title(Copy, "Untitled", "2000", "Anonymous")
+
+        with self.assertRaises(ValueError):
+            self.title.new_copies(-1)
@@ -1,8 +1,18 @@
+import json
+import os
+import tempfile
+import threading
 from datetime import datetime, timedelta
 
-from library_management.library import Library
+from library_management.library import (
+    Library, LENT, RETURNED, UNKNOWN_ITEM, DUPLICATE, ALREADY_ON_LOAN, NOT_ON_LOAN, NOT_APPLIED
+)
+from library_management.circulation_log import CirculationLog
+from library_management.circulation_stats import CirculationStats
+from library_management.inventory import Title
 from library_management.library_item import Book, Magazine, DVD
 from library_management.member import Member
+from library_management.result_cache import ResultCache
 
 import unittest
 
@@ -54,6 +64,23 @@ class TestLibrary(unittest.TestCase):
         self.assertNotEqual(items, [])
         self.assertEqual(len(items), 1)
 
+    def test_add_items(self):
+        added = self.library.add_items(
+            [self.book, self.magazine, self.dvd, self.two_days_due_borrowed_item],
+            batch_size=3
+        )
+
+        self.assertEqual(added, 4)
+        self.assertEqual(len(self.library.get_items()), 4)
+        self.assertEqual(self.library.search_item("Inception"), [self.dvd])
+        self.assertEqual(self.library.get_overdue_items(), [self.two_days_due_borrowed_item])
+
+    def test_add_items_rejects_whole_invalid_batch(self):
+        with self.assertRaises(ValueError):
+            self.library.add_items([self.book, "not an item"])
+
+        self.assertEqual(self.library.get_items(), [])
+
     def test_remove_item_from_library(self):
         item = self.book
         self.library.add_item(item)
@@ -72,6 +99,154 @@ class TestLibrary(unittest.TestCase):
         self.assertEqual(len(members), 1)
         self.assertEqual(member_id, members[0].get("id"))
 
+    def test_create_members(self):
+        member_ids = self.library.create_members(["Patrick", "Ama"])
+        members = self.library.get_members()
+
+        self.assertEqual([member.get("id") for member in members], member_ids)
+        self.assertEqual([member.get("name") for member in members], ["Patrick", "Ama"])
+
+        with self.assertRaises(ValueError):
+            self.library.create_members(["Kofi", 42])
+
+        self.assertEqual(len(self.library.get_members()), 2)
+
+    def test_create_members_with_ids(self):
+        self.assertEqual(self.library.create_member("Patrick", member_id="m-1"), "m-1")
+        self.assertEqual(self.library.create_members(["Ama", "Kofi"], ["m-2", None])[0], "m-2")
+
+        with self.assertRaises(ValueError):
+            self.library.create_member("Esi", member_id="m-1")
+
+        with self.assertRaises(ValueError):
+            self.library.create_members(["Esi", "Yaw"], ["m-3", "m-3"])
+
+        with self.assertRaises(ValueError):
+            self.library.create_members(["Esi"], ["m-2"])
+
+        self.assertEqual(len(self.library.get_members()), 3)
+
+    def test_get_items_with_fields(self):
+        self.library.add_items([self.book, self.two_days_due_borrowed_item])
+
+        self.assertEqual(
+            self.library.get_items(fields=("id", "borrower_id")),
+            [
+                {"id": self.book.get_id(), "borrower_id": None},
+                {"id": self.two_days_due_borrowed_item.get_id(), "borrower_id": self.member.get_id()},
+            ]
+        )
+
+        with self.assertRaises(KeyError):
+            self.library.get_items(fields=("unknown",))
+
+    def test_get_items_page(self):
+        items = [
+            Book(title=f"Book {number}", pub_year="2000", author_name="Author",
+                 ISBN=str(number), item_id=f"id-{number}")
+            for number in range(5)
+        ]
+        self.library.add_items(reversed(items))
+
+        page, cursor = self.library.get_items_page(limit=2, fields=("id",))
+        self.assertEqual(page, [{"id": "id-0"}, {"id": "id-1"}])
+
+        self.library.remove_item("id-1")
+        self.library.remove_item("id-2")
+
+        page, cursor = self.library.get_items_page(cursor, limit=2, fields=("id",))
+        self.assertEqual(page, [{"id": "id-3"}, {"id": "id-4"}])
+        self.assertIsNone(cursor)
+
+        with self.assertRaises(ValueError):
+            self.library.get_items_page("not a cursor")
+
+        with self.assertRaises(ValueError):
+            self.library.get_items_page(limit=0)
+
+    def test_iter_items(self):
+        self.library.add_items([self.book, self.magazine, self.dvd])
+
+        infos = list(self.library.iter_items(page_size=2))
+
+        self.assertEqual(
+            sorted(info["id"] for info in infos),
+            sorted(info["id"] for info in self.library.get_items())
+        )
+        self.assertEqual(sorted(infos, key=lambda info: info["id"]), infos)
+
+    def test_iter_items_json(self):
+        self.assertEqual(b"".join(self.library.iter_items_json()), b"[]")
+
+        self.library.add_items([self.book, self.magazine, self.two_days_due_borrowed_item])
+        chunks = list(self.library.iter_items_json(page_size=2))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(
+            json.loads(b"".join(chunks)),
+            json.loads(json.dumps(list(self.library.iter_items()), default=datetime.isoformat))
+        )
+
+        with self.assertRaises(ValueError):
+            next(self.library.iter_items_json(page_size=0))
+
+    def test_export_and_import_columnar(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "catalog.col")
+
+        self.library.add_items([self.magazine, self.dvd, self.two_days_due_borrowed_item])
+        member_id = self.library.create_member("Ama")
+        self.library.lend_item(member_id, self.dvd)
+        self.library.export_columnar(path)
+
+        restored = Library()
+        self.assertEqual(restored.import_columnar(path), 3)
+        self.assertEqual(list(restored.iter_items()), list(self.library.iter_items()))
+        self.assertEqual(restored.get_members(), self.library.get_members())
+        self.assertEqual(restored.get_borrowed_item_ids(member_id), [self.dvd.get_id()])
+        self.assertEqual(
+            [item.get_id() for item in restored.get_overdue_items()],
+            [self.two_days_due_borrowed_item.get_id()]
+        )
+
+        with self.assertRaises(ValueError):
+            restored.import_columnar(path)
+
+    def test_export_and_import_columnar_keeps_titles(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "catalog.col")
+
+        title = Title(DVD, "Inception", "2010", "Christopher Nolan", "2h:28m")
+        copy_ids = self.library.add_copies(title, 3)
+        member_id = self.library.create_member("Ama")
+        self.library.lend_title(member_id, title.get_id())
+        self.library.export_columnar(path)
+
+        restored = Library()
+        restored.import_columnar(path)
+        self.assertEqual(restored.get_availability(title.get_id()), (2, 3))
+        self.assertEqual(sorted(restored.get_title(title.get_id()).get_copy_ids()), sorted(copy_ids))
+        restored.lend_title(member_id, title.get_id())
+        self.assertEqual(restored.get_availability(title.get_id()), (1, 3))
+
+    def test_get_members_page(self):
+        member_ids = self.library.create_members(["Patrick", "Ama", "Kofi"])
+
+        page, cursor = self.library.get_members_page(limit=2, fields=("id",))
+        rest, last_cursor = self.library.get_members_page(cursor, limit=2, fields=("id",))
+
+        self.assertEqual([info["id"] for info in page + rest], sorted(member_ids))
+        self.assertIsNone(last_cursor)
+        self.assertEqual(
+            list(self.library.iter_members(page_size=1)),
+            sorted(self.library.get_members(), key=lambda info: info["id"])
+        )
+
+        with self.assertRaises(ValueError):
+            self.library.get_items_page(cursor)
+
     def test_lend_item(self):
         self.library.add_item(self.book)
         member_id = self.library.create_member(name="Patrick")
@@ -84,6 +259,40 @@ class TestLibrary(unittest.TestCase):
         self.assertIsNotNone(self.book.get_due_date())
         self.assertTrue(self.book.get_is_borrowed())
 
+    def test_lend_item_already_on_loan(self):
+        self.library.add_item(self.book)
+        patrick_id, ama_id = self.library.create_members(["Patrick", "Ama"])
+        self.library.lend_item(member_id=patrick_id, item=self.book)
+
+        with self.assertRaises(Exception):
+            self.library.lend_item(member_id=ama_id, item=self.book)
+
+        self.assertEqual(self.book.get_borrowed_by().get_id(), patrick_id)
+
+    def test_thread_safe_library_never_double_lends(self):
+        library = Library(thread_safe=True)
+        library.add_item(self.book)
+        member_ids = library.create_members(f"Member {number}" for number in range(8))
+        winners = []
+        barrier = threading.Barrier(len(member_ids))
+
+        def borrow(member_id):
+            barrier.wait()
+            try:
+                library.lend_item(member_id=member_id, item=self.book)
+                winners.append(member_id)
+            except Exception:
+                pass
+
+        threads = [threading.Thread(target=borrow, args=(member_id,)) for member_id in member_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(winners), 1)
+        self.assertEqual(self.book.get_borrowed_by().get_id(), winners[0])
+
     def test_return_item(self):
         self.library.add_item(self.book)
         member_id = self.library.create_member(name="Patrick")
@@ -95,6 +304,37 @@ class TestLibrary(unittest.TestCase):
         self.assertIsNone(self.book.get_due_date())
         self.assertFalse(self.book.get_is_borrowed())
 
+    def test_loan_lookups(self):
+        self.library.add_items([self.book, self.magazine, self.two_days_due_borrowed_item])
+        member_id = self.library.create_member("Ama")
+        self.library.lend_item(member_id, self.book)
+        self.library.lend_item(member_id, self.magazine)
+
+        self.assertIs(self.library.get_item(self.book.get_id()), self.book)
+        self.assertEqual(self.library.get_borrower_id(self.book.get_id()), member_id)
+        self.assertEqual(
+            self.library.get_borrower_id(self.two_days_due_borrowed_item.get_id()),
+            self.member.get_id()
+        )
+        self.assertEqual(
+            self.library.get_borrowed_item_ids(member_id),
+            [self.book.get_id(), self.magazine.get_id()]
+        )
+        self.assertEqual(self.library.get_loan_count(member_id), 2)
+
+        self.library.return_item(member_id, self.book)
+        self.library.remove_item(self.magazine.get_id())
+
+        self.assertEqual(self.library.get_loan_count(member_id), 0)
+        self.assertEqual(self.library.get_borrowed_item_ids(member_id), [])
+        self.assertIsNone(self.library.get_borrower_id(self.book.get_id()))
+
+        with self.assertRaises(KeyError):
+            self.library.get_item(self.magazine.get_id())
+
+        with self.assertRaises(KeyError):
+            self.library.get_borrower_id(self.magazine.get_id())
+
     def test_overdue_items(self):
         self.library.add_item(self.two_days_due_borrowed_item)
 
@@ -105,6 +345,332 @@ class TestLibrary(unittest.TestCase):
         self.assertTrue(item.is_overdue())
         self.assertEqual(item.calculate_fine(), 30)
 
+    def test_calculate_fines(self):
+        self.library.add_items([self.book, self.two_days_due_borrowed_item])
+        member_id = self.library.create_member("Ama")
+        self.library.lend_item(member_id, self.book)
+
+        self.assertEqual(self.library.calculate_fines(), {self.member.get_id(): 30.0})
+        self.assertEqual(
+            self.library.calculate_fines(datetime.now() + timedelta(days=40)),
+            {self.member.get_id(): 500.0, member_id: 500.0}
+        )
+
+    def test_overdue_items_skips_items_not_borrowed(self):
+        self.library.add_item(self.book)
+        self.library.add_item(self.two_days_due_borrowed_item)
+        member_id = self.library.create_member(name="Patrick")
+        self.library.add_item(self.dvd)
+        self.library.lend_item(member_id=member_id, item=self.dvd)
+
+        overdue_items = self.library.get_overdue_items()
+
+        self.assertEqual(len(overdue_items), 1)
+        self.assertEqual(overdue_items[0].get_id(), self.two_days_due_borrowed_item.get_id())
+
+    def test_items_due_within(self):
+        self.library.add_item(self.book)
+        self.library.add_item(self.two_days_due_borrowed_item)
+        member_id = self.library.create_member(name="Patrick")
+        self.library.lend_item(member_id=member_id, item=self.book)
+
+        self.assertEqual(self.library.get_items_due_within(days=2), [])
+        self.assertEqual(self.library.get_items_due_within(days=5), [self.book])
+
+        self.library.return_item(member_id=member_id, item=self.book)
+        self.assertEqual(self.library.get_items_due_within(days=5), [])
+
+    def test_lend_and_return_items(self):
+        self.library.add_items([self.book, self.magazine, self.dvd])
+        member_id = self.library.create_member(name="Patrick")
+        basket = [self.book.get_id(), self.magazine.get_id()]
+
+        self.assertEqual(self.library.lend_items(member_id, basket), [LENT, LENT])
+        self.assertEqual(self.library.get_borrowed_item_ids(member_id), basket)
+        self.assertEqual(self.book.get_due_date(), self.magazine.get_due_date())
+
+        self.assertEqual(
+            self.library.return_items(member_id, basket + [self.dvd.get_id()]),
+            [NOT_APPLIED, NOT_APPLIED, NOT_ON_LOAN]
+        )
+        self.assertEqual(self.library.get_loan_count(member_id), 2)
+
+        self.assertEqual(self.library.return_items(member_id, reversed(basket)), [RETURNED, RETURNED])
+        self.assertFalse(self.book.get_is_borrowed())
+        self.assertEqual(self.library.get_overdue_items(), [])
+
+    def test_holds_hand_off_on_return(self):
+        self.library.add_items([self.book, self.dvd])
+        patrick, ama, kofi = self.library.create_members(["Patrick", "Ama", "Kofi"])
+        self.library.lend_item(patrick, self.book)
+
+        self.assertEqual(self.library.place_hold(ama, self.book.get_id()), 1)
+        self.assertEqual(self.library.place_hold(kofi, self.book.get_id()), 2)
+        self.assertEqual(self.library.get_hold_queue(self.book.get_id()), [ama, kofi])
+        self.assertEqual(self.library.get_held_item_ids(ama), [self.book.get_id()])
+
+        self.assertEqual(self.library.return_item(patrick, self.book), ama)
+        self.assertEqual(self.library.get_borrower_id(self.book.get_id()), ama)
+        self.assertIs(self.book.get_borrowed_by().get_id(), ama)
+        self.assertEqual(self.library.get_held_item_ids(ama), [])
+
+        self.library.cancel_hold(kofi, self.book.get_id())
+        self.assertIsNone(self.library.return_item(ama, self.book))
+        self.assertFalse(self.book.get_is_borrowed())
+
+        with self.assertRaises(KeyError):
+            self.library.cancel_hold(kofi, self.book.get_id())
+
+    def test_hand_off_waits_for_the_holder(self):
+        library = Library(thread_safe=True)
+        library.add_items([self.book, self.magazine, self.dvd])
+        patrick, ama = library.create_members(["Patrick", "Ama"])
+        library.lend_item(patrick, self.book)
+        library.lend_item(ama, self.magazine)
+        library.place_hold(ama, self.book.get_id())
+
+        # Pause Ama's own lend of the DVD halfway, while it holds her stripe.
+        ama_member = self.magazine.get_borrowed_by()
+        borrow_item = ama_member.borrow_item
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_borrow_item(item):
+            if item is self.dvd:
+                entered.set()
+                release.wait(5)
+            borrow_item(item)
+
+        ama_member.borrow_item = slow_borrow_item
+        lending = threading.Thread(target=library.lend_item, args=(ama, self.dvd))
+        lending.start()
+        entered.wait(5)
+        returning = threading.Thread(target=library.return_item, args=(patrick, self.book))
+        returning.start()
+
+        returning.join(0.2)
+        self.assertTrue(returning.is_alive())
+        release.set()
+        lending.join()
+        returning.join()
+
+        self.assertEqual(library.get_borrower_id(self.book.get_id()), ama)
+        self.assertEqual(
+            sorted(library.get_borrowed_item_ids(ama)),
+            sorted(item.get_id() for item in (self.book, self.magazine, self.dvd))
+        )
+
+    def test_hold_errors(self):
+        self.library.add_items([self.book, self.dvd])
+        patrick, ama = self.library.create_members(["Patrick", "Ama"])
+        self.library.lend_item(patrick, self.book)
+        self.library.place_hold(ama, self.book.get_id())
+
+        for member_id, item_id in (
+                (ama, self.dvd.get_id()),
+                (patrick, self.book.get_id()),
+                (ama, self.book.get_id()),
+                ("missing", self.book.get_id()),
+                (ama, "missing"),
+        ):
+            with self.assertRaises(Exception):
+                self.library.place_hold(member_id, item_id)
+
+        self.library.remove_item(self.book.get_id())
+        self.assertEqual(self.library.get_held_item_ids(ama), [])
+
+    def test_return_items_hands_off(self):
+        self.library.add_items([self.book, self.dvd])
+        patrick, ama = self.library.create_members(["Patrick", "Ama"])
+        self.library.lend_items(patrick, [self.book.get_id(), self.dvd.get_id()])
+        self.library.place_hold(ama, self.dvd.get_id())
+
+        self.library.return_items(patrick, [self.book.get_id(), self.dvd.get_id()])
+        self.assertEqual(self.library.get_borrowed_item_ids(ama), [self.dvd.get_id()])
+        self.assertFalse(self.book.get_is_borrowed())
+
+    def test_copies_availability(self):
+        title = Title(Book, "The Pragmatic Programmer", "1999", "Andrew Hunt and David Thomas", "978-0201616224")
+        copy_ids = self.library.add_copies(title, 3)
+        patrick, ama = self.library.create_members(["Patrick", "Ama"])
+
+        self.assertIs(self.library.get_title(title.get_id()), title)
+        self.assertEqual(self.library.get_availability(title.get_id()), (3, 3))
+        self.assertEqual(len(self.library.search_item("Pragmatic", mode="substring")), 3)
+
+        lent_id = self.library.lend_title(patrick, title.get_id())
+        self.assertIn(lent_id, copy_ids)
+        self.assertEqual(self.library.get_borrower_id(lent_id), patrick)
+        self.assertEqual(self.library.get_availability(title.get_id()), (2, 3))
+
+        others = [copy_id for copy_id in copy_ids if copy_id != lent_id]
+        self.assertEqual(self.library.lend_items(ama, others), [LENT, LENT])
+        self.assertEqual(self.library.get_availability(title.get_id()), (0, 3))
+        with self.assertRaises(Exception):
+            self.library.lend_title(patrick, title.get_id())
+
+        self.library.place_hold(patrick, others[0])
+        self.library.return_items(ama, others)
+        self.assertEqual(self.library.get_availability(title.get_id()), (1, 3))
+
+        self.library.return_item(patrick, self.library.get_item(lent_id))
+        self.library.remove_item(lent_id)
+        self.assertEqual(self.library.get_availability(title.get_id()), (1, 2))
+
+        for copy_id in others:
+            self.library.remove_item(copy_id)
+        with self.assertRaises(KeyError):
+            self.library.get_availability(title.get_id())
+
+    def test_thread_safe_library_lends_each_copy_once(self):
+        library = Library(thread_safe=True)
+        title = Title(Book, "The Pragmatic Programmer", "1999", "Andrew Hunt and David Thomas", "978-0201616224")
+        copy_ids = library.add_copies(title, 2)
+        patrick, ama = library.create_members(["Patrick", "Ama"])
+        library.add_item(self.book)
+        library.lend_item(patrick, self.book)
+        lent_ids = []
+
+        # Pause Patrick's loan halfway, before the copy he picked is marked as lent.
+        patrick_member = self.book.get_borrowed_by()
+        borrow_item = patrick_member.borrow_item
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_borrow_item(item, *args):
+            entered.set()
+            release.wait(5)
+            borrow_item(item, *args)
+
+        def lend(member_id):
+            lent_ids.append(library.lend_title(member_id, title.get_id()))
+
+        patrick_member.borrow_item = slow_borrow_item
+        first = threading.Thread(target=lend, args=(patrick,))
+        first.start()
+        entered.wait(5)
+        second = threading.Thread(target=lend, args=(ama,))
+        second.start()
+
+        second.join(0.2)
+        release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(sorted(lent_ids), sorted(copy_ids))
+        self.assertEqual(library.get_availability(title.get_id()), (0, 2))
+
+    def test_lend_title_errors(self):
+        title = Title(Book, "The Pragmatic Programmer", "1999", "Andrew Hunt and David Thomas", "978-0201616224")
+        self.library.add_copies(title)
+
+        with self.assertRaises(Exception):
+            self.library.lend_title("missing", title.get_id())
+        with self.assertRaises(KeyError):
+            self.library.lend_title(self.library.create_member("Patrick"), "missing")
+
+    def test_loan_history(self):
+        library = Library(circulation_log=CirculationLog())
+        library.add_items([self.book, self.dvd])
+        patrick, ama = library.create_members(["Patrick", "Ama"])
+        start = datetime.now()
+
+        library.lend_item(patrick, self.book)
+        due_date = self.book.get_due_date()
+        library.place_hold(ama, self.book.get_id())
+        library.return_item(patrick, self.book)
+        library.lend_items(patrick, [self.dvd.get_id()])
+        library.return_items(patrick, [self.dvd.get_id()])
+
+        history = library.get_loan_history(item_id=self.book.get_id())
+        self.assertEqual(
+            [(event.is_lend(), event.get_member_id()) for event in history],
+            [(True, patrick), (False, patrick), (True, ama)]
+        )
+        self.assertEqual(history[0].get_due_date(), due_date)
+        self.assertGreaterEqual(history[0].get_moment(), start)
+        self.assertEqual(len(library.get_loan_history(member_id=patrick)), 4)
+        self.assertEqual(library.get_loan_history(start=datetime.now() + timedelta(days=1)), [])
+        self.assertEqual(len(library.get_circulation_log()), 5)
+
+        with self.assertRaises(ValueError):
+            self.library.get_loan_history()
+
+    def test_circulation_summary(self):
+        library = Library(circulation_stats=CirculationStats())
+        library.add_items([self.book, self.magazine, self.dvd, self.two_days_due_borrowed_item])
+        patrick, ama = library.create_members(["Patrick", "Ama"])
+
+        library.lend_item(patrick, self.book)
+        library.place_hold(ama, self.book.get_id())
+        library.return_item(patrick, self.book)
+        library.lend_items(patrick, [self.dvd.get_id(), self.magazine.get_id()])
+        library.return_items(patrick, [self.magazine.get_id()])
+        library.remove_item(self.magazine.get_id())
+
+        summary = library.get_circulation_summary(n=1)
+        self.assertEqual(summary["lends"], 4)
+        self.assertEqual(summary["top_titles"], [("the pragmatic programmer / andrew hunt and david thomas", 2)])
+        self.assertEqual(summary["top_authors"], [("Andrew Hunt and David Thomas", 2)])
+        self.assertEqual(summary["active_loans"], {"Book": 2, "DVD": 1})
+
+        library.remove_item(self.two_days_due_borrowed_item.get_id())
+        self.assertEqual(library.get_circulation_summary()["active_loans"], {"Book": 1, "DVD": 1})
+        self.assertEqual(library.get_circulation_stats().get_title_loans("inception / christopher nolan"), 1)
+
+        with self.assertRaises(ValueError):
+            self.library.get_circulation_summary()
+
+    def test_lend_items_is_atomic(self):
+        self.library.add_items([self.book, self.magazine, self.dvd])
+        patrick = self.library.create_member(name="Patrick")
+        ama = self.library.create_member(name="Ama")
+        self.library.lend_item(ama, self.dvd)
+        version = self.library.get_version()
+
+        outcomes = self.library.lend_items(
+            patrick, [self.book.get_id(), "missing", self.dvd.get_id(), self.book.get_id()]
+        )
+        self.assertEqual(outcomes, [NOT_APPLIED, UNKNOWN_ITEM, ALREADY_ON_LOAN, DUPLICATE])
+        self.assertFalse(self.book.get_is_borrowed())
+        self.assertEqual(self.library.get_version(), version)
+
+        outcomes = self.library.lend_items(
+            patrick, [self.book.get_id(), self.dvd.get_id(), self.magazine.get_id()], atomic=False
+        )
+        self.assertEqual(outcomes, [LENT, ALREADY_ON_LOAN, LENT])
+        self.assertEqual(self.library.get_borrower_id(self.dvd.get_id()), ama)
+        self.assertEqual(self.library.get_loan_count(patrick), 2)
+
+        with self.assertRaises(Exception):
+            self.library.lend_items("missing", [self.book.get_id()])
+
+    def test_loan_events(self):
+        self.library.add_items([self.two_days_due_borrowed_item, self.magazine])
+        subscription_id = self.library.subscribe()
+        self.library.add_item(self.book)
+        member_id = self.library.create_member(name="Patrick")
+        self.library.lend_item(member_id=member_id, item=self.book)
+        self.library.lend_item(member_id=member_id, item=self.magazine)
+        self.library.return_item(member_id=member_id, item=self.magazine)
+
+        self.assertEqual(self.library.poll_events(subscription_id), [])
+
+        events = self.library.poll_events(subscription_id, datetime.now() + timedelta(days=29))
+        self.assertEqual(
+            [(event.get_kind(), event.get_item_id()) for event in events],
+            [
+                ("overdue", self.book.get_id()),
+                ("daily", self.book.get_id()),
+                ("monthly", self.two_days_due_borrowed_item.get_id()),
+            ]
+        )
+        self.assertEqual(events[0].get_member_id(), member_id)
+
+        self.library.unsubscribe(subscription_id)
+        with self.assertRaises(KeyError):
+            self.library.poll_events(subscription_id)
+        with self.assertRaises(ValueError):
+            self.library.subscribe(kinds=("weekly",))
+
     def test_search_item(self):
         self.library.add_item(self.book)
         self.library.add_item(self.magazine)
@@ -120,4 +686,121 @@ class TestLibrary(unittest.TestCase):
         self.assertEqual(result2[0].get_id(), self.magazine.get_id())
         self.assertEqual(len(result3), 1)
         self.assertEqual(result3[0].get_id(), self.dvd.get_id())
-        
+
+    def test_search_item_modes(self):
+        self.library.add_item(self.book)
+        self.library.add_item(self.magazine)
+        self.library.add_item(self.dvd)
+
+        prefix_result = self.library.search_item(keyword="pragm", mode="prefix")
+        substring_result = self.library.search_item(keyword="geograph", mode="substring")
+
+        self.assertEqual([item.get_id() for item in prefix_result], [self.book.get_id()])
+        self.assertEqual([item.get_id() for item in substring_result], [self.magazine.get_id()])
+
+        self.library.remove_item(self.dvd.get_id())
+        self.assertEqual(self.library.search_item(keyword="Inception"), [])
+
+        with self.assertRaises(ValueError):
+            self.library.search_item(keyword="Inception", mode="unknown")
+
+    def test_search_item_rejects_negative_limit(self):
+        self.library.add_items([self.book, self.magazine])
+
+        for mode in ("exact", "prefix", "substring", "ranked"):
+            self.assertEqual(self.library.search_item("National Geographic", mode, limit=0), [])
+            with self.assertRaises(ValueError):
+                self.library.search_item("National Geographic", mode, limit=-1)
+
+        with self.assertRaises(ValueError):
+            self.library.search_ranked("national", limit=-1)
+
+    def test_cache_serves_repeated_queries(self):
+        library = Library(cache=ResultCache())
+        library.add_items([self.book, self.dvd])
+
+        self.assertEqual(library.search_item("incep", mode="prefix"), [self.dvd])
+        self.assertEqual(library.search_item("incep", mode="prefix"), [self.dvd])
+        self.assertEqual(library.get_items(), library.get_items())
+        self.assertEqual(library.search_item("Inception"), [self.dvd])
+
+        stats = library.get_cache().get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+
+    def test_cache_results_are_copies(self):
+        library = Library(cache=ResultCache())
+        library.add_items([self.book, self.two_days_due_borrowed_item])
+
+        library.search_item("The Pragmatic Programmer").clear()
+        library.get_items()[1]["borrowed_by"]["name"] = "Changed"
+        library.get_items()[0]["title"] = "Changed"
+
+        self.assertEqual(len(library.search_item("The Pragmatic Programmer")), 2)
+        self.assertEqual(library.get_items(), [self.book.get_info(), self.two_days_due_borrowed_item.get_info()])
+
+    def test_cache_invalidated_by_every_mutation(self):
+        library = Library(cache=ResultCache())
+        versions = [library.get_version()]
+
+        def assert_fresh():
+            self.assertEqual(library.get_items(), [item.get_info() for item in items])
+            self.assertEqual(library.get_items(fields=("id", "borrower_id")),
+                             [item.get_info(("id", "borrower_id")) for item in items])
+            self.assertEqual(library.search_item("Inception"), [item for item in items if item is self.dvd])
+            self.assertEqual(library.search_item("pragmatic", mode="ranked"),
+                             [item for item in items if item is self.book])
+            self.assertEqual(library.get_members(), [{"id": member_id, "name": "Patrick"}
+                                                     for member_id in member_ids])
+            self.assertGreater(library.get_version(), versions[-1])
+            versions.append(library.get_version())
+
+        items, member_ids = [], []
+        library.get_items()
+
+        library.add_item(self.book)
+        items.append(self.book)
+        assert_fresh()
+
+        library.add_items([self.dvd])
+        items.append(self.dvd)
+        assert_fresh()
+
+        member_ids.append(library.create_member("Patrick"))
+        assert_fresh()
+
+        member_ids.extend(library.create_members(["Patrick"]))
+        assert_fresh()
+
+        library.lend_item(member_ids[0], self.book)
+        assert_fresh()
+
+        library.return_item(member_ids[0], self.book)
+        assert_fresh()
+
+        library.remove_item(self.dvd.get_id())
+        items.remove(self.dvd)
+        assert_fresh()
+
+        self.assertGreater(library.get_cache().get_stats()["invalidations"], 0)
+
+    def test_failed_mutation_keeps_cache(self):
+        library = Library(cache=ResultCache())
+        library.add_item(self.book)
+        version = library.get_version()
+
+        with self.assertRaises(Exception):
+            library.lend_item("missing", self.book)
+
+        with self.assertRaises(KeyError):
+            library.remove_item("missing")
+
+        self.assertEqual(library.get_version(), version)
+
+    def test_search_ranked(self):
+        self.library.add_items([self.book, self.magazine, self.dvd])
+
+        self.assertEqual(self.library.search_item("nationl geographic", mode="ranked"), [self.magazine])
+
+        ranked = self.library.search_ranked("pragmatic programmer", limit=5)
+        self.assertEqual([item for item, _ in ranked], [self.book])
+        self.assertGreater(ranked[0][1], 0)
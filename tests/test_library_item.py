@@ -1,5 +1,8 @@
+import json
 from datetime import datetime, timedelta
-from library_management.library_item import LibraryItem, Book, DVD, Magazine
+from library_management.library_item import (
+    LibraryItem, Book, DVD, Magazine, items_to_json, get_memoization, set_memoization
+)
 
 import unittest
 
@@ -92,6 +95,86 @@ class TestLibraryItem(unittest.TestCase):
             self.library_item.__borrowed_by
             self.library_item.__due_date
 
+    def test_uses_slots(self):
+        self.assertFalse(hasattr(self.library_item, "__dict__"))
+
+        with self.assertRaises(AttributeError):
+            self.library_item.shelf = "A3"
+
+    def test_reuses_given_id(self):
+        item = LibraryItem(
+            title="The Art of Thinking Clearly",
+            pub_year="2013",
+            author_name="Rolf Dobelli",
+            item_id="item-1"
+        )
+
+        self.assertEqual(item.get_id(), "item-1")
+        self.assertEqual(item.get_pub_year(), "2013")
+        self.assertIsNone(item.get_detail())
+
+    def test_get_info_returns_a_new_dict(self):
+        info = self.not_overdue_item.get_info()
+        info["title"] = "Changed"
+        info["borrowed_by"]["name"] = "Changed"
+
+        self.assertEqual(self.not_overdue_item.get_info()["title"], "The Art of Thinking Clearly")
+        self.assertEqual(self.not_overdue_item.get_info()["borrowed_by"], self.member.get_info())
+
+    def test_get_info_follows_loan_state(self):
+        self.assertFalse(self.library_item.get_info()["is_borrowed"])
+
+        self.member.borrow_item(self.library_item)
+        info = self.library_item.get_info()
+        self.assertTrue(info["is_borrowed"])
+        self.assertEqual(info["borrowed_by"], self.member.get_info())
+        self.assertEqual(info["due_date"], self.library_item.get_due_date())
+
+        self.member.return_item(self.library_item)
+        info = self.library_item.get_info()
+        self.assertEqual((info["is_borrowed"], info["borrowed_by"], info["due_date"]), (False, None, None))
+
+    def test_to_json(self):
+        decoded = json.loads(self.not_overdue_item.to_json())
+
+        self.assertEqual(decoded["borrowed_by"], self.member.get_info())
+        self.assertEqual(decoded["due_date"], self.not_overdue_item.get_due_date().isoformat())
+
+        due_date = datetime(2030, 1, 1)
+        self.not_overdue_item.set_due_date(due_date)
+        self.assertEqual(json.loads(self.not_overdue_item.to_json())["due_date"], due_date.isoformat())
+
+        self.not_overdue_item.set_borrowed_by(None)
+        self.assertIsNone(json.loads(self.not_overdue_item.to_json())["borrowed_by"])
+
+        self.not_overdue_item.set_is_borrowed(False)
+        self.assertFalse(json.loads(self.not_overdue_item.to_json())["is_borrowed"])
+
+    def test_memoization(self):
+        self.assertFalse(get_memoization())
+        self.assertIsNot(self.not_overdue_item.to_json(), self.not_overdue_item.to_json())
+
+        self.assertFalse(set_memoization(True))
+        self.addCleanup(set_memoization, False)
+        item = self.library_item
+        self.assertIs(item.to_json(), item.to_json())
+        info = item.get_info()
+        info["title"] = "Changed"
+        self.assertEqual(item.get_info()["title"], "The Art of Thinking Clearly")
+
+        # Lending and returning through the member invalidate both memos.
+        self.member.borrow_item(item)
+        self.assertEqual(item.get_info()["borrowed_by"], self.member.get_info())
+        self.assertEqual(json.loads(item.to_json())["due_date"], item.get_due_date().isoformat())
+        self.member.return_items([item])
+        self.assertIsNone(item.get_info()["borrowed_by"])
+        self.assertFalse(json.loads(item.to_json())["is_borrowed"])
+
+        items = [item, self.not_overdue_item]
+        memoized = items_to_json(items)
+        set_memoization(False)
+        self.assertEqual(memoized, items_to_json(items))
+
     def test_calculate_fine(self):
         two_days_overdue = self.two_days_due_borrowed_item.calculate_fine()
         two_months_overdue = self.two_months_due_borrowed_item.calculate_fine()
@@ -129,6 +212,38 @@ class TestBook(unittest.TestCase):
         self.assertIn("ISBN", info)
         self.assertEqual(ISBN, "978-0201616224")
 
+    def test_book_to_json(self):
+        self.assertEqual(json.loads(self.book.to_json()), self.book.get_info())
+
+    def test_items_to_json(self):
+        items = [self.book, Book("Dune", "1965", "Frank Herbert", "978-0441013593")]
+
+        self.assertEqual(json.loads(items_to_json(items)), [json.loads(item.to_json()) for item in items])
+        self.assertEqual(items_to_json([]), b"[]")
+
+    def test_get_info_with_fields(self):
+        self.assertEqual(
+            self.book.get_info(fields=("title", "ISBN")),
+            {"title": "The Pragmatic Programmer", "ISBN": "978-0201616224"}
+        )
+        self.assertEqual(self.book.get_field("borrower_id"), None)
+
+        with self.assertRaises(KeyError):
+            self.book.get_field("duration")
+
+    def test_book_from_fields(self):
+        book = Book.from_fields(
+            title="The Pragmatic Programmer",
+            pub_year="1999",
+            author_name="Andrew Hunt and David Thomas",
+            detail="978-0201616224",
+            item_id=self.book.get_id()
+        )
+
+        self.assertEqual(book.get_info(), self.book.get_info())
+        self.assertEqual(book.get_ISBN(), "978-0201616224")
+        self.assertFalse(hasattr(book, "__dict__"))
+
 class TestMagazine(unittest.TestCase):
     def setUp(self):
         self.magazine = Magazine(
@@ -0,0 +1,67 @@
+import io
+import os
+import tempfile
+
+from library_management.library import Library
+from library_management.library_item import Book, Magazine, DVD
+from library_management.loader import build_items, load_items, read_csv, read_jsonl
+
+import unittest
+
+
+CSV_EXPORT = """type,id,title,pub_year,author_name,ISBN,issue_no,duration
+Book,b-1,The Pragmatic Programmer,1999,Andrew Hunt and David Thomas,978-0201616224,,
+Magazine,,National Geographic,2023,Susan Goldberg,,May 2023 Issue,
+DVD,,Inception,2010,Christopher Nolan,,,2h:28m
+"""
+
+JSONL_EXPORT = """{"type": "Book", "title": "Clean Code", "pub_year": "2008", "author_name": "Robert Martin", "ISBN": "978-0132350884"}
+
+{"type": "DVD", "title": "Inception", "pub_year": "2010", "author_name": "Christopher Nolan", "duration": "2h:28m"}
+"""
+
+
+class TestLoader(unittest.TestCase):
+
+    def test_read_csv(self):
+        items = list(read_csv(io.StringIO(CSV_EXPORT), batch_size=2))
+
+        self.assertEqual([type(item) for item in items], [Book, Magazine, DVD])
+        self.assertEqual(items[0].get_id(), "b-1")
+        self.assertEqual(items[0].get_ISBN(), "978-0201616224")
+        self.assertEqual(items[1].get_issue_no(), "May 2023 Issue")
+        self.assertEqual(items[2].get_duration(), "2h:28m")
+
+    def test_read_jsonl(self):
+        items = list(read_jsonl(io.StringIO(JSONL_EXPORT)))
+
+        self.assertEqual([type(item) for item in items], [Book, DVD])
+        self.assertEqual(items[0].get_title(), "Clean Code")
+
+    def test_invalid_records_fail_before_the_batch_is_built(self):
+        records = [
+            {"type": "Book", "title": "Clean Code", "pub_year": "2008",
+             "author_name": "Robert Martin", "ISBN": "978-0132350884"},
+            {"type": "Book", "title": "No ISBN", "pub_year": "2008", "author_name": "Unknown"},
+        ]
+
+        with self.assertRaisesRegex(ValueError, "record 2: missing ISBN"):
+            next(build_items(records))
+
+        with self.assertRaisesRegex(ValueError, "unknown item type"):
+            next(build_items([{"type": "Map"}]))
+
+    def test_load_items(self):
+        library = Library()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(CSV_EXPORT)
+
+            self.assertEqual(load_items(library, path), 3)
+
+            with self.assertRaises(ValueError):
+                load_items(library, os.path.join(directory, "catalog.xml"))
+
+        self.assertEqual(len(library.get_items()), 3)
+        self.assertEqual(len(library.search_item("Inception")), 1)
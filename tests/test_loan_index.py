@@ -0,0 +1,35 @@
+from library_management.loan_index import LoanIndex
+
+import unittest
+
+
+class TestLoanIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = LoanIndex()
+        self.index.add("item-1", "member-1")
+        self.index.add("item-2", "member-1")
+        self.index.add("item-3", "member-2")
+
+    def test_lookups(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.get_holder("item-3"), "member-2")
+        self.assertIsNone(self.index.get_holder("missing"))
+        self.assertEqual(self.index.get_item_ids("member-1"), ["item-1", "item-2"])
+        self.assertEqual(self.index.count("member-1"), 2)
+        self.assertEqual(self.index.count("member-3"), 0)
+
+    def test_add_moves_item_to_new_holder(self):
+        self.index.add("item-1", "member-2")
+
+        self.assertEqual(self.index.get_holder("item-1"), "member-2")
+        self.assertEqual(self.index.get_item_ids("member-1"), ["item-2"])
+        self.assertEqual(self.index.get_item_ids("member-2"), ["item-3", "item-1"])
+
+    def test_discard(self):
+        self.index.discard("item-3")
+        self.index.discard("missing")
+
+        self.assertNotIn("item-3", self.index)
+        self.assertEqual(self.index.get_item_ids("member-2"), [])
+        self.assertEqual(self.index.count("member-2"), 0)
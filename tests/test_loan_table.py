@@ -0,0 +1,58 @@
+from library_management.fines import DAY_MICROS, fine_for_days
+from library_management.loan_table import LoanTable
+
+import unittest
+
+
+class TestLoanTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = LoanTable()
+        self.moment = 1_000 * DAY_MICROS
+
+        self.table.set("item-1", "member-1", self.moment - 2 * DAY_MICROS)
+        self.table.set("item-2", "member-2", self.moment - 40 * DAY_MICROS)
+        self.table.set("item-3", "member-1", self.moment - 3 * DAY_MICROS)
+
+    def test_total_fines(self):
+        self.assertEqual(
+            self.table.total_fines(self.moment),
+            {"member-1": 75.0, "member-2": 500.0}
+        )
+
+    def test_set_replaces_loan(self):
+        self.table.set("item-2", "member-1", self.moment + DAY_MICROS)
+
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table.total_fines(self.moment), {"member-1": 75.0})
+
+    def test_discard_keeps_rows_dense(self):
+        self.table.discard("item-1")
+        self.table.discard("missing")
+
+        self.assertEqual(len(self.table), 2)
+        self.assertNotIn("item-1", self.table)
+        self.assertEqual(
+            self.table.total_fines(self.moment),
+            {"member-1": 45.0, "member-2": 500.0}
+        )
+
+        self.table.discard("item-3")
+        self.table.set("item-4", "member-3", self.moment - DAY_MICROS)
+        self.assertEqual(
+            self.table.total_fines(self.moment),
+            {"member-2": 500.0, "member-3": 15.0}
+        )
+
+    def test_large_table_matches_per_loan_fines(self):
+        table = LoanTable()
+        expected = {}
+        for number in range(3_000):
+            member_id = f"member-{number % 7}"
+            due_date = self.moment - number * DAY_MICROS // 5
+            table.set(f"item-{number}", member_id, due_date)
+            fine = fine_for_days((self.moment - due_date) // DAY_MICROS)
+            if fine:
+                expected[member_id] = expected.get(member_id, 0.0) + fine
+
+        self.assertEqual(table.total_fines(self.moment), expected)
@@ -0,0 +1,37 @@
+import threading
+
+from library_management.locking import NullStripedLock, StripedLock, null_lock
+
+import unittest
+
+
+class TestStripedLock(unittest.TestCase):
+
+    def test_hold_serializes_same_key(self):
+        stripes = StripedLock(stripes=4)
+        counter = {"value": 0}
+
+        def work():
+            for _ in range(2_000):
+                with stripes.hold("item-1", "member-1"):
+                    value = counter["value"]
+                    counter["value"] = value + 1
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counter["value"], 8_000)
+
+    def test_hold_is_reentrant(self):
+        stripes = StripedLock(stripes=1)
+
+        with stripes.hold("a", "b"):
+            with stripes.hold("c"):
+                pass
+
+    def test_null_locks(self):
+        with NullStripedLock().hold("a"), null_lock():
+            pass
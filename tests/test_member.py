@@ -22,6 +22,17 @@ class TestMember(unittest.TestCase):
         self.assertNotEqual(info.get("id"), "")
         self.assertEqual(self.member.get_borrowed_items(), [])
 
+    def test_get_info_with_fields(self):
+        self.assertEqual(self.member.get_info(fields=("name",)), {"name": "Patrick"})
+
+        with self.assertRaises(KeyError):
+            self.member.get_field("email")
+
+    def test_get_borrowed_item_ids(self):
+        self.member.borrow_item(item=self.book)
+
+        self.assertEqual(self.member.get_borrowed_item_ids(), [self.book.get_id()])
+
     def test_can_not_access_private_attributes(self):
         with self.assertRaises(AttributeError):
             self.member.__name
@@ -0,0 +1,59 @@
+from library_management.result_cache import ResultCache
+
+import unittest
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = ResultCache(max_entries=2, ttl=10, clock=lambda: self.now)
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.cache.get("a", 1))
+
+        self.cache.put("a", 1, ["result"])
+
+        self.assertEqual(self.cache.get("a", 1), ["result"])
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_newer_version_invalidates(self):
+        self.cache.put("a", 1, ["old"])
+
+        self.assertIsNone(self.cache.get("a", 2))
+        self.assertEqual(self.cache.get_stats()["invalidations"], 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", 1, ["a"])
+        self.cache.put("b", 1, ["b"])
+        self.cache.get("a", 1)
+        self.cache.put("c", 1, ["c"])
+
+        self.assertEqual(self.cache.get("a", 1), ["a"])
+        self.assertIsNone(self.cache.get("b", 1))
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    def test_ttl_expires(self):
+        self.cache.put("a", 1, ["a"])
+        self.now = 9.9
+        self.assertEqual(self.cache.get("a", 1), ["a"])
+
+        self.now = 10.0
+        self.assertIsNone(self.cache.get("a", 1))
+        self.assertEqual(self.cache.get_stats()["expirations"], 1)
+
+    def test_clear(self):
+        self.cache.put("a", 1, ["a"])
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get("a", 1))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ResultCache(max_entries=0)
+
+        with self.assertRaises(ValueError):
+            ResultCache(ttl=0)
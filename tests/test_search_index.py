@@ -0,0 +1,101 @@
+from library_management.search_index import SearchIndex
+
+import unittest
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("id-1", "The Pragmatic Programmer", "Andrew Hunt and David Thomas")
+        self.index.add("id-2", "National Geographic", "Susan Goldberg")
+        self.index.add("id-3", "Inception", "Christopher Nolan")
+
+    def test_exact_search(self):
+        self.assertEqual(self.index.search("Inception"), ["id-3"])
+        self.assertEqual(self.index.search("Susan Goldberg"), ["id-2"])
+        self.assertEqual(self.index.search("id-1"), ["id-1"])
+        self.assertEqual(self.index.search("inception"), [])
+
+    def test_prefix_search(self):
+        self.assertEqual(self.index.search("prag", mode="prefix"), ["id-1"])
+        self.assertEqual(self.index.search("The Prag", mode="prefix"), ["id-1"])
+        self.assertEqual(self.index.search("id-", mode="prefix"), ["id-1", "id-2", "id-3"])
+        self.assertEqual(self.index.search("ception", mode="prefix"), [])
+
+    def test_substring_search(self):
+        self.assertEqual(self.index.search("ception", mode="substring"), ["id-3"])
+        self.assertEqual(self.index.search("GRAPHIC", mode="substring"), ["id-2"])
+        self.assertEqual(sorted(self.index.search("ol", mode="substring")), ["id-2", "id-3"])
+        self.assertEqual(self.index.search("xyz", mode="substring"), [])
+
+    def test_remove(self):
+        self.index.remove("id-3")
+
+        self.assertEqual(len(self.index), 2)
+        self.assertNotIn("id-3", self.index)
+        self.assertEqual(self.index.search("Inception"), [])
+        self.assertEqual(self.index.search("incep", mode="prefix"), [])
+        self.assertEqual(self.index.search("ception", mode="substring"), [])
+
+        with self.assertRaises(KeyError):
+            self.index.remove("id-3")
+
+    def test_add_many(self):
+        index = SearchIndex()
+        index.add_many([
+            ("id-1", "Clean Code", "Robert Martin"),
+            ("id-2", "Clean Architecture", "Robert Martin"),
+            ("id-1", "Refactoring", "Martin Fowler"),
+        ])
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search("clean", mode="prefix"), ["id-2"])
+        self.assertEqual(index.search("fowl", mode="prefix"), ["id-1"])
+        self.assertEqual(sorted(index.search("martin", mode="substring")), ["id-1", "id-2"])
+
+    def test_ranked_search_tolerates_typos(self):
+        self.assertEqual(self.index.search("pragmatic programer", mode="ranked"), ["id-1"])
+        self.assertEqual(self.index.search("Incpetion", mode="ranked"), ["id-3"])
+        self.assertEqual(self.index.search("christopher nolan", mode="ranked"), ["id-3"])
+        self.assertEqual(self.index.search("nolen", mode="ranked"), ["id-3"])
+        self.assertEqual(self.index.search("hnut", mode="ranked"), [])
+        self.assertEqual(self.index.search("xyzzy", mode="ranked"), [])
+
+    def test_ranked_search_orders_by_relevance(self):
+        index = SearchIndex()
+        index.add_many([
+            ("id-1", "Clean Code", "Robert Martin"),
+            ("id-2", "Clean Architecture", "Robert Martin"),
+            ("id-3", "Code Complete", "Steve McConnell"),
+            ("id-4", "The Clean Coder", "Robert Martin"),
+        ])
+
+        ranked = index.rank("clean code")
+        self.assertEqual(ranked[0][0], "id-1")
+        self.assertEqual({item_id for item_id, _ in ranked}, {"id-1", "id-2", "id-3", "id-4"})
+        self.assertEqual([score for _, score in ranked], sorted((score for _, score in ranked), reverse=True))
+
+        self.assertEqual(index.rank("clean code", limit=1), ranked[:1])
+        self.assertEqual(index.search("clean code", mode="ranked", limit=2), [item_id for item_id, _ in ranked[:2]])
+        self.assertEqual(index.rank("clean code", limit=0), [])
+
+    def test_ranked_search_after_remove(self):
+        self.index.remove("id-3")
+
+        self.assertEqual(self.index.search("inception", mode="ranked"), [])
+        self.assertEqual(self.index.search("national", mode="ranked"), ["id-2"])
+
+    def test_search_limit(self):
+        self.assertEqual(self.index.search("id-", mode="prefix", limit=2), ["id-1", "id-2"])
+        for mode in ("exact", "prefix", "substring", "ranked"):
+            self.assertEqual(self.index.search("national", mode=mode, limit=0), [])
+            with self.assertRaises(ValueError):
+                self.index.search("id-", mode=mode, limit=-1)
+
+        with self.assertRaises(ValueError):
+            self.index.rank("national", limit=-1)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.index.search("Inception", mode="fuzzy")
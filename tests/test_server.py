@@ -0,0 +1,161 @@
+import http.client
+import json
+import threading
+
+from library_management.library import Library
+from library_management.library_item import Book, DVD
+from library_management.server import LibraryHTTPServer, MAX_BATCH_SIZE
+
+import unittest
+
+
+class TestLibraryHTTPServer(unittest.TestCase):
+
+    def setUp(self):
+        self.library = Library(thread_safe=True)
+        self.book = Book("The Pragmatic Programmer", "1999", "Andrew Hunt and David Thomas", "978-0201616224")
+        self.dvd = DVD("Inception", "2010", "Christopher Nolan", "2h:28m")
+        self.library.add_items([self.book, self.dvd])
+        self.member_id = self.library.create_member("Patrick")
+
+        self.server = LibraryHTTPServer(("127.0.0.1", 0), self.library, page_size=1)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.connection = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def request(self, method:str, path:str, payload = None) -> tuple:
+        body = None if payload is None else json.dumps(payload)
+        self.connection.request(method, path, body=body)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_keeps_connection_alive(self):
+        self.request("GET", f"/items/{self.book.get_id()}")
+        sock = self.connection.sock
+
+        status, info = self.request("GET", f"/items/{self.dvd.get_id()}")
+        self.assertEqual(status, 200)
+        self.assertEqual(info["duration"], "2h:28m")
+        self.assertIs(self.connection.sock, sock)
+
+    def test_streams_items(self):
+        self.connection.request("GET", "/items")
+        response = self.connection.getresponse()
+
+        self.assertEqual(response.getheader("Transfer-Encoding"), "chunked")
+        self.assertEqual(json.loads(response.read()), self.library.get_items())
+
+        status, members = self.request("GET", "/members")
+        self.assertEqual(members, [{"id": self.member_id, "name": "Patrick"}])
+
+    def test_create_lend_and_return(self):
+        status, created = self.request(
+            "POST", "/items", {"kind": "Book", "title": "Dune", "pub_year": "1965", "author_name": "Frank Herbert",
+                               "detail": "978-0441013593"}
+        )
+        self.assertEqual(status, 201)
+        self.assertEqual(self.library.get_item(created["id"]).get_ISBN(), "978-0441013593")
+
+        status, member = self.request("POST", "/members", {"name": "Ama"})
+        self.assertEqual(status, 201)
+
+        status, lent = self.request("POST", "/lend", {"member_id": member["id"], "item_id": created["id"]})
+        self.assertEqual(status, 200)
+        self.assertIsNotNone(lent["due_date"])
+        self.assertEqual(self.library.get_borrower_id(created["id"]), member["id"])
+
+        status, _ = self.request("POST", "/lend", {"member_id": self.member_id, "item_id": created["id"]})
+        self.assertEqual(status, 409)
+
+        for path in ("/lend", "/return"):
+            status, _ = self.request("POST", path, {"member_id": "missing", "item_id": created["id"]})
+            self.assertEqual(status, 404)
+
+        status, returned = self.request("POST", "/return", {"member_id": member["id"], "item_id": created["id"]})
+        self.assertEqual((status, returned), (200, {"handed_to": None}))
+
+    def test_search(self):
+        status, items = self.request("GET", "/search?q=incep&mode=prefix")
+        self.assertEqual([item["id"] for item in items], [self.dvd.get_id()])
+
+        self.assertEqual(self.request("GET", "/search?q=incep&mode=bogus")[0], 400)
+        self.assertEqual(self.request("GET", "/search")[0], 400)
+
+    def test_batch(self):
+        status, body = self.request("POST", "/batch", {"operations": [
+            {"op": "lend", "member_id": self.member_id, "item_id": self.book.get_id()},
+            {"op": "lend", "member_id": self.member_id, "item_id": self.book.get_id()},
+            {"op": "search", "keyword": "Christopher Nolan"},
+            {"op": "return", "member_id": self.member_id, "item_id": "missing"},
+            {"op": "return", "member_id": self.member_id, "item_id": self.book.get_id()},
+            {"op": "renew"},
+            "lend",
+        ]})
+
+        self.assertEqual(status, 200)
+        results = body["results"]
+        self.assertEqual([result["ok"] for result in results], [True, False, True, False, True, False, False])
+        self.assertEqual([item["id"] for item in results[2]["items"]], [self.dvd.get_id()])
+        self.assertFalse(self.book.get_is_borrowed())
+
+        status, _ = self.request("POST", "/batch", {"operations": [{"op": "search"}] * (MAX_BATCH_SIZE + 1)})
+        self.assertEqual(status, 400)
+
+    def test_rejects_malformed_fields(self):
+        self.assertEqual(self.request("POST", "/members", {"name": 5})[0], 400)
+        self.assertEqual(self.request("POST", "/members", {"name": ["Ama"]})[0], 400)
+        self.assertEqual(self.request("POST", "/items", {"kind": "Book", "title": "Dune", "pub_year": 1965,
+                                                         "author_name": "Frank Herbert"})[0], 400)
+        self.assertEqual(self.request("POST", "/items", {"kind": "Book", "title": "Dune", "pub_year": "1965",
+                                                         "author_name": "Frank Herbert", "detail": {}})[0], 400)
+        self.assertEqual(self.request("POST", "/lend", {"member_id": self.member_id, "item_id": ["x"]})[0], 400)
+        self.assertEqual(self.request("POST", "/batch", {"operations": {"op": "search"}})[0], 400)
+
+        for limit in ("0", "-1", "x"):
+            self.assertEqual(self.request("GET", f"/search?q=incep&mode=prefix&limit={limit}")[0], 400)
+
+        status, body = self.request("POST", "/batch", {"operations": [
+            {"op": "search", "keyword": "Inception", "limit": [1]},
+            {"op": "search", "keyword": "Inception", "limit": 0},
+            {"op": "search", "keyword": "Inception", "limit": -1},
+            {"op": "search", "keyword": "Inception", "limit": True},
+            {"op": "search", "keyword": "Inception", "mode": ["prefix"]},
+            {"op": "search", "keyword": 5},
+            {"op": ["lend"]},
+            {"op": "lend", "member_id": self.member_id, "item_id": ["x"]},
+            {"op": "lend", "member_id": {}, "item_id": self.book.get_id()},
+            {"op": "search", "keyword": "Inception", "limit": 1},
+        ]})
+        self.assertEqual(status, 200)
+        self.assertEqual([result["ok"] for result in body["results"]], [False] * 9 + [True])
+        self.assertFalse(self.book.get_is_borrowed())
+
+        # The connection survives every malformed request.
+        self.assertEqual(self.request("GET", f"/items/{self.book.get_id()}")[0], 200)
+
+    def test_errors(self):
+        self.assertEqual(self.request("GET", "/items/missing")[0], 404)
+        self.assertEqual(self.request("GET", "/nowhere")[0], 404)
+        self.assertEqual(self.request("POST", "/members", {})[0], 400)
+        self.assertEqual(self.request("POST", "/items", {"kind": "Scroll", "title": "t", "pub_year": "1",
+                                                         "author_name": "a"})[0], 400)
+
+        self.connection.request("POST", "/lend", body="{not json")
+        response = self.connection.getresponse()
+        self.assertEqual(response.status, 400)
+        response.read()
+
+        self.connection.request("POST", "/members", body="{}", headers={"Content-Length": "ten"})
+        response = self.connection.getresponse()
+        self.assertEqual(response.status, 400)
+        response.read()
+        self.connection.close()
+
+        # The connection survives every other error.
+        self.assertEqual(self.request("GET", f"/items/{self.book.get_id()}")[0], 200)
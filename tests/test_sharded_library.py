@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+from library_management.library_item import Book, DVD
+from library_management.sharded_library import ShardedLibrary
+
+import unittest
+
+
+class TestShardedLibrary(unittest.TestCase):
+
+    def setUp(self):
+        self.library = ShardedLibrary(shards=3)
+        self.items = [
+            Book(
+                title=f"Book {number}",
+                pub_year="1999",
+                author_name="Andrew Hunt",
+                ISBN=f"978-{number}"
+            )
+            for number in range(12)
+        ]
+        self.dvd = DVD(
+            title="Inception",
+            pub_year="2010",
+            author_name="Christopher Nolan",
+            duration="2h:28m"
+        )
+        self.library.add_items(self.items)
+        self.library.add_item(self.dvd)
+
+    def tearDown(self):
+        self.library.close()
+
+    def test_items_spread_over_shards(self):
+        shards = {self.library.shard_of(item.get_id()) for item in self.items}
+
+        self.assertEqual(self.library.get_shard_count(), 3)
+        self.assertGreater(len(shards), 1)
+        self.assertEqual(len(self.library.get_items()), 13)
+        self.assertEqual(self.library.get_item(self.dvd.get_id()).get_title(), "Inception")
+
+    def test_search_merges_shards(self):
+        self.assertEqual(len(self.library.search_item("hunt", "substring")), 12)
+        self.assertEqual(
+            [item.get_id() for item in self.library.search_item("Inception")],
+            [self.dvd.get_id()]
+        )
+
+    def test_ranked_search_merges_shards(self):
+        ranked = self.library.search_ranked("inceptoin")
+        self.assertEqual([item.get_id() for item, _ in ranked], [self.dvd.get_id()])
+
+        self.assertEqual(len(self.library.search_item("book hnut", mode="ranked", limit=4)), 4)
+        self.assertEqual(len(self.library.search_item("hunt", "substring", limit=5)), 5)
+
+    def test_lend_and_return_across_shards(self):
+        member_id = self.library.create_member("Patrick")
+        for item in self.items:
+            self.library.lend_item(member_id, item)
+
+        self.assertEqual(self.library.get_loan_count(member_id), 12)
+        self.assertEqual(
+            sorted(self.library.get_borrowed_item_ids(member_id)),
+            sorted(item.get_id() for item in self.items)
+        )
+        self.assertEqual(self.library.get_borrower_id(self.items[0].get_id()), member_id)
+
+        with self.assertRaises(Exception):
+            self.library.lend_item(member_id, self.items[0])
+
+        for item in self.items:
+            self.library.return_item(member_id, item)
+
+        self.assertEqual(self.library.get_loan_count(member_id), 0)
+        self.assertIsNone(self.library.get_borrower_id(self.items[0].get_id()))
+
+    def test_members_are_known_to_every_shard(self):
+        member_ids = self.library.create_members(["Patrick", "Ama"])
+
+        self.assertEqual([member["id"] for member in self.library.get_members()], member_ids)
+        for item in self.items:
+            self.library.lend_item(member_ids[1], item)
+
+        with self.assertRaises(ValueError):
+            self.library.create_member(42)
+
+    def test_due_dates_and_fines(self):
+        member_id = self.library.create_member("Patrick")
+        for item in self.items:
+            self.library.lend_item(member_id, item)
+
+        self.assertEqual(self.library.get_overdue_items(), [])
+        due = [item.get_due_date() for item in self.library.get_items_due_within(days=5)]
+        self.assertEqual(len(due), 12)
+        self.assertEqual(due, sorted(due))
+
+        fines = self.library.calculate_fines(datetime.now() + timedelta(days=10))
+        self.assertEqual(list(fines), [member_id])
+        self.assertGreater(fines[member_id], 0)
+
+    def test_errors_propagate(self):
+        with self.assertRaises(KeyError):
+            self.library.remove_item("missing")
+
+        with self.assertRaises(ValueError):
+            self.library.add_item("not an item")
+
+        with self.assertRaises(Exception):
+            self.library.lend_item("missing", self.dvd)
+
+        self.library.remove_item(self.dvd.get_id())
+        with self.assertRaises(KeyError):
+            self.library.get_item(self.dvd.get_id())
+
+    def test_close_is_idempotent(self):
+        self.library.close()
+        self.library.close()
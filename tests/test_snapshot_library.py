@@ -0,0 +1,74 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from library_management.library import Library
+from library_management.library_item import Book, DVD
+from library_management.member import Member
+from library_management.snapshot_library import SnapshotLibrary
+
+import unittest
+
+
+class TestSnapshotLibrary(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "catalog.col")
+
+        self.library = Library()
+        self.books = [
+            Book(f"Book {number}", "1999", "Andrew Hunt", f"978-{number}") for number in range(5)
+        ]
+        self.dvd = DVD(
+            "Inception", "2010", "Christopher Nolan", "2h:28m",
+            is_borrowed=True, borrowed_by=Member("Visitor"), due_date=datetime.now() - timedelta(days=2)
+        )
+        self.library.add_items(self.books + [self.dvd])
+        self.member_ids = self.library.create_members(["Patrick", "Ama"])
+        self.library.lend_item(self.member_ids[0], self.books[0])
+        self.library.export_columnar(path)
+
+        self.snapshot = SnapshotLibrary(path)
+        self.addCleanup(self.snapshot.close)
+
+    def test_items_match_library(self):
+        self.assertEqual(self.snapshot.get_item_count(), 6)
+        self.assertEqual(self.snapshot.get_items(), list(self.library.iter_items()))
+        self.assertEqual(
+            self.snapshot.get_item(self.dvd.get_id()).get_info(),
+            self.dvd.get_info()
+        )
+
+        with self.assertRaises(KeyError):
+            self.snapshot.get_item("missing")
+
+    def test_loans(self):
+        self.assertEqual(self.snapshot.get_borrower_id(self.books[0].get_id()), self.member_ids[0])
+        self.assertIsNone(self.snapshot.get_borrower_id(self.books[1].get_id()))
+        self.assertEqual(
+            [item.get_id() for item in self.snapshot.get_overdue_items()],
+            [self.dvd.get_id()]
+        )
+
+        with self.assertRaises(KeyError):
+            self.snapshot.get_borrower_id("missing")
+
+    def test_pages_share_library_cursors(self):
+        page, cursor = self.library.get_items_page(limit=4, fields=("id",))
+        rest, last_cursor = self.snapshot.get_items_page(cursor, limit=4, fields=("id",))
+
+        self.assertEqual(page + rest, list(self.library.iter_items(fields=("id",))))
+        self.assertIsNone(last_cursor)
+        self.assertEqual(self.snapshot.get_items_page(limit=4)[1], cursor)
+
+        with self.assertRaises(ValueError):
+            self.snapshot.get_items_page(limit=0)
+
+    def test_members(self):
+        self.assertEqual(self.snapshot.get_member_count(), 2)
+        self.assertEqual(
+            self.snapshot.get_members(),
+            sorted(self.library.get_members(), key=lambda info: info["id"])
+        )
@@ -0,0 +1,38 @@
+from library_management.sorted_list import SortedList
+
+import random
+import unittest
+
+
+class TestSortedList(unittest.TestCase):
+
+    def setUp(self):
+        self.values = list(range(0, 5_000, 3))
+        random.Random(7).shuffle(self.values)
+        self.sorted_list = SortedList()
+        for value in self.values:
+            self.sorted_list.add(value)
+
+    def test_add_keeps_values_sorted(self):
+        self.assertEqual(len(self.sorted_list), len(self.values))
+        self.assertEqual(list(self.sorted_list), sorted(self.values))
+
+    def test_remove(self):
+        for value in self.values[:1_000]:
+            self.sorted_list.remove(value)
+
+        self.assertEqual(list(self.sorted_list), sorted(self.values[1_000:]))
+
+        with self.assertRaises(ValueError):
+            self.sorted_list.remove(1)
+
+    def test_irange(self):
+        self.assertEqual(list(self.sorted_list.irange(4_990)), [4_992, 4_995, 4_998])
+        self.assertEqual(list(self.sorted_list.irange(5_000)), [])
+        self.assertEqual(next(self.sorted_list.irange(-10)), 0)
+
+    def test_update(self):
+        sorted_list = SortedList([5, 1])
+        sorted_list.update([4, 2, 3])
+
+        self.assertEqual(list(sorted_list), [1, 2, 3, 4, 5])
@@ -0,0 +1,322 @@
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import zlib
+from datetime import datetime, timedelta
+
+from library_management.library import Library
+from library_management.inventory import Title
+from library_management.library_item import Book, Magazine, DVD
+from library_management.member import Member
+from library_management.storage import (
+    FileStorage, SQLiteStorage, encode, decode, cancel_loan_churn,
+    SCHEMAS, ADD_ITEM, REMOVE_ITEM, LEND_ITEM, RETURN_ITEM
+)
+
+import unittest
+
+
+class TestEncoding(unittest.TestCase):
+
+    def test_round_trip(self):
+        record = (1, "id-1", "Inception", "2010", "Christopher Nolan", None, None, None, -5, "t-1")
+        data = encode(SCHEMAS[ADD_ITEM], record)
+
+        self.assertEqual(decode(SCHEMAS[ADD_ITEM], data), (record, len(data)))
+
+    def test_cancel_loan_churn(self):
+        operations = [
+            (LEND_ITEM, ("m-1", "i-1", 0)),
+            (RETURN_ITEM, ("m-1", "i-1")),
+            (LEND_ITEM, ("m-1", "i-2", 0)),
+            (REMOVE_ITEM, ("i-2",)),
+            (RETURN_ITEM, ("m-1", "i-2")),
+            (LEND_ITEM, ("m-2", "i-1", 0)),
+        ]
+
+        self.assertEqual(cancel_loan_churn(operations), operations[2:])
+
+
+class StorageTestMixin:
+    """Scenarios shared by every storage backend."""
+
+    def make_storage(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def populate(self, library:Library) -> dict:
+        book = Book("The Pragmatic Programmer", "1999", "Andrew Hunt and David Thomas", "978-0201616224")
+        magazine = Magazine("National Geographic", "2023", "Susan Goldberg", "May 2023 Issue")
+        dvd = DVD("Inception", "2010", "Christopher Nolan", "2h:28m")
+        outsider = Member(name="Visitor")
+        overdue = Book(
+            "Clean Code", "2008", "Robert Martin", "978-0132350884",
+            is_borrowed=True, borrowed_by=outsider, due_date=datetime.now() - timedelta(days=2)
+        )
+
+        library.add_items([book, magazine])
+        library.add_item(dvd)
+        library.add_item(overdue)
+        patrick, ama = library.create_members(["Patrick", "Ama"])
+        library.lend_item(patrick, book)
+        library.lend_item(ama, dvd)
+        library.return_item(ama, dvd)
+        library.lend_item(ama, magazine)
+        library.remove_item(dvd.get_id())
+
+        return {"patrick": patrick, "ama": ama, "book": book}
+
+    def assert_same_state(self, restored:Library, original:Library) -> None:
+        self.assertEqual(restored.get_items(), original.get_items())
+        self.assertEqual(restored.get_members(), original.get_members())
+        self.assertEqual(
+            [item.get_id() for item in restored.get_overdue_items()],
+            [item.get_id() for item in original.get_overdue_items()]
+        )
+
+    def test_restores_state(self):
+        library = Library(storage=self.make_storage())
+        state = self.populate(library)
+        library.close()
+
+        restored = Library(storage=self.make_storage())
+        self.assert_same_state(restored, library)
+
+        book = restored.search_item("The Pragmatic Programmer")[0]
+        restored.return_item(state["patrick"], book)
+        self.assertFalse(book.get_is_borrowed())
+        restored.close()
+
+    def test_restores_after_snapshot(self):
+        library = Library(storage=self.make_storage())
+        state = self.populate(library)
+        library.snapshot()
+        library.return_item(state["patrick"], state["book"])
+        library.create_member("Kofi")
+        library.close()
+
+        restored = Library(storage=self.make_storage())
+        self.assert_same_state(restored, library)
+        restored.close()
+
+    def test_restores_batch_circulation(self):
+        library = Library(storage=self.make_storage())
+        state = self.populate(library)
+        items = [Book(f"Book {number}", "2000", "Author", str(number)) for number in range(6)]
+        library.add_items(items)
+        library.lend_items(state["ama"], [item.get_id() for item in items])
+        library.return_items(state["ama"], [item.get_id() for item in items[:2]])
+        library.close()
+
+        restored = Library(storage=self.make_storage())
+        self.assert_same_state(restored, library)
+        self.assertEqual(restored.get_loan_count(state["ama"]), 5)
+        restored.close()
+
+    def test_restores_hold_hand_off(self):
+        library = Library(storage=self.make_storage())
+        state = self.populate(library)
+        library.place_hold(state["ama"], state["book"].get_id())
+        library.return_item(state["patrick"], state["book"])
+        library.close()
+
+        restored = Library(storage=self.make_storage())
+        self.assert_same_state(restored, library)
+        self.assertEqual(restored.get_borrower_id(state["book"].get_id()), state["ama"])
+        restored.close()
+
+    def test_restores_copies_as_their_kind(self):
+        library = Library(storage=self.make_storage())
+        title = Title(DVD, "Inception", "2010", "Christopher Nolan", "2h:28m")
+        copy_ids = library.add_copies(title, 2)
+        member_id = library.create_member("Patrick")
+        library.lend_title(member_id, title.get_id())
+        library.close()
+
+        restored = Library(storage=self.make_storage())
+        fields = ("id", "title", "pub_year", "duration", "borrower_id", "due_date")
+        self.assertEqual(restored.get_items(fields), library.get_items(fields))
+        self.assertIs(restored.get_item(copy_ids[0]).get_kind(), DVD)
+        self.assertEqual(restored.get_item(copy_ids[0]).get_detail(), "2h:28m")
+        restored.close()
+
+    def test_restores_titles(self):
+        library = Library(storage=self.make_storage())
+        title = Title(Book, "Dune", "1965", "Frank Herbert", "978-0441013593")
+        copy_ids = library.add_copies(title, 3)
+        member_id = library.create_member("Patrick")
+        lent_id = library.lend_title(member_id, title.get_id())
+        removed_id = next(copy_id for copy_id in copy_ids if copy_id != lent_id)
+        library.remove_item(removed_id)
+        library.close()
+
+        restored = Library(storage=self.make_storage())
+        record = restored.get_title(title.get_id())
+        self.assertEqual(restored.get_availability(title.get_id()), (1, 2))
+        self.assertEqual(sorted(record.get_copy_ids()), sorted(set(copy_ids) - {removed_id}))
+        self.assertIs(restored.get_item(lent_id).get_record(), record)
+
+        new_ids = restored.add_copies(record, 2)
+        self.assertFalse(set(new_ids) & set(copy_ids))
+        self.assertEqual(restored.get_availability(title.get_id()), (3, 4))
+        restored.close()
+
+
+class TestFileStorage(StorageTestMixin, unittest.TestCase):
+
+    def make_storage(self):
+        return FileStorage(self.directory.name, group_size=4)
+
+    def test_ignores_torn_tail(self):
+        library = Library(storage=self.make_storage())
+        self.populate(library)
+        library.close()
+
+        with open(os.path.join(self.directory.name, FileStorage.WAL_FILE), "ab") as file:
+            file.write(b"\x20\x00\x00\x00\x00")
+
+        restored = Library(storage=self.make_storage())
+        self.assert_same_state(restored, library)
+        restored.create_member("Kofi")
+        restored.close()
+
+        reopened = Library(storage=self.make_storage())
+        self.assertEqual(len(reopened.get_members()), 3)
+        reopened.close()
+
+    def test_snapshots_automatically(self):
+        storage = FileStorage(self.directory.name, group_size=4, snapshot_threshold=3)
+        library = Library(storage=storage)
+        state = self.populate(library)
+        for _ in range(10):
+            library.return_item(state["patrick"], state["book"])
+            library.lend_item(state["patrick"], state["book"])
+        library.close()
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, FileStorage.SNAPSHOT_FILE)))
+        reopened = FileStorage(self.directory.name, snapshot_threshold=3)
+        members, items, operations = reopened.load()
+        # A snapshot is due once the WAL holds as many operations as the snapshot holds records.
+        self.assertEqual((len(members), len(items)), (2, 3))
+        self.assertLess(len(operations), len(members) + len(items))
+        self.assertFalse(reopened.needs_snapshot())
+        reopened.close()
+
+        restored = Library(storage=self.make_storage())
+        self.assert_same_state(restored, library)
+        restored.close()
+
+    def test_no_automatic_snapshot(self):
+        library = Library(storage=FileStorage(self.directory.name, snapshot_threshold=None))
+        self.populate(library)
+        library.close()
+
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, FileStorage.SNAPSHOT_FILE)))
+        with self.assertRaises(ValueError):
+            FileStorage(self.directory.name, snapshot_threshold=0)
+
+    def test_restores_titles_after_snapshot(self):
+        library = Library(storage=self.make_storage())
+        title = Title(DVD, "Inception", "2010", "Christopher Nolan", "2h:28m")
+        library.add_copies(title, 2)
+        library.lend_title(library.create_member("Patrick"), title.get_id())
+        library.snapshot()
+        library.close()
+
+        restored = Library(storage=self.make_storage())
+        self.assertEqual(restored.get_availability(title.get_id()), (1, 2))
+        restored.close()
+
+    def test_reads_legacy_files(self):
+        # A WAL written before ADD_ITEM records carried a title ID.
+        body = b"\x01" + encode("Bsssssssq", (1, "b-1", "Dune", "1965", "Frank Herbert", "978-0441013593",
+                                                None, None, -2 ** 63))
+        with open(os.path.join(self.directory.name, FileStorage.WAL_FILE), "wb") as file:
+            file.write(struct.pack("<8sq", b"LMSWAL01", 1))
+            file.write(struct.pack("<II", len(body), zlib.crc32(body)) + body)
+
+        library = Library(storage=self.make_storage())
+        self.assertEqual(library.get_item("b-1").get_detail(), "978-0441013593")
+        library.create_member("Patrick")
+        library.close()
+
+        reopened = Library(storage=self.make_storage())
+        self.assertEqual((len(reopened.get_items()), len(reopened.get_members())), (1, 1))
+        reopened.close()
+
+    def test_snapshot_during_circulation(self):
+        for method in ("borrow_item", "return_item"):
+            with self.subTest(method=method):
+                directory = tempfile.mkdtemp(dir=self.directory.name)
+                library = Library(storage=FileStorage(directory), thread_safe=True)
+                state = self.populate(library)
+                patrick_member = state["book"].get_borrowed_by()
+                dvd = DVD("Interstellar", "2014", "Christopher Nolan", "2h:49m")
+                library.add_item(dvd)
+                if method == "return_item":
+                    library.lend_item(state["patrick"], dvd)
+
+                # Pause once the member has changed but before the change is logged, and snapshot meanwhile.
+                original = getattr(patrick_member, method)
+                entered, release = threading.Event(), threading.Event()
+
+                def paused(item, *args):
+                    result = original(item, *args)
+                    entered.set()
+                    release.wait(5)
+                    return result
+
+                setattr(patrick_member, method, paused)
+                call = library.lend_item if method == "borrow_item" else library.return_item
+                changing = threading.Thread(target=call, args=(state["patrick"], dvd))
+                changing.start()
+                entered.wait(5)
+                snapshotting = threading.Thread(target=library.snapshot)
+                snapshotting.start()
+                snapshotting.join(0.2)
+                release.set()
+                changing.join()
+                snapshotting.join()
+                library.close()
+
+                restored = Library(storage=FileStorage(directory))
+                self.assert_same_state(restored, library)
+                restored.close()
+
+    def test_snapshot_requires_storage(self):
+        with self.assertRaises(Exception):
+            Library().snapshot()
+
+
+class TestSQLiteStorage(StorageTestMixin, unittest.TestCase):
+
+    def make_storage(self):
+        return SQLiteStorage(os.path.join(self.directory.name, "library.db"), group_size=4)
+
+    def test_migrates_legacy_database(self):
+        path = os.path.join(self.directory.name, "library.db")
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE items (id TEXT PRIMARY KEY, kind INTEGER NOT NULL, title TEXT, pub_year TEXT,"
+                " author_name TEXT, detail TEXT, borrower_id TEXT, borrower_name TEXT, due INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT INTO items VALUES ('b-1', 1, 'Dune', '1965', 'Frank Herbert', '978-0441013593',"
+                " NULL, NULL, ?)", (-2 ** 63,)
+            )
+        connection.close()
+
+        library = Library(storage=self.make_storage())
+        self.assertEqual(library.get_item("b-1").get_detail(), "978-0441013593")
+        title = Title(DVD, "Inception", "2010", "Christopher Nolan", "2h:28m")
+        library.add_copies(title, 2)
+        library.close()
+
+        reopened = Library(storage=self.make_storage())
+        self.assertEqual(reopened.get_availability(title.get_id()), (2, 2))
+        reopened.close()
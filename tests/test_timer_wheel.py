@@ -0,0 +1,51 @@
+from library_management.timer_wheel import TimerWheel
+
+import unittest
+
+
+class TestTimerWheel(unittest.TestCase):
+
+    def setUp(self):
+        self.wheel = TimerWheel(tick=10)
+
+    def test_expire_in_deadline_order(self):
+        self.wheel.schedule("b", 25, "second")
+        self.wheel.schedule("a", 3, "first")
+        self.wheel.schedule("c", 1_000_000, "later")
+
+        self.assertEqual(self.wheel.next_deadline(), 3)
+        self.assertEqual(self.wheel.expire(25), [(3, "a", "first"), (25, "b", "second")])
+        self.assertEqual(self.wheel.expire(999_999), [])
+        self.assertEqual(len(self.wheel), 1)
+        self.assertEqual(self.wheel.expire(1_000_000), [(1_000_000, "c", "later")])
+        self.assertIsNone(self.wheel.next_deadline())
+
+    def test_partial_bucket(self):
+        self.wheel.schedule("a", 21)
+        self.wheel.schedule("b", 28)
+
+        self.assertEqual([key for _, key, _ in self.wheel.expire(24)], ["a"])
+        self.assertIn("b", self.wheel)
+        self.assertEqual([key for _, key, _ in self.wheel.expire(28)], ["b"])
+
+    def test_schedule_replaces_and_cancel(self):
+        self.wheel.schedule("a", 5)
+        self.wheel.schedule("a", 50)
+
+        self.assertEqual(self.wheel.expire(10), [])
+        self.assertTrue(self.wheel.cancel("a"))
+        self.assertFalse(self.wheel.cancel("a"))
+        self.assertEqual(self.wheel.expire(100), [])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_churn_keeps_heap_bounded(self):
+        for deadline in range(0, 100_000, 10):
+            self.wheel.schedule("a", deadline + 1_000_000)
+        self.wheel.schedule("b", 1_000_000)
+
+        self.assertEqual(len(self.wheel), 2)
+        self.assertEqual([key for _, key, _ in self.wheel.expire(2_000_000)], ["b", "a"])
+
+    def test_rejects_bad_tick(self):
+        with self.assertRaises(ValueError):
+            TimerWheel(tick=0)
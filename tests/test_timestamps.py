@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from library_management.timestamps import from_micros, to_micros, NO_TIMESTAMP
+
+import unittest
+
+
+class TestTimestamps(unittest.TestCase):
+
+    def test_round_trip(self):
+        moment = datetime(2024, 2, 29, 23, 59, 59, 999_999)
+
+        self.assertEqual(from_micros(to_micros(moment)), moment)
+        self.assertEqual(to_micros(datetime(1970, 1, 1, 0, 0, 1)), 1_000_000)
+
+    def test_none(self):
+        self.assertEqual(to_micros(None), NO_TIMESTAMP)
+        self.assertIsNone(from_micros(NO_TIMESTAMP))